@@ -4,6 +4,7 @@ Celery configuration for hellodjango project
 
 import os
 from celery import Celery
+from celery.signals import worker_init
 
 # Set the default Django settings module  
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hellodjango.settings')
@@ -21,6 +22,20 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@worker_init.connect
+def preload_census_boundary_indexes(**kwargs):
+    """
+    Build the configured census boundary indexes in the parent worker process
+    so the forked pool children share them copy-on-write
+    """
+    from django.conf import settings
+
+    if settings.CENSUS_BOUNDARY_INDEX_PRELOAD:
+        from utilities.census_boundary_index import preload_boundary_indexes
+
+        preload_boundary_indexes(settings.CENSUS_BOUNDARY_INDEX_PRELOAD)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -1 +1,3 @@
 from .nominatim_geocoding import *
+from .census_geocoding import *
+from .geocoding_providers import *
@@ -0,0 +1,19 @@
+import os
+
+# US Census Bureau geocoder
+# https://geocoding.geo.census.gov/geocoder/Geocoding_Services_API.html
+# Point CENSUS_GEOCODER_BASE_URL at a local stand-in server for testing
+
+CENSUS_GEOCODER_BASE_URL = os.environ.get(
+    "CENSUS_GEOCODER_BASE_URL", "https://geocoding.geo.census.gov/geocoder"
+)
+
+CENSUS_GEOCODER_BENCHMARK = os.environ.get("CENSUS_GEOCODER_BENCHMARK", "Public_AR_Current")
+
+# The batch endpoint accepts at most 10,000 addresses per file
+
+CENSUS_GEOCODER_BATCH_SIZE = int(os.environ.get("CENSUS_GEOCODER_BATCH_SIZE", 10000))
+
+# Seconds to wait for a batch response (large batches take minutes)
+
+CENSUS_GEOCODER_BATCH_TIMEOUT = int(os.environ.get("CENSUS_GEOCODER_BATCH_TIMEOUT", 900))
@@ -0,0 +1,71 @@
+import os
+
+from .census_geocoding import CENSUS_GEOCODER_BASE_URL
+from .nominatim_geocoding import NOMINATIM_API_BASE_URL, NOMINATIM_USER_AGENT
+
+# Connection pooling, rate limiting and retry policy per geocoding provider
+# (used by utilities/geocoding_client.py)
+#   rate_per_second : token bucket refill rate (requests per second)
+#   burst           : token bucket capacity
+#   max_in_flight   : concurrent requests per process
+#   max_retries     : retries on 429 / 5xx / connection errors
+#   backoff_seconds : base delay for exponential backoff when no Retry-After is sent
+# Limits apply per process: every Celery worker process has its own bucket.
+# The public Nominatim usage policy allows at most 1 request per second in total.
+
+GEOCODING_PROVIDERS = {
+    "census": {
+        "base_url": CENSUS_GEOCODER_BASE_URL,
+        "user_agent": NOMINATIM_USER_AGENT,
+        "rate_per_second": float(os.environ.get("CENSUS_GEOCODER_RATE_PER_SECOND", 10)),
+        "burst": 10,
+        "max_in_flight": int(os.environ.get("CENSUS_GEOCODER_MAX_IN_FLIGHT", 8)),
+        "max_retries": 5,
+        "backoff_seconds": 1.0,
+        "timeout": 30,
+    },
+    "nominatim": {
+        "base_url": NOMINATIM_API_BASE_URL.rstrip("?").rsplit("/search", 1)[0],
+        "user_agent": NOMINATIM_USER_AGENT,
+        "rate_per_second": float(os.environ.get("NOMINATIM_RATE_PER_SECOND", 1)),
+        "burst": 1,
+        "max_in_flight": int(os.environ.get("NOMINATIM_MAX_IN_FLIGHT", 1)),
+        "max_retries": 5,
+        "backoff_seconds": 2.0,
+        "timeout": 30,
+    },
+}
+
+# Geocode result cache (utilities/geocode_cache.py)
+#   matches are kept for GEOCODE_CACHE_TTL_DAYS, no-matches for GEOCODE_CACHE_NEGATIVE_TTL_DAYS
+#   GEOCODE_CACHE_REDIS_URL enables an optional Redis tier in front of the table
+
+GEOCODE_CACHE_ENABLED = os.environ.get("GEOCODE_CACHE_ENABLED", "true").lower() == "true"
+
+GEOCODE_CACHE_TTL_DAYS = int(os.environ.get("GEOCODE_CACHE_TTL_DAYS", 365))
+
+GEOCODE_CACHE_NEGATIVE_TTL_DAYS = int(os.environ.get("GEOCODE_CACHE_NEGATIVE_TTL_DAYS", 30))
+
+GEOCODE_CACHE_REDIS_URL = os.environ.get("GEOCODE_CACHE_REDIS_URL")
+
+# Hedged single-address geocoding (utilities/geocoding_orchestrator.py)
+#   GEOCODING_PROVIDER_ORDER        : providers tried in order (census, tiger_local, nominatim);
+#                                     nominatim is left out by default because hedged
+#                                     requests from several worker processes would
+#                                     exceed its 1 request/second policy
+#   GEOCODING_HEDGE_DELAY_SECONDS   : start the next provider if no answer arrived by then
+#   GEOCODING_MIN_QUALITY           : first result at or above this quality wins
+#                                     (Rooftop > Interpolated > Approximate > Zip)
+#   GEOCODING_ORCHESTRATOR_TIMEOUT  : give up on outstanding providers after this many seconds
+
+GEOCODING_PROVIDER_ORDER = [
+    provider.strip()
+    for provider in os.environ.get("GEOCODING_PROVIDER_ORDER", "census,tiger_local").split(",")
+    if provider.strip()
+]
+
+GEOCODING_HEDGE_DELAY_SECONDS = float(os.environ.get("GEOCODING_HEDGE_DELAY_SECONDS", 1.5))
+
+GEOCODING_MIN_QUALITY = os.environ.get("GEOCODING_MIN_QUALITY", "Interpolated")
+
+GEOCODING_ORCHESTRATOR_TIMEOUT = float(os.environ.get("GEOCODING_ORCHESTRATOR_TIMEOUT", 60))
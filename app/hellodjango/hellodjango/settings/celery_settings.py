@@ -0,0 +1,146 @@
+import os
+
+# Resource tokens for heavy Celery tasks (utilities/resource_tokens.py)
+#   RESOURCE_TOKENS_REDIS_URL       : Redis holding the shared token pools (default: the broker)
+#   RESOURCE_TOKEN_MEMORY_MB        : memory pool size; 0 = RESOURCE_TOKEN_MEMORY_FRACTION of the container's
+#                                     memory limit (or host RAM)
+#   RESOURCE_TOKEN_DB_WRITES        : concurrent bulk writers allowed against PostGIS
+#   RESOURCE_TOKEN_LEASE_SECONDS    : tokens of a worker that stops renewing return after this long
+#   RESOURCE_TOKEN_RETRY_SECONDS    : a task short of tokens is retried after about this long
+
+RESOURCE_TOKENS_REDIS_URL = os.environ.get(
+    "RESOURCE_TOKENS_REDIS_URL", os.environ.get("CELERY_BROKER_URL")
+)
+
+RESOURCE_TOKEN_MEMORY_MB = int(os.environ.get("RESOURCE_TOKEN_MEMORY_MB", 0))
+
+RESOURCE_TOKEN_MEMORY_FRACTION = float(os.environ.get("RESOURCE_TOKEN_MEMORY_FRACTION", 0.7))
+
+RESOURCE_TOKEN_DB_WRITES = int(os.environ.get("RESOURCE_TOKEN_DB_WRITES", 4))
+
+RESOURCE_TOKEN_LEASE_SECONDS = int(os.environ.get("RESOURCE_TOKEN_LEASE_SECONDS", 120))
+
+RESOURCE_TOKEN_RETRY_SECONDS = int(os.environ.get("RESOURCE_TOKEN_RETRY_SECONDS", 30))
+
+# Estimated peak worker memory (MB) of the heavy tasks, per GADM layer and per
+# TIGER unit type. Admin levels 2 and 3 hold most of GADM's geometry.
+
+GADM_LAYER_MEMORY_MB = {
+    "Admin_Level_0": 3000,
+    "Admin_Level_1": 3000,
+    "Admin_Level_2": 6000,
+    "Admin_Level_3": 8000,
+    "Admin_Level_4": 3000,
+    "Admin_Level_5": 1000,
+}
+
+CENSUS_LOAD_MEMORY_MB = {
+    "state": 500,
+    "county": 500,
+    "cd": 500,
+    "sldu": 500,
+    "sldl": 500,
+    "tract": 1000,
+    "blockgroup": 1000,
+    "tabblock": 2000,
+    "vtd": 1000,
+    "place": 1000,
+    "zcta": 2000,
+}
+
+# Task queues
+#   bulk-ingest         : downloads and loads (GADM, TIGER, VTDs, point CSVs, batch geocoding)
+#   geometry-compute    : spatial joins, intersections, crosswalks, census unit assignment
+#   interactive-geocode : single-address requests that should not wait behind bulk work
+# Each queue is consumed by its own worker (compose.yaml) with its own concurrency
+# and prefetch: long queues prefetch 1 task per process so queued work stays on
+# the broker instead of sitting behind a running load. Unrouted tasks go to
+# CELERY_TASK_DEFAULT_QUEUE, consumed by the geometry-compute worker.
+
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+
+TASK_QUEUE_ASSIGNMENTS = {
+    "bulk-ingest": [
+        "load_single_spatial_model",
+        "fetch_and_load_standard_spatial_data_async",
+        "fetch_and_load_census_tiger_data_async",
+        "create_sample_places_async",
+        "create_sample_addresses_async",
+        "preprocess_gadm_layer_sedonadb",
+        "load_gadm_from_geoparquet",
+        "populate_gadm_fks_bulk",
+        "load_gadm_sedonadb",
+        "preprocess_single_gadm_layer",
+        "load_preprocessed_gadm_layer",
+        "populate_gadm_foreign_keys_fast",
+        "load_gadm_pipelined",
+        "load_gadm_layer_parallel",
+        "populate_gadm_foreign_keys",
+        "load_gadm_parallel_optimized",
+        "fetch_and_load_vtd_state",
+        "fetch_all_vtds_for_year",
+        "fetch_and_load_addrfeat_county",
+        "fetch_census_unit_task",
+        "load_all_years_for_unit",
+        "load_all_units_for_year",
+        "load_comprehensive_census",
+        "import_point_csv_range_task",
+        "import_point_csv_parallel",
+        "geocode_addresses_batch",
+        "geocode_addresses_concurrent",
+        "geocode_addresses_tiger_local",
+        "geocode_census_batch_task",
+        "geocode_addresses_census_batch",
+        "fan_out_geocodes_task",
+        "purge_expired_geocode_cache",
+    ],
+    "geometry-compute": [
+        "cleanup_old_locations",
+        "assign_census_units_batch",
+        "assign_census_units_sql_chunk",
+        "assign_census_units_bulk",
+        "fan_out_census_units_task",
+        "address_work_queue_worker",
+        "start_address_work_queue",
+        "enrich_locations_task",
+        "assign_census_units_geopandas_task",
+        "assign_blocks_sedona_task",
+        "build_vtd_cd_intersections_sedona_task",
+        "build_census_intersections_state_task",
+        "build_census_intersections_all",
+        "build_census_crosswalk_tile_task",
+        "finalize_census_crosswalk_task",
+        "build_census_crosswalk_all",
+        "build_block_crosswalk_state_task",
+        "build_block_crosswalk_all",
+    ],
+    "interactive-geocode": [
+        "process_location_update",
+        "calculate_distances",
+        "geocode_address",
+        "assign_census_units_to_address",
+    ],
+}
+
+CELERY_TASK_ROUTES = {
+    f"locations.tasks.{task}": {"queue": queue}
+    for queue, tasks in TASK_QUEUE_ASSIGNMENTS.items()
+    for task in tasks
+}
+
+# Tasks of the long queues are acknowledged when they finish, not when they are
+# received, so a worker restarted mid-load leaves the message to be redelivered.
+# Redis redelivers unacknowledged messages after visibility_timeout, which must
+# therefore exceed the longest task (CELERY_VISIBILITY_TIMEOUT_SECONDS, default 12h).
+
+LATE_ACK_QUEUES = ["bulk-ingest", "geometry-compute"]
+
+CELERY_TASK_ANNOTATIONS = {
+    f"locations.tasks.{task}": {"acks_late": True}
+    for queue in LATE_ACK_QUEUES
+    for task in TASK_QUEUE_ASSIGNMENTS[queue]
+}
+
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": int(os.environ.get("CELERY_VISIBILITY_TIMEOUT_SECONDS", 43200)),
+}
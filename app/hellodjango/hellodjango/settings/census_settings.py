@@ -0,0 +1,79 @@
+import os
+
+# Census unit assignment
+
+# Default strategy for United_States_Address.assign_census_units:
+#   hierarchical : one containment query per level against PostGIS
+#   block_first  : one block containment query, ancestors sliced from the block GEOID
+#   index        : in-process STRtree boundary index (utilities/census_boundary_index.py)
+
+CENSUS_ASSIGNMENT_STRATEGY = os.environ.get("CENSUS_ASSIGNMENT_STRATEGY", "hierarchical")
+
+# Boundary indexes to build in the Celery parent process before the pool forks,
+# given as "unit:year" pairs, e.g. "state:2020,county:2020,tract:2020"
+
+CENSUS_BOUNDARY_INDEX_PRELOAD = [
+    (unit_type.strip(), int(year))
+    for unit_type, year in (
+        pair.split(":")
+        for pair in os.environ.get("CENSUS_BOUNDARY_INDEX_PRELOAD", "").split(",")
+        if pair.strip()
+    )
+]
+
+# Number of address ids per UPDATE ... FROM chunk in set-based assignment
+
+CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE = int(
+    os.environ.get("CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE", 50000)
+)
+
+# Database alias the offline batch engines (GeoPandas, Sedona) read addresses and
+# boundaries from, e.g. a read replica so large jobs stay off the primary.
+# Results are always written to "default".
+
+CENSUS_BATCH_READ_DATABASE = os.environ.get("CENSUS_BATCH_READ_DATABASE", "default")
+
+# Work-queue mode (utilities/address_work_queue.py): rows claimed per chunk and
+# number of worker tasks started by start_address_work_queue
+
+ADDRESS_WORK_QUEUE_CHUNK_SIZE = int(os.environ.get("ADDRESS_WORK_QUEUE_CHUNK_SIZE", 1000))
+
+ADDRESS_WORK_QUEUE_WORKERS = int(os.environ.get("ADDRESS_WORK_QUEUE_WORKERS", 4))
+
+# Address ids pulled into memory per chunk by the GeoPandas engine
+
+CENSUS_GEOPANDAS_CHUNK_SIZE = int(os.environ.get("CENSUS_GEOPANDAS_CHUNK_SIZE", 250000))
+
+# Sedona on local Spark (utilities/sedona_spatial_joins.py)
+#   SEDONA_SPARK_MASTER          : local[*] uses every core of the machine
+#   SEDONA_SPARK_PACKAGES        : Maven coordinates of the Sedona and GeoTools jars
+#   SEDONA_SHUFFLE_PARTITIONS    : partitions of the spatial join (0 = 4 per core)
+
+SEDONA_SPARK_MASTER = os.environ.get("SEDONA_SPARK_MASTER", "local[*]")
+
+SEDONA_SPARK_DRIVER_MEMORY = os.environ.get("SEDONA_SPARK_DRIVER_MEMORY", "8g")
+
+SEDONA_SPARK_PACKAGES = os.environ.get(
+    "SEDONA_SPARK_PACKAGES",
+    "org.apache.sedona:sedona-spark-shaded-3.5_2.12:1.6.1,org.datasyslab:geotools-wrapper:1.6.1-28.2",
+)
+
+SEDONA_SHUFFLE_PARTITIONS = int(os.environ.get("SEDONA_SHUFFLE_PARTITIONS", 0))
+
+# TIGER vintage of the address range features used by the offline geocoder
+# (utilities/tiger_geocoder.py, geocode_source='TIGER_LOCAL')
+
+TIGER_GEOCODER_YEAR = int(os.environ.get("TIGER_GEOCODER_YEAR", 2024))
+
+# Streaming point CSV import (utilities/point_csv_importer.py)
+#   POINT_IMPORT_CHUNK_SIZE : rows per COPY chunk and transaction
+#   POINT_IMPORT_TASK_ROWS  : rows per Celery task when a file is imported in parallel
+
+POINT_IMPORT_CHUNK_SIZE = int(os.environ.get("POINT_IMPORT_CHUNK_SIZE", 100000))
+
+POINT_IMPORT_TASK_ROWS = int(os.environ.get("POINT_IMPORT_TASK_ROWS", 1000000))
+
+# Intersections smaller than this (square meters, equal-area) are treated as
+# boundary slivers and not stored (utilities/census_intersections.py)
+
+CENSUS_INTERSECTION_MIN_AREA_SQM = float(os.environ.get("CENSUS_INTERSECTION_MIN_AREA_SQM", 1))
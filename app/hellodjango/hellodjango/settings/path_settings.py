@@ -26,6 +26,7 @@ VECTOR_SPATIAL_DATA_SUBDIRECTORY = SPATIAL_DATA_SUBDIRECTORY / 'vector'
 RASTER_SPATIAL_DATA_SUBDIRECTORY = SPATIAL_DATA_SUBDIRECTORY / 'raster'
 POINTCLOUD_SPATIAL_DATA_SUBDIRECTORY = SPATIAL_DATA_SUBDIRECTORY / 'pointcloud'
 CENSUS_TIGER_LINE_DATA = VECTOR_SPATIAL_DATA_SUBDIRECTORY / 'census_tiger'
+GEOPARQUET_EXPORT_SUBDIRECTORY = VECTOR_SPATIAL_DATA_SUBDIRECTORY / 'geoparquet_exports'
 
 # Logs
 
@@ -53,6 +54,7 @@ NECESSARY_PATHS = [
     RASTER_SPATIAL_DATA_SUBDIRECTORY,
     POINTCLOUD_SPATIAL_DATA_SUBDIRECTORY,
     CENSUS_TIGER_LINE_DATA,
+    GEOPARQUET_EXPORT_SUBDIRECTORY,
     LOGS_DIRECTORY,
     UTILITIES_PACKAGE_NAME,
     PATH_TO_UTILITIES_PACKAGE,
@@ -0,0 +1,214 @@
+"""
+Assign census units (state, county, tract, block group, block, VTD, CD) to geocoded addresses
+
+Modes:
+- orm: one Celery task per address (United_States_Address.assign_census_units)
+- sql: set-based UPDATE ... FROM spatial join per unit type over id-range chunks
+- geopandas: vectorized sjoin in this process (or one worker), results written
+  back with COPY + one UPDATE per chunk; reads can go to a replica
+  (CENSUS_BATCH_READ_DATABASE)
+- sedona: address x block spatial join on local Spark over GeoParquet exports;
+  ancestors come from the block GEOID and VTD/CD from the block crosswalk
+
+Usage:
+    # Set-based assignment for all geocoded 2020 addresses, in this process
+    python manage.py assign_census_units --year 2020 --mode sql
+
+    # Same, chunks fanned out across Celery workers
+    python manage.py assign_census_units --year 2020 --mode sql --async
+
+    # Set-based, deriving state/county/tract/block group from the block GEOID
+    python manage.py assign_census_units --year 2020 --mode sql --strategy block_first
+
+    # Offline batch assignment with GeoPandas
+    python manage.py assign_census_units --year 2020 --mode geopandas
+
+    # Tens of millions of addresses: Sedona on every core
+    python manage.py assign_census_units --year 2020 --mode sedona
+
+    # Per-address tasks using the in-memory boundary index
+    python manage.py assign_census_units --year 2020 --mode orm --strategy index
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Assign census units to geocoded addresses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=2020,
+            help='Census year (restricts addresses by census_year and boundaries by year)'
+        )
+
+        parser.add_argument(
+            '--mode',
+            type=str,
+            default='sql',
+            choices=['orm', 'sql', 'geopandas', 'sedona'],
+            help='orm = one task per address, sql = set-based spatial joins, '
+                 'geopandas = vectorized joins outside the database, '
+                 'sedona = partitioned joins on local Spark'
+        )
+
+        parser.add_argument(
+            '--strategy',
+            type=str,
+            choices=['hierarchical', 'block_first', 'index'],
+            help='Assignment strategy (index is only available for --mode orm)'
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Address ids per chunk for --mode sql/geopandas '
+                 '(default: CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE / CENSUS_GEOPANDAS_CHUNK_SIZE)'
+        )
+
+        parser.add_argument(
+            '--start-id',
+            type=int,
+            help='First address id to process'
+        )
+
+        parser.add_argument(
+            '--end-id',
+            type=int,
+            help='Last address id to process'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery'
+        )
+
+    def handle(self, *args, **options):
+        year = options['year']
+        mode = options['mode']
+        use_async = options['use_async']
+
+        if mode == 'orm':
+            self._assign_orm(year, options['strategy'])
+        elif mode == 'sql':
+            self._assign_sql(year, options, use_async)
+        elif mode == 'geopandas':
+            self._assign_geopandas(year, options, use_async)
+        elif mode == 'sedona':
+            self._assign_sedona(year, options, use_async)
+        else:
+            raise CommandError(f"Unsupported mode: {mode}")
+
+    def _assign_orm(self, year, strategy):
+        """Queue one assignment task per geocoded address"""
+        from locations.models import United_States_Address
+        from locations.tasks import assign_census_units_batch
+
+        address_ids = list(
+            United_States_Address.objects.filter(
+                census_year=year, geocoded=True
+            ).values_list('id', flat=True)
+        )
+
+        result = assign_census_units_batch.delay(address_ids, year, strategy)
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Queued assignment for {len(address_ids)} addresses: {result.id}")
+        )
+
+    def _assign_sql(self, year, options, use_async):
+        """Run set-based assignment in id-range chunks"""
+        chunk_size = options['chunk_size'] or settings.CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE
+        strategy = options['strategy']
+
+        if strategy == 'index':
+            raise CommandError("--strategy index is only available for --mode orm")
+
+        block_first = strategy == 'block_first'
+
+        if use_async:
+            from locations.tasks import assign_census_units_bulk
+
+            result = assign_census_units_bulk.delay(year, chunk_size, True, block_first)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued bulk assignment: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.bulk_census_assignment import assign_census_units_bulk
+
+        stats = assign_census_units_bulk(
+            year,
+            chunk_size=chunk_size,
+            start_id=options.get('start_id'),
+            end_id=options.get('end_id'),
+            block_first=block_first,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Assigned {stats['addresses']} addresses in {stats['chunks']} chunks, "
+                f"{stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/s)"
+            )
+        )
+
+    def _assign_geopandas(self, year, options, use_async):
+        """Run vectorized assignment with the GeoPandas engine"""
+        if options['strategy']:
+            raise CommandError("--strategy is not used by --mode geopandas")
+
+        if use_async:
+            from locations.tasks import assign_census_units_geopandas_task
+
+            result = assign_census_units_geopandas_task.delay(
+                year, options['chunk_size'], options.get('start_id'), options.get('end_id')
+            )
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued GeoPandas assignment: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.geopandas_census_assignment import assign_census_units_geopandas
+
+        stats = assign_census_units_geopandas(
+            year,
+            chunk_size=options['chunk_size'],
+            start_id=options.get('start_id'),
+            end_id=options.get('end_id'),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Assigned {stats['addresses']} addresses in {stats['chunks']} chunks, "
+                f"{stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/s)"
+            )
+        )
+
+    def _assign_sedona(self, year, options, use_async):
+        """Run the address x block join with Sedona on local Spark"""
+        if options['strategy'] or options.get('start_id') or options.get('end_id'):
+            raise CommandError("--mode sedona processes the whole year; --strategy and id ranges are not used")
+
+        if use_async:
+            from locations.tasks import assign_blocks_sedona_task
+
+            result = assign_blocks_sedona_task.delay(year)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued Sedona assignment: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.sedona_spatial_joins import assign_blocks_sedona
+
+        stats = assign_blocks_sedona(year)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Assigned {stats['addresses']}/{stats['exported']} addresses in "
+                f"{stats['elapsed_seconds']}s ({stats['fanned_out']} duplicates filled in)"
+            )
+        )
@@ -0,0 +1,77 @@
+"""
+Build the block-to-district crosswalk (VTD, CD, SLDU, SLDL, place, ZCTA per block)
+
+Requires tabulation blocks and the district boundaries to be loaded for the years used.
+
+Usage:
+    # All states with blocks loaded, in this process
+    python manage.py build_block_crosswalk --year 2020
+
+    # 2024 districts over 2020 blocks, one Celery task per state
+    python manage.py build_block_crosswalk --year 2024 --block-year 2020 --async
+
+    # Selected states
+    python manage.py build_block_crosswalk --year 2020 --state 06 --state 48
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Build the block-to-district crosswalk table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=2020,
+            help='District boundary year'
+        )
+
+        parser.add_argument(
+            '--block-year',
+            type=int,
+            help='Tabulation block year (default: --year)'
+        )
+
+        parser.add_argument(
+            '--state',
+            type=str,
+            action='append',
+            dest='states',
+            help='State FIPS code (repeatable, default: every state with blocks loaded)'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery (one task per state)'
+        )
+
+    def handle(self, *args, **options):
+        year = options['year']
+        block_year = options['block_year'] or year
+        states = options['states']
+
+        if options['use_async']:
+            from locations.tasks import build_block_crosswalk_all
+
+            result = build_block_crosswalk_all.delay(year, block_year, states)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued block crosswalk build: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.block_crosswalk import build_block_crosswalk
+
+        stats = build_block_crosswalk(year, block_year, states)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Crosswalked {stats['blocks']} blocks in {stats['states']} states, "
+                f"{stats['elapsed_seconds']}s"
+            )
+        )
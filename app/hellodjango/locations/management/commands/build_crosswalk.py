@@ -0,0 +1,165 @@
+"""
+Build a weighted crosswalk between two census unit types
+
+Any pair from CENSUS_CROSSWALK_UNITS (state, county, tract, block_group, vtd, cd,
+sldu, sldl, place, zcta) is intersected state tile by state tile and stored in
+United_States_Census_Unit_Crosswalk with area weights, and optionally population
+weights from 2020 block pop20.
+
+Completed tiles are checkpointed: re-running resumes with the missing ones.
+Each tile also stores the geometry fingerprints of its inputs, so --incremental
+only recomputes pairs touching units that were added, changed or removed.
+
+Usage:
+    # ZCTA x CD for 2020 with population weights, one task per state
+    python manage.py build_crosswalk --source zcta --target cd --year 2020 --population --async
+
+    # Place x County in this process
+    python manage.py build_crosswalk --source place --target county --year 2020
+
+    # Recompute every tile
+    python manage.py build_crosswalk --source tract --target sldu --year 2020 --restart
+
+    # After a boundary reload, recompute only pairs of changed units
+    python manage.py build_crosswalk --source vtd --target cd --year 2020 --incremental --async
+
+    # Show tile progress
+    python manage.py build_crosswalk --source zcta --target cd --year 2020 --status
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Build a weighted crosswalk between two census unit types'
+
+    def add_arguments(self, parser):
+        from utilities.dispatchers import CENSUS_CROSSWALK_UNITS
+
+        parser.add_argument(
+            '--source',
+            type=str,
+            required=True,
+            choices=list(CENSUS_CROSSWALK_UNITS),
+            help='Unit whose shares are measured (area_weight = share of the source)'
+        )
+
+        parser.add_argument(
+            '--target',
+            type=str,
+            required=True,
+            choices=list(CENSUS_CROSSWALK_UNITS),
+            help='Unit the source is split across'
+        )
+
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=2020,
+            help='Census year of both unit types'
+        )
+
+        parser.add_argument(
+            '--population',
+            action='store_true',
+            help='Also store population weights from block pop20'
+        )
+
+        parser.add_argument(
+            '--block-year',
+            type=int,
+            default=2020,
+            help='Tabulation block year for population weights'
+        )
+
+        parser.add_argument(
+            '--state',
+            type=str,
+            action='append',
+            dest='states',
+            help='State tile FIPS code (repeatable; default: all tiles)'
+        )
+
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore checkpoints and rebuild every tile'
+        )
+
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Revisit every tile and recompute only pairs of changed units'
+        )
+
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            help='Only report pending tiles'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery (one task per tile)'
+        )
+
+    def handle(self, *args, **options):
+        source = options['source']
+        target = options['target']
+        year = options['year']
+
+        if source == target:
+            raise CommandError("--source and --target must differ")
+        if options['incremental'] and options['restart']:
+            raise CommandError("--incremental and --restart are exclusive")
+
+        from utilities.census_crosswalks import (
+            build_census_crosswalk,
+            get_crosswalk_tiles,
+            pending_crosswalk_tiles,
+        )
+
+        if options['status']:
+            tiles = options['states'] or get_crosswalk_tiles(source, target, year)
+            pending = pending_crosswalk_tiles(source, target, year, options['population'], tiles)
+            self.stdout.write(f"  {len(tiles) - len(pending)}/{len(tiles)} tiles done")
+            if pending:
+                self.stdout.write(f"  pending: {', '.join(pending)}")
+            return
+
+        if options['use_async']:
+            from locations.tasks import build_census_crosswalk_all
+
+            result = build_census_crosswalk_all.delay(
+                source, target, year, options['population'], options['block_year'],
+                options['states'], not options['restart'], options['incremental']
+            )
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued {source} x {target} crosswalk ({year}): {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        try:
+            stats = build_census_crosswalk(
+                source,
+                target,
+                year,
+                with_population=options['population'],
+                block_year=options['block_year'],
+                state_fips=options['states'],
+                resume=not options['restart'],
+                incremental=options['incremental'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Built {stats['rows']} {source} x {target} rows in {stats['tiles']} tiles "
+                f"({stats['elapsed_seconds']}s)"
+            )
+        )
@@ -0,0 +1,128 @@
+"""
+Build pre-computed intersections between census units
+
+Types:
+- county_cd: CountyCongressionalDistrictIntersection (shares, relationship, dominant CD)
+- vtd_cd:    VTDCongressionalDistrictIntersection (share of each VTD in each CD)
+
+Engines:
+- postgis: one set-based INSERT per state; --async runs one Celery task per state
+- sedona:  partitioned spatial join on local Spark over GeoParquet exports (vtd_cd only)
+
+Existing rows for the year (and state, with postgis) are replaced.
+
+Usage:
+    # County x CD intersections for 2020, in this process
+    python manage.py build_intersections --type county_cd --year 2020
+
+    # VTD x CD for every state, one task per state
+    python manage.py build_intersections --type vtd_cd --year 2020 --async
+
+    # VTD x CD for California only
+    python manage.py build_intersections --type vtd_cd --year 2020 --state 06
+
+    # VTD x CD with Sedona, on a Celery worker
+    python manage.py build_intersections --type vtd_cd --year 2020 --engine sedona --async
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Build pre-computed intersections between census units'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            type=str,
+            default='vtd_cd',
+            choices=['county_cd', 'vtd_cd'],
+            help='Intersection to build'
+        )
+
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=2020,
+            help='Census year of both unit types'
+        )
+
+        parser.add_argument(
+            '--engine',
+            type=str,
+            default='postgis',
+            choices=['postgis', 'sedona'],
+            help='postgis = per-state SQL, sedona = Apache Sedona on local Spark'
+        )
+
+        parser.add_argument(
+            '--state',
+            type=str,
+            action='append',
+            dest='states',
+            help='State FIPS code (repeatable, postgis only; default: all loaded states)'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery'
+        )
+
+    def handle(self, *args, **options):
+        intersection_type = options['type']
+        year = options['year']
+
+        if options['engine'] == 'sedona':
+            self._handle_sedona(intersection_type, year, options)
+            return
+
+        if options['use_async']:
+            from locations.tasks import build_census_intersections_all
+
+            result = build_census_intersections_all.delay(intersection_type, year, options['states'])
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Queued {intersection_type} intersections ({year}): {result.id}")
+            )
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.census_intersections import build_census_intersections
+
+        stats = build_census_intersections(intersection_type, year, options['states'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Built {stats['intersections']} {intersection_type} intersections for {year} "
+                f"({stats['states']} states) in {stats['elapsed_seconds']}s"
+            )
+        )
+
+    def _handle_sedona(self, intersection_type, year, options):
+        if intersection_type != 'vtd_cd':
+            raise CommandError("The sedona engine only builds vtd_cd")
+        if options['states']:
+            raise CommandError("--state is not supported by the sedona engine")
+
+        if options['use_async']:
+            from locations.tasks import build_vtd_cd_intersections_sedona_task
+
+            result = build_vtd_cd_intersections_sedona_task.delay(year)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued VTD x CD intersections: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.sedona_spatial_joins import build_vtd_cd_intersections_sedona
+
+        stats = build_vtd_cd_intersections_sedona(year)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Built {stats['intersections']} VTD x CD intersections for {year} "
+                f"({stats['vtds']} VTDs, {stats['cds']} CDs) in {stats['elapsed_seconds']}s"
+            )
+        )
@@ -0,0 +1,111 @@
+"""
+Switch TIGER unit types between inline and deduplicated geometry storage
+
+inline:       each (geoid, year) row stores its own geometry (default)
+deduplicated: each distinct geometry is stored once in census_geometry and the
+              unit's table becomes a view joining it back (same name and columns)
+
+Without --mode, reports the storage mode and size of every unit type.
+
+Usage:
+    # Storage report
+    python manage.py census_geometry_storage
+
+    # Deduplicate tracts, blocks and ZCTAs, then reclaim the freed space
+    python manage.py census_geometry_storage --unit tract --unit tabblock --unit zcta --mode deduplicated --vacuum
+
+    # Back to a plain table (e.g. before a schema migration of that model)
+    python manage.py census_geometry_storage --unit tract --mode inline
+
+    # Drop geometries no row references any more (after reloads)
+    python manage.py census_geometry_storage --prune
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Switch TIGER unit types between inline and deduplicated geometry storage'
+
+    def add_arguments(self, parser):
+        from utilities.census_geometry_storage import GEOMETRY_STORAGE_MODES
+        from utilities.dispatchers import CENSUS_FINGERPRINT_UNITS
+
+        parser.add_argument(
+            '--unit',
+            type=str,
+            action='append',
+            dest='units',
+            choices=list(CENSUS_FINGERPRINT_UNITS),
+            help='Census unit type (repeatable)'
+        )
+
+        parser.add_argument(
+            '--mode',
+            type=str,
+            choices=GEOMETRY_STORAGE_MODES,
+            help='Storage mode to switch the units to'
+        )
+
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete shared geometries that no row references'
+        )
+
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='VACUUM FULL the switched tables to return freed space to the OS'
+        )
+
+    def handle(self, *args, **options):
+        from utilities.census_geometry_storage import (
+            census_geometry_storage_mode,
+            census_geometry_storage_report,
+            deduplicate_census_geometry,
+            inline_census_geometry,
+            prune_census_geometry,
+            vacuum_census_unit_table,
+        )
+
+        if options['mode']:
+            if not options['units']:
+                raise CommandError("--mode needs at least one --unit")
+
+            for unit_type in options['units']:
+                if census_geometry_storage_mode(unit_type) == options['mode']:
+                    self.stdout.write(f"  {unit_type}: already {options['mode']}")
+                    continue
+
+                if options['mode'] == 'deduplicated':
+                    stats = deduplicate_census_geometry(unit_type)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"✅ {unit_type}: {stats['rows']} rows now share {stats['geometries']} geometries"
+                        )
+                    )
+                else:
+                    stats = inline_census_geometry(unit_type)
+                    self.stdout.write(self.style.SUCCESS(f"✅ {unit_type}: {stats['rows']} rows inline again"))
+
+                if options['vacuum']:
+                    vacuum_census_unit_table(unit_type)
+
+        if options['prune']:
+            deleted = prune_census_geometry()
+            self.stdout.write(self.style.SUCCESS(f"✅ Pruned {deleted} unreferenced geometries"))
+
+        if options['mode'] or options['prune']:
+            return
+
+        report = census_geometry_storage_report()
+        for unit in report['units']:
+            self.stdout.write(
+                f"  {unit['unit_type']:<11} {unit['mode']:<13} {unit['rows']:>10} rows "
+                f"{unit['distinct_geometries']:>10} geometries {unit['table_bytes'] / 1e6:>10.1f} MB"
+            )
+        self.stdout.write(f"  census_geometry: {report['geometry_table_bytes'] / 1e6:.1f} MB")
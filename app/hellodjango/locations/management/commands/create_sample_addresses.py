@@ -77,47 +77,25 @@ class Command(BaseCommand):
             logger.info(message)
 
 
-def create_addresses_from_data_file(path_to_data_file: pathlib.Path) -> bool:
+def create_addresses_from_data_file(path_to_data_file: pathlib.Path, mode: str = "wipe") -> bool:
 
-    # container for bad addresses
-
-    bad_addresses = []
-    United_States_Address.objects.all().delete()
-
-    # open the csv and create a DictReader
+    # streamed and COPYed in chunks; normalize + fingerprint happen per chunk,
+    # so duplicates are geocoded once
 
     try:
-        inpath = pathlib.Path(path_to_data_file)
-
-        with inpath.open("r", newline="\n", encoding="utf-8-sig") as infile:
-            reader = csv.DictReader(infile)
-            for row in reader:
-
-                # create concatenated street name
-
-                street_name_fields = [
-                    row["predir"],
-                    row["prequal"],
-                    row["pretyp"],
-                    row["street"],
-                    row["suftyp"],
-                    row["sufqual"],
-                    row["sufdir"],
-                ]
-
-                concatenated_street_name = " ".join(street_name_fields)
-
-                us_address = United_States_Address(
-                    primary_number=row["number"],
-                    street_name=concatenated_street_name,
-                    city_name=row["city"],
-                    state_abbreviation=row["state"],
-                    zip5=row["zip"],
-                )
-                us_address.save()
+        result = import_point_csv(
+            path_to_data_file,
+            dataset="address",
+            column_map=POINT_IMPORT_PRESETS["address_sample"],
+            mode=mode,
+        )
 
+        stats = duplication_stats()
         message = "\n"
-        message += "Success creating address objects"
+        message += (
+            f"Success creating address objects: {result['rows']} rows read, "
+            f"{stats['rows']} rows, {stats['distinct']} distinct addresses"
+        )
         logger.info(message)
         return True
 
@@ -130,10 +108,12 @@ def create_addresses_from_data_file(path_to_data_file: pathlib.Path) -> bool:
 
 def geocode_addresses_with_nominatim() -> bool:
 
-    ungeocoded_addresses = United_States_Address.objects.filter(
-        (Q(latitude=None) | Q(longitude=None))
+    ungeocoded_addresses = list(
+        United_States_Address.objects.filter((Q(latitude=None) | Q(longitude=None)))
     )
 
+    concatenated_addresses = []
+
     for uga in ungeocoded_addresses:
 
         concatenated_street_address = (
@@ -143,15 +123,24 @@ def geocode_addresses_with_nominatim() -> bool:
         concatenated_address = f"{concatenated_street_address}, {uga.city_name}, {uga.state_abbreviation} {uga.zip5}".replace(
             "  ", " "
         )
+        concatenated_addresses.append(concatenated_address)
 
-        address_information_from_nominatim = geocode_with_nominatim_public(
-            concatenated_address=concatenated_address
-        )
+    # requests are paced and bounded by the shared Nominatim client
+
+    results = get_geocoding_client("nominatim").map(
+        geocode_with_nominatim_public, concatenated_addresses
+    )
+
+    for uga, address_information_from_nominatim in zip(ungeocoded_addresses, results):
 
         if address_information_from_nominatim:
             try:
-                uga.latitude = uga[settings.NOMINATIM_LATITUDE_VARIABLE]
-                uga.longitude = uga[settings.NOMINATIM_LONGITUDE_VARIABLE]
+                uga.latitude = address_information_from_nominatim[
+                    settings.NOMINATIM_LATITUDE_VARIABLE
+                ]
+                uga.longitude = address_information_from_nominatim[
+                    settings.NOMINATIM_LONGITUDE_VARIABLE
+                ]
                 uga.save()
 
             except Exception as e:
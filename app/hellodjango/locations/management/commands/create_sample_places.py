@@ -81,102 +81,26 @@ class Command(BaseCommand):
             logger.info(message)
 
 
-def create_places_from_data_file(path_to_data_file: pathlib.Path) -> bool:
+def create_places_from_data_file(path_to_data_file: pathlib.Path, mode: str = "wipe") -> bool:
 
-    United_States_Address.objects.all().delete()
-    Place.objects.all().delete()
-
-    # container for bad addresses
-
-    bad_locations = []
-
-    # open the csv and create a DictReader
+    # addresses and places are streamed and COPYed in chunks; the file's
+    # lon/lat become the point of both
 
     try:
-        inpath = pathlib.Path(path_to_data_file)
-
-        with inpath.open("r", newline="\n", encoding="utf-8-sig") as infile:
-            reader = csv.DictReader(infile)
-            for row in reader:
-
-                # field names
-                # 'original_Pharmacy ID',
-                # 'original_Pharmacy Name',
-                # 'original_Pharmacy        Address 1',
-                # 'original_Pharmacy City',
-                # 'original_State',
-                # 'original_Pharmacy Zip Code',
-                # 'original_Pharmacy Phone Number',
-                # 'lat',
-                # 'lon',
-                # 'formatted',
-                # 'name',
-                # 'housenumber',
-                # 'street',
-                # 'postcode',
-                # 'suburb',
-                # 'district',
-                # 'city',
-                # 'county',
-                # 'state',
-                # 'state_code',
-                # 'country',
-                # 'country_code',
-                # 'confidence',
-                # 'confidence_city_level',
-                # 'confidence_street_level',
-                # 'confidence_building_level',
-                # 'attribution',
-                # 'attribution_license',
-                # 'attribution_url'
-
-                # Get address fields
-
-                split_address_raw = row["formatted"].split(",")
-                split_address = list(map(str, split_address_raw))
-
-                primary_number = row["housenumber"].strip()
-                street_name = row["street"].strip()
-                city_name = row["city"].strip()
-                state_abbreviation = row["state_code"].strip()
-                zip5 = row["postcode"].strip()
-
-                # coordinates
-                longitude = row["lon"].strip()
-                latitude = row["lat"].strip()
-
-                place_address = United_States_Address(
-                    primary_number=primary_number.strip(),
-                    street_name=street_name.strip(),
-                    city_name=city_name,
-                    state_abbreviation=state_abbreviation,
-                    zip5=zip5,
-                    longitude=longitude,
-                    latitude=latitude,
-                    geom=fromstr(f"POINT({longitude} {latitude})", srid=4326),
-                )
-                place_address.save()
-                #
-                # get place name
-
-                name = row["name"]
-                if place_address:
-                    new_place = Place(
-                        name=name,
-                        address=place_address,
-                        geom=fromstr(f"POINT({longitude} {latitude})", srid=4326),
-                    )
-                    new_place.save()
-                    message = ""
-                    message += f"Place {name} created successfully."
-                    logging.info(message)
-                else:
-                    message = ""
-                    message += (
-                        f"Place {name} could not be created because of address: {place_address}"
-                        f""
-                    )
-                    logging.info(message)
+        result = import_point_csv(
+            path_to_data_file,
+            dataset="place",
+            column_map=POINT_IMPORT_PRESETS["pharmacies"],
+            mode=mode,
+        )
+
+        message = ""
+        message += (
+            f"{result.get('places_inserted', 0)} places created from {result['rows']} rows "
+            f"({result['skipped']} skipped)."
+        )
+        logging.info(message)
+        return True
 
     except Exception as e:
         message = "\n"
@@ -187,22 +111,16 @@ def create_places_from_data_file(path_to_data_file: pathlib.Path) -> bool:
 
 def update_place_foreign_keys() -> bool:
     """
-    This function takes a list of Place objects and updates the foreign keys from them.
+    This function fills the spatial foreign keys (GADM, timezone) of every Place,
+    with one set-based spatial join per target table.
     :return: bool
     """
     try:
-        qs = Place.objects.all()
-
-        updated_places = [
-            update_model_geometry_foreign_keys(
-                target_object=p, model_keys_and_names=MODEL_FIELDS_AND_NAMES_TO_TEST
-            )
-            for p in qs
-        ]
+        stats = enrich_locations(models=[Place], include_addresses=False)
 
-        fields_to_update = MODEL_FIELDS_AND_NAMES_TO_TEST.keys()
-
-        Place.objects.bulk_update(updated_places, fields_to_update)
+        message = ""
+        message += f"Updated place foreign keys: {stats['Place']} in {stats['elapsed_seconds']}s"
+        logger.info(message)
 
         return True
 
@@ -210,9 +128,6 @@ def update_place_foreign_keys() -> bool:
         message = ""
         message += f"There was an error updating foreign keys: {e}"
         logger.error(message)
-        import ipdb
-
-        ipdb.set_trace()
         return False
 
 
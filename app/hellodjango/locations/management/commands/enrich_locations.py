@@ -0,0 +1,70 @@
+"""
+Fill spatial foreign keys of Places and Localities, and address time zones
+
+Every GADM level (gid_0..gid_5) and timezone key is resolved for all rows with
+one set-based spatial join per target table. United_States_Address.time_zone
+and utc_offset are filled from Timezone in the same run.
+
+Usage:
+    # Places, Localities and addresses without a time zone
+    python manage.py enrich_locations
+
+    # Recompute every address's time zone too
+    python manage.py enrich_locations --all-addresses
+
+    # On a Celery worker
+    python manage.py enrich_locations --async
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Fill GADM and timezone foreign keys of places/localities and address time zones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-addresses',
+            action='store_true',
+            help='Only enrich Places and Localities'
+        )
+
+        parser.add_argument(
+            '--all-addresses',
+            action='store_true',
+            help='Recompute time zones of addresses that already have one'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery'
+        )
+
+    def handle(self, *args, **options):
+        include_addresses = not options['skip_addresses']
+        only_missing = not options['all_addresses']
+
+        if options['use_async']:
+            from locations.tasks import enrich_locations_task
+
+            result = enrich_locations_task.delay(include_addresses, only_missing)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued location enrichment: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.location_enrichment import enrich_locations
+
+        stats = enrich_locations(include_addresses=include_addresses, only_missing_addresses=only_missing)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Enriched locations in {stats['elapsed_seconds']}s"))
+        for name, counts in stats.items():
+            if isinstance(counts, dict):
+                for column, changed in counts.items():
+                    self.stdout.write(f"  {name}.{column}: {changed} changed")
+        if 'addresses' in stats:
+            self.stdout.write(f"  addresses time_zone: {stats['addresses']} updated")
@@ -0,0 +1,145 @@
+"""
+Fetch and load Census TIGER address range features (ADDRFEAT) for the offline geocoder
+
+ADDRFEAT is published per county. County FIPS codes are read from the loaded
+county boundaries (United_States_Census_County) for the same year, so load
+counties first.
+
+Sources:
+- Census TIGER: https://www2.census.gov/geo/tiger/TIGER{year}/ADDRFEAT/
+
+Usage:
+    # One county (Alameda, CA)
+    python manage.py fetch_census_addrfeat --year 2024 --state 06 --county 001
+
+    # Every county of a state, one Celery task per county
+    python manage.py fetch_census_addrfeat --year 2024 --state CA --async
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import requests
+import zipfile
+import logging
+
+from utilities.address_normalization import STATE_FIPS
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Fetch and load Census TIGER address range features (ADDRFEAT)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=settings.TIGER_GEOCODER_YEAR,
+            help='TIGER vintage'
+        )
+
+        parser.add_argument(
+            '--state',
+            type=str,
+            required=True,
+            help='State FIPS code (e.g., 06 for CA) or abbreviation (e.g., CA)'
+        )
+
+        parser.add_argument(
+            '--county',
+            type=str,
+            help='County FIPS code (3 digits); default: every county of the state'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery (one task per county)'
+        )
+
+        parser.add_argument(
+            '--skip-download',
+            action='store_true',
+            help='Skip download if file already exists'
+        )
+
+    def handle(self, *args, **options):
+        year = options['year']
+        state_fips = STATE_FIPS.get(options['state'].upper(), options['state'])
+
+        if options['county']:
+            county_fips_codes = [options['county'].zfill(3)]
+        else:
+            county_fips_codes = self._county_fips_codes(year, state_fips)
+
+        if not county_fips_codes:
+            raise CommandError(
+                f"No counties loaded for state {state_fips} ({year}); load counties or pass --county"
+            )
+
+        self.stdout.write(f"Processing {len(county_fips_codes)} county(s) in state {state_fips} for {year}")
+
+        if options['use_async']:
+            from locations.tasks import fetch_and_load_addrfeat_county
+
+            for county_fips in county_fips_codes:
+                result = fetch_and_load_addrfeat_county.delay(year, state_fips, county_fips)
+                self.stdout.write(f"  Queued {state_fips}{county_fips}: task {result.id}")
+
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued {len(county_fips_codes)} tasks"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        for county_fips in county_fips_codes:
+            try:
+                self._fetch_and_load_county(year, state_fips, county_fips, options['skip_download'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"  ❌ Failed {state_fips}{county_fips}: {e}"))
+
+    def _county_fips_codes(self, year, state_fips):
+        """County FIPS codes of a state from the loaded county boundaries"""
+        from locations.models import United_States_Census_County
+
+        return list(
+            United_States_Census_County.objects.filter(statefp=state_fips, year=year)
+            .values_list('countyfp', flat=True)
+            .distinct()
+            .order_by('countyfp')
+        )
+
+    def _fetch_and_load_county(self, year, state_fips, county_fips, skip_download=False):
+        """Fetch and load the address range features of a single county"""
+        from utilities.tiger_geocoder import load_address_features
+
+        name = f"tl_{year}_{state_fips}{county_fips}_addrfeat"
+        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ADDRFEAT/{name}.zip"
+
+        download_dir = settings.VECTOR_SPATIAL_DATA_SUBDIRECTORY / "census_addrfeat" / f"{year}"
+        download_dir.mkdir(parents=True, exist_ok=True)
+
+        zip_path = download_dir / f"{name}.zip"
+        extract_dir = download_dir / name
+
+        if not skip_download or not zip_path.exists():
+            self.stdout.write(f"Downloading from {url}...")
+
+            response = requests.get(url, stream=True)
+            response.raise_for_status()
+
+            with open(zip_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+
+        if not extract_dir.exists() or not skip_download:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(extract_dir)
+
+        shp_file = list(extract_dir.glob("*.shp"))[0]
+
+        loaded = load_address_features(shp_file, year, state_fips, county_fips)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"  ✅ Loaded {loaded} address ranges for {state_fips}{county_fips} ({year})")
+        )
+        return loaded
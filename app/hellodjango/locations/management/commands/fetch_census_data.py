@@ -16,6 +16,10 @@ Usage:
     # Load all years 2020-2024 for Congressional Districts
     python manage.py fetch_census_data --unit cd --start-year 2020 --end-year 2024 --async
 
+Features are fingerprinted (geometry + attribute hashes) while loading: re-loading
+a year only writes features that changed, and each load reports how many units
+differ from the previous loaded vintage (utilities/census_fingerprints.py).
+
 Supported units:
 - state: States
 - county: Counties
@@ -31,7 +35,6 @@ Supported units:
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.contrib.gis.utils import LayerMapping
 from pathlib import Path
 import requests
 import zipfile
@@ -120,6 +123,7 @@ UNIT_CONFIG = {
         'needs_state_fips': True,
         'shapefile_pattern': 'tl_{year}_{state_fips}_vtd{decade}.shp',
         'needs_decade': True,  # Different files for 2010 vs 2020
+        'decade_mappings': {10: 'united_states_census_voter_tabulation_district_mapping_2010'},
     },
     'place': {
         'model': 'United_States_Census_Place',
@@ -130,7 +134,7 @@ UNIT_CONFIG = {
     },
     'zcta': {
         'model': 'United_States_Census_ZCTA',
-        'mapping': 'united_states_census_zcta_mapping',
+        'mapping': 'united_states_census_zcta_mapping_2020',
         'url_pattern': 'https://www2.census.gov/geo/tiger/TIGER{year}/ZCTA520/tl_{year}_us_zcta520.zip',
         'needs_state_fips': False,
         'shapefile_pattern': 'tl_{year}_us_zcta520.shp',
@@ -331,29 +335,31 @@ class Command(BaseCommand):
             if not shapefile_path.exists():
                 raise FileNotFoundError(f"Shapefile not found: {shapefile_name}")
             
-            # Load into database
-            from locations.models.census.tiger import *
-            
-            model = globals()[config['model']]
-            mapping_dict = globals()[config['mapping']]
+            # Load into database, skipping features identical to the stored ones
+            from locations.models.census import tiger
+            from utilities.census_fingerprints import load_census_features
             
-            lm = LayerMapping(
-                model,
-                str(shapefile_path),
-                mapping_dict,
-                transform=False,
-                encoding='utf-8'
+            mapping_name = config.get('decade_mappings', {}).get(get_decade(year), config['mapping'])
+            stats = load_census_features(
+                unit_type,
+                shapefile_path,
+                year,
+                state_fips=state_fips,
+                mapping=getattr(tiger, mapping_name),
             )
             
-            # Save with year
-            lm.save(strict=True, verbose=True)
-            
-            # Set year on all records (LayerMapping doesn't handle computed fields)
-            model.objects.filter(year__isnull=True).update(year=year)
-            
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'✓ Loaded: {unit_type} {year} {state_fips or "national"}'
+                    f'✓ Loaded: {unit_type} {year} {state_fips or "national"} '
+                    f'({stats["inserted"]} new, {stats["updated"]} updated, '
+                    f'{stats["unchanged"]} unchanged, {stats["deleted"]} removed)'
                 )
             )
+            
+            previous = stats['previous_vintage']
+            if previous:
+                self.stdout.write(
+                    f'  vs {previous["year"]}: {previous["unchanged"]} identical, {previous["changed"]} changed, '
+                    f'{previous["added"]} added, {previous["removed"]} removed'
+                )
 
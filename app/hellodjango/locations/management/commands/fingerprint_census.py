@@ -0,0 +1,106 @@
+"""
+Fingerprint loaded TIGER units and compare vintages
+
+Rows loaded by fetch_census_data are fingerprinted as they are written; this
+backfills geom_hash / attr_hash for rows loaded earlier, and reports which
+GEOIDs were added, removed or changed between two years.
+
+Usage:
+    # Backfill fingerprints of every tract year
+    python manage.py fingerprint_census --unit tract
+
+    # Recompute fingerprints of 2020 counties
+    python manage.py fingerprint_census --unit county --year 2020 --all
+
+    # What changed in California tracts between 2020 and 2021?
+    python manage.py fingerprint_census --unit tract --compare 2020 2021 --state 06
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Fingerprint loaded TIGER units and compare vintages'
+
+    def add_arguments(self, parser):
+        from utilities.dispatchers import CENSUS_FINGERPRINT_UNITS
+
+        parser.add_argument(
+            '--unit',
+            type=str,
+            required=True,
+            choices=list(CENSUS_FINGERPRINT_UNITS),
+            help='Census unit type'
+        )
+
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Only fingerprint this year (default: all years)'
+        )
+
+        parser.add_argument(
+            '--state',
+            type=str,
+            help='State FIPS code'
+        )
+
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='recompute',
+            help='Recompute existing fingerprints too'
+        )
+
+        parser.add_argument(
+            '--compare',
+            type=int,
+            nargs=2,
+            metavar=('FROM_YEAR', 'TO_YEAR'),
+            help='Report GEOIDs added, removed and changed between two years'
+        )
+
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='With --compare, print the GEOIDs and not only the counts'
+        )
+
+    def handle(self, *args, **options):
+        from utilities.census_fingerprints import diff_census_vintages, fingerprint_census_units
+
+        unit_type = options['unit']
+
+        if options['compare']:
+            from_year, to_year = options['compare']
+            if from_year == to_year:
+                raise CommandError("--compare needs two different years")
+
+            # The comparison only reads stored fingerprints; backfill both years first
+            for year in (from_year, to_year):
+                fingerprint_census_units(unit_type, year, options['state'])
+
+            diff = diff_census_vintages(unit_type, from_year, to_year, options['state'])
+
+            self.stdout.write(self.style.SUCCESS(f"✅ {unit_type} {from_year} → {to_year}"))
+            for key in ('added', 'removed', 'geometry_changed', 'attributes_changed', 'unfingerprinted'):
+                self.stdout.write(f"  {key}: {len(diff[key])}")
+                if options['list'] and diff[key]:
+                    self.stdout.write(f"    {', '.join(diff[key])}")
+            self.stdout.write(f"  unchanged: {diff['unchanged']}")
+            return
+
+        if options['state'] and options['year'] is None:
+            raise CommandError("--state needs --year")
+
+        count = fingerprint_census_units(
+            unit_type,
+            options['year'],
+            options['state'],
+            only_missing=not options['recompute'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Fingerprinted {count} {unit_type} rows"))
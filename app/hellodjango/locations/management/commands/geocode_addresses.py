@@ -0,0 +1,131 @@
+"""
+Geocode ungeocoded United_States_Address rows in batches
+
+Sources:
+- census_batch: CSV files of up to CENSUS_GEOCODER_BATCH_SIZE rows sent to the
+  Census batch geocoder
+- tiger_local: offline interpolation on loaded TIGER address ranges
+  (python manage.py fetch_census_addrfeat)
+
+Matches are written back with one bulk update per batch. Only one row per
+address fingerprint is geocoded; duplicates are filled in from it (see
+python manage.py normalize_addresses).
+
+Usage:
+    # All ungeocoded addresses, batches submitted one after another
+    python manage.py geocode_addresses
+
+    # One Celery task per batch
+    python manage.py geocode_addresses --async
+
+    # Offline, against loaded TIGER address ranges
+    python manage.py geocode_addresses --source tiger_local
+
+    # Against a local stand-in server
+    CENSUS_GEOCODER_BASE_URL=http://localhost:8081/geocoder python manage.py geocode_addresses --limit 100
+"""
+
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Geocode ungeocoded addresses in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            type=str,
+            default='census_batch',
+            choices=['census_batch', 'tiger_local'],
+            help='census_batch = Census batch geocoder, tiger_local = offline TIGER address ranges'
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CENSUS_GEOCODER_BATCH_SIZE,
+            help='Addresses per batch request (capped at the provider limit)'
+        )
+
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Maximum number of addresses to geocode'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery (one task per batch)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        limit = options['limit']
+
+        if options['source'] == 'tiger_local':
+            self._geocode_tiger_local(batch_size, limit, options['use_async'])
+            return
+
+        if options['use_async']:
+            from locations.tasks import geocode_addresses_census_batch
+
+            result = geocode_addresses_census_batch.delay(batch_size, limit)
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued Census batch geocoding: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.census_batch_geocoding import geocode_ungeocoded_addresses
+
+        stats = geocode_ungeocoded_addresses(batch_size=batch_size, limit=limit)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Geocoded {stats['matched']}/{stats['submitted']} addresses in "
+                f"{stats['batches']} batches, {stats['elapsed_seconds']}s "
+                f"({stats['cached']} from cache, {stats['no_match']} no match, {stats['tie']} ties, "
+                f"{stats['fanned_out']} duplicates filled in)"
+            )
+        )
+
+    def _geocode_tiger_local(self, batch_size, limit, use_async):
+        """Geocode offline against the TIGER address ranges"""
+        from utilities.address_deduplication import fan_out_geocodes
+        from utilities.census_batch_geocoding import iter_ungeocoded_id_batches
+
+        fan_out_geocodes()
+
+        if use_async:
+            from locations.tasks import geocode_addresses_tiger_local
+
+            batches = 0
+            for ids in iter_ungeocoded_id_batches(batch_size, limit):
+                geocode_addresses_tiger_local.delay(ids)
+                batches += 1
+
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued {batches} TIGER_LOCAL geocoding tasks"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        from utilities.census_batch_geocoding import ungeocoded_addresses
+        from utilities.tiger_geocoder import geocode_addresses_tiger
+
+        submitted = matched = 0
+        for ids in iter_ungeocoded_id_batches(batch_size, limit):
+            counts = geocode_addresses_tiger(ungeocoded_addresses().filter(id__in=ids))
+            submitted += counts['submitted']
+            matched += counts['matched']
+
+        fanned_out = fan_out_geocodes()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ TIGER_LOCAL geocoded {matched}/{submitted} addresses "
+                f"({fanned_out} duplicates filled in)"
+            )
+        )
@@ -0,0 +1,163 @@
+"""
+Import a point dataset (addresses or places) from a CSV
+
+The file is streamed in chunks, cleaned and normalized in batches and COPYed into
+locations_address (and locations_place). Rows with valid lon/lat are stored as
+geocoded points (geocode_source 'Import').
+
+Modes:
+- wipe:   delete existing addresses (and places) first
+- append: add every row
+- upsert: refresh existing addresses with the same fingerprint, add the rest
+
+Columns are mapped with --preset or --columns 'field=column,...'; join several
+source columns with '+'. Fields: primary_number, street_name, street_suffix,
+city_name, state_abbreviation, zip5, county_fips, longitude, latitude,
+geocode_quality, name (places).
+
+Usage:
+    # Voter file, appended in this process
+    python manage.py import_points voters.csv \\
+        --columns 'primary_number=HOUSE_NUM,street_name=PRE_DIR+STREET_NAME,street_suffix=STREET_TYPE,city_name=CITY,state_abbreviation=STATE,zip5=ZIP'
+
+    # Same file split over Celery workers, refreshing existing addresses
+    python manage.py import_points voters.csv --columns '...' --mode upsert --async
+
+    # Sample pharmacies as places, replacing existing rows
+    python manage.py import_points geocoded_pharmacies.csv --dataset place --preset pharmacies --mode wipe
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import logging
+import pathlib
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Stream a CSV of addresses or places into the database with COPY'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='CSV file with a header row'
+        )
+
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            default='address',
+            choices=['address', 'place'],
+            help='address = United_States_Address rows, place = Place rows with their addresses'
+        )
+
+        parser.add_argument(
+            '--preset',
+            type=str,
+            help='Named column map (address_sample, pharmacies)'
+        )
+
+        parser.add_argument(
+            '--columns',
+            type=str,
+            help="Column map 'field=column,field=column+column' (overrides --preset fields)"
+        )
+
+        parser.add_argument(
+            '--mode',
+            type=str,
+            default='append',
+            choices=['wipe', 'append', 'upsert'],
+            help='What to do with existing rows'
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.POINT_IMPORT_CHUNK_SIZE,
+            help='Rows per COPY chunk'
+        )
+
+        parser.add_argument(
+            '--task-rows',
+            type=int,
+            default=settings.POINT_IMPORT_TASK_ROWS,
+            help='Rows per Celery task with --async'
+        )
+
+        parser.add_argument(
+            '--census-year',
+            type=int,
+            default=2020,
+            help='census_year of new addresses'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Split the file into row ranges imported by parallel Celery tasks'
+        )
+
+    def handle(self, *args, **options):
+        from utilities.point_csv_importer import (
+            POINT_IMPORT_PRESETS,
+            import_point_csv,
+            parse_column_map,
+        )
+
+        path = pathlib.Path(options['path']).resolve()
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        if options['preset'] and options['preset'] not in POINT_IMPORT_PRESETS:
+            raise CommandError(
+                f"Unknown preset: {options['preset']} (choose from {', '.join(POINT_IMPORT_PRESETS)})"
+            )
+
+        column_map = dict(POINT_IMPORT_PRESETS.get(options['preset'], {}))
+        try:
+            column_map.update(parse_column_map(options['columns'] or ''))
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if not column_map:
+            raise CommandError("Give --preset or --columns")
+
+        dataset = options['dataset']
+        mode = options['mode']
+
+        if options['use_async']:
+            from locations.tasks import import_point_csv_parallel
+
+            result = import_point_csv_parallel.delay(
+                str(path), dataset, column_map, mode, options['task_rows'],
+                options['chunk_size'], options['census_year']
+            )
+            self.stdout.write(self.style.SUCCESS(f"✅ Queued {dataset} import of {path.name}: {result.id}"))
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        try:
+            stats = import_point_csv(
+                path,
+                dataset,
+                column_map,
+                mode=mode,
+                chunk_size=options['chunk_size'],
+                census_year=options['census_year'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Imported {stats['rows']} rows ({stats['skipped']} skipped) in "
+                f"{stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/s)"
+            )
+        )
+        for key in ['addresses_inserted', 'addresses_updated', 'places_inserted', 'places_updated']:
+            if key in stats:
+                self.stdout.write(f"  {key}: {stats[key]}")
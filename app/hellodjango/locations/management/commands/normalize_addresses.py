@@ -0,0 +1,49 @@
+"""
+Normalize United_States_Address rows and store their fingerprints
+
+Rows with the same fingerprint are one geocoding / census assignment unit:
+geocode_addresses and assign_census_units --mode sql only process the first row
+of each fingerprint and copy its result to the others.
+
+Usage:
+    # Rows without a fingerprint (e.g. loaded before fingerprints existed)
+    python manage.py normalize_addresses
+
+    # Recompute every row (after changing the normalization rules)
+    python manage.py normalize_addresses --refresh
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Normalize addresses and store their deduplication fingerprints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk update'
+        )
+
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Recompute rows that already have a fingerprint'
+        )
+
+    def handle(self, *args, **options):
+        from utilities.address_deduplication import duplication_stats, fingerprint_addresses
+
+        updated = fingerprint_addresses(batch_size=options['batch_size'], refresh=options['refresh'])
+        stats = duplication_stats()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Fingerprinted {updated} addresses"))
+        self.stdout.write(
+            f"  {stats['rows']} rows, {stats['distinct']} distinct addresses "
+            f"(ratio {stats['ratio']})"
+        )
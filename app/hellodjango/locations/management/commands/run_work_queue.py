@@ -0,0 +1,132 @@
+"""
+Process pending addresses through the database-backed work queue
+
+Workers claim chunks of pending United_States_Address rows with
+SELECT ... FOR UPDATE SKIP LOCKED, process and commit them. Any number can run
+at once, and an interrupted run resumes where it stopped.
+
+Queues:
+- geocode: ungeocoded rows not yet attempted
+- assign:  geocoded rows of --year without census units
+
+Usage:
+    # Drain the geocode queue in this process
+    python manage.py run_work_queue --queue geocode
+
+    # Start 8 Celery workers on the assign queue
+    python manage.py run_work_queue --queue assign --year 2020 --workers 8 --async
+
+    # Show what is pending
+    python manage.py run_work_queue --queue assign --year 2020 --status
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process pending addresses through the SKIP LOCKED work queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            type=str,
+            required=True,
+            choices=['geocode', 'assign'],
+            help='geocode = ungeocoded addresses, assign = census unit assignment'
+        )
+
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Census year (required for --queue assign)'
+        )
+
+        parser.add_argument(
+            '--source',
+            type=str,
+            default='census_batch',
+            choices=['census_batch', 'tiger_local'],
+            help='Geocoder for --queue geocode'
+        )
+
+        parser.add_argument(
+            '--strategy',
+            type=str,
+            default='hierarchical',
+            choices=['hierarchical', 'block_first'],
+            help='Assignment strategy for --queue assign'
+        )
+
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.ADDRESS_WORK_QUEUE_CHUNK_SIZE,
+            help='Rows claimed per chunk'
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.ADDRESS_WORK_QUEUE_WORKERS,
+            help='Worker tasks to start with --async'
+        )
+
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Run via Celery (--workers tasks draining the queue)'
+        )
+
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            help='Only report pending row counts'
+        )
+
+    def handle(self, *args, **options):
+        queue = options['queue']
+        year = options['year']
+
+        if queue == 'assign' and year is None:
+            raise CommandError("--queue assign needs --year")
+
+        from utilities.address_work_queue import pending_counts, run_work_queue
+
+        if options['status']:
+            for name, count in pending_counts(year).items():
+                self.stdout.write(f"  {name}: {count} pending")
+            return
+
+        block_first = options['strategy'] == 'block_first'
+
+        if options['use_async']:
+            from locations.tasks import start_address_work_queue
+
+            result = start_address_work_queue.delay(
+                queue, options['workers'], year, options['chunk_size'], options['source'], block_first
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Started {options['workers']} {queue} workers: {result.id}")
+            )
+            self.stdout.write("Monitor progress in Flower: http://localhost:5555")
+            return
+
+        stats = run_work_queue(
+            queue,
+            year=year,
+            chunk_size=options['chunk_size'],
+            source=options['source'],
+            block_first=block_first,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Processed {stats['rows']} rows in {stats['chunks']} chunks, "
+                f"{stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/s)"
+            )
+        )
@@ -1,5 +1,7 @@
 from .gadm import *
 from .time import *
 from .addresses import *
+from .geocode_cache import *
 from .synthetic_models import *
 from .census import *
+from .intersections import *
@@ -62,6 +62,13 @@ class United_States_Address(models.Model):
     # geodjango geometry field
     geom = models.PointField(srid=4326, null=True, blank=True, default=None)
     
+    # SHA-1 of the normalized address (utilities/address_normalization.py);
+    # rows sharing it are geocoded and assigned once
+    address_fingerprint = models.CharField(
+        max_length=40, null=True, blank=True,
+        help_text="Fingerprint of the normalized address"
+    )
+    
     # Geocoding metadata
     geocoded = models.BooleanField(default=False, help_text="Whether address has been geocoded")
     geocode_quality = models.CharField(
@@ -73,6 +80,9 @@ class United_States_Address(models.Model):
         help_text="Source: Census, Google, Nominatim, SmartyStreets"
     )
     geocoded_at = models.DateTimeField(null=True, blank=True)
+    # Set when a geocoding attempt found no match, so work-queue workers
+    # (utilities/address_work_queue.py) do not claim the row again
+    geocode_attempted_at = models.DateTimeField(null=True, blank=True)
     
     # Year for census unit assignment (which boundaries to use)
     census_year = models.IntegerField(
@@ -105,6 +115,18 @@ class United_States_Address(models.Model):
             models.Index(fields=['state_geoid', 'county_geoid']),
             models.Index(fields=['cd_geoid', 'census_year']),
             models.Index(fields=['vtd_geoid', 'census_year']),
+            models.Index(fields=['address_fingerprint']),
+            # Work-queue claims only scan pending rows
+            models.Index(
+                fields=['id'],
+                name='address_pending_geocode_idx',
+                condition=models.Q(geocoded=False, geocode_attempted_at__isnull=True)
+            ),
+            models.Index(
+                fields=['census_year', 'id'],
+                name='address_pending_assign_idx',
+                condition=models.Q(geocoded=True, census_units_assigned_at__isnull=True)
+            ),
         ]
     
     def __str__(self):
@@ -113,12 +135,55 @@ class United_States_Address(models.Model):
         )
         return representative_string
     
-    def assign_census_units(self, year=None):
+    def normalize(self):
+        """
+        Canonicalize the address fields in place and set address_fingerprint
+        
+        Returns:
+            str: the fingerprint, or None when the row has no address text
+        """
+        from utilities.address_normalization import (
+            address_fingerprint,
+            normalize_address_fields
+        )
+        
+        fields = normalize_address_fields(
+            self.primary_number,
+            self.street_name,
+            self.street_suffix,
+            self.city_name,
+            self.state_abbreviation,
+            self.zip5
+        )
+        
+        for field_name in ["primary_number", "street_name", "street_suffix",
+                           "city_name", "state_abbreviation", "zip5"]:
+            setattr(self, field_name, fields[field_name] or None)
+        
+        self.address_fingerprint = address_fingerprint(fields)
+        return self.address_fingerprint
+    
+    # Fields written by census unit assignment
+    CENSUS_UNIT_FIELDS = [
+        "state_geoid",
+        "county_geoid",
+        "tract_geoid",
+        "block_group_geoid",
+        "block_geoid",
+        "vtd_geoid",
+        "cd_geoid",
+    ]
+
+    def assign_census_units(self, year=None, strategy=None):
         """
         Assign census geographic units via spatial join
         
         Args:
             year: Census year to use (2010 or 2020). If None, uses self.census_year
+            strategy: 'hierarchical' (containment query per level), 'block_first'
+                (one block lookup, ancestors sliced from the block GEOID) or 'index'
+                (in-process boundary index, no spatial queries).
+                If None, uses settings.CENSUS_ASSIGNMENT_STRATEGY
         
         Returns:
             bool: True if successful, False if no geometry or units not found
@@ -126,34 +191,179 @@ class United_States_Address(models.Model):
         if not self.geom:
             return False
         
+        from django.conf import settings
+
         year = year or self.census_year
+        strategy = strategy or settings.CENSUS_ASSIGNMENT_STRATEGY
+        if strategy not in ("index", "block_first", "hierarchical"):
+            raise ValueError(f"Unknown census assignment strategy: {strategy}")
+
+        # Start from a clean slate: a unit that no longer contains the point (e.g.
+        # after re-geocoding) must not keep its GEOID, and the block-first fallback
+        # must not derive units from a stale block_geoid
+        for field_name in self.CENSUS_UNIT_FIELDS:
+            setattr(self, field_name, None)
+
+        if strategy == "index":
+            self._assign_census_units_from_index(year)
+        elif strategy == "block_first":
+            self._assign_census_units_block_first(year)
+        else:
+            self._assign_census_units_hierarchical(year)
         
-        from django.contrib.gis.measure import D
+        self.census_year = year
+        self.census_units_assigned_at = timezone.now()
+        self.save(
+            update_fields=self.CENSUS_UNIT_FIELDS
+            + ["census_year", "census_units_assigned_at"]
+        )
+        
+        return True
+
+    def _assign_census_units_from_index(self, year):
+        """
+        Resolve all units from the in-memory STRtree indexes (no database reads)
+        """
+        from utilities.census_boundary_index import resolve_census_units
+
+        units = resolve_census_units(self.geom.x, self.geom.y, year)
+
+        for field_name, geoid in units.items():
+            if geoid:
+                setattr(self, field_name, geoid)
+
+    def _assign_census_units_block_first(self, year):
+        """
+        Find the containing tabulation block once and derive its ancestors
+
+        A block GEOID is state(2) + county(3) + tract(6) + block(4), and the block
+        group is the first digit of the block code, so state, county, tract and
+        block group GEOIDs are prefixes of it. VTD and CD come from the block
+        crosswalk when it has been built for the year. Falls back to the
+        level-by-level lookup when no block covers the point (blocks not loaded
+        for that state/year).
+        """
+        from utilities.census_candidate_pruning import census_candidate_hints, first_containing
+        from .census import (
+            United_States_Census_Block_Crosswalk,
+            United_States_Census_Tabulation_Block
+        )
+
+        # Narrow blocks to the hinted counties (or state) before the containment test
+        hints = census_candidate_hints(self, year)
+        if hints["county_geoids"]:
+            block_hints = {
+                "statefp20__in": sorted({geoid[:2] for geoid in hints["county_geoids"]}),
+                "countyfp20__in": sorted({geoid[2:] for geoid in hints["county_geoids"]}),
+            }
+        elif hints["statefp"]:
+            block_hints = {"statefp20": hints["statefp"]}
+        else:
+            block_hints = None
+
+        block = first_containing(
+            United_States_Census_Tabulation_Block.objects.filter(year=year).only("geoid20"),
+            self.geom,
+            block_hints
+        )
+
+        if not block:
+            self._assign_census_units_hierarchical(year)
+            return
+
+        block_geoid = block.geoid20
+        self.block_geoid = block_geoid
+        self.state_geoid = block_geoid[:2]
+        self.county_geoid = block_geoid[:5]
+        self.tract_geoid = block_geoid[:11]
+        self.block_group_geoid = block_geoid[:12]
+
+        crosswalk = (
+            United_States_Census_Block_Crosswalk.objects.filter(
+                block_geoid=block_geoid,
+                year=year
+            )
+            .values("vtd_geoid", "cd_geoid")
+            .first()
+        )
+
+        if crosswalk:
+            self.vtd_geoid = crosswalk["vtd_geoid"]
+            self.cd_geoid = crosswalk["cd_geoid"]
+            return
+
+        self._assign_voting_districts(
+            year, statefp=block_geoid[:2], countyfp=block_geoid[2:5]
+        )
+
+    def _assign_voting_districts(self, year, statefp, countyfp=None):
+        """
+        Assign VTD (needs the county) and congressional district (needs the state)
+
+        These do not nest in the block GEOID, so they still need containment tests.
+        """
+        from .census.tiger import (
+            United_States_Census_Congressional_District,
+            United_States_Census_Voter_Tabulation_District
+        )
+
+        if countyfp:
+            # VTD (voting tabulation district)
+            vtd = United_States_Census_Voter_Tabulation_District.objects.filter(
+                geom__contains=self.geom,
+                statefp=statefp,
+                countyfp=countyfp,
+                year=year
+            ).first()
+            
+            if vtd:
+                self.vtd_geoid = vtd.geoid
+
+        # Congressional district (may span counties)
+        cd = United_States_Census_Congressional_District.objects.filter(
+            geom__contains=self.geom,
+            statefp=statefp,
+            year=year
+        ).first()
+        
+        if cd:
+            self.cd_geoid = cd.geoid
+
+    def _assign_census_units_hierarchical(self, year):
+        """
+        Resolve units level by level with one containment query each
+        
+        State and county candidates are first narrowed with the address's own
+        attributes (state abbreviation, county FIPS, ZIP -> ZCTA -> counties);
+        a miss falls back to the unrestricted search.
+        """
+        from utilities.census_candidate_pruning import census_candidate_hints, first_containing
         from .census.tiger import (
             United_States_Census_State,
             United_States_Census_County,
             United_States_Census_Tract,
             United_States_Census_Block_Group,
-            United_States_Census_Tabulation_Block,
-            United_States_Census_Congressional_District,
-            United_States_Census_Voter_Tabulation_District
+            United_States_Census_Tabulation_Block
         )
         
+        hints = census_candidate_hints(self, year)
+        
         # State
-        state = United_States_Census_State.objects.filter(
-            geom__contains=self.geom,
-            year=year
-        ).first()
+        state = first_containing(
+            United_States_Census_State.objects.filter(year=year),
+            self.geom,
+            {"statefp": hints["statefp"]} if hints["statefp"] else None
+        )
         
         if state:
             self.state_geoid = state.geoid
             
             # County (within state)
-            county = United_States_Census_County.objects.filter(
-                geom__contains=self.geom,
-                statefp=state.statefp,
-                year=year
-            ).first()
+            county = first_containing(
+                United_States_Census_County.objects.filter(statefp=state.statefp, year=year),
+                self.geom,
+                {"geoid__in": hints["county_geoids"]} if hints["county_geoids"] else None
+            )
             
             if county:
                 self.county_geoid = county.geoid
@@ -192,30 +402,10 @@ class United_States_Address(models.Model):
                     
                     if block:
                         self.block_geoid = block.geoid20
-                
-                # VTD (voting tabulation district)
-                vtd = United_States_Census_Voter_Tabulation_District.objects.filter(
-                    geom__contains=self.geom,
-                    statefp=state.statefp,
-                    countyfp=county.countyfp,
-                    year=year
-                ).first()
-                
-                if vtd:
-                    self.vtd_geoid = vtd.geoid
             
-            # Congressional district (may span counties)
-            cd = United_States_Census_Congressional_District.objects.filter(
-                geom__contains=self.geom,
+            # VTD and congressional district
+            self._assign_voting_districts(
+                year,
                 statefp=state.statefp,
-                year=year
-            ).first()
-            
-            if cd:
-                self.cd_geoid = cd.geoid
-        
-        self.census_year = year
-        self.census_units_assigned_at = timezone.now()
-        self.save()
-        
-        return True
+                countyfp=county.countyfp if county else None
+            )
@@ -1 +1,4 @@
 from .tiger import *
+from .block_crosswalk import *
+from .unit_crosswalk import *
+from .geometry import *
@@ -0,0 +1,52 @@
+"""
+Block-to-District Crosswalk Model
+
+Every tabulation block nests in exactly one VTD, and (for a given vintage) one
+congressional district and state legislative district. Place and ZCTA do not
+nest strictly, so blocks are assigned by their representative point.
+
+Built per state with utilities/block_crosswalk.py:
+    python manage.py build_block_crosswalk --year 2020
+
+Address assignment then needs one block lookup; every district GEOID comes
+from this table by block_geoid instead of another polygon containment test.
+"""
+
+from django.contrib.gis.db import models
+
+
+class United_States_Census_Block_Crosswalk(models.Model):
+    """
+    District membership of one tabulation block for one district vintage
+    """
+
+    block_geoid = models.CharField(max_length=15, help_text="Block GEOID (geoid20)")
+    statefp = models.CharField(max_length=2, help_text="State FIPS code")
+
+    # District vintage (year of the VTD/CD/SLDU/SLDL/place/ZCTA boundaries)
+    year = models.IntegerField(help_text="District boundary year")
+    block_year = models.IntegerField(help_text="Tabulation block year")
+
+    # District GEOIDs (null where no district covers the block's representative point)
+    vtd_geoid = models.CharField(max_length=11, null=True, blank=True)
+    cd_geoid = models.CharField(max_length=4, null=True, blank=True)
+    sldu_geoid = models.CharField(max_length=5, null=True, blank=True)
+    sldl_geoid = models.CharField(max_length=5, null=True, blank=True)
+    place_geoid = models.CharField(max_length=7, null=True, blank=True)
+    zcta_geoid = models.CharField(max_length=5, null=True, blank=True)
+
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'census_block_crosswalk'
+        verbose_name = 'Block-District Crosswalk'
+        verbose_name_plural = 'Block-District Crosswalks'
+        unique_together = [['block_geoid', 'year']]
+        indexes = [
+            models.Index(fields=['year', 'statefp']),
+            models.Index(fields=['year', 'vtd_geoid']),
+            models.Index(fields=['year', 'cd_geoid']),
+        ]
+
+    def __str__(self):
+        return f"Block {self.block_geoid} ({self.year})"
@@ -0,0 +1,27 @@
+"""
+Content-addressed storage for census geometries
+
+With the deduplicated storage mode (utilities/census_geometry_storage.py), each
+distinct boundary is stored once here, keyed by its fingerprint, and the yearly
+rows of a TIGER table reference it by geom_hash. A view with the table's
+original name joins them back, so existing ORM and SQL queries keep working.
+
+    python manage.py census_geometry_storage --unit tract --mode deduplicated
+"""
+
+from django.contrib.gis.db import models
+
+
+class Census_Geometry(models.Model):
+    """One distinct census geometry, shared by every (geoid, year) row that has it"""
+
+    geom_hash = models.CharField(max_length=32, primary_key=True, help_text="md5 of the normalized WKB")
+    geom = models.GeometryField(srid=4269)
+
+    class Meta:
+        db_table = 'census_geometry'
+        verbose_name = 'Census Geometry'
+        verbose_name_plural = 'Census Geometries'
+
+    def __str__(self):
+        return f"{self.geom.geom_type} {self.geom_hash}"
@@ -1,3 +1,4 @@
+from .fingerprint import *
 from .blockgroup import *
 from .cd import *
 from .county import *
@@ -10,3 +11,4 @@ from .tract import *
 from .ttract import *
 from .vtd import *
 from .zcta import *
+from .addrfeat import *
@@ -0,0 +1,85 @@
+"""
+Address Range Feature (ADDRFEAT) Model
+
+Street segments with left/right house number ranges and ZIP codes, published
+per county. Used by the offline geocoder (utilities/tiger_geocoder.py), which
+interpolates a house number's position along the matching segment.
+
+Sources:
+- Census TIGER: https://www2.census.gov/geo/tiger/TIGER{year}/ADDRFEAT/
+"""
+
+from django.contrib.gis.db import models
+
+
+class United_States_Census_Address_Feature(models.Model):
+    """
+    Street segment with address ranges on each side
+
+    The from-house-numbers sit at the first vertex of the line and the
+    to-house-numbers at the last, so a number's position is interpolated
+    between them along the geometry.
+    """
+
+    # Standard Census TIGER fields
+    tlid = models.BigIntegerField(help_text="TIGER/Line edge id")
+    linearid = models.CharField(max_length=22, null=True, blank=True, help_text="Linear feature id")
+    fullname = models.CharField(max_length=100, null=True, blank=True, help_text="Full street name")
+    lfromhn = models.CharField(max_length=12, null=True, blank=True, help_text="Left from house number")
+    ltohn = models.CharField(max_length=12, null=True, blank=True, help_text="Left to house number")
+    rfromhn = models.CharField(max_length=12, null=True, blank=True, help_text="Right from house number")
+    rtohn = models.CharField(max_length=12, null=True, blank=True, help_text="Right to house number")
+    zipl = models.CharField(max_length=5, null=True, blank=True, help_text="Left ZIP code")
+    zipr = models.CharField(max_length=5, null=True, blank=True, help_text="Right ZIP code")
+    parityl = models.CharField(max_length=1, null=True, blank=True, help_text="Left parity (O, E, B)")
+    parityr = models.CharField(max_length=1, null=True, blank=True, help_text="Right parity (O, E, B)")
+    road_mtfcc = models.CharField(max_length=5, null=True, blank=True, help_text="Road feature class")
+
+    # Geometry
+    geom = models.LineStringField(srid=4269, help_text="Street segment (NAD83)")
+
+    # Set by the loader (not in the shapefile attributes)
+    statefp = models.CharField(max_length=2, help_text="State FIPS code")
+    countyfp = models.CharField(max_length=3, help_text="County FIPS code")
+    year = models.IntegerField(help_text="TIGER vintage")
+
+    # Matching keys derived by the loader
+    normalized_name = models.CharField(
+        max_length=100, db_index=True, help_text="fullname normalized for matching"
+    )
+    lfrom_number = models.IntegerField(null=True, blank=True)
+    lto_number = models.IntegerField(null=True, blank=True)
+    rfrom_number = models.IntegerField(null=True, blank=True)
+    rto_number = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'census_addrfeat'
+        verbose_name = 'Address Range Feature'
+        verbose_name_plural = 'Address Range Features'
+        indexes = [
+            models.Index(fields=['year', 'statefp', 'countyfp']),
+            models.Index(fields=['year', 'normalized_name', 'zipl']),
+            models.Index(fields=['year', 'normalized_name', 'zipr']),
+            models.Index(fields=['year', 'statefp', 'normalized_name']),
+        ]
+
+    def __str__(self):
+        return f"{self.fullname} ({self.tlid}, {self.year})"
+
+
+# LayerMapping dictionary for Census TIGER ADDRFEAT files
+united_states_census_address_feature_mapping = {
+    'tlid': 'TLID',
+    'linearid': 'LINEARID',
+    'fullname': 'FULLNAME',
+    'lfromhn': 'LFROMHN',
+    'ltohn': 'LTOHN',
+    'rfromhn': 'RFROMHN',
+    'rtohn': 'RTOHN',
+    'zipl': 'ZIPL',
+    'zipr': 'ZIPR',
+    'parityl': 'PARITYL',
+    'parityr': 'PARITYR',
+    'road_mtfcc': 'ROAD_MTFCC',
+    'geom': 'LINESTRING',
+}
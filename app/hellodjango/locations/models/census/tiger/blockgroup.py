@@ -1,8 +1,10 @@
 # This is an auto-generated Django model module created by ogrinspect.
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Block_Group(models.Model):
+
+class United_States_Census_Block_Group(Census_Fingerprint):
 
     # given fields
     statefp = models.CharField(max_length=2)
@@ -33,19 +35,19 @@ class United_States_Census_Block_Group(models.Model):
 
 
 # Auto-generated `LayerMapping` dictionary for US_Census_Block_Group model
-# united_states_census_block_group_mapping = {
-#     "statefp": "STATEFP",
-#     "countyfp": "COUNTYFP",
-#     "tractce": "TRACTCE",
-#     "blkgrpce": "BLKGRPCE",
-#     "geoid": "GEOID",
-#     "geoidfq": "GEOIDFQ",
-#     "namelsad": "NAMELSAD",
-#     "mtfcc": "MTFCC",
-#     "funcstat": "FUNCSTAT",
-#     "aland": "ALAND",
-#     "awater": "AWATER",
-#     "intptlat": "INTPTLAT",
-#     "intptlon": "INTPTLON",
-#     "geom": "POLYGON",
-# }
+united_states_census_block_group_mapping = {
+    "statefp": "STATEFP",
+    "countyfp": "COUNTYFP",
+    "tractce": "TRACTCE",
+    "blkgrpce": "BLKGRPCE",
+    "geoid": "GEOID",
+    "geoidfq": "GEOIDFQ",
+    "namelsad": "NAMELSAD",
+    "mtfcc": "MTFCC",
+    "funcstat": "FUNCSTAT",
+    "aland": "ALAND",
+    "awater": "AWATER",
+    "intptlat": "INTPTLAT",
+    "intptlon": "INTPTLON",
+    "geom": "POLYGON",
+}
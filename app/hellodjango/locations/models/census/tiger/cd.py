@@ -1,8 +1,10 @@
 # This is an auto-generated Django model module created by ogrinspect.
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Congressional_District(models.Model):
+
+class United_States_Census_Congressional_District(Census_Fingerprint):
     statefp = models.CharField(max_length=2)
     cd118fp = models.CharField(max_length=2)
     geoid = models.CharField(max_length=4)
@@ -1,7 +1,9 @@
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_County(models.Model):
+
+class United_States_Census_County(Census_Fingerprint):
     statefp = models.CharField(max_length=2)
     countyfp = models.CharField(max_length=3)
     countyns = models.CharField(max_length=8)
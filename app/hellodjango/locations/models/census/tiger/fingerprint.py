@@ -0,0 +1,24 @@
+"""
+Geometry and attribute fingerprints for TIGER features
+
+Most units are identical across adjacent vintages. Each loaded feature stores:
+- geom_hash: md5 of the normalized WKB (vertex order and ring start do not matter)
+- attr_hash: md5 of the attribute columns read from the TIGER file
+
+Both are computed in PostGIS by utilities/census_fingerprints.py, which uses them
+to skip unchanged features on reload and to diff vintages by GEOID.
+"""
+
+from django.contrib.gis.db import models
+
+
+class Census_Fingerprint(models.Model):
+    geom_hash = models.CharField(
+        max_length=32, null=True, blank=True, help_text="md5 of the normalized WKB"
+    )
+    attr_hash = models.CharField(
+        max_length=32, null=True, blank=True, help_text="md5 of the TIGER attribute columns"
+    )
+
+    class Meta:
+        abstract = True
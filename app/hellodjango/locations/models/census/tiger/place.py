@@ -10,8 +10,10 @@ Sources:
 
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Place(models.Model):
+
+class United_States_Census_Place(Census_Fingerprint):
     """
     Census Place - cities, towns, and Census Designated Places
     
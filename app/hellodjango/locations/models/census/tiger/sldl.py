@@ -1,7 +1,9 @@
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_State_Legislative_District_Lower(models.Model):
+
+class United_States_Census_State_Legislative_District_Lower(Census_Fingerprint):
     statefp = models.CharField(max_length=2)
     sldlst = models.CharField(max_length=3)
     geoid = models.CharField(max_length=5)
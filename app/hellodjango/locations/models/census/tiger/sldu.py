@@ -1,8 +1,10 @@
 # This is an auto-generated Django model module created by ogrinspect.
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_State_Legislative_District_Upper(models.Model):
+
+class United_States_Census_State_Legislative_District_Upper(Census_Fingerprint):
 
     statefp = models.CharField(max_length=2)
     sldust = models.CharField(max_length=3)
@@ -1,7 +1,9 @@
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_State(models.Model):
+
+class United_States_Census_State(Census_Fingerprint):
     region = models.CharField(max_length=2)
     division = models.CharField(max_length=2)
     statefp = models.CharField(max_length=2)
@@ -1,8 +1,10 @@
 # This is an auto-generated Django model module created by ogrinspect.
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Tabulation_Block(models.Model):
+
+class United_States_Census_Tabulation_Block(Census_Fingerprint):
     statefp20 = models.CharField(max_length=2)
     countyfp20 = models.CharField(max_length=3)
     tractce20 = models.CharField(max_length=6)
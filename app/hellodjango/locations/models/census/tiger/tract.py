@@ -1,8 +1,10 @@
 # This is an auto-generated Django model module created by ogrinspect.
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Tract(models.Model):
+
+class United_States_Census_Tract(Census_Fingerprint):
     statefp = models.CharField(max_length=2)
     countyfp = models.CharField(max_length=3)
     tractce = models.CharField(max_length=6)
@@ -16,8 +16,10 @@ Sources:
 
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_Voter_Tabulation_District(models.Model):
+
+class United_States_Census_Voter_Tabulation_District(Census_Fingerprint):
     """
     Voter Tabulation District - smallest unit for election results
     
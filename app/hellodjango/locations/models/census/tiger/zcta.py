@@ -15,8 +15,10 @@ Sources:
 
 from django.contrib.gis.db import models
 
+from .fingerprint import Census_Fingerprint
 
-class United_States_Census_ZCTA(models.Model):
+
+class United_States_Census_ZCTA(Census_Fingerprint):
     """
     ZIP Code Tabulation Area - statistical approximation of ZIP codes
     
@@ -0,0 +1,119 @@
+"""
+Generic Census Unit Crosswalk Models
+
+Weighted overlaps between any two unit types in CENSUS_CROSSWALK_UNITS
+(utilities/dispatchers.py): ZCTA x CD, Place x County, Tract x SLDU, ...
+
+Built per state tile with utilities/census_crosswalks.py:
+    python manage.py build_crosswalk --source zcta --target cd --year 2020
+
+Downstream analytics read shares from here instead of recomputing geometry:
+    "what share of ZCTA 94110 (area / population) is in CA-11?"
+"""
+
+from django.contrib.gis.db import models
+
+
+class United_States_Census_Unit_Crosswalk(models.Model):
+    """
+    Overlap of one source unit with one target unit inside one state tile
+
+    Units that cross state lines (ZCTAs) get one row per state they overlap;
+    sum over statefp for the whole pair.
+    """
+
+    source_type = models.CharField(max_length=20, help_text="Source unit type (e.g. zcta)")
+    source_geoid = models.CharField(max_length=15)
+    target_type = models.CharField(max_length=20, help_text="Target unit type (e.g. cd)")
+    target_geoid = models.CharField(max_length=15)
+
+    year = models.IntegerField(help_text="Census year of both unit types")
+    statefp = models.CharField(max_length=2, help_text="State tile the overlap was computed in")
+
+    # ==== Area weights (equal-area projection) ====
+    intersection_area_sqm = models.BigIntegerField()
+    area_weight = models.FloatField(help_text="Share of the source unit's area in the target")
+    target_area_weight = models.FloatField(help_text="Share of the target unit's area in the source")
+
+    # ==== Population weights (2020 blocks, by representative point) ====
+    population = models.BigIntegerField(null=True, blank=True, help_text="pop20 of blocks in both units")
+    population_weight = models.FloatField(
+        null=True, blank=True,
+        help_text="Share of the source unit's population in the target"
+    )
+
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'census_unit_crosswalk'
+        verbose_name = 'Census Unit Crosswalk'
+        verbose_name_plural = 'Census Unit Crosswalks'
+        unique_together = [['source_type', 'target_type', 'year', 'statefp', 'source_geoid', 'target_geoid']]
+        indexes = [
+            models.Index(fields=['source_type', 'target_type', 'year', 'source_geoid']),
+            models.Index(fields=['source_type', 'target_type', 'year', 'target_geoid']),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.source_type} {self.source_geoid} ∩ {self.target_type} {self.target_geoid} "
+            f"({self.year}, {self.area_weight:.1%} of area)"
+        )
+
+
+class United_States_Census_Crosswalk_Tile(models.Model):
+    """
+    Checkpoint: one state tile of one crosswalk build has been written
+
+    Interrupted builds resume by skipping completed tiles.
+    """
+
+    source_type = models.CharField(max_length=20)
+    target_type = models.CharField(max_length=20)
+    year = models.IntegerField()
+    statefp = models.CharField(max_length=2)
+
+    with_population = models.BooleanField(default=False)
+    rows = models.IntegerField(default=0)
+    completed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'census_unit_crosswalk_tile'
+        verbose_name = 'Census Crosswalk Tile'
+        verbose_name_plural = 'Census Crosswalk Tiles'
+        unique_together = [['source_type', 'target_type', 'year', 'statefp']]
+
+    def __str__(self):
+        return f"{self.source_type} x {self.target_type} {self.year} tile {self.statefp}"
+
+
+class United_States_Census_Crosswalk_Input(models.Model):
+    """
+    Geometry fingerprint of one input unit of a crosswalk tile, as last built
+
+    After a boundary reload, an incremental build compares these with the units
+    now loaded and recomputes only pairs touching added, changed or removed units.
+    """
+
+    SIDE_CHOICES = [
+        ('source', 'Source'),
+        ('target', 'Target'),
+    ]
+
+    source_type = models.CharField(max_length=20)
+    target_type = models.CharField(max_length=20)
+    year = models.IntegerField()
+    statefp = models.CharField(max_length=2)
+
+    side = models.CharField(max_length=6, choices=SIDE_CHOICES)
+    geoid = models.CharField(max_length=15)
+    geom_hash = models.CharField(max_length=32, help_text="md5 of the normalized WKB")
+
+    class Meta:
+        db_table = 'census_unit_crosswalk_input'
+        verbose_name = 'Census Crosswalk Input'
+        verbose_name_plural = 'Census Crosswalk Inputs'
+        unique_together = [['source_type', 'target_type', 'year', 'statefp', 'side', 'geoid']]
+
+    def __str__(self):
+        return f"{self.source_type} x {self.target_type} {self.year} tile {self.statefp}: {self.side} {self.geoid}"
@@ -0,0 +1,34 @@
+from __future__ import unicode_literals
+from django.contrib.gis.db import models
+
+# Persistent geocode results, one row per (normalized address, provider).
+# No-match results are cached too (matched=False) so they are not retried
+# until they expire. See utilities/geocode_cache.py.
+
+
+class Geocode_Cache_Entry(models.Model):
+
+    address_key = models.CharField(
+        max_length=500, help_text="Canonical normalized one-line address"
+    )
+    provider = models.CharField(
+        max_length=50, help_text="Geocoding provider (census, nominatim, ...)"
+    )
+
+    matched = models.BooleanField(default=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geocode_quality = models.CharField(max_length=20, null=True, blank=True)
+    geocode_source = models.CharField(max_length=50, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text="Last time the result was refreshed")
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "locations_geocode_cache"
+        unique_together = [["address_key", "provider"]]
+
+    def __str__(self):
+        representative_string = f"{self.provider}: {self.address_key}"
+        return representative_string
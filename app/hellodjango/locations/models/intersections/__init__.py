@@ -0,0 +1 @@
+from .county_cd import *
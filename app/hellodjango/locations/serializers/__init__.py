@@ -2,3 +2,4 @@ from .gadm import *
 from .addresses import *
 from .synthetic_models import *
 from .time import *
+from .census import *
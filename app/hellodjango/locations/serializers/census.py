@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from utilities.census_interpolation import INTERPOLATION_WEIGHTS
+from utilities.dispatchers import CENSUS_CROSSWALK_UNITS, CENSUS_FINGERPRINT_UNITS
+
+
+class Census_Interpolation_Request_Serializer(serializers.Serializer):
+    source_type = serializers.ChoiceField(choices=list(CENSUS_CROSSWALK_UNITS))
+    target_type = serializers.ChoiceField(choices=list(CENSUS_CROSSWALK_UNITS))
+    year = serializers.IntegerField(default=2020)
+    weight = serializers.ChoiceField(choices=list(INTERPOLATION_WEIGHTS), default="area")
+
+    # {source_geoid: value}
+    values = serializers.DictField(child=serializers.FloatField(), allow_empty=False)
+
+    def validate(self, data):
+        if data["source_type"] == data["target_type"]:
+            raise serializers.ValidationError("source_type and target_type must differ")
+        return data
+
+
+class Census_Vintage_Diff_Request_Serializer(serializers.Serializer):
+    unit = serializers.ChoiceField(choices=list(CENSUS_FINGERPRINT_UNITS))
+    from_year = serializers.IntegerField()
+    to_year = serializers.IntegerField()
+    state = serializers.RegexField(r"^\d{2}$", required=False)
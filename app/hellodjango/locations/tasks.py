@@ -3,10 +3,12 @@ Celery tasks for locations app
 """
 
 from celery import shared_task, group, chord, chain
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import Distance
 from django.core.management import call_command
 from .models import Place
+from utilities.resource_tokens import uses_resource_tokens
 import logging
 
 logger = logging.getLogger(__name__)
@@ -301,7 +303,10 @@ import pathlib
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda layer_index, layer_name, *args, **kwargs: settings.GADM_LAYER_MEMORY_MB[layer_name]
+)
 def preprocess_gadm_layer_sedonadb(self, layer_index, layer_name, source_gpkg_path):
     """
     Preprocess ONE GADM layer using SedonaDB (Arrow-based, vectorized)
@@ -387,7 +392,11 @@ def preprocess_gadm_layer_sedonadb(self, layer_index, layer_name, source_gpkg_pa
         }
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda preprocess_result: settings.GADM_LAYER_MEMORY_MB[preprocess_result['layer_name']],
+    db_writes=1
+)
 def load_gadm_from_geoparquet(self, preprocess_result):
     """
     Load preprocessed GeoParquet to PostGIS (to *_string fields)
@@ -624,7 +633,10 @@ import pathlib
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda layer_index, layer_name, *args, **kwargs: settings.GADM_LAYER_MEMORY_MB[layer_name]
+)
 def preprocess_single_gadm_layer(self, layer_index, layer_name, source_gpkg_path):
     """
     Preprocess ONE GADM layer: fix 'NA' strings → NULL values
@@ -686,7 +698,11 @@ def preprocess_single_gadm_layer(self, layer_index, layer_name, source_gpkg_path
         }
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda preprocess_result: settings.GADM_LAYER_MEMORY_MB[preprocess_result['layer_name']],
+    db_writes=1
+)
 def load_preprocessed_gadm_layer(self, preprocess_result):
     """
     Load a preprocessed GADM layer to PostGIS (to *_string fields, no FK resolution)
@@ -930,7 +946,11 @@ import time
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda layer_index: settings.GADM_LAYER_MEMORY_MB[f'Admin_Level_{layer_index}'],
+    db_writes=1
+)
 def load_gadm_layer_parallel(self, layer_index):
     """
     Load ONE GADM layer without FK resolution (uses *_string fields)
@@ -1164,7 +1184,8 @@ def load_gadm_parallel_optimized(self):
 # CENSUS VOTER TABULATION DISTRICT (VTD) TASKS
 # ============================================================================
 
-@shared_task(bind=True)
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(memory_mb=settings.CENSUS_LOAD_MEMORY_MB['vtd'], db_writes=1)
 def fetch_and_load_vtd_state(self, year, state_fips):
     """
     Fetch and load VTDs for a single state
@@ -1257,20 +1278,89 @@ def fetch_all_vtds_for_year(year):
     return tasks.apply_async()
 
 
+# ============================================================================
+# CENSUS TIGER ADDRESS RANGE (ADDRFEAT) TASKS
+# ============================================================================
+
+@shared_task(bind=True)
+def fetch_and_load_addrfeat_county(self, year, state_fips, county_fips):
+    """
+    Fetch and load the TIGER address range features of one county
+    
+    Args:
+        year: TIGER vintage
+        state_fips: State FIPS code (e.g., '06')
+        county_fips: County FIPS code (e.g., '001')
+    
+    Returns:
+        dict with status, count, elapsed time
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        logger.info(f"[Worker {self.request.hostname}] Fetching ADDRFEAT: {state_fips}{county_fips} ({year})")
+        
+        call_command(
+            'fetch_census_addrfeat',
+            year=year,
+            state=state_fips,
+            county=county_fips,
+            verbosity=1
+        )
+        
+        from locations.models import United_States_Census_Address_Feature
+        count = United_States_Census_Address_Feature.objects.filter(
+            statefp=state_fips,
+            countyfp=county_fips,
+            year=year
+        ).count()
+        
+        elapsed = time.time() - start_time
+        
+        return {
+            'status': 'success',
+            'state_fips': state_fips,
+            'county_fips': county_fips,
+            'year': year,
+            'feature_count': count,
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        elapsed = time.time() - start_time
+        logger.error(f"[Worker {self.request.hostname}] Failed ADDRFEAT fetch {state_fips}{county_fips}: {e}")
+        
+        return {
+            'status': 'error',
+            'state_fips': state_fips,
+            'county_fips': county_fips,
+            'year': year,
+            'error': str(e),
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+
+
 # ============================================================================
 # ADDRESS GEOCODING AND CENSUS UNIT ASSIGNMENT
 # ============================================================================
 
 @shared_task(bind=True)
-def geocode_address(self, address_id):
+def geocode_address(self, address_id, geocode_source='auto'):
     """
-    Geocode a single address using Census Geocoder API
+    Geocode a single address
     
     Args:
         address_id: Address model ID
+        geocode_source: 'auto' (hedged across settings.GEOCODING_PROVIDER_ORDER,
+            first result meeting GEOCODING_MIN_QUALITY wins), 'Census'
+            (Census Geocoder API only) or 'TIGER_LOCAL' (offline interpolation
+            on loaded TIGER address ranges only)
     
     Returns:
-        dict with status, coordinates, quality
+        dict with status, coordinates, quality, source (the winning provider)
     """
     import time
     from django.utils import timezone
@@ -1278,6 +1368,7 @@ def geocode_address(self, address_id):
     
     try:
         from locations.models import United_States_Address
+        from utilities.tiger_geocoder import apply_geocode_result, geocode_address_tiger
         
         address = United_States_Address.objects.get(id=address_id)
         
@@ -1285,7 +1376,6 @@ def geocode_address(self, address_id):
         address_str = f"{address.primary_number} {address.street_name} {address.street_suffix}".strip()
         city = address.city_name or address.default_city_name
         state = address.state_abbreviation
-        zip_code = address.zip5
         
         if not all([address_str, city, state]):
             return {
@@ -1294,33 +1384,40 @@ def geocode_address(self, address_id):
                 'error': 'Incomplete address'
             }
         
-        # Call Census Geocoder API
-        import requests
+        attempts = None
         
-        url = "https://geocoding.geo.census.gov/geocoder/locations/onelineaddress"
-        params = {
-            'address': f"{address_str}, {city}, {state} {zip_code}",
-            'benchmark': 'Public_AR_Current',
-            'format': 'json'
-        }
+        if geocode_source == 'auto':
+            # Hedged across providers; the winner ends up in geocode_source
+            from utilities.geocoding_orchestrator import geocode_hedged
+            
+            outcome = geocode_hedged(address)
+            result = outcome['result']
+            attempts = outcome['attempts']
         
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        result = response.json()
+        elif geocode_source == 'TIGER_LOCAL':
+            # Offline: local address range interpolation
+            result = geocode_address_tiger(address)
         
-        if result.get('result', {}).get('addressMatches'):
-            match = result['result']['addressMatches'][0]
-            coords = match['coordinates']
+        elif geocode_source == 'Census':
+            # Call Census Geocoder API (geocode cache first, then the shared rate-limited client)
+            from utilities.geocoding import address_oneline, geocode_with_census_oneline
             
+            match = geocode_with_census_oneline(address_oneline(address))
+            result = None
+            if match:
+                result = {
+                    'latitude': match['coordinates']['y'],
+                    'longitude': match['coordinates']['x'],
+                    'geocode_quality': 'Interpolated',
+                    'geocode_source': 'Census'
+                }
+        
+        else:
+            raise ValueError(f"Unknown geocode source: {geocode_source}")
+        
+        if result:
             # Update address
-            from django.contrib.gis.geos import Point
-            address.geom = Point(coords['x'], coords['y'], srid=4326)
-            address.latitude = coords['y']
-            address.longitude = coords['x']
-            address.geocoded = True
-            address.geocode_quality = match.get('matchedAddress', 'Matched')
-            address.geocode_source = 'Census'
-            address.geocoded_at = timezone.now()
+            apply_geocode_result(address, result, timezone.now())
             address.save()
             
             elapsed = time.time() - start_time
@@ -1328,14 +1425,17 @@ def geocode_address(self, address_id):
             return {
                 'status': 'success',
                 'address_id': address_id,
-                'coordinates': [coords['x'], coords['y']],
+                'coordinates': [result['longitude'], result['latitude']],
                 'quality': address.geocode_quality,
+                'source': address.geocode_source,
+                'attempts': attempts,
                 'elapsed_seconds': round(elapsed, 2)
             }
         else:
             return {
                 'status': 'no_match',
                 'address_id': address_id,
+                'attempts': attempts,
                 'elapsed_seconds': round(time.time() - start_time, 2)
             }
     
@@ -1360,18 +1460,234 @@ def geocode_addresses_batch(address_ids):
     Returns:
         Async result group
     """
-    tasks = group(geocode_address.s(addr_id) for addr_id in address_ids)
+    # The children stay on this batch's queue instead of flooding interactive-geocode
+    queue = settings.CELERY_TASK_ROUTES[geocode_addresses_batch.name]["queue"]
+    tasks = group(geocode_address.s(addr_id).set(queue=queue) for addr_id in address_ids)
     return tasks.apply_async()
 
 
 @shared_task(bind=True)
-def assign_census_units_to_address(self, address_id, year=2020):
+def geocode_addresses_concurrent(self, address_ids):
+    """
+    Geocode addresses inside one task with concurrent onelineaddress requests
+    
+    Requests go through the shared Census client, so in-flight calls are bounded
+    and paced to the provider rate limit; matches are saved with one bulk update.
+    
+    Args:
+        address_ids: List of address IDs
+    
+    Returns:
+        dict with matched/no_match/error counts
+    """
+    import time
+    from django.contrib.gis.geos import Point
+    from django.utils import timezone
+    start_time = time.time()
+    
+    from locations.models import United_States_Address
+    from utilities.census_batch_geocoding import GEOCODED_FIELDS, ungeocoded_addresses
+    from utilities.geocoding import address_oneline, geocode_with_census_oneline
+    from utilities.geocoding_client import get_geocoding_client
+    
+    addresses = list(ungeocoded_addresses().filter(id__in=address_ids))
+    results = get_geocoding_client('census').map(
+        geocode_with_census_oneline,
+        [address_oneline(address) for address in addresses]
+    )
+    
+    geocoded_at = timezone.now()
+    matched = []
+    errors = 0
+    
+    for address, match in zip(addresses, results):
+        if isinstance(match, Exception):
+            errors += 1
+            logger.error(f"Failed geocoding address {address.id}: {match}")
+            continue
+        if not match:
+            continue
+        
+        coords = match['coordinates']
+        address.geom = Point(coords['x'], coords['y'], srid=4326)
+        address.latitude = coords['y']
+        address.longitude = coords['x']
+        address.geocoded = True
+        address.geocode_quality = 'Interpolated'
+        address.geocode_source = 'Census'
+        address.geocoded_at = geocoded_at
+        matched.append(address)
+    
+    if matched:
+        United_States_Address.objects.bulk_update(matched, GEOCODED_FIELDS)
+    
+    elapsed = time.time() - start_time
+    logger.info(
+        f"[Worker {self.request.hostname}] Geocoded {len(matched)}/{len(addresses)} "
+        f"addresses in {elapsed:.2f}s ({len(addresses) / max(elapsed, 1e-6):.1f} req/s)"
+    )
+    
+    return {
+        'status': 'success',
+        'submitted': len(addresses),
+        'matched': len(matched),
+        'no_match': len(addresses) - len(matched) - errors,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 2),
+        'worker': self.request.hostname
+    }
+
+
+@shared_task(bind=True)
+def geocode_addresses_tiger_local(self, address_ids, year=None):
+    """
+    Geocode addresses offline against the loaded TIGER address ranges
+    
+    Args:
+        address_ids: List of address IDs
+        year: TIGER vintage (default: settings.TIGER_GEOCODER_YEAR)
+    
+    Returns:
+        dict with submitted/matched/no_match counts
+    """
+    import time
+    start_time = time.time()
+    
+    from utilities.census_batch_geocoding import ungeocoded_addresses
+    from utilities.tiger_geocoder import geocode_addresses_tiger
+    
+    counts = geocode_addresses_tiger(ungeocoded_addresses().filter(id__in=address_ids), year)
+    elapsed = time.time() - start_time
+    
+    logger.info(
+        f"[Worker {self.request.hostname}] TIGER_LOCAL geocoded "
+        f"{counts['matched']}/{counts['submitted']} addresses in {elapsed:.2f}s"
+    )
+    
+    return {
+        'status': 'success',
+        **counts,
+        'elapsed_seconds': round(elapsed, 2),
+        'worker': self.request.hostname
+    }
+
+
+@shared_task(bind=True)
+def geocode_census_batch_task(self, address_ids):
+    """
+    Geocode up to CENSUS_GEOCODER_BATCH_SIZE addresses with one Census batch request
+    
+    Args:
+        address_ids: List of address IDs
+    
+    Returns:
+        dict with submitted/matched/no_match/tie counts
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.census_batch_geocoding import geocode_census_batch, ungeocoded_addresses
+        
+        counts = geocode_census_batch(
+            ungeocoded_addresses().filter(id__in=address_ids).order_by('id')
+        )
+        elapsed = time.time() - start_time
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Census batch geocoded "
+            f"{counts['matched']}/{counts['submitted']} addresses in {elapsed:.2f}s"
+        )
+        
+        return {
+            'status': 'success',
+            **counts,
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed Census batch geocoding of {len(address_ids)} addresses: {e}")
+        return {
+            'status': 'error',
+            'submitted': len(address_ids),
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2),
+            'worker': self.request.hostname
+        }
+
+
+@shared_task
+def geocode_addresses_census_batch(batch_size=None, limit=None):
+    """
+    Geocode all ungeocoded addresses with one Census batch task per CSV batch
+    
+    Args:
+        batch_size: Addresses per batch (capped at settings.CENSUS_GEOCODER_BATCH_SIZE)
+        limit: Optional maximum number of addresses
+    
+    Returns:
+        Async result group
+    """
+    from django.conf import settings
+    from utilities.census_batch_geocoding import iter_ungeocoded_id_batches
+    
+    batch_size = min(
+        batch_size or settings.CENSUS_GEOCODER_BATCH_SIZE,
+        settings.CENSUS_GEOCODER_BATCH_SIZE
+    )
+    from utilities.address_deduplication import fan_out_geocodes
+    
+    fan_out_geocodes()
+    batches = list(iter_ungeocoded_id_batches(batch_size, limit))
+    
+    tasks = group(geocode_census_batch_task.s(ids) for ids in batches)
+    
+    logger.info(f"Queued {len(batches)} Census batch geocoding tasks")
+    
+    # Duplicate addresses take their representative's coordinates once every batch is done
+    return chord(tasks)(fan_out_geocodes_task.si())
+
+
+@shared_task
+def fan_out_geocodes_task():
+    """
+    Copy coordinates from geocoded addresses to ungeocoded rows with the same fingerprint
+    
+    Returns:
+        dict with rows updated
+    """
+    from utilities.address_deduplication import fan_out_geocodes
+    
+    updated = fan_out_geocodes()
+    return {'status': 'success', 'fanned_out': updated}
+
+
+@shared_task
+def purge_expired_geocode_cache():
+    """
+    Delete expired geocode cache rows
+    
+    Returns:
+        dict with rows deleted
+    """
+    from utilities.geocode_cache import purge_expired_geocodes
+    
+    deleted = purge_expired_geocodes()
+    logger.info(f"Purged {deleted} expired geocode cache entries")
+    
+    return {'status': 'success', 'deleted': deleted}
+
+
+@shared_task(bind=True)
+def assign_census_units_to_address(self, address_id, year=2020, strategy=None):
     """
     Assign census units to a geocoded address via spatial join
     
     Args:
         address_id: Address model ID
         year: Census year (2010 or 2020)
+        strategy: 'hierarchical', 'block_first' or 'index' (None = settings.CENSUS_ASSIGNMENT_STRATEGY)
     
     Returns:
         dict with status and assigned units
@@ -1392,7 +1708,7 @@ def assign_census_units_to_address(self, address_id, year=2020):
             }
         
         # Call assign_census_units method
-        success = address.assign_census_units(year=year)
+        success = address.assign_census_units(year=year, strategy=strategy)
         
         elapsed = time.time() - start_time
         
@@ -1432,70 +1748,814 @@ def assign_census_units_to_address(self, address_id, year=2020):
 
 
 @shared_task
-def assign_census_units_batch(address_ids, year=2020):
+def assign_census_units_batch(address_ids, year=2020, strategy=None):
     """
     Assign census units to multiple addresses in parallel
     
     Args:
         address_ids: List of address IDs
         year: Census year
+        strategy: 'hierarchical', 'block_first' or 'index' (None = settings.CENSUS_ASSIGNMENT_STRATEGY)
     
     Returns:
         Async result group
     """
+    # The children stay on this batch's queue instead of flooding interactive-geocode
+    queue = settings.CELERY_TASK_ROUTES[assign_census_units_batch.name]["queue"]
     tasks = group(
-        assign_census_units_to_address.s(addr_id, year)
+        assign_census_units_to_address.s(addr_id, year, strategy).set(queue=queue)
         for addr_id in address_ids
     )
     return tasks.apply_async()
 
 
 @shared_task(bind=True)
-def fetch_census_unit_task(self, unit_type, year, state_fips=None, skip_download=False):
+def assign_census_units_sql_chunk(self, year, start_id, end_id, unit_types=None, block_first=False):
     """
-    Fetch and load Census TIGER data for a specific unit/year/state
-    
-    This is the Celery task called by fetch_census_data management command.
+    Assign census units to one id range with set-based UPDATE ... FROM joins
     
     Args:
-        unit_type: Type of unit (state, county, cd, sldu, sldl, tract, blockgroup, vtd, place, zcta)
         year: Census year
-        state_fips: State FIPS code (if needed for this unit type)
-        skip_download: Skip download if file exists
+        start_id: First address id (inclusive)
+        end_id: Last address id (inclusive)
+        unit_types: Optional list of unit types (default: all)
+        block_first: Derive state/county/tract/block group from the block GEOID
     
     Returns:
-        dict with status, unit_type, year, state_fips, count
+        dict with rows updated per unit type and rows per second
     """
-    from django.core.management import call_command
-    from io import StringIO
-    import sys
-    
-    # Capture command output
-    stdout = StringIO()
-    stderr = StringIO()
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    sys.stdout = stdout
-    sys.stderr = stderr
+    import time
+    start_time = time.time()
     
     try:
-        # Build command args
-        cmd_args = [
-            '--unit', unit_type,
-            '--year', str(year),
-        ]
-        
-        if state_fips:
-            cmd_args.extend(['--state', state_fips])
+        from utilities.bulk_census_assignment import assign_census_units_for_id_range
         
-        if skip_download:
-            cmd_args.append('--skip-download')
+        counts = assign_census_units_for_id_range(
+            year, start_id, end_id, unit_types, block_first
+        )
+        elapsed = time.time() - start_time
         
-        # Run management command (synchronous within this task)
-        call_command('fetch_census_data', *cmd_args)
+        logger.info(
+            f"[Worker {self.request.hostname}] Assigned census units for ids "
+            f"{start_id}-{end_id}: {counts['addresses']} addresses in {elapsed:.2f}s"
+        )
         
-        # Get model count
-        from locations.models.census.tiger import *
+        return {
+            'status': 'success',
+            'year': year,
+            'start_id': start_id,
+            'end_id': end_id,
+            'counts': counts,
+            'elapsed_seconds': round(elapsed, 2),
+            'rows_per_second': round(counts['addresses'] / max(elapsed, 1e-6), 1),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed bulk census assignment for ids {start_id}-{end_id}: {e}")
+        return {
+            'status': 'error',
+            'year': year,
+            'start_id': start_id,
+            'end_id': end_id,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task
+def assign_census_units_bulk(year=2020, chunk_size=None, parallel=True, block_first=False):
+    """
+    Assign census units to all geocoded addresses for a census year in id-range chunks
+    
+    Each chunk is one UPDATE ... FROM spatial join per unit type instead of one
+    task (and seven queries) per address. Only one row per address fingerprint is
+    joined; duplicates are filled in afterwards.
+    
+    Args:
+        year: Census year (restricts addresses and boundaries)
+        chunk_size: Ids per chunk (default: settings.CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE)
+        parallel: Fan chunks out across workers (True) or run them here in order
+        block_first: Derive state/county/tract/block group from the block GEOID
+    
+    Returns:
+        Async result group (parallel) or aggregate stats (sequential)
+    """
+    from django.conf import settings
+    from utilities.bulk_census_assignment import (
+        assign_census_units_bulk as run_bulk_assignment,
+        get_assignable_id_bounds,
+        iter_id_chunks,
+    )
+    
+    chunk_size = chunk_size or settings.CENSUS_BULK_ASSIGNMENT_CHUNK_SIZE
+    
+    if not parallel:
+        return run_bulk_assignment(year, chunk_size=chunk_size, block_first=block_first)
+    
+    min_id, max_id = get_assignable_id_bounds(year)
+    if min_id is None:
+        return {'status': 'success', 'year': year, 'addresses': 0, 'chunks': 0}
+    
+    chunks = list(iter_id_chunks(min_id, max_id, chunk_size))
+    tasks = group(
+        assign_census_units_sql_chunk.s(year, chunk_start, chunk_end, None, block_first)
+        for chunk_start, chunk_end in chunks
+    )
+    
+    logger.info(f"Queued {len(chunks)} bulk census assignment chunks for {year}")
+    
+    # Duplicate addresses take their representative's units once every chunk is done
+    return chord(tasks)(fan_out_census_units_task.si(year))
+
+
+@shared_task
+def fan_out_census_units_task(year):
+    """
+    Copy census units from each address fingerprint's representative to its duplicates
+    
+    Args:
+        year: Census year
+    
+    Returns:
+        dict with rows updated
+    """
+    from utilities.address_deduplication import fan_out_census_units
+    
+    updated = fan_out_census_units(year)
+    return {'status': 'success', 'year': year, 'fanned_out': updated}
+
+
+@shared_task(bind=True)
+def address_work_queue_worker(self, queue, year=None, chunk_size=None, source='census_batch',
+                              block_first=False):
+    """
+    Drain an address work queue: claim chunks with SKIP LOCKED until none are left
+    
+    Any number of these can run at once; each commits its own chunks.
+    
+    Args:
+        queue: 'geocode' or 'assign'
+        year: Census year (required for 'assign')
+        chunk_size: Rows per claim (default: settings.ADDRESS_WORK_QUEUE_CHUNK_SIZE)
+        source: Geocoder for 'geocode': 'census_batch' or 'tiger_local'
+        block_first: Derive nested units from the block GEOID for 'assign'
+    
+    Returns:
+        dict with chunks and rows processed
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.address_work_queue import run_work_queue
+        
+        stats = run_work_queue(
+            queue, year=year, chunk_size=chunk_size, source=source, block_first=block_first
+        )
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Work queue {queue} drained: "
+            f"{stats['rows']} rows in {stats['chunks']} chunks, {stats['elapsed_seconds']}s"
+        )
+        
+        return {
+            'status': 'success',
+            **stats,
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Work queue {queue} worker failed: {e}")
+        return {
+            'status': 'error',
+            'queue': queue,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task
+def start_address_work_queue(queue, workers=None, year=None, chunk_size=None, source='census_batch',
+                             block_first=False):
+    """
+    Start N work-queue workers (one message each, no id lists)
+    
+    Args:
+        queue: 'geocode' or 'assign'
+        workers: Number of worker tasks (default: settings.ADDRESS_WORK_QUEUE_WORKERS)
+        year, chunk_size, source, block_first: passed to address_work_queue_worker
+    
+    Returns:
+        Async result group
+    """
+    from django.conf import settings
+    
+    workers = workers or settings.ADDRESS_WORK_QUEUE_WORKERS
+    tasks = group(
+        address_work_queue_worker.s(queue, year, chunk_size, source, block_first)
+        for _ in range(workers)
+    )
+    
+    logger.info(f"Starting {workers} {queue} work-queue workers")
+    
+    return tasks.apply_async()
+
+
+@shared_task(bind=True)
+def import_point_csv_range_task(self, path, dataset, column_map, mode='append', start_row=0,
+                                max_rows=None, chunk_size=None, census_year=2020):
+    """
+    Import one row range of a point CSV (see utilities/point_csv_importer.py)
+    
+    Args:
+        path: CSV path readable by the worker
+        dataset: 'address' or 'place'
+        column_map: Target field -> source column(s)
+        mode: 'append' or 'upsert' (wiping happens once, before the ranges are queued)
+        start_row: Data rows to skip
+        max_rows: Rows in this range
+        chunk_size: Rows per COPY chunk (default: settings.POINT_IMPORT_CHUNK_SIZE)
+        census_year: census_year of new addresses
+    
+    Returns:
+        dict with rows read and inserted/updated counts
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.point_csv_importer import import_point_csv
+        
+        stats = import_point_csv(
+            path, dataset, column_map, mode=mode, chunk_size=chunk_size,
+            start_row=start_row, max_rows=max_rows, census_year=census_year
+        )
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Imported {stats['rows']} {dataset} rows "
+            f"from {path} (start row {start_row}) in {stats['elapsed_seconds']}s"
+        )
+        
+        return {
+            'status': 'success',
+            'start_row': start_row,
+            **stats,
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to import rows {start_row}+ of {path}: {e}")
+        return {
+            'status': 'error',
+            'start_row': start_row,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task
+def import_point_csv_parallel(path, dataset, column_map, mode='append', rows_per_task=None,
+                              chunk_size=None, census_year=2020):
+    """
+    Import a point CSV with one task per row range
+    
+    Wipes first when mode is 'wipe', then queues the ranges in append mode.
+    
+    Args:
+        rows_per_task: Rows per range task (default: settings.POINT_IMPORT_TASK_ROWS)
+        path, dataset, column_map, chunk_size, census_year: passed to import_point_csv_range_task
+    
+    Returns:
+        Async result group
+    """
+    from django.conf import settings
+    from utilities.point_csv_importer import count_csv_rows, point_csv_row_ranges, wipe_point_dataset
+    
+    if mode == 'wipe':
+        wipe_point_dataset(dataset)
+        mode = 'append'
+    
+    total_rows = count_csv_rows(path, column_map)
+    ranges = point_csv_row_ranges(total_rows, rows_per_task or settings.POINT_IMPORT_TASK_ROWS)
+    
+    tasks = group(
+        import_point_csv_range_task.s(
+            path, dataset, column_map, mode, r['start_row'], r['max_rows'], chunk_size, census_year
+        )
+        for r in ranges
+    )
+    
+    logger.info(f"Queued import of {total_rows} {dataset} rows from {path} in {len(ranges)} tasks")
+    
+    return tasks.apply_async()
+
+
+@shared_task(bind=True)
+def enrich_locations_task(self, include_addresses=True, only_missing_addresses=True):
+    """
+    Fill GADM/timezone foreign keys of all Places and Localities and address time zones
+    
+    One set-based spatial join per target table (see utilities/location_enrichment.py).
+    
+    Args:
+        include_addresses: Also fill United_States_Address.time_zone/utc_offset
+        only_missing_addresses: Only addresses without a time_zone
+    
+    Returns:
+        dict with rows changed per model and field
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.location_enrichment import enrich_locations
+        
+        stats = enrich_locations(
+            include_addresses=include_addresses, only_missing_addresses=only_missing_addresses
+        )
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Enriched locations in {stats['elapsed_seconds']}s: {stats}"
+        )
+        
+        return {
+            'status': 'success',
+            **stats,
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed location enrichment: {e}")
+        return {
+            'status': 'error',
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task(bind=True)
+def assign_census_units_geopandas_task(self, year=2020, chunk_size=None, start_id=None, end_id=None):
+    """
+    Assign census units with the vectorized GeoPandas engine
+
+    Runs the whole id range in this worker so boundaries are loaded once; point-in-polygon
+    work happens in the worker instead of on the database.
+
+    Args:
+        year: Census year (restricts addresses and boundaries)
+        chunk_size: Ids per in-memory chunk (default: settings.CENSUS_GEOPANDAS_CHUNK_SIZE)
+        start_id: First address id (default: lowest geocoded id)
+        end_id: Last address id (default: highest geocoded id)
+
+    Returns:
+        dict with addresses assigned and rows per second
+    """
+    import time
+    start_time = time.time()
+
+    try:
+        from utilities.geopandas_census_assignment import assign_census_units_geopandas
+
+        stats = assign_census_units_geopandas(
+            year, chunk_size=chunk_size, start_id=start_id, end_id=end_id
+        )
+
+        logger.info(
+            f"[Worker {self.request.hostname}] GeoPandas assigned {stats['addresses']} "
+            f"addresses ({year}) in {stats['elapsed_seconds']}s"
+        )
+
+        return {
+            'status': 'success',
+            **stats,
+            'worker': self.request.hostname
+        }
+
+    except Exception as e:
+        logger.error(f"Failed GeoPandas census assignment for {year}: {e}")
+        return {
+            'status': 'error',
+            'year': year,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task(bind=True)
+def assign_blocks_sedona_task(self, year=2020):
+    """
+    Assign blocks (and units derived from them) to addresses with Sedona on local Spark
+
+    The Spark session uses every core of the worker's machine, so run this on a
+    worker with nothing else scheduled.
+
+    Args:
+        year: Census year (restricts addresses and blocks)
+
+    Returns:
+        dict with addresses assigned and elapsed seconds
+    """
+    import time
+    start_time = time.time()
+
+    try:
+        from utilities.sedona_spatial_joins import assign_blocks_sedona
+
+        stats = assign_blocks_sedona(year)
+
+        logger.info(
+            f"[Worker {self.request.hostname}] Sedona assigned blocks to {stats['addresses']} "
+            f"addresses ({year}) in {stats['elapsed_seconds']}s"
+        )
+
+        return {
+            'status': 'success',
+            **stats,
+            'worker': self.request.hostname
+        }
+
+    except Exception as e:
+        logger.error(f"Failed Sedona block assignment for {year}: {e}")
+        return {
+            'status': 'error',
+            'year': year,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task(bind=True)
+def build_vtd_cd_intersections_sedona_task(self, year=2020):
+    """
+    Rebuild VTD x CD intersections for a year with Sedona on local Spark
+
+    Args:
+        year: Census year of the VTDs and CDs
+
+    Returns:
+        dict with intersections written and elapsed seconds
+    """
+    import time
+    start_time = time.time()
+
+    try:
+        from utilities.sedona_spatial_joins import build_vtd_cd_intersections_sedona
+
+        stats = build_vtd_cd_intersections_sedona(year)
+
+        logger.info(
+            f"[Worker {self.request.hostname}] Sedona built {stats['intersections']} "
+            f"VTD x CD intersections ({year}) in {stats['elapsed_seconds']}s"
+        )
+
+        return {
+            'status': 'success',
+            **stats,
+            'worker': self.request.hostname
+        }
+
+    except Exception as e:
+        logger.error(f"Failed Sedona VTD x CD intersections for {year}: {e}")
+        return {
+            'status': 'error',
+            'year': year,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+@shared_task(bind=True)
+def build_census_intersections_state_task(self, intersection_type, year, statefp):
+    """
+    Rebuild one state's intersections of one type with PostGIS
+    
+    Args:
+        intersection_type: 'county_cd' or 'vtd_cd'
+        year: Census year of both unit types
+        statefp: 2-digit state FIPS code
+    
+    Returns:
+        dict with status and intersections written
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.census_intersections import build_census_intersections_for_state
+        
+        written = build_census_intersections_for_state(intersection_type, year, statefp)
+        elapsed = time.time() - start_time
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Built {intersection_type} intersections for "
+            f"state {statefp} ({year}): {written} rows in {elapsed:.2f}s"
+        )
+        
+        return {
+            'status': 'success',
+            'type': intersection_type,
+            'year': year,
+            'statefp': statefp,
+            'intersections': written,
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed {intersection_type} intersections for state {statefp} ({year}): {e}")
+        return {
+            'status': 'error',
+            'type': intersection_type,
+            'year': year,
+            'statefp': statefp,
+            'error': str(e),
+            'worker': self.request.hostname
+        }
+
+
+@shared_task
+def build_census_intersections_all(intersection_type, year=2020, state_fips=None):
+    """
+    Build intersections of one type with one task per state
+    
+    Args:
+        intersection_type: 'county_cd' or 'vtd_cd'
+        year: Census year of both unit types
+        state_fips: Optional list of state FIPS codes (default: every state with source units)
+    
+    Returns:
+        Async result group
+    """
+    from utilities.census_intersections import get_intersection_states
+    
+    state_fips = state_fips or get_intersection_states(intersection_type, year)
+    
+    tasks = group(
+        build_census_intersections_state_task.s(intersection_type, year, statefp)
+        for statefp in state_fips
+    )
+    
+    logger.info(f"Queued {intersection_type} intersections for {len(state_fips)} states ({year})")
+    
+    return tasks.apply_async()
+
+
+@shared_task(bind=True)
+def build_census_crosswalk_tile_task(self, source_type, target_type, year, statefp,
+                                     with_population=False, block_year=2020, incremental=False):
+    """
+    Build one state tile of a generic census unit crosswalk (writes its checkpoint)
+    
+    Args:
+        source_type, target_type: Keys of CENSUS_CROSSWALK_UNITS
+        year: Census year of both unit types
+        statefp: 2-digit state FIPS code of the tile
+        with_population: Also sum block pop20 per pair
+        block_year: Tabulation block year for population
+        incremental: Only recompute pairs of units whose geometry changed
+    
+    Returns:
+        dict with status and rows written
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.census_crosswalks import build_crosswalk_tile
+        
+        rows = build_crosswalk_tile(
+            source_type, target_type, year, statefp, with_population, block_year, incremental
+        )
+        elapsed = time.time() - start_time
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Built {source_type} x {target_type} crosswalk "
+            f"tile {statefp} ({year}): {rows} rows in {elapsed:.2f}s"
+        )
+        
+        return {
+            'status': 'success',
+            'statefp': statefp,
+            'rows': rows,
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed {source_type} x {target_type} crosswalk tile {statefp} ({year}): {e}")
+        return {
+            'status': 'error',
+            'statefp': statefp,
+            'error': str(e),
+            'worker': self.request.hostname
+        }
+
+
+@shared_task
+def finalize_census_crosswalk_task(results, source_type, target_type, year, with_population=False):
+    """
+    Chord callback: normalize population weights once every tile has run
+    
+    Args:
+        results: Tile task results (from the chord)
+    
+    Returns:
+        dict with tiles failed and rows normalized
+    """
+    from utilities.census_crosswalks import finalize_census_crosswalk
+    
+    failed = [r['statefp'] for r in results if r.get('status') != 'success']
+    if failed:
+        logger.warning(
+            f"{source_type} x {target_type} crosswalk ({year}): tiles {failed} failed; "
+            f"re-run the build to resume them"
+        )
+    
+    normalized = finalize_census_crosswalk(source_type, target_type, year) if with_population else 0
+    
+    return {'status': 'success', 'failed_tiles': failed, 'normalized': normalized}
+
+
+@shared_task
+def build_census_crosswalk_all(source_type, target_type, year=2020, with_population=False,
+                               block_year=2020, state_fips=None, resume=True, incremental=False):
+    """
+    Build a generic crosswalk with one task per pending state tile
+    
+    Tiles with a checkpoint are skipped unless resume is False. With incremental,
+    every tile is revisited and only pairs of changed units are recomputed.
+    
+    Returns:
+        Async result of the chord, or None when no tile is pending
+    """
+    from utilities.census_crosswalks import (
+        get_crosswalk_tiles,
+        pending_crosswalk_tiles,
+        reset_crosswalk_checkpoints,
+    )
+    
+    if not resume:
+        reset_crosswalk_checkpoints(source_type, target_type, year)
+    
+    if incremental:
+        tiles = list(state_fips or get_crosswalk_tiles(source_type, target_type, year))
+    else:
+        tiles = pending_crosswalk_tiles(source_type, target_type, year, with_population, state_fips)
+    if not tiles:
+        logger.info(f"{source_type} x {target_type} crosswalk ({year}): no pending tiles")
+        return None
+    
+    tasks = [
+        build_census_crosswalk_tile_task.s(
+            source_type, target_type, year, statefp, with_population, block_year, incremental
+        )
+        for statefp in tiles
+    ]
+    
+    logger.info(f"Queued {source_type} x {target_type} crosswalk ({year}): {len(tiles)} tiles")
+    
+    return chord(tasks)(
+        finalize_census_crosswalk_task.s(source_type, target_type, year, with_population)
+    )
+
+
+@shared_task(bind=True)
+def build_block_crosswalk_state_task(self, year, statefp, block_year=None):
+    """
+    Rebuild the block-to-district crosswalk for one state
+    
+    Args:
+        year: District boundary year
+        statefp: 2-digit state FIPS code
+        block_year: Tabulation block year (default: year)
+    
+    Returns:
+        dict with status and blocks written
+    """
+    import time
+    start_time = time.time()
+    
+    try:
+        from utilities.block_crosswalk import build_block_crosswalk_for_state
+        
+        blocks = build_block_crosswalk_for_state(year, statefp, block_year)
+        elapsed = time.time() - start_time
+        
+        logger.info(
+            f"[Worker {self.request.hostname}] Built block crosswalk for state {statefp} "
+            f"({year}): {blocks} blocks in {elapsed:.2f}s"
+        )
+        
+        return {
+            'status': 'success',
+            'year': year,
+            'statefp': statefp,
+            'blocks': blocks,
+            'elapsed_seconds': round(elapsed, 2),
+            'worker': self.request.hostname
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to build block crosswalk for state {statefp} ({year}): {e}")
+        return {
+            'status': 'error',
+            'year': year,
+            'statefp': statefp,
+            'error': str(e),
+            'worker': self.request.hostname
+        }
+
+
+@shared_task
+def build_block_crosswalk_all(year=2020, block_year=None, state_fips=None):
+    """
+    Build the block-to-district crosswalk with one task per state
+    
+    Args:
+        year: District boundary year
+        block_year: Tabulation block year (default: year)
+        state_fips: Optional list of state FIPS codes (default: every state with blocks)
+    
+    Returns:
+        Async result group
+    """
+    from utilities.block_crosswalk import get_block_states
+    
+    block_year = block_year or year
+    state_fips = state_fips or get_block_states(block_year)
+    
+    tasks = group(
+        build_block_crosswalk_state_task.s(year, statefp, block_year)
+        for statefp in state_fips
+    )
+    
+    logger.info(f"Queued block crosswalk build for {len(state_fips)} states ({year})")
+    
+    return tasks.apply_async()
+
+
+@shared_task(bind=True, max_retries=None)
+@uses_resource_tokens(
+    memory_mb=lambda unit_type, *args, **kwargs: settings.CENSUS_LOAD_MEMORY_MB.get(unit_type, 1000),
+    db_writes=1
+)
+def fetch_census_unit_task(self, unit_type, year, state_fips=None, skip_download=False):
+    """
+    Fetch and load Census TIGER data for a specific unit/year/state
+    
+    This is the Celery task called by fetch_census_data management command.
+    
+    Args:
+        unit_type: Type of unit (state, county, cd, sldu, sldl, tract, blockgroup, vtd, place, zcta)
+        year: Census year
+        state_fips: State FIPS code (if needed for this unit type)
+        skip_download: Skip download if file exists
+    
+    Returns:
+        dict with status, unit_type, year, state_fips, count
+    """
+    from django.core.management import call_command
+    from io import StringIO
+    import sys
+    
+    # Capture command output
+    stdout = StringIO()
+    stderr = StringIO()
+    old_stdout = sys.stdout
+    old_stderr = sys.stderr
+    sys.stdout = stdout
+    sys.stderr = stderr
+    
+    try:
+        # Build command args
+        cmd_args = [
+            '--unit', unit_type,
+            '--year', str(year),
+        ]
+        
+        if state_fips:
+            cmd_args.extend(['--state', state_fips])
+        
+        if skip_download:
+            cmd_args.append('--skip-download')
+        
+        # Run management command (synchronous within this task)
+        call_command('fetch_census_data', *cmd_args)
+        
+        # Get model count
+        from locations.models.census.tiger import (
+            United_States_Census_State,
+            United_States_Census_County,
+            United_States_Census_Congressional_District,
+            United_States_Census_State_Legislative_District_Upper,
+            United_States_Census_State_Legislative_District_Lower,
+            United_States_Census_Tract,
+            United_States_Census_Block_Group,
+            United_States_Census_Voter_Tabulation_District,
+            United_States_Census_Place,
+            United_States_Census_ZCTA,
+        )
         model_mapping = {
             'state': United_States_Census_State,
             'county': United_States_Census_County,
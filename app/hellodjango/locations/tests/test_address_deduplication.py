@@ -0,0 +1,103 @@
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import TestCase
+
+from locations.models import United_States_Address
+from utilities.address_deduplication import (
+    EMPTY_ADDRESS_FINGERPRINT,
+    assignment_representative_clause,
+    fan_out_census_units,
+    fingerprint_addresses,
+)
+
+FINGERPRINT = "f" * 40
+HERE = Point(-122.27, 37.80, srid=4326)
+THERE = Point(-122.41, 37.77, srid=4326)
+
+
+def _address(**fields):
+    fields = {"census_year": 2020, "geocoded": True, **fields}
+    return United_States_Address.objects.create(**fields)
+
+
+class AssignmentFanOutTests(TestCase):
+    def setUp(self):
+        self.representative = _address(
+            address_fingerprint=FINGERPRINT, geom=HERE, state_geoid="06", county_geoid="06001"
+        )
+        self.same_point = _address(address_fingerprint=FINGERPRINT, geom=HERE)
+        self.other_point = _address(address_fingerprint=FINGERPRINT, geom=THERE)
+
+    def _representative_ids(self):
+        table = connection.ops.quote_name(United_States_Address._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT a.id FROM {table} AS a
+                WHERE a.census_year = 2020 AND a.geocoded AND a.geom IS NOT NULL
+                {assignment_representative_clause("a")}
+                ORDER BY a.id
+                """
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_twins_at_another_point_are_joined_on_their_own(self):
+        self.assertEqual(self._representative_ids(), [self.representative.id, self.other_point.id])
+
+    def test_units_fan_out_only_to_twins_at_the_same_point(self):
+        updated = fan_out_census_units(2020)
+
+        self.assertEqual(updated, 1)
+        self.same_point.refresh_from_db()
+        self.other_point.refresh_from_db()
+        self.assertEqual((self.same_point.state_geoid, self.same_point.county_geoid), ("06", "06001"))
+        self.assertIsNone(self.other_point.state_geoid)
+
+    def test_each_point_keeps_its_own_representative(self):
+        _address(address_fingerprint=FINGERPRINT, geom=THERE)
+        United_States_Address.objects.filter(id=self.other_point.id).update(state_geoid="06", county_geoid="06075")
+
+        fan_out_census_units(2020)
+
+        self.assertEqual(
+            sorted(
+                United_States_Address.objects.filter(geom=THERE).values_list("county_geoid", flat=True)
+            ),
+            ["06075", "06075"],
+        )
+
+    def test_rows_without_fingerprint_are_never_grouped(self):
+        first = _address(geom=HERE, state_geoid="06")
+        second = _address(geom=HERE)
+
+        fan_out_census_units(2020)
+
+        self.assertIn(second.id, self._representative_ids())
+        second.refresh_from_db()
+        self.assertIsNone(second.state_geoid)
+        self.assertIn(first.id, self._representative_ids())
+
+    def test_other_years_are_left_alone(self):
+        other_year = _address(address_fingerprint=FINGERPRINT, geom=HERE, census_year=2010)
+
+        fan_out_census_units(2020)
+
+        other_year.refresh_from_db()
+        self.assertIsNone(other_year.state_geoid)
+
+
+class FingerprintAddressesTests(TestCase):
+    def test_coordinate_only_rows_lose_the_empty_fingerprint(self):
+        legacy = _address(geom=HERE, address_fingerprint=EMPTY_ADDRESS_FINGERPRINT)
+        unfingerprinted = _address(geom=THERE)
+        with_text = _address(primary_number="123", street_name="Main", street_suffix="Street", zip5="94612")
+
+        self.assertEqual(fingerprint_addresses(), 3)
+
+        legacy.refresh_from_db()
+        unfingerprinted.refresh_from_db()
+        with_text.refresh_from_db()
+        self.assertIsNone(legacy.address_fingerprint)
+        self.assertIsNone(unfingerprinted.address_fingerprint)
+        self.assertIsNotNone(with_text.address_fingerprint)
+        self.assertEqual(with_text.street_suffix, "ST")
@@ -0,0 +1,136 @@
+from django.test import SimpleTestCase
+
+from locations.models import United_States_Address
+from utilities.address_normalization import (
+    address_fingerprint,
+    clean_address_text,
+    normalize_address_fields,
+    normalize_state,
+    normalize_street_name,
+    state_fips_for,
+    normalize_zip5,
+)
+
+
+class NormalizeAddressFieldsTests(SimpleTestCase):
+    def test_clean_address_text(self):
+        self.assertEqual(clean_address_text(" 123 Main St.,  Apt #4 "), "123 MAIN ST APT #4")
+        self.assertEqual(clean_address_text(None), "")
+
+    def test_street_name_abbreviations(self):
+        self.assertEqual(normalize_street_name("North Main", "Street"), "N MAIN ST")
+        self.assertEqual(normalize_street_name("Main Street North"), "MAIN ST N")
+        self.assertEqual(normalize_street_name("Martin Luther King Jr Boulevard"), "MARTIN LUTHER KING JR BLVD")
+
+    def test_lone_words_are_not_abbreviated(self):
+        # 'North' and 'Court' are the street name here, not a directional or suffix
+        self.assertEqual(normalize_street_name("North"), "NORTH")
+        self.assertEqual(normalize_street_name("Court"), "COURT")
+
+    def test_zip5(self):
+        self.assertEqual(normalize_zip5("94110-1234"), "94110")
+        self.assertEqual(normalize_zip5(94110), "94110")
+        self.assertEqual(normalize_zip5("9411"), "")
+        self.assertEqual(normalize_zip5(None), "")
+
+    def test_full_state_names_become_usps_codes(self):
+        self.assertEqual(normalize_state("Texas"), "TX")
+        self.assertEqual(normalize_state("New York"), "NY")
+        self.assertEqual(normalize_state("new jersey"), "NJ")
+        self.assertEqual(normalize_state(" ny "), "NY")
+
+    def test_unrecognised_states_are_not_truncated(self):
+        self.assertEqual(normalize_state("Texs"), "TEXS")
+        self.assertEqual(normalize_state(None), "")
+
+    def test_state_fips_from_names(self):
+        self.assertEqual(state_fips_for("New York"), "36")
+        self.assertEqual(state_fips_for("New Jersey"), "34")
+        self.assertEqual(state_fips_for("NE"), "31")
+        self.assertIsNone(state_fips_for("Texs"))
+
+    def test_components(self):
+        fields = normalize_address_fields("123", "north main", "Avenue", "Oakland", "California", "94612-0001")
+
+        self.assertEqual(fields, {
+            "primary_number": "123",
+            "street_name": "N MAIN",
+            "street_suffix": "AVE",
+            "full_street": "N MAIN AVE",
+            "city_name": "OAKLAND",
+            "state_abbreviation": "CA",
+            "zip5": "94612",
+        })
+
+    def test_empty_input(self):
+        fields = normalize_address_fields()
+
+        self.assertTrue(all(value == "" for value in fields.values()))
+
+
+class AddressFingerprintTests(SimpleTestCase):
+    def _fingerprint(self, *values):
+        return address_fingerprint(normalize_address_fields(*values))
+
+    def test_spelling_variants_share_a_fingerprint(self):
+        self.assertEqual(
+            self._fingerprint("123", "North Main", "Street", "Oakland", "ca", "94612"),
+            self._fingerprint("123", "N. MAIN", "ST", "OAKLAND", "CA", "94612-0001"),
+        )
+
+    def test_different_addresses_differ(self):
+        self.assertNotEqual(
+            self._fingerprint("123", "Main", "St", "Oakland", "CA", "94612"),
+            self._fingerprint("125", "Main", "St", "Oakland", "CA", "94612"),
+        )
+
+    def test_no_address_text_has_no_fingerprint(self):
+        self.assertIsNone(self._fingerprint())
+        self.assertIsNone(self._fingerprint("", " ", None, ",", "", "123"))
+
+    def test_partial_addresses_are_fingerprinted(self):
+        zip_only = self._fingerprint(None, None, None, None, None, "94612")
+        city_only = self._fingerprint(None, None, None, "Oakland", "CA", None)
+
+        self.assertIsNotNone(zip_only)
+        self.assertIsNotNone(city_only)
+        self.assertNotEqual(zip_only, city_only)
+
+    def test_states_sharing_a_prefix_do_not_collide(self):
+        self.assertNotEqual(
+            self._fingerprint("1", "Main", "St", "Springfield", "New York", None),
+            self._fingerprint("1", "Main", "St", "Springfield", "New Jersey", None),
+        )
+        self.assertEqual(
+            self._fingerprint("1", "Main", "St", "Austin", "Texas", "78701"),
+            self._fingerprint("1", "Main", "St", "Austin", "TX", "78701"),
+        )
+
+    def test_components_do_not_run_together(self):
+        self.assertNotEqual(
+            self._fingerprint("1", "23 Main", None, None, None, None),
+            self._fingerprint("12", "3 Main", None, None, None, None),
+        )
+
+
+class AddressNormalizeTests(SimpleTestCase):
+    def test_normalize_sets_canonical_fields_and_fingerprint(self):
+        address = United_States_Address(
+            primary_number="123", street_name="north main", street_suffix="street",
+            city_name="Oakland", state_abbreviation="ca", zip5="94612"
+        )
+
+        fingerprint = address.normalize()
+
+        self.assertEqual(address.street_name, "N MAIN")
+        self.assertEqual(address.street_suffix, "ST")
+        self.assertEqual(address.state_abbreviation, "CA")
+        self.assertEqual(address.address_fingerprint, fingerprint)
+        self.assertIsNotNone(fingerprint)
+
+    def test_coordinate_only_rows_get_no_fingerprint(self):
+        address = United_States_Address(latitude=37.8, longitude=-122.27)
+
+        self.assertIsNone(address.normalize())
+        self.assertIsNone(address.address_fingerprint)
+        self.assertIsNone(address.street_name)
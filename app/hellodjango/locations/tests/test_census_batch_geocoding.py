@@ -0,0 +1,176 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from locations.models import United_States_Address
+from utilities import census_batch_geocoding
+from utilities.census_batch_geocoding import (
+    build_batch_csv,
+    geocode_census_batch,
+    parse_census_batch_response,
+)
+from utilities.geocode_cache import cache_entry, normalize_address_key
+from utilities.geocoding import address_oneline
+
+MATCH = (
+    '"1","123 Main St, Oakland, CA, 94612","Match","Exact",'
+    '"123 MAIN ST, OAKLAND, CA, 94612","-122.27,37.8","647283921","L"'
+)
+NON_EXACT = (
+    '"2","9 Elm Ave, Oakland, CA, 94612","Match","Non_Exact",'
+    '"9 ELM AVE, OAKLAND, CA, 94610","-122.25,37.81","647283999","R"'
+)
+NO_MATCH = '"3","1 Nowhere Rd, Oakland, CA, 94612","No_Match"'
+TIE = '"4","5 Oak St, , CA, ","Tie"'
+
+
+def _address(address_id, **fields):
+    fields = {
+        "primary_number": "123", "street_name": "Main", "street_suffix": "St",
+        "city_name": "Oakland", "state_abbreviation": "CA", "zip5": "94612", **fields,
+    }
+    return United_States_Address(id=address_id, **fields)
+
+
+class BuildBatchCsvTests(SimpleTestCase):
+    def test_rows_are_id_street_city_state_zip(self):
+        batch = build_batch_csv([_address(7)])
+
+        self.assertEqual(batch, b"7,123 Main St,Oakland,CA,94612\r\n")
+
+    def test_fields_with_commas_are_quoted(self):
+        batch = build_batch_csv([_address(7, street_name="Main, Unit 4", street_suffix=None)])
+
+        self.assertEqual(batch, b'7,"123 Main, Unit 4",Oakland,CA,94612\r\n')
+
+    def test_missing_parts_are_empty(self):
+        address = _address(8, primary_number=None, city_name=None, default_city_name="Berkeley", zip5=None)
+
+        self.assertEqual(build_batch_csv([address]), b"8,Main St,Berkeley,CA,\r\n")
+
+
+class ParseCensusBatchResponseTests(SimpleTestCase):
+    def _parse(self, *lines):
+        return list(parse_census_batch_response(lines))
+
+    def test_match(self):
+        [result] = self._parse(MATCH)
+
+        self.assertEqual(result, {
+            "id": 1,
+            "status": "Match",
+            "match_type": "Exact",
+            "geocode_quality": "Interpolated",
+            "matched_address": "123 MAIN ST, OAKLAND, CA, 94612",
+            "longitude": -122.27,
+            "latitude": 37.8,
+        })
+
+    def test_non_exact_match_is_approximate(self):
+        [result] = self._parse(NON_EXACT)
+
+        self.assertEqual(result["geocode_quality"], "Approximate")
+
+    def test_no_match_and_tie_have_no_coordinates(self):
+        no_match, tie = self._parse(NO_MATCH, TIE)
+
+        self.assertEqual((no_match["id"], no_match["status"]), (3, "No_Match"))
+        self.assertEqual((tie["id"], tie["status"]), (4, "Tie"))
+        for result in (no_match, tie):
+            self.assertIsNone(result["longitude"])
+            self.assertIsNone(result["latitude"])
+            self.assertIsNone(result["geocode_quality"])
+
+    def test_blank_and_non_data_lines_are_skipped(self):
+        results = self._parse("", '"Record ID","Input Address"', MATCH, "", NO_MATCH)
+
+        self.assertEqual([result["id"] for result in results], [1, 3])
+
+    def test_row_without_status_is_a_no_match(self):
+        [result] = self._parse('"5","1 Main St, Oakland, CA, 94612"')
+
+        self.assertEqual(result["status"], "No_Match")
+
+
+class GeocodeCensusBatchTests(SimpleTestCase):
+    def setUp(self):
+        self.cached = {}
+        self.stored = {}
+        self.updated = []
+
+        def bulk_update(objs, fields):
+            self.updated.extend(objs)
+
+        for patcher in (
+            mock.patch.object(
+                census_batch_geocoding, "get_cached_geocodes",
+                side_effect=lambda keys, provider: {k: self.cached[k] for k in keys if k in self.cached},
+            ),
+            mock.patch.object(
+                census_batch_geocoding, "set_cached_geocodes",
+                side_effect=lambda results, provider: self.stored.update(results),
+            ),
+            mock.patch.object(United_States_Address.objects, "bulk_update", side_effect=bulk_update),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _submit(self, *lines):
+        response = mock.Mock(encoding="utf-8")
+        response.iter_lines.return_value = iter(lines)
+        patcher = mock.patch.object(census_batch_geocoding, "submit_census_batch", return_value=response)
+        submit = patcher.start()
+        self.addCleanup(patcher.stop)
+        return submit
+
+    def test_results_are_written_to_their_addresses_by_id(self):
+        addresses = [
+            _address(1),
+            _address(2, primary_number="9", street_name="Elm", street_suffix="Ave"),
+            _address(3, primary_number="1", street_name="Nowhere", street_suffix="Rd"),
+            _address(4, primary_number="5", street_name="Oak", city_name=None, zip5=None),
+        ]
+        # The response does not come back in request order
+        self._submit(TIE, NON_EXACT, NO_MATCH, MATCH)
+
+        counts = geocode_census_batch(addresses)
+
+        self.assertEqual(
+            {key: counts[key] for key in ("submitted", "requested", "cached", "matched", "no_match", "tie")},
+            {"submitted": 4, "requested": 4, "cached": 0, "matched": 2, "no_match": 1, "tie": 1},
+        )
+        updated = {address.id: address for address in self.updated}
+        self.assertEqual(sorted(updated), [1, 2])
+        self.assertEqual((updated[1].longitude, updated[1].latitude), (-122.27, 37.8))
+        self.assertEqual(updated[1].geom.coords, (-122.27, 37.8))
+        self.assertEqual(updated[2].geocode_quality, "Approximate")
+        self.assertTrue(all(address.geocoded and address.geocode_source == "Census" for address in self.updated))
+
+    def test_fresh_results_are_cached_except_ties(self):
+        addresses = [
+            _address(1),
+            _address(3, primary_number="1", street_name="Nowhere", street_suffix="Rd"),
+            _address(4, primary_number="5", street_name="Oak", city_name=None, zip5=None),
+        ]
+        self._submit(MATCH, NO_MATCH, TIE)
+
+        geocode_census_batch(addresses)
+
+        key = {address.id: normalize_address_key(address_oneline(address)) for address in addresses}
+        self.assertEqual(set(self.stored), {key[1], key[3]})
+        self.assertTrue(self.stored[key[1]]["matched"])
+        self.assertFalse(self.stored[key[3]]["matched"])
+
+    def test_cached_addresses_are_not_submitted(self):
+        cached_address = _address(1)
+        fresh_address = _address(3, primary_number="1", street_name="Nowhere", street_suffix="Rd")
+        self.cached[normalize_address_key(address_oneline(cached_address))] = cache_entry(
+            latitude=37.8, longitude=-122.27, geocode_quality="Interpolated", geocode_source="Census"
+        )
+        submit = self._submit(NO_MATCH)
+
+        counts = geocode_census_batch([cached_address, fresh_address])
+
+        self.assertEqual(submit.call_args.args[0].splitlines(), [b"3,1 Nowhere Rd,Oakland,CA,94612"])
+        self.assertEqual((counts["cached"], counts["requested"], counts["matched"]), (1, 1, 1))
+        self.assertEqual([address.id for address in self.updated], [1])
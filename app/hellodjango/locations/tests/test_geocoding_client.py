@@ -0,0 +1,177 @@
+from email.utils import formatdate
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from utilities import geocoding_client
+from utilities.geocoding_client import GeocodingClient, GeocodingProviderError, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instantly"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeClockTestCase(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(geocoding_client, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TokenBucketTests(FakeClockTestCase):
+    def test_burst_is_available_immediately(self):
+        bucket = TokenBucket(rate_per_second=2, burst=3)
+
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_waits_for_the_next_token_once_empty(self):
+        bucket = TokenBucket(rate_per_second=2, burst=3)
+        for _ in range(3):
+            bucket.acquire()
+
+        bucket.acquire()
+
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_paces_requests_to_the_rate(self):
+        bucket = TokenBucket(rate_per_second=4, burst=1)
+        start = self.clock.now
+
+        for _ in range(5):
+            bucket.acquire()
+
+        self.assertAlmostEqual(self.clock.now - start, 1.0)
+
+    def test_idle_time_refills_up_to_the_burst_only(self):
+        bucket = TokenBucket(rate_per_second=1, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        self.clock.now += 60
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+    def test_throttle_halves_the_rate_down_to_the_floor(self):
+        bucket = TokenBucket(rate_per_second=1)
+
+        bucket.throttle()
+        self.assertEqual(bucket.rate, 0.5)
+
+        for _ in range(10):
+            bucket.throttle()
+        self.assertEqual(bucket.rate, 0.1)
+
+    def test_recover_steps_back_to_the_configured_rate(self):
+        bucket = TokenBucket(rate_per_second=10)
+        bucket.throttle()
+
+        bucket.recover()
+        self.assertAlmostEqual(bucket.rate, 5.5)
+
+        for _ in range(20):
+            bucket.recover()
+        self.assertEqual(bucket.rate, 10)
+
+
+class GeocodingClientTests(FakeClockTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(geocoding_client.random, "random", return_value=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _client(self, responses, **options):
+        options = {"rate_per_second": 100, "burst": 10, "max_retries": 3, "backoff_seconds": 1.0, **options}
+        client = GeocodingClient("test", "https://geocoder.example/api/", **options)
+        patcher = mock.patch.object(client.session, "request", side_effect=responses)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+        return client
+
+    def test_returns_a_successful_response_without_retrying(self):
+        ok = _response(200)
+        client = self._client([ok])
+
+        self.assertIs(client.get("/locations", params={"q": "x"}), ok)
+        self.request.assert_called_once_with(
+            "GET", "https://geocoder.example/api/locations", params={"q": "x"}, timeout=30
+        )
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_429_waits_for_retry_after_and_throttles(self):
+        client = self._client([_response(429, {"Retry-After": "3"}), _response(200)], rate_per_second=1, burst=1)
+
+        client.get("locations")
+
+        self.assertEqual(self.request.call_count, 2)
+        self.assertEqual(self.clock.sleeps, [3.0])
+        # halved by the 429, one recovery step after the success
+        self.assertAlmostEqual(client.bucket.rate, 0.55)
+
+    def test_retry_after_as_http_date(self):
+        retry_at = formatdate(self.clock.now + 10, usegmt=True)
+        client = self._client([_response(503, {"Retry-After": retry_at}), _response(200)])
+
+        client.get("locations")
+
+        self.assertEqual(self.clock.sleeps, [10.0])
+
+    def test_5xx_backs_off_exponentially_without_throttling(self):
+        client = self._client([_response(502), _response(503), _response(200)])
+
+        client.get("locations")
+
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0])
+        self.assertEqual(client.bucket.rate, 100)
+
+    def test_connection_errors_are_retried(self):
+        ok = _response(200)
+        client = self._client([requests.ConnectionError("reset"), requests.Timeout("slow"), ok])
+
+        self.assertIs(client.get("locations"), ok)
+        self.assertEqual(self.request.call_count, 3)
+
+    def test_gives_up_after_max_retries(self):
+        client = self._client([_response(500)] * 3, max_retries=2)
+
+        with self.assertRaises(GeocodingProviderError):
+            client.get("locations")
+
+        self.assertEqual(self.request.call_count, 3)
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0])
+
+    def test_client_errors_are_not_retried(self):
+        client = self._client([_response(404)])
+
+        with self.assertRaises(requests.HTTPError):
+            client.get("locations")
+
+        self.assertEqual(self.request.call_count, 1)
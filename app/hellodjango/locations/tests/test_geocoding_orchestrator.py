@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from locations.models import United_States_Address
+from utilities import geocoding_orchestrator
+from utilities.geocoding_orchestrator import geocode_hedged
+
+
+def _result(quality):
+    return {"latitude": 37.8, "longitude": -122.27, "geocode_quality": quality, "geocode_source": quality}
+
+
+class HedgedGeocodingTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.started = {}
+
+    def _providers(self, **behaviours):
+        """Fake providers: a result, an exception to raise, or 'slow' (blocks until released)"""
+        def make(name, behaviour):
+            def provider(address):
+                self.started[name] = time.monotonic()
+                if behaviour == "slow":
+                    self.release.wait(10)
+                    return _result("Rooftop")
+                if isinstance(behaviour, Exception):
+                    raise behaviour
+                return behaviour
+            return provider
+
+        patcher = mock.patch.dict(
+            geocoding_orchestrator.GEOCODING_PROVIDER_FUNCTIONS,
+            {name: make(name, behaviour) for name, behaviour in behaviours.items()},
+            clear=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return list(behaviours)
+
+    def _geocode(self, providers, hedge_delay=0.5):
+        return geocode_hedged(
+            United_States_Address(), providers, hedge_delay=hedge_delay, min_quality="Interpolated", timeout=5
+        )
+
+    def test_first_good_result_wins(self):
+        providers = self._providers(first=_result("Rooftop"), second=_result("Rooftop"))
+
+        outcome = self._geocode(providers)
+
+        self.assertEqual(outcome["provider"], "first")
+        self.assertNotIn("second", self.started)
+
+    def test_no_match_falls_back_immediately(self):
+        providers = self._providers(first=None, second=_result("Interpolated"))
+        start = time.monotonic()
+
+        outcome = self._geocode(providers, hedge_delay=2)
+
+        self.assertEqual(outcome["provider"], "second")
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_error_falls_back_immediately_while_a_hedge_is_running(self):
+        providers = self._providers(
+            slow="slow", broken=RuntimeError("provider down"), fallback=_result("Interpolated")
+        )
+
+        outcome = self._geocode(providers, hedge_delay=0.5)
+
+        self.assertEqual(outcome["provider"], "fallback")
+        # started as soon as 'broken' failed, not a hedge delay later
+        self.assertLess(self.started["fallback"] - self.started["broken"], 0.3)
+        self.assertEqual(
+            [(provider, result) for provider, result, _ in outcome["attempts"]],
+            [("broken", "error"), ("fallback", "match"), ("slow", "abandoned")],
+        )
+
+    def test_best_result_below_the_bar_is_returned(self):
+        providers = self._providers(first=_result("Zip"), second=_result("Approximate"), third=None)
+
+        outcome = self._geocode(providers)
+
+        self.assertEqual(outcome["provider"], "second")
+        self.assertEqual(len(outcome["attempts"]), 3)
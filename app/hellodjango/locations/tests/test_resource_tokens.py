@@ -0,0 +1,280 @@
+import os
+import tempfile
+from unittest import mock
+
+import fakeredis
+from celery import Celery
+from celery.exceptions import MaxRetriesExceededError
+from django.test import SimpleTestCase, override_settings
+
+from utilities import resource_tokens
+from utilities.resource_tokens import (
+    acquire_resource_tokens,
+    release_resource_tokens,
+    renew_resource_tokens,
+    resource_token_capacity,
+    resource_token_usage,
+    uses_resource_tokens,
+)
+
+GB = 1024 * 1024 * 1024
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class Retry(Exception):
+    pass
+
+
+app = Celery("test_resource_tokens", set_as_current=False)
+
+
+@app.task(bind=True, max_retries=None)
+@uses_resource_tokens(memory_mb=6000)
+def heavy_task(self):
+    return "done"
+
+
+@app.task(bind=True)
+@uses_resource_tokens(memory_mb=6000)
+def heavy_task_with_default_retries(self):
+    return "done"
+
+
+@override_settings(
+    RESOURCE_TOKEN_MEMORY_MB=10000,
+    RESOURCE_TOKEN_DB_WRITES=2,
+    RESOURCE_TOKEN_LEASE_SECONDS=120,
+    RESOURCE_TOKEN_RETRY_SECONDS=30,
+)
+class ResourceTokenTestCase(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for patcher in (
+            mock.patch.object(resource_tokens, "_redis_client", fakeredis.FakeRedis()),
+            mock.patch.object(resource_tokens, "time", self.clock),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _used(self, pool):
+        return resource_token_usage()[pool]["used"]
+
+
+class AcquireResourceTokensTests(ResourceTokenTestCase):
+    def test_grants_within_capacity(self):
+        first = acquire_resource_tokens("a", memory_mb=6000, db_writes=1)
+        second = acquire_resource_tokens("b", memory_mb=4000, db_writes=1)
+
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertEqual(resource_token_usage()["memory_mb"], {"capacity": 10000, "used": 10000, "leases": 2})
+
+    def test_refuses_when_a_pool_is_short(self):
+        acquire_resource_tokens("a", memory_mb=8000)
+
+        self.assertIsNone(acquire_resource_tokens("b", memory_mb=3000))
+
+    def test_takes_all_pools_or_none(self):
+        acquire_resource_tokens("a", db_writes=2)
+
+        self.assertIsNone(acquire_resource_tokens("b", memory_mb=1000, db_writes=1))
+        self.assertEqual(self._used("memory_mb"), 0)
+
+    def test_oversized_request_runs_alone(self):
+        self.assertIsNotNone(acquire_resource_tokens("big", memory_mb=50000))
+        self.assertIsNone(acquire_resource_tokens("small", memory_mb=1))
+
+    def test_expired_leases_are_reclaimed(self):
+        acquire_resource_tokens("killed", memory_mb=10000)
+
+        self.clock.now += 121
+
+        self.assertIsNotNone(acquire_resource_tokens("next", memory_mb=10000))
+        self.assertEqual(resource_token_usage()["memory_mb"]["leases"], 1)
+
+    def test_unknown_pool(self):
+        with self.assertRaises(ValueError):
+            acquire_resource_tokens("a", gpus=1)
+
+    def test_without_redis_every_request_is_granted(self):
+        with mock.patch.object(resource_tokens, "_redis_client", None), \
+                override_settings(RESOURCE_TOKENS_REDIS_URL=None):
+            lease = acquire_resource_tokens("a", memory_mb=50000)
+
+        self.assertEqual(lease["amounts"], {"memory_mb": 50000})
+
+
+class RenewReleaseResourceTokensTests(ResourceTokenTestCase):
+    def test_renewed_lease_outlives_its_first_expiry(self):
+        lease = acquire_resource_tokens("a", memory_mb=10000)
+
+        self.clock.now += 100
+        renew_resource_tokens(lease)
+        self.clock.now += 100
+
+        self.assertIsNone(acquire_resource_tokens("b", memory_mb=1))
+
+    def test_renew_does_not_revive_an_expired_lease(self):
+        lease = acquire_resource_tokens("a", memory_mb=10000)
+        self.clock.now += 121
+        acquire_resource_tokens("b", memory_mb=1)
+
+        renew_resource_tokens(lease)
+
+        self.assertEqual(self._used("memory_mb"), 1)
+
+    def test_release_returns_the_tokens(self):
+        lease = acquire_resource_tokens("a", memory_mb=10000, db_writes=2)
+
+        release_resource_tokens(lease)
+
+        self.assertEqual(self._used("memory_mb"), 0)
+        self.assertEqual(self._used("db_writes"), 0)
+        self.assertIsNotNone(acquire_resource_tokens("b", memory_mb=10000, db_writes=2))
+
+
+class UsesResourceTokensTests(ResourceTokenTestCase):
+    def _task(self):
+        task = mock.Mock()
+        task.name = "locations.tasks.heavy"
+        task.request.id = "task-id"
+        task.request.hostname = "celery@test"
+        task.retry.return_value = Retry()
+        return task
+
+    def test_holds_tokens_while_running(self):
+        used = self._used
+
+        @uses_resource_tokens(memory_mb=lambda layer: 4000 if layer == "big" else 1000, db_writes=1)
+        def run(task, layer):
+            return used("memory_mb"), used("db_writes")
+
+        self.assertEqual(run(self._task(), "big"), (4000, 1))
+        self.assertEqual(self._used("memory_mb"), 0)
+        self.assertEqual(self._used("db_writes"), 0)
+
+    def test_releases_tokens_when_the_task_fails(self):
+        @uses_resource_tokens(memory_mb=4000)
+        def run(task):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            run(self._task())
+
+        self.assertEqual(self._used("memory_mb"), 0)
+
+    def test_retries_later_when_tokens_are_short(self):
+        acquire_resource_tokens("other", memory_mb=8000)
+        body = mock.Mock()
+        task = self._task()
+
+        with self.assertRaises(Retry):
+            uses_resource_tokens(memory_mb=6000)(body)(task)
+
+        body.assert_not_called()
+        countdown = task.retry.call_args.kwargs["countdown"]
+        self.assertTrue(15 <= countdown <= 45)
+
+    def _short_then_granted(self, shortages):
+        """acquire_resource_tokens that is short `shortages` times, then grants"""
+        return mock.patch.object(
+            resource_tokens,
+            "acquire_resource_tokens",
+            side_effect=[None] * shortages + [{"id": "lease", "amounts": {}}],
+        )
+
+    def test_waits_through_more_retries_than_celery_allows_by_default(self):
+        with self._short_then_granted(5) as acquire:
+            result = heavy_task.apply()
+
+        self.assertEqual(result.get(), "done")
+        self.assertEqual(acquire.call_count, 6)
+
+    def test_default_retry_limit_would_give_up(self):
+        with self._short_then_granted(5):
+            result = heavy_task_with_default_retries.apply()
+
+        with self.assertRaises(MaxRetriesExceededError):
+            result.get()
+
+    def test_token_holding_tasks_retry_without_limit(self):
+        from locations import tasks
+
+        for task in (
+            tasks.preprocess_gadm_layer_sedonadb,
+            tasks.preprocess_single_gadm_layer,
+            tasks.load_gadm_from_geoparquet,
+            tasks.load_preprocessed_gadm_layer,
+            tasks.load_gadm_layer_parallel,
+            tasks.fetch_and_load_vtd_state,
+            tasks.fetch_census_unit_task,
+        ):
+            self.assertIsNone(task.max_retries, task.name)
+
+    def test_runs_without_tokens_when_redis_fails(self):
+        body = mock.Mock(return_value="done")
+
+        with mock.patch.object(resource_tokens, "acquire_resource_tokens", side_effect=ConnectionError):
+            self.assertEqual(uses_resource_tokens(memory_mb=6000)(body)(self._task()), "done")
+
+
+@override_settings(RESOURCE_TOKEN_MEMORY_MB=0, RESOURCE_TOKEN_MEMORY_FRACTION=0.5, RESOURCE_TOKEN_DB_WRITES=4)
+class ResourceTokenCapacityTests(SimpleTestCase):
+    def setUp(self):
+        # 16 GB host
+        sysconf = {"SC_PAGE_SIZE": 4096, "SC_PHYS_PAGES": 16 * GB // 4096}
+        patcher = mock.patch.object(resource_tokens.os, "sysconf", side_effect=sysconf.__getitem__)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _cgroup(self, v2=None, v1=None):
+        files = []
+        for name, limit in (("memory.max", v2), ("memory.limit_in_bytes", v1)):
+            path = os.path.join(self.directory.name, name)
+            if limit is not None:
+                with open(path, "w") as f:
+                    f.write(f"{limit}\n")
+            files.append(path)
+        patcher = mock.patch.object(resource_tokens, "CGROUP_MEMORY_LIMIT_FILES", files)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fraction_of_host_memory_outside_a_container(self):
+        self._cgroup()
+
+        self.assertEqual(resource_token_capacity(), {"memory_mb": 8192, "db_writes": 4})
+
+    def test_cgroup_v2_limit(self):
+        self._cgroup(v2=4 * GB)
+
+        self.assertEqual(resource_token_capacity()["memory_mb"], 2048)
+
+    def test_cgroup_v2_without_limit(self):
+        self._cgroup(v2="max", v1=4 * GB)
+
+        self.assertEqual(resource_token_capacity()["memory_mb"], 8192)
+
+    def test_cgroup_v1_limit(self):
+        self._cgroup(v1=2 * GB)
+
+        self.assertEqual(resource_token_capacity()["memory_mb"], 1024)
+
+    def test_cgroup_v1_unlimited_is_capped_by_the_host(self):
+        self._cgroup(v1=9223372036854771712)
+
+        self.assertEqual(resource_token_capacity()["memory_mb"], 8192)
+
+    def test_explicit_memory_setting_wins(self):
+        self._cgroup(v2=4 * GB)
+
+        with override_settings(RESOURCE_TOKEN_MEMORY_MB=3000):
+            self.assertEqual(resource_token_capacity()["memory_mb"], 3000)
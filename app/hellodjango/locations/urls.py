@@ -100,6 +100,19 @@ synthetics = [
     path("places/lookup/", views.Filtered_Place_List.as_view(), name="lookup"),
 ]
 
+census = [
+    path(
+        "census/interpolate/",
+        views.Census_Interpolation.as_view(),
+        name="census_interpolation",
+    ),
+    path(
+        "census/diff/",
+        views.Census_Vintage_Diff.as_view(),
+        name="census_vintage_diff",
+    ),
+]
+
 # this is licit
 # new_urls = []
 #
@@ -107,5 +120,6 @@ urlpatterns.extend(gadm)
 urlpatterns.extend(time)
 urlpatterns.extend(synthetics)
 urlpatterns.extend(addresses)
+urlpatterns.extend(census)
 
 urlpatterns = format_suffix_patterns(urlpatterns)
@@ -3,3 +3,4 @@ from .synthetics import *
 from .interactive import *
 from .time import *
 from .addresses import *
+from .census import *
@@ -0,0 +1,73 @@
+from locations.serializers import *
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+# utilities
+
+from utilities.census_fingerprints import diff_census_vintages
+from utilities.census_interpolation import interpolate_census_values
+
+# logging
+
+import logging
+
+logger = logging.getLogger("django")
+
+
+# Create your views here.
+class Census_Interpolation(APIView):
+    """
+    Reallocate values keyed by source GEOIDs onto another census unit type
+
+    POST {"source_type": "vtd", "target_type": "cd", "year": 2020, "weight": "area",
+          "values": {"060014001001": 1250.0, ...}}
+
+    Uses the precomputed crosswalk weights (manage.py build_crosswalk); no geometry
+    is touched per request.
+    """
+
+    def post(self, request, format=None):
+        serializer = Census_Interpolation_Request_Serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        try:
+            result = interpolate_census_values(
+                params["values"],
+                params["source_type"],
+                params["target_type"],
+                params["year"],
+                params["weight"],
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(result)
+
+
+class Census_Vintage_Diff(APIView):
+    """
+    GEOIDs added, removed and changed between two vintages of a unit type
+
+    GET ?unit=tract&from_year=2020&to_year=2021[&state=06]
+
+    Compares the stored geometry and attribute fingerprints, not the geometry,
+    and never writes: rows not yet fingerprinted are counted in
+    missing_fingerprints (backfill them with manage.py fingerprint_census).
+    """
+
+    def get(self, request, format=None):
+        serializer = Census_Vintage_Diff_Request_Serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        return Response(
+            diff_census_vintages(
+                params["unit"],
+                params["from_year"],
+                params["to_year"],
+                params.get("state"),
+            )
+        )
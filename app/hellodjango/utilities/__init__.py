@@ -3,4 +3,28 @@ from .dispatchers import *
 from .vector_data_utilities import *
 from .existing_file_hashes import *
 from .django_model_management import *
+from .geocoding_client import *
+from .geocode_cache import *
 from .geocoding import *
+from .census_boundary_index import *
+from .census_candidate_pruning import *
+from .bulk_census_assignment import *
+from .copy_utilities import *
+from .geopandas_census_assignment import *
+from .census_intersections import *
+from .census_crosswalks import *
+from .census_interpolation import *
+from .census_fingerprints import *
+from .census_geometry_storage import *
+from .sedona_spatial_joins import *
+from .block_crosswalk import *
+from .census_batch_geocoding import *
+from .address_normalization import *
+from .address_deduplication import *
+from .address_work_queue import *
+from .tiger_geocoder import *
+from .geocoding_orchestrator import *
+from .point_csv_importer import *
+from .gadm_resolution import *
+from .location_enrichment import *
+from .resource_tokens import *
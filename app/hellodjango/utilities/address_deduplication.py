@@ -0,0 +1,227 @@
+"""
+Address deduplication by fingerprint
+
+Rows of United_States_Address with the same address_fingerprint are one
+geocoding unit, and rows with the same fingerprint and the same point are one
+census assignment unit:
+- only a representative row (lowest id among the rows still to be processed)
+  is geocoded or spatially joined
+- its result is then fanned out to every other row of the unit with one
+  UPDATE ... FROM
+
+Rows with the same address but their own coordinates (imported lon/lat,
+partial addresses) are assigned on their own. Rows without address text have
+no fingerprint and are never grouped.
+
+External geocoding calls and spatial joins therefore scale with distinct
+addresses rather than rows.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+
+from locations.models import United_States_Address
+
+logger = logging.getLogger(__name__)
+
+# Fingerprint that earlier versions gave every row without address text
+# (the hash of the empty components); such rows are re-fingerprinted to None
+EMPTY_ADDRESS_FINGERPRINT = hashlib.sha1("||||".encode("utf-8")).hexdigest()
+
+NORMALIZED_FIELDS = [
+    "primary_number",
+    "street_name",
+    "street_suffix",
+    "city_name",
+    "state_abbreviation",
+    "zip5",
+    "address_fingerprint",
+]
+
+
+def fingerprint_addresses(queryset=None, batch_size: int = 5000, refresh: bool = False) -> int:
+    """
+    Normalize addresses and store their fingerprints
+
+    Args:
+        queryset: Addresses to process (default: all)
+        batch_size: Rows per bulk_update
+        refresh: Recompute rows that already have a fingerprint (rows carrying
+            the empty-address fingerprint are always recomputed)
+
+    Returns:
+        Number of rows updated
+    """
+    queryset = queryset if queryset is not None else United_States_Address.objects.all()
+    if not refresh:
+        queryset = queryset.filter(
+            Q(address_fingerprint__isnull=True) | Q(address_fingerprint=EMPTY_ADDRESS_FINGERPRINT)
+        )
+
+    queryset = queryset.only("id", *NORMALIZED_FIELDS).order_by("id")
+
+    updated = 0
+    pending = []
+    for address in queryset.iterator(chunk_size=batch_size):
+        address.normalize()
+        pending.append(address)
+
+        if len(pending) >= batch_size:
+            United_States_Address.objects.bulk_update(pending, NORMALIZED_FIELDS)
+            updated += len(pending)
+            pending = []
+
+    if pending:
+        United_States_Address.objects.bulk_update(pending, NORMALIZED_FIELDS)
+        updated += len(pending)
+
+    logger.info(f"Fingerprinted {updated} addresses")
+    return updated
+
+
+def geocoding_representatives(queryset):
+    """
+    Restrict ungeocoded addresses to one row per fingerprint (the lowest id)
+
+    Rows without a fingerprint are always kept.
+    """
+    twin_with_lower_id = United_States_Address.objects.filter(
+        address_fingerprint=OuterRef("address_fingerprint"),
+        geocoded=False,
+        id__lt=OuterRef("id"),
+    )
+    return queryset.filter(geocoded=False).exclude(Exists(twin_with_lower_id))
+
+
+def _fingerprint_clause(fingerprints: Optional[Iterable[str]]) -> str:
+    """Optional restriction to a set of fingerprints (bound as %(fingerprints)s)"""
+    return "AND address_fingerprint = ANY(%(fingerprints)s)" if fingerprints is not None else ""
+
+
+def fan_out_geocodes(fingerprints: Optional[Iterable[str]] = None) -> int:
+    """
+    Copy coordinates from a geocoded row to every ungeocoded row with the same fingerprint
+
+    Args:
+        fingerprints: Only fan out these fingerprints (default: all)
+
+    Returns:
+        Number of rows updated
+    """
+    table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    params = {"fingerprints": list(fingerprints) if fingerprints is not None else None}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} AS a
+            SET geom = g.geom,
+                latitude = g.latitude,
+                longitude = g.longitude,
+                geocoded = true,
+                geocode_quality = g.geocode_quality,
+                geocode_source = g.geocode_source,
+                geocoded_at = g.geocoded_at
+            FROM (
+                SELECT DISTINCT ON (address_fingerprint)
+                       address_fingerprint, geom, latitude, longitude,
+                       geocode_quality, geocode_source, geocoded_at
+                FROM {table}
+                WHERE geocoded AND address_fingerprint IS NOT NULL
+                  {_fingerprint_clause(fingerprints)}
+                ORDER BY address_fingerprint, geocoded_at DESC NULLS LAST, id
+            ) AS g
+            WHERE a.address_fingerprint = g.address_fingerprint
+              AND NOT a.geocoded
+            """,
+            params,
+        )
+        updated = cursor.rowcount
+
+    logger.info(f"Fanned out geocodes to {updated} duplicate addresses")
+    return updated
+
+
+def assignment_representative_clause(alias: str = "a") -> str:
+    """
+    SQL condition keeping one row per (fingerprint, point) among geocoded rows of a census year
+
+    The representative is the lowest id; used by the set-based census assignment
+    so spatial joins only run once per distinct address. A twin at another point
+    does not stand in for the row: it may lie in other units.
+    """
+    table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    return f"""
+          AND NOT EXISTS (
+              SELECT 1 FROM {table} AS twin
+              WHERE twin.address_fingerprint = {alias}.address_fingerprint
+                AND twin.census_year = {alias}.census_year
+                AND twin.geocoded
+                AND twin.geom = {alias}.geom
+                AND twin.id < {alias}.id
+          )
+    """
+
+
+def fan_out_census_units(year: int, fingerprints: Optional[Iterable[str]] = None) -> int:
+    """
+    Copy census units from each (fingerprint, point) representative to its duplicates
+
+    Duplicates at another point than the representative are left alone; they
+    were spatially joined themselves.
+
+    Args:
+        year: Census year
+        fingerprints: Only fan out these fingerprints (default: all)
+
+    Returns:
+        Number of rows updated
+    """
+    table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    unit_fields = United_States_Address.CENSUS_UNIT_FIELDS + ["census_units_assigned_at"]
+    assignments = ", ".join(f"{field} = r.{field}" for field in unit_fields)
+    columns = ", ".join(unit_fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} AS a
+            SET {assignments}
+            FROM (
+                SELECT DISTINCT ON (address_fingerprint, geom) id, address_fingerprint, geom, {columns}
+                FROM {table}
+                WHERE census_year = %(year)s
+                  AND geocoded
+                  AND geom IS NOT NULL
+                  AND address_fingerprint IS NOT NULL
+                  {_fingerprint_clause(fingerprints)}
+                ORDER BY address_fingerprint, geom, id
+            ) AS r
+            WHERE a.address_fingerprint = r.address_fingerprint
+              AND a.geom = r.geom
+              AND a.census_year = %(year)s
+              AND a.geocoded
+              AND a.id <> r.id
+            """,
+            {"year": year, "fingerprints": list(fingerprints) if fingerprints is not None else None},
+        )
+        updated = cursor.rowcount
+
+    logger.info(f"Fanned out {year} census units to {updated} duplicate addresses")
+    return updated
+
+
+def duplication_stats(queryset=None) -> Dict[str, Optional[float]]:
+    """Row count, distinct fingerprints and duplication ratio"""
+    from django.db.models import Count
+
+    queryset = queryset if queryset is not None else United_States_Address.objects.all()
+    stats = queryset.aggregate(
+        rows=Count("id"), distinct=Count("address_fingerprint", distinct=True)
+    )
+    stats["ratio"] = round(stats["rows"] / stats["distinct"], 2) if stats["distinct"] else None
+    return stats
@@ -0,0 +1,227 @@
+"""
+US street address normalization
+
+Canonicalizes street names the way TIGER and USPS Publication 28 spell them
+(upper case, standard suffix and directional abbreviations), so addresses can
+be matched against TIGER address ranges and compared with each other.
+
+address_fingerprint() hashes the canonical fields; rows with equal fingerprints
+are the same address and only need to be geocoded and assigned once
+(see utilities/address_deduplication.py).
+"""
+
+import hashlib
+import re
+from typing import Dict, Optional
+
+# USPS Publication 28, Appendix C1 (common street suffixes)
+STREET_SUFFIX_ABBREVIATIONS = {
+    "ALLEY": "ALY",
+    "ANNEX": "ANX",
+    "AVENUE": "AVE",
+    "AV": "AVE",
+    "AVEN": "AVE",
+    "BOULEVARD": "BLVD",
+    "BOUL": "BLVD",
+    "BRIDGE": "BRG",
+    "BYPASS": "BYP",
+    "CAUSEWAY": "CSWY",
+    "CENTER": "CTR",
+    "CIRCLE": "CIR",
+    "CIRCL": "CIR",
+    "COURT": "CT",
+    "COVE": "CV",
+    "CREEK": "CRK",
+    "CRESCENT": "CRES",
+    "CROSSING": "XING",
+    "DRIVE": "DR",
+    "DRIV": "DR",
+    "EXPRESSWAY": "EXPY",
+    "EXTENSION": "EXT",
+    "FREEWAY": "FWY",
+    "GARDENS": "GDNS",
+    "HEIGHTS": "HTS",
+    "HIGHWAY": "HWY",
+    "HIWAY": "HWY",
+    "HILL": "HL",
+    "HOLLOW": "HOLW",
+    "JUNCTION": "JCT",
+    "LANE": "LN",
+    "LOOP": "LOOP",
+    "MOTORWAY": "MTWY",
+    "MOUNTAIN": "MTN",
+    "PARKWAY": "PKWY",
+    "PKY": "PKWY",
+    "PLACE": "PL",
+    "PLAZA": "PLZ",
+    "POINT": "PT",
+    "RIDGE": "RDG",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "SQUARE": "SQ",
+    "STREET": "ST",
+    "STR": "ST",
+    "TERRACE": "TER",
+    "TRAIL": "TRL",
+    "TURNPIKE": "TPKE",
+    "VALLEY": "VLY",
+    "VIEW": "VW",
+    "WAY": "WAY",
+}
+
+DIRECTIONAL_ABBREVIATIONS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+
+STATE_FIPS = {
+    "AL": "01", "AK": "02", "AZ": "04", "AR": "05", "CA": "06", "CO": "08",
+    "CT": "09", "DE": "10", "FL": "12", "GA": "13", "HI": "15", "ID": "16",
+    "IL": "17", "IN": "18", "IA": "19", "KS": "20", "KY": "21", "LA": "22",
+    "ME": "23", "MD": "24", "MA": "25", "MI": "26", "MN": "27", "MS": "28",
+    "MO": "29", "MT": "30", "NE": "31", "NV": "32", "NH": "33", "NJ": "34",
+    "NM": "35", "NY": "36", "NC": "37", "ND": "38", "OH": "39", "OK": "40",
+    "OR": "41", "PA": "42", "RI": "44", "SC": "45", "SD": "46", "TN": "47",
+    "TX": "48", "UT": "49", "VT": "50", "VA": "51", "WA": "53", "WV": "54",
+    "WI": "55", "WY": "56", "DC": "11", "PR": "72",
+}
+
+# Full state names, as written in address files, to USPS codes
+STATE_ABBREVIATIONS = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR",
+    "CALIFORNIA": "CA", "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE",
+    "DISTRICT OF COLUMBIA": "DC", "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI",
+    "IDAHO": "ID", "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA",
+    "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME",
+    "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE",
+    "NEVADA": "NV", "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM",
+    "NEW YORK": "NY", "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH",
+    "OKLAHOMA": "OK", "OREGON": "OR", "PENNSYLVANIA": "PA", "PUERTO RICO": "PR",
+    "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD", "TENNESSEE": "TN",
+    "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+}
+
+
+def clean_address_text(value: Optional[str]) -> str:
+    """Upper case, punctuation to spaces (keeping '#', '/', '-'), whitespace collapsed"""
+    if not value:
+        return ""
+    value = re.sub(r"[^\w\s#/-]", " ", str(value).upper())
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def normalize_street_name(street_name: Optional[str], street_suffix: Optional[str] = None) -> str:
+    """
+    Canonical street name, e.g. ('North Main', 'Street') -> 'N MAIN ST'
+
+    Directionals are abbreviated when they lead or trail the name, suffixes when
+    they are the last word that is not a directional. Matches TIGER FULLNAME spelling.
+    """
+    words = clean_address_text(" ".join(part for part in [street_name, street_suffix] if part)).split()
+    if not words:
+        return ""
+
+    if words[0] in DIRECTIONAL_ABBREVIATIONS and len(words) > 1:
+        words[0] = DIRECTIONAL_ABBREVIATIONS[words[0]]
+    if words[-1] in DIRECTIONAL_ABBREVIATIONS and len(words) > 1:
+        words[-1] = DIRECTIONAL_ABBREVIATIONS[words[-1]]
+
+    suffix_index = len(words) - 1
+    if words[suffix_index] in DIRECTIONAL_ABBREVIATIONS.values() and suffix_index > 0:
+        suffix_index -= 1
+    if suffix_index > 0 and words[suffix_index] in STREET_SUFFIX_ABBREVIATIONS:
+        words[suffix_index] = STREET_SUFFIX_ABBREVIATIONS[words[suffix_index]]
+
+    return " ".join(words)
+
+
+def parse_house_number(primary_number: Optional[str]) -> Optional[int]:
+    """
+    Numeric part of a house number, e.g. '123', '123A', '123-1/2' -> 123
+
+    Returns None when the number has no leading digits (TIGER ranges are numeric).
+    """
+    if not primary_number:
+        return None
+    match = re.match(r"\s*(\d+)", str(primary_number))
+    return int(match.group(1)) if match else None
+
+
+def normalize_state(state: Optional[str]) -> str:
+    """
+    USPS code of a state code or full name, e.g. 'New York' -> 'NY'
+
+    Unrecognised values are returned cleaned but otherwise unchanged (never
+    truncated, which would turn 'New Jersey' into Nebraska).
+    """
+    state = clean_address_text(state)
+    return STATE_ABBREVIATIONS.get(state, state)
+
+
+def state_fips_for(state_abbreviation: Optional[str]) -> Optional[str]:
+    """State FIPS code for a USPS state abbreviation or full state name"""
+    return STATE_FIPS.get(normalize_state(state_abbreviation)) if state_abbreviation else None
+
+
+def normalize_street_suffix(street_suffix: Optional[str]) -> str:
+    """Standard USPS abbreviation of a street suffix, e.g. 'Avenue' -> 'AVE'"""
+    suffix = clean_address_text(street_suffix)
+    return STREET_SUFFIX_ABBREVIATIONS.get(suffix, suffix)
+
+
+def normalize_zip5(zip_code: Optional[str]) -> str:
+    """First five digits of a ZIP or ZIP+4, '' when there are fewer than five"""
+    digits = re.sub(r"\D", "", str(zip_code or ""))
+    return digits[:5] if len(digits) >= 5 else ""
+
+
+def normalize_address_fields(
+    primary_number: Optional[str] = None,
+    street_name: Optional[str] = None,
+    street_suffix: Optional[str] = None,
+    city_name: Optional[str] = None,
+    state_abbreviation: Optional[str] = None,
+    zip5: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Canonical address components ('' for missing values)
+
+    street_name is normalized on its own and street_suffix is abbreviated, so the
+    two can still be stored separately; full_street is the combined TIGER spelling.
+    """
+    return {
+        "primary_number": clean_address_text(primary_number),
+        "street_name": normalize_street_name(street_name),
+        "street_suffix": normalize_street_suffix(street_suffix),
+        "full_street": normalize_street_name(street_name, street_suffix),
+        "city_name": clean_address_text(city_name),
+        "state_abbreviation": normalize_state(state_abbreviation),
+        "zip5": normalize_zip5(zip5),
+    }
+
+
+FINGERPRINT_FIELDS = ["primary_number", "full_street", "city_name", "state_abbreviation", "zip5"]
+
+
+def address_fingerprint(fields: Dict[str, str]) -> Optional[str]:
+    """
+    SHA-1 of the canonical number, street, city, state and ZIP
+
+    Returns None when every component is empty: coordinate-only rows have no
+    address to share, so they must not all fall into one fingerprint.
+
+    Args:
+        fields: Output of normalize_address_fields
+    """
+    values = [fields[name] for name in FINGERPRINT_FIELDS]
+    if not any(values):
+        return None
+    return hashlib.sha1("|".join(values).encode("utf-8")).hexdigest()
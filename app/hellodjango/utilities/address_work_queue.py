@@ -0,0 +1,240 @@
+"""
+Database-backed work queue for address geocoding and census assignment
+
+Instead of a caller enumerating ids into a Celery group, N identical workers
+each loop:
+1. claim the next chunk of pending rows with SELECT ... FOR UPDATE SKIP LOCKED
+   (rows locked by another worker are skipped, never waited on)
+2. process the chunk
+3. commit, which releases the locks
+
+A worker that dies mid-chunk rolls back, so its rows become claimable again.
+There is no coordinator; scaling out means starting more workers, and a
+stopped run resumes where it left off.
+
+Queues:
+- geocode: geocoded=False and no earlier no-match attempt (geocode_attempted_at)
+- assign:  geocoded rows of a census year with census_units_assigned_at NULL
+
+Both claim one row per address fingerprint; results are fanned out to the
+duplicates in the same transaction. Partial indexes on United_States_Address
+keep the claim query to the pending rows.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from locations.models import United_States_Address
+
+from .address_deduplication import (
+    assignment_representative_clause,
+    fan_out_census_units,
+    fan_out_geocodes,
+)
+from .bulk_census_assignment import assign_census_units_for_ids
+
+logger = logging.getLogger(__name__)
+
+WORK_QUEUES = ["geocode", "assign"]
+
+
+def _claim_sql(queue: str) -> str:
+    """Claim query for a queue (must run inside a transaction)"""
+    table = connection.ops.quote_name(United_States_Address._meta.db_table)
+
+    if queue == "geocode":
+        # Skip rows whose fingerprint has an earlier pending twin: the twin's
+        # result is fanned out to them
+        where = f"""
+            NOT a.geocoded
+            AND a.geocode_attempted_at IS NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM {table} AS twin
+                WHERE twin.address_fingerprint = a.address_fingerprint
+                  AND twin.id < a.id
+                  AND NOT twin.geocoded
+                  AND twin.geocode_attempted_at IS NULL
+            )
+        """
+    elif queue == "assign":
+        where = f"""
+            a.census_year = %(year)s
+            AND a.geocoded
+            AND a.geom IS NOT NULL
+            AND a.census_units_assigned_at IS NULL
+            {assignment_representative_clause("a")}
+        """
+    else:
+        raise ValueError(f"Unknown work queue: {queue}")
+
+    return f"""
+        SELECT a.id FROM {table} AS a
+        WHERE {where}
+        ORDER BY a.id
+        LIMIT %(limit)s
+        FOR UPDATE OF a SKIP LOCKED
+    """
+
+
+def claim_pending_ids(queue: str, chunk_size: int, year: Optional[int] = None) -> List[int]:
+    """
+    Lock and return up to chunk_size pending ids
+
+    Must be called inside transaction.atomic(); the locks are held until it commits.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_claim_sql(queue), {"limit": chunk_size, "year": year})
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _chunk_fingerprints(ids: List[int]) -> List[str]:
+    return list(
+        United_States_Address.objects.filter(id__in=ids, address_fingerprint__isnull=False)
+        .values_list("address_fingerprint", flat=True)
+        .distinct()
+    )
+
+
+def _geocode_claimed(ids: List[int], source: str) -> Dict[str, int]:
+    """Geocode claimed rows, fan out matches and mark no-matches as attempted"""
+    from .census_batch_geocoding import geocode_census_batch, ungeocoded_addresses
+    from .tiger_geocoder import geocode_addresses_tiger
+
+    addresses = ungeocoded_addresses().filter(id__in=ids)
+
+    if source == "census_batch":
+        counts = geocode_census_batch(addresses)
+    elif source == "tiger_local":
+        counts = geocode_addresses_tiger(addresses)
+    else:
+        raise ValueError(f"Unknown work queue geocode source: {source}")
+
+    fingerprints = _chunk_fingerprints(ids)
+    counts["fanned_out"] = fan_out_geocodes(fingerprints)
+
+    # No-matches (and their still-pending twins) are not claimed again
+    counts["attempted"] = (
+        United_States_Address.objects.filter(geocoded=False, geocode_attempted_at__isnull=True)
+        .filter(id__in=ids)
+        .update(geocode_attempted_at=timezone.now())
+    )
+    if fingerprints:
+        counts["attempted"] += United_States_Address.objects.filter(
+            geocoded=False, geocode_attempted_at__isnull=True, address_fingerprint__in=fingerprints
+        ).update(geocode_attempted_at=timezone.now())
+
+    return counts
+
+
+def _assign_claimed(ids: List[int], year: int, block_first: bool) -> Dict[str, int]:
+    """Assign census units to claimed rows and fan them out to duplicates"""
+    counts = assign_census_units_for_ids(year, ids, block_first=block_first)
+    counts["fanned_out"] = fan_out_census_units(year, _chunk_fingerprints(ids))
+    return counts
+
+
+def process_next_chunk(
+    queue: str,
+    chunk_size: int,
+    year: Optional[int] = None,
+    source: str = "census_batch",
+    block_first: bool = False,
+) -> Dict[str, int]:
+    """
+    Claim, process and commit one chunk
+
+    Returns:
+        dict with 'claimed' (0 when the queue is empty) plus the processing counts
+    """
+    with transaction.atomic():
+        ids = claim_pending_ids(queue, chunk_size, year)
+        if not ids:
+            return {"claimed": 0}
+
+        if queue == "geocode":
+            counts = _geocode_claimed(ids, source)
+        else:
+            counts = _assign_claimed(ids, year, block_first)
+
+    return {"claimed": len(ids), **counts}
+
+
+def run_work_queue(
+    queue: str,
+    year: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+    source: str = "census_batch",
+    block_first: bool = False,
+) -> Dict[str, float]:
+    """
+    Process chunks until the queue is empty (or max_chunks is reached)
+
+    Safe to run in any number of processes at once.
+
+    Args:
+        queue: 'geocode' or 'assign'
+        year: Census year (required for 'assign')
+        chunk_size: Rows per claim (default: settings.ADDRESS_WORK_QUEUE_CHUNK_SIZE)
+        max_chunks: Stop after this many chunks
+        source: Geocoder for 'geocode': 'census_batch' or 'tiger_local'
+        block_first: Derive nested units from the block GEOID for 'assign'
+
+    Returns:
+        dict with chunks and rows processed and elapsed seconds
+    """
+    if queue not in WORK_QUEUES:
+        raise ValueError(f"Unknown work queue: {queue}")
+    if queue == "assign" and year is None:
+        raise ValueError("The assign queue needs a census year")
+
+    chunk_size = chunk_size or settings.ADDRESS_WORK_QUEUE_CHUNK_SIZE
+    if queue == "geocode" and source == "census_batch":
+        chunk_size = min(chunk_size, settings.CENSUS_GEOCODER_BATCH_SIZE)
+
+    start_time = time.time()
+
+    # Catch up duplicates whose representative finished before they were loaded
+    if queue == "geocode":
+        fan_out_geocodes()
+    else:
+        fan_out_census_units(year)
+
+    chunks = 0
+    rows = 0
+    while max_chunks is None or chunks < max_chunks:
+        counts = process_next_chunk(queue, chunk_size, year, source, block_first)
+        if not counts["claimed"]:
+            break
+
+        chunks += 1
+        rows += counts["claimed"]
+        logger.info(f"Work queue {queue}: chunk of {counts['claimed']} rows done ({counts})")
+
+    elapsed = time.time() - start_time
+    return {
+        "queue": queue,
+        "chunks": chunks,
+        "rows": rows,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / max(elapsed, 1e-6), 1),
+    }
+
+
+def pending_counts(year: Optional[int] = None) -> Dict[str, int]:
+    """Rows still pending in each queue (assign only when year is given)"""
+    counts = {
+        "geocode": United_States_Address.objects.filter(
+            geocoded=False, geocode_attempted_at__isnull=True
+        ).count()
+    }
+    if year is not None:
+        counts["assign"] = United_States_Address.objects.filter(
+            census_year=year, geocoded=True, geom__isnull=False, census_units_assigned_at__isnull=True
+        ).count()
+    return counts
@@ -0,0 +1,183 @@
+"""
+Block-to-district crosswalk builder
+
+Fills United_States_Census_Block_Crosswalk one state at a time: each block is
+reduced to ST_PointOnSurface (guaranteed inside the block, unlike the centroid)
+and matched to every district type in BLOCK_CROSSWALK_DISTRICT_DISPATCHER with a
+LATERAL point-in-polygon probe. States are independent, so they can be built in
+parallel (see locations.tasks.build_block_crosswalk_all).
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connection, transaction
+
+from locations.models import (
+    United_States_Census_Block_Crosswalk,
+    United_States_Census_Tabulation_Block,
+)
+
+from .dispatchers import BLOCK_CROSSWALK_DISTRICT_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+
+def _district_lateral_sql(district_type: str) -> str:
+    """
+    Build the LATERAL subquery that finds the district containing a block's point
+    """
+    config = BLOCK_CROSSWALK_DISTRICT_DISPATCHER[district_type]
+    model = config["model"]
+    quote = connection.ops.quote_name
+
+    scope_clause = "".join(
+        f" AND d.{quote(district_field)} = b.{quote(block_field)}"
+        for block_field, district_field in config["scope"]
+    )
+
+    return f"""
+        LEFT JOIN LATERAL (
+            SELECT d.{quote(config['geoid_field'])} AS geoid
+            FROM {quote(model._meta.db_table)} AS d
+            WHERE d.year = %(year)s
+              AND ST_Contains(d.geom, b.point)
+              {scope_clause}
+            LIMIT 1
+        ) AS {district_type} ON true
+    """
+
+
+def _crosswalk_insert_sql(district_types: List[str], upsert: bool = False) -> str:
+    """
+    Build the INSERT ... SELECT that crosswalks every block of one state
+
+    With upsert, existing rows only have the requested district columns replaced.
+    """
+    quote = connection.ops.quote_name
+    block_table = quote(United_States_Census_Tabulation_Block._meta.db_table)
+    crosswalk_table = quote(United_States_Census_Block_Crosswalk._meta.db_table)
+
+    district_columns = [
+        BLOCK_CROSSWALK_DISTRICT_DISPATCHER[district_type]["crosswalk_field"]
+        for district_type in district_types
+    ]
+    insert_columns = ", ".join(
+        quote(column) for column in ["block_geoid", "statefp", "year", "block_year"]
+        + district_columns + ["computed_at"]
+    )
+    select_columns = ", ".join(
+        f"{district_type}.geoid" for district_type in district_types
+    )
+    laterals = "".join(
+        _district_lateral_sql(district_type) for district_type in district_types
+    )
+    on_conflict = ""
+    if upsert:
+        updates = ", ".join(
+            f"{quote(column)} = EXCLUDED.{quote(column)}"
+            for column in district_columns + ["block_year", "computed_at"]
+        )
+        on_conflict = f"ON CONFLICT (block_geoid, year) DO UPDATE SET {updates}"
+
+    return f"""
+        INSERT INTO {crosswalk_table} ({insert_columns})
+        SELECT b.geoid20, b.statefp20, %(year)s, %(block_year)s, {select_columns}, now()
+        FROM (
+            SELECT geoid20, statefp20, countyfp20, ST_PointOnSurface(geom) AS point
+            FROM {block_table}
+            WHERE year = %(block_year)s
+              AND statefp20 = %(statefp)s
+        ) AS b
+        {laterals}
+        {on_conflict}
+    """
+
+
+def build_block_crosswalk_for_state(
+    year: int,
+    statefp: str,
+    block_year: Optional[int] = None,
+    district_types: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Rebuild the crosswalk rows of one state
+
+    Existing rows for (year, statefp) are replaced in the same transaction. When
+    only some district types are given, rows are updated in place instead, so
+    the other district columns keep their values.
+
+    Args:
+        year: District boundary year
+        statefp: 2-digit state FIPS code
+        block_year: Tabulation block year (default: year)
+        district_types: Keys of BLOCK_CROSSWALK_DISTRICT_DISPATCHER (default: all)
+
+    Returns:
+        Number of blocks written
+    """
+    block_year = block_year or year
+    district_types = list(district_types or BLOCK_CROSSWALK_DISTRICT_DISPATCHER.keys())
+    partial = set(district_types) != set(BLOCK_CROSSWALK_DISTRICT_DISPATCHER)
+    params = {"year": year, "block_year": block_year, "statefp": statefp}
+
+    with transaction.atomic():
+        if not partial:
+            United_States_Census_Block_Crosswalk.objects.filter(
+                year=year, statefp=statefp
+            ).delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(_crosswalk_insert_sql(district_types, upsert=partial), params)
+            return cursor.rowcount
+
+
+def get_block_states(block_year: int) -> List[str]:
+    """Return the state FIPS codes that have blocks loaded for a year"""
+    return list(
+        United_States_Census_Tabulation_Block.objects.filter(year=block_year)
+        .values_list("statefp20", flat=True)
+        .distinct()
+        .order_by("statefp20")
+    )
+
+
+def build_block_crosswalk(
+    year: int,
+    block_year: Optional[int] = None,
+    state_fips: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """
+    Build the crosswalk for several states in this process, one after another
+
+    Args:
+        year: District boundary year
+        block_year: Tabulation block year (default: year)
+        state_fips: State FIPS codes (default: every state with blocks loaded)
+
+    Returns:
+        dict with blocks written, states built and elapsed seconds
+    """
+    start_time = time.time()
+    block_year = block_year or year
+    state_fips = list(state_fips or get_block_states(block_year))
+
+    total_blocks = 0
+    for statefp in state_fips:
+        state_time = time.time()
+        blocks = build_block_crosswalk_for_state(year, statefp, block_year)
+        total_blocks += blocks
+        logger.info(
+            f"Built block crosswalk for state {statefp} ({year}): "
+            f"{blocks} blocks in {time.time() - state_time:.2f}s"
+        )
+
+    elapsed = time.time() - start_time
+    return {
+        "year": year,
+        "block_year": block_year,
+        "blocks": total_blocks,
+        "states": len(state_fips),
+        "elapsed_seconds": round(elapsed, 2),
+    }
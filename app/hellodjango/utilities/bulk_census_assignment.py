@@ -0,0 +1,377 @@
+"""
+Set-based census unit assignment
+
+Assigns census units to geocoded United_States_Address rows with one
+UPDATE ... FROM spatial join per unit type, over id-range chunks.
+Throughput is bounded by PostGIS join speed rather than Celery task dispatch.
+
+With block_first=True only the block join runs for the nested levels: state,
+county, tract and block group GEOIDs are prefixes of the block GEOID and are
+filled in with one substring UPDATE, and VTD/CD are copied from the block
+crosswalk (United_States_Census_Block_Crosswalk) where it has been built.
+
+Spatial joins only run for one row per (address_fingerprint, point); the results are
+fanned out to the duplicates once every chunk is done.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from locations.models import United_States_Address, United_States_Census_Block_Crosswalk
+
+from .address_deduplication import assignment_representative_clause, fan_out_census_units
+from .dispatchers import CENSUS_UNIT_ASSIGNMENT_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+
+# Row selection for one chunk: a contiguous id range, or an explicit id list
+# (used by the work queue, utilities/address_work_queue.py)
+ID_RANGE_CLAUSE = "a.id BETWEEN %(start_id)s AND %(end_id)s"
+ID_LIST_CLAUSE = "a.id = ANY(%(ids)s)"
+
+
+# Units whose GEOID is a prefix of the block GEOID, with the prefix length
+BLOCK_GEOID_PREFIXES = {
+    "state": 2,
+    "county": 5,
+    "tract": 11,
+    "block_group": 12,
+}
+
+
+def _unit_update_sql(
+    unit_type: str, restrict_to_state: bool, extra_where: str = "", id_clause: str = ID_RANGE_CLAUSE
+) -> str:
+    """
+    Build the UPDATE ... FROM statement that assigns one unit type
+
+    Units below the state are restricted to the state already assigned to the
+    address, so the join only probes candidates inside one state. Duplicate
+    addresses (same fingerprint and point, higher id) are skipped.
+    """
+    config = CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]
+    model = config["model"]
+    quote = connection.ops.quote_name
+
+    unit_srid = model._meta.get_field("geom").srid
+    state_clause = ""
+    if restrict_to_state and unit_type != "state":
+        state_clause = f"AND u.{quote(config['statefp_field'])} = a.state_geoid"
+
+    return f"""
+        UPDATE {quote(United_States_Address._meta.db_table)} AS a
+        SET {quote(config['address_field'])} = u.{quote(config['geoid_field'])}
+        FROM {quote(model._meta.db_table)} AS u
+        WHERE {id_clause}
+          AND a.census_year = %(year)s
+          AND a.geocoded
+          AND a.geom IS NOT NULL
+          AND u.year = %(year)s
+          AND ST_Contains(u.geom, ST_Transform(a.geom, {unit_srid}))
+          {state_clause}
+          {assignment_representative_clause("a")}
+          {extra_where}
+    """
+
+
+def _reset_units_sql(unit_types: Iterable[str], id_clause: str = ID_RANGE_CLAUSE) -> str:
+    """
+    Build the UPDATE that clears the unit GEOIDs of a chunk before they are reassigned
+
+    Without it a re-run (e.g. after re-geocoding) keeps GEOIDs of units that no
+    longer contain the point, and a stale state_geoid restricts the sub-state
+    joins to the wrong state.
+    """
+    quote = connection.ops.quote_name
+    assignments = ", ".join(
+        f"{quote(CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]['address_field'])} = NULL"
+        for unit_type in unit_types
+    )
+
+    return f"""
+        UPDATE {quote(United_States_Address._meta.db_table)} AS a
+        SET {assignments}
+        WHERE {id_clause}
+          AND a.census_year = %(year)s
+          AND a.geocoded
+          AND a.geom IS NOT NULL
+    """
+
+
+def _derive_from_block_sql(unit_types: Iterable[str], id_clause: str = ID_RANGE_CLAUSE) -> str:
+    """
+    Build the UPDATE that slices nested unit GEOIDs out of the assigned block GEOID
+    """
+    quote = connection.ops.quote_name
+    assignments = ", ".join(
+        f"{quote(CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]['address_field'])} = "
+        f"left(a.block_geoid, {BLOCK_GEOID_PREFIXES[unit_type]})"
+        for unit_type in unit_types
+    )
+
+    return f"""
+        UPDATE {quote(United_States_Address._meta.db_table)} AS a
+        SET {assignments}
+        WHERE {id_clause}
+          AND a.census_year = %(year)s
+          AND a.geocoded
+          AND a.geom IS NOT NULL
+          AND a.block_geoid IS NOT NULL
+    """
+
+
+# Units copied from the block crosswalk, with the crosswalk column
+BLOCK_CROSSWALK_UNITS = {
+    "vtd": "vtd_geoid",
+    "cd": "cd_geoid",
+}
+
+
+def _crosswalk_update_sql(unit_types: Iterable[str], id_clause: str = ID_RANGE_CLAUSE) -> str:
+    """
+    Build the UPDATE that copies district GEOIDs from the block crosswalk
+    """
+    quote = connection.ops.quote_name
+    assignments = ", ".join(
+        f"{quote(CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]['address_field'])} = "
+        f"x.{quote(BLOCK_CROSSWALK_UNITS[unit_type])}"
+        for unit_type in unit_types
+    )
+
+    return f"""
+        UPDATE {quote(United_States_Address._meta.db_table)} AS a
+        SET {assignments}
+        FROM {quote(United_States_Census_Block_Crosswalk._meta.db_table)} AS x
+        WHERE {id_clause}
+          AND a.census_year = %(year)s
+          AND a.geocoded
+          AND a.geom IS NOT NULL
+          AND x.block_geoid = a.block_geoid
+          AND x.year = %(year)s
+    """
+
+
+def _not_in_crosswalk_clause() -> str:
+    """Restrict a spatial fallback join to rows the crosswalk could not serve"""
+    crosswalk_table = connection.ops.quote_name(
+        United_States_Census_Block_Crosswalk._meta.db_table
+    )
+    return f"""
+          AND NOT EXISTS (
+              SELECT 1 FROM {crosswalk_table} AS x
+              WHERE x.block_geoid = a.block_geoid AND x.year = %(year)s
+          )
+    """
+
+
+def _assign_census_units_chunk(
+    year: int,
+    params: Dict,
+    id_clause: str,
+    unit_types: Optional[Iterable[str]] = None,
+    block_first: bool = False,
+) -> Dict[str, int]:
+    """
+    Assign every requested unit type to the addresses selected by id_clause
+
+    Only rows with census_year == year and geocoded=True are touched. The
+    requested unit GEOIDs are cleared first, so units that no longer contain a
+    point are not kept. The chunk is committed as one transaction.
+
+    With block_first, nested units are derived from the block GEOID and VTD/CD are
+    read from the block crosswalk; spatial joins only run for addresses that no
+    block contains or whose block is missing from the crosswalk.
+
+    Returns:
+        Dict of unit type -> rows updated, plus 'addresses' (rows stamped as assigned)
+    """
+    unit_types = list(unit_types or CENSUS_UNIT_ASSIGNMENT_DISPATCHER.keys())
+    restrict_to_state = "state" in unit_types
+    params = {"year": year, **params}
+    counts = {}
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_reset_units_sql(unit_types, id_clause), params)
+
+        if block_first and "block" in unit_types:
+            derived = [u for u in unit_types if u in BLOCK_GEOID_PREFIXES]
+
+            cursor.execute(_unit_update_sql("block", restrict_to_state=False, id_clause=id_clause), params)
+            counts["block"] = cursor.rowcount
+
+            if derived:
+                cursor.execute(_derive_from_block_sql(derived, id_clause), params)
+                counts["derived_from_block"] = cursor.rowcount
+
+            for unit_type in derived:
+                cursor.execute(
+                    _unit_update_sql(
+                        unit_type, restrict_to_state, extra_where="AND a.block_geoid IS NULL",
+                        id_clause=id_clause
+                    ),
+                    params,
+                )
+                counts[unit_type] = cursor.rowcount
+
+            crosswalked = [u for u in unit_types if u in BLOCK_CROSSWALK_UNITS]
+            if crosswalked:
+                cursor.execute(_crosswalk_update_sql(crosswalked, id_clause), params)
+                counts["from_crosswalk"] = cursor.rowcount
+
+            for unit_type in crosswalked:
+                cursor.execute(
+                    _unit_update_sql(
+                        unit_type, restrict_to_state, extra_where=_not_in_crosswalk_clause(),
+                        id_clause=id_clause
+                    ),
+                    params,
+                )
+                counts[unit_type] = cursor.rowcount
+
+            unit_types = [
+                u for u in unit_types
+                if u not in derived and u not in crosswalked and u != "block"
+            ]
+
+        for unit_type in unit_types:
+            cursor.execute(_unit_update_sql(unit_type, restrict_to_state, id_clause=id_clause), params)
+            counts[unit_type] = cursor.rowcount
+
+        cursor.execute(
+            f"""
+            UPDATE {connection.ops.quote_name(United_States_Address._meta.db_table)} AS a
+            SET census_units_assigned_at = now()
+            WHERE {id_clause}
+              AND a.census_year = %(year)s
+              AND a.geocoded
+              AND a.geom IS NOT NULL
+            """,
+            params,
+        )
+        counts["addresses"] = cursor.rowcount
+
+    return counts
+
+
+def assign_census_units_for_id_range(
+    year: int,
+    start_id: int,
+    end_id: int,
+    unit_types: Optional[Iterable[str]] = None,
+    block_first: bool = False,
+) -> Dict[str, int]:
+    """
+    Assign every requested unit type to addresses with start_id <= id <= end_id
+
+    See _assign_census_units_chunk for what is touched and how.
+
+    Returns:
+        Dict of unit type -> rows updated, plus 'addresses' (rows stamped as assigned)
+    """
+    return _assign_census_units_chunk(
+        year, {"start_id": start_id, "end_id": end_id}, ID_RANGE_CLAUSE, unit_types, block_first
+    )
+
+
+def assign_census_units_for_ids(
+    year: int,
+    ids: Iterable[int],
+    unit_types: Optional[Iterable[str]] = None,
+    block_first: bool = False,
+) -> Dict[str, int]:
+    """
+    Assign every requested unit type to an explicit list of address ids
+
+    Returns:
+        Dict of unit type -> rows updated, plus 'addresses' (rows stamped as assigned)
+    """
+    return _assign_census_units_chunk(
+        year, {"ids": list(ids)}, ID_LIST_CLAUSE, unit_types, block_first
+    )
+
+
+def get_assignable_id_bounds(year: int):
+    """Return (min_id, max_id) of geocoded addresses for a census year"""
+    bounds = United_States_Address.objects.filter(
+        census_year=year, geocoded=True
+    ).aggregate(min_id=Min("id"), max_id=Max("id"))
+    return bounds["min_id"], bounds["max_id"]
+
+
+def iter_id_chunks(start_id: int, end_id: int, chunk_size: int):
+    """Yield inclusive (chunk_start, chunk_end) id ranges"""
+    for chunk_start in range(start_id, end_id + 1, chunk_size):
+        yield chunk_start, min(chunk_start + chunk_size - 1, end_id)
+
+
+def assign_census_units_bulk(
+    year: int,
+    chunk_size: int = 50000,
+    start_id: Optional[int] = None,
+    end_id: Optional[int] = None,
+    unit_types: Optional[Iterable[str]] = None,
+    block_first: bool = False,
+) -> Dict[str, float]:
+    """
+    Assign census units to all geocoded addresses of a census year, chunk by chunk
+
+    Args:
+        year: Census year (restricts both addresses and boundaries)
+        chunk_size: Number of ids per UPDATE chunk
+        start_id: First id to process (default: lowest geocoded id)
+        end_id: Last id to process (default: highest geocoded id)
+        unit_types: Keys of CENSUS_UNIT_ASSIGNMENT_DISPATCHER (default: all)
+        block_first: Derive nested units from the block GEOID
+
+    Returns:
+        dict with addresses assigned, chunk count, duplicates fanned out,
+        elapsed seconds and rows per second
+    """
+    start_time = time.time()
+
+    if start_id is None or end_id is None:
+        min_id, max_id = get_assignable_id_bounds(year)
+        start_id = min_id if start_id is None else start_id
+        end_id = max_id if end_id is None else end_id
+
+    total_addresses = 0
+    chunks = 0
+
+    if start_id is not None and end_id is not None:
+        for chunk_start, chunk_end in iter_id_chunks(start_id, end_id, chunk_size):
+            chunk_time = time.time()
+            counts = assign_census_units_for_id_range(
+                year, chunk_start, chunk_end, unit_types, block_first
+            )
+            chunks += 1
+            total_addresses += counts["addresses"]
+
+            chunk_elapsed = time.time() - chunk_time
+            logger.info(
+                f"Assigned census units for ids {chunk_start}-{chunk_end} ({year}): "
+                f"{counts['addresses']} addresses in {chunk_elapsed:.2f}s "
+                f"({counts['addresses'] / max(chunk_elapsed, 1e-6):.0f} rows/s)"
+            )
+
+    fanned_out = fan_out_census_units(year)
+
+    elapsed = time.time() - start_time
+    rows_per_second = total_addresses / max(elapsed, 1e-6)
+    logger.info(
+        f"Bulk census assignment ({year}) complete: {total_addresses} addresses, "
+        f"{chunks} chunks in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)"
+    )
+
+    return {
+        "year": year,
+        "addresses": total_addresses,
+        "chunks": chunks,
+        "fanned_out": fanned_out,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(rows_per_second, 1),
+    }
@@ -0,0 +1,349 @@
+"""
+Census batch geocoding
+
+Geocodes United_States_Address rows through the Census Bureau batch endpoint
+(locations/addressbatch): up to CENSUS_GEOCODER_BATCH_SIZE addresses are sent as
+one CSV file, the CSV response is parsed line by line as it streams back, and
+matches are written with one bulk_update per batch. Addresses already in the
+geocode cache are answered from it and never submitted; fresh results
+(including no-matches) are added to it.
+
+Request rows:   id, street, city, state, zip
+Response rows:  id, input address, Match|No_Match|Tie, Exact|Non_Exact,
+                matched address, "lon,lat", TIGER line id, side
+"""
+
+import csv
+import io
+import logging
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.utils import timezone
+
+from locations.models import United_States_Address
+
+from .address_deduplication import fan_out_geocodes, geocoding_representatives
+from .geocode_cache import (
+    cache_entry,
+    get_cached_geocodes,
+    normalize_address_key,
+    set_cached_geocodes,
+)
+from .geocoding import address_oneline
+from .geocoding_client import get_geocoding_client
+
+logger = logging.getLogger(__name__)
+
+# Census match type -> United_States_Address.geocode_quality
+CENSUS_MATCH_QUALITY = {
+    "Exact": "Interpolated",
+    "Non_Exact": "Approximate",
+}
+
+GEOCODED_FIELDS = [
+    "geom",
+    "latitude",
+    "longitude",
+    "geocoded",
+    "geocode_quality",
+    "geocode_source",
+    "geocoded_at",
+]
+
+
+def address_batch_row(address: United_States_Address) -> List[str]:
+    """Return the batch CSV row (id, street, city, state, zip) for an address"""
+    street = " ".join(
+        part
+        for part in [address.primary_number, address.street_name, address.street_suffix]
+        if part
+    )
+    return [
+        str(address.id),
+        street,
+        address.city_name or address.default_city_name or "",
+        address.state_abbreviation or "",
+        address.zip5 or "",
+    ]
+
+
+def build_batch_csv(addresses: Iterable[United_States_Address]) -> bytes:
+    """Serialize addresses into a headerless batch CSV file"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for address in addresses:
+        writer.writerow(address_batch_row(address))
+    return buffer.getvalue().encode("utf-8")
+
+
+def submit_census_batch(
+    batch_csv: bytes,
+    base_url: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> requests.Response:
+    """
+    POST one batch file and return the (streaming) response
+
+    By default the request goes through the shared Census client (pooled
+    connection, rate limit, retries on 429 / 5xx).
+
+    Args:
+        batch_csv: CSV produced by build_batch_csv
+        base_url: Geocoder base URL; when given, posts directly instead of via the client
+        session: Optional requests session to use with base_url
+    """
+    request_kwargs = {
+        "files": {"addressFile": ("addresses.csv", batch_csv, "text/csv")},
+        "data": {"benchmark": settings.CENSUS_GEOCODER_BENCHMARK},
+        "timeout": settings.CENSUS_GEOCODER_BATCH_TIMEOUT,
+        "stream": True,
+    }
+
+    if base_url is None and session is None:
+        return get_geocoding_client("census").post("locations/addressbatch", **request_kwargs)
+
+    base_url = (base_url or settings.CENSUS_GEOCODER_BASE_URL).rstrip("/")
+    http = session or requests
+
+    response = http.post(f"{base_url}/locations/addressbatch", **request_kwargs)
+    response.raise_for_status()
+    return response
+
+
+def parse_census_batch_response(lines: Iterable[str]) -> Iterator[Dict]:
+    """
+    Parse batch response lines into result dicts
+
+    Yields:
+        dict with id, status (Match, No_Match, Tie), match_type, geocode_quality,
+        matched_address, longitude and latitude (None unless matched)
+    """
+    for row in csv.reader(line for line in lines if line):
+        if not row or not row[0].strip().isdigit():
+            continue
+
+        result = {
+            "id": int(row[0]),
+            "status": row[2] if len(row) > 2 else "No_Match",
+            "match_type": None,
+            "geocode_quality": None,
+            "matched_address": None,
+            "longitude": None,
+            "latitude": None,
+        }
+
+        if result["status"] == "Match" and len(row) > 5 and row[5]:
+            longitude, latitude = row[5].split(",")
+            result["match_type"] = row[3]
+            result["geocode_quality"] = CENSUS_MATCH_QUALITY.get(row[3], "Approximate")
+            result["matched_address"] = row[4]
+            result["longitude"] = float(longitude)
+            result["latitude"] = float(latitude)
+
+        yield result
+
+
+def apply_census_batch_results(results: Iterable[Dict]) -> Dict[str, int]:
+    """
+    Write matched coordinates back with a single bulk_update
+
+    Returns:
+        dict with counts of matched, unmatched and tied rows
+    """
+    geocoded_at = timezone.now()
+    matched = []
+    counts = {"matched": 0, "no_match": 0, "tie": 0}
+
+    for result in results:
+        if result["longitude"] is None:
+            counts["tie" if result["status"] == "Tie" else "no_match"] += 1
+            continue
+
+        matched.append(
+            United_States_Address(
+                id=result["id"],
+                geom=Point(result["longitude"], result["latitude"], srid=4326),
+                latitude=result["latitude"],
+                longitude=result["longitude"],
+                geocoded=True,
+                geocode_quality=result["geocode_quality"],
+                geocode_source="Census",
+                geocoded_at=geocoded_at,
+            )
+        )
+
+    if matched:
+        United_States_Address.objects.bulk_update(matched, GEOCODED_FIELDS)
+    counts["matched"] = len(matched)
+
+    return counts
+
+
+def _cached_batch_result(address_id: int, entry: Dict) -> Dict:
+    """Shape a cache entry like a parsed batch response row"""
+    return {
+        "id": address_id,
+        "status": "Match" if entry["matched"] else "No_Match",
+        "match_type": None,
+        "geocode_quality": entry["geocode_quality"],
+        "matched_address": None,
+        "longitude": entry["longitude"],
+        "latitude": entry["latitude"],
+    }
+
+
+def _batch_cache_entry(result: Dict) -> Dict:
+    """Cache entry for a parsed batch response row"""
+    if result["longitude"] is None:
+        return cache_entry()
+    return cache_entry(
+        latitude=result["latitude"],
+        longitude=result["longitude"],
+        geocode_quality=result["geocode_quality"],
+        geocode_source="Census",
+    )
+
+
+def geocode_census_batch(
+    addresses: Iterable[United_States_Address],
+    base_url: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, int]:
+    """
+    Geocode one batch of addresses end to end (cache, build, submit, stream, apply)
+
+    Returns:
+        dict with submitted (addresses in the batch), requested (sent to the
+        provider), cached, matched, no_match and tie counts
+    """
+    addresses = list(addresses)
+    if not addresses:
+        return {"submitted": 0, "requested": 0, "cached": 0, "matched": 0, "no_match": 0, "tie": 0}
+
+    address_keys = {
+        address.id: normalize_address_key(address_oneline(address)) for address in addresses
+    }
+    cached = get_cached_geocodes(address_keys.values(), "census")
+
+    results = [
+        _cached_batch_result(address.id, cached[address_keys[address.id]])
+        for address in addresses
+        if address_keys[address.id] in cached
+    ]
+    to_request = [address for address in addresses if address_keys[address.id] not in cached]
+
+    if to_request:
+        response = submit_census_batch(build_batch_csv(to_request), base_url, session)
+        response.encoding = response.encoding or "utf-8"
+
+        try:
+            fresh = list(parse_census_batch_response(response.iter_lines(decode_unicode=True)))
+        finally:
+            response.close()
+
+        # Ties are left uncached; they may resolve with a better input address
+        set_cached_geocodes(
+            {
+                address_keys[result["id"]]: _batch_cache_entry(result)
+                for result in fresh
+                if result["status"] != "Tie" and result["id"] in address_keys
+            },
+            "census",
+        )
+        results.extend(fresh)
+
+    counts = apply_census_batch_results(results)
+    counts["submitted"] = len(addresses)
+    counts["requested"] = len(to_request)
+    counts["cached"] = len(addresses) - len(to_request)
+    return counts
+
+
+def ungeocoded_addresses():
+    """Queryset of addresses still waiting for coordinates"""
+    return United_States_Address.objects.filter(geocoded=False).only(
+        "id",
+        "primary_number",
+        "street_name",
+        "street_suffix",
+        "city_name",
+        "default_city_name",
+        "state_abbreviation",
+        "zip5",
+    )
+
+
+def iter_ungeocoded_id_batches(batch_size: int, limit: Optional[int] = None) -> Iterator[List[int]]:
+    """
+    Yield lists of ungeocoded address ids, keyset-paginated by id
+
+    Only one row per address fingerprint is yielded; run fan_out_geocodes()
+    afterwards to copy its coordinates to the duplicates.
+    """
+    last_id = 0
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        ids = list(
+            geocoding_representatives(
+                United_States_Address.objects.filter(geocoded=False, id__gt=last_id)
+            )
+            .order_by("id")
+            .values_list("id", flat=True)[:size]
+        )
+        if not ids:
+            return
+
+        yield ids
+        last_id = ids[-1]
+        if remaining is not None:
+            remaining -= len(ids)
+
+
+def geocode_ungeocoded_addresses(
+    batch_size: Optional[int] = None,
+    limit: Optional[int] = None,
+    base_url: Optional[str] = None,
+) -> Dict[str, float]:
+    """
+    Batch-geocode every ungeocoded address in this process, one batch after another
+
+    Returns:
+        dict with submitted/requested/cached/matched/no_match/tie totals,
+        batches, duplicates fanned out and elapsed seconds
+    """
+    start_time = time.time()
+    batch_size = min(
+        batch_size or settings.CENSUS_GEOCODER_BATCH_SIZE, settings.CENSUS_GEOCODER_BATCH_SIZE
+    )
+    totals = {
+        "submitted": 0, "requested": 0, "cached": 0, "matched": 0, "no_match": 0, "tie": 0,
+        "batches": 0,
+    }
+
+    # Duplicates of already geocoded addresses need no request at all
+    totals["fanned_out"] = fan_out_geocodes()
+
+    for ids in iter_ungeocoded_id_batches(batch_size, limit):
+        batch_time = time.time()
+        counts = geocode_census_batch(
+            ungeocoded_addresses().filter(id__in=ids).order_by("id"), base_url
+        )
+
+        for key in ["submitted", "requested", "cached", "matched", "no_match", "tie"]:
+            totals[key] += counts[key]
+        totals["batches"] += 1
+
+        logger.info(
+            f"Census batch geocoded ids {ids[0]}-{ids[-1]}: "
+            f"{counts['matched']}/{counts['submitted']} matched in {time.time() - batch_time:.2f}s"
+        )
+
+    totals["fanned_out"] += fan_out_geocodes()
+    totals["elapsed_seconds"] = round(time.time() - start_time, 2)
+    return totals
@@ -0,0 +1,172 @@
+"""
+In-process spatial index over census boundaries
+
+Resolves which census units contain a point without a database round trip.
+Each (unit, year) pair is loaded once into a shapely STRtree over prepared
+geometries and kept at module level, so every task in a worker process reuses it.
+
+Indexes listed in settings.CENSUS_BOUNDARY_INDEX_PRELOAD are built in the Celery
+parent process before the pool forks (see hellodjango/celery.py). Forked children
+then share those pages copy-on-write instead of each building their own copy.
+
+NOTE: TIGER geometries are NAD83 (4269) and addresses are WGS84 (4326). The datum
+shift is well below TIGER positional accuracy, so points are tested as-is.
+"""
+
+import gc
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import shapely
+from django.contrib.gis.db.models.functions import AsWKB
+from django.db import connections
+
+from .dispatchers import CENSUS_UNIT_ASSIGNMENT_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+_BOUNDARY_INDEXES: Dict[Tuple[str, int], "CensusBoundaryIndex"] = {}
+_BUILD_LOCK = threading.Lock()
+
+
+class CensusBoundaryIndex:
+    """
+    STRtree over every feature of one census unit type for one year
+    """
+
+    def __init__(self, unit_type: str, year: int):
+        if unit_type not in CENSUS_UNIT_ASSIGNMENT_DISPATCHER:
+            raise ValueError(f"Unknown census unit type: {unit_type}")
+
+        self.unit_type = unit_type
+        self.year = int(year)
+        self.geoids = np.empty(0, dtype=object)
+        self.geometries = np.empty(0, dtype=object)
+        self.tree = None
+
+    def __len__(self):
+        return len(self.geoids)
+
+    def build(self) -> "CensusBoundaryIndex":
+        """
+        Load geometries for this unit/year and build the tree
+
+        Geometries are pulled as WKB so no GEOS objects are created on the Django side.
+        """
+        start_time = time.time()
+        config = CENSUS_UNIT_ASSIGNMENT_DISPATCHER[self.unit_type]
+
+        rows = (
+            config["model"]
+            .objects.filter(year=self.year)
+            .annotate(wkb=AsWKB("geom"))
+            .values_list(config["geoid_field"], "wkb")
+            .iterator(chunk_size=5000)
+        )
+
+        geoids = []
+        wkbs = []
+        for geoid, wkb in rows:
+            geoids.append(geoid)
+            wkbs.append(bytes(wkb))
+
+        self.geoids = np.array(geoids, dtype=object)
+        self.geometries = shapely.from_wkb(wkbs) if wkbs else np.empty(0, dtype=object)
+
+        # Prepared geometries make the repeated contains() tests cheap
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Built {self.unit_type} {self.year} boundary index: {len(self)} features in {elapsed:.2f}s"
+        )
+        return self
+
+    def lookup(self, longitude: float, latitude: float) -> Optional[str]:
+        """
+        Return the GEOID of the feature containing the point, or None
+        """
+        if not len(self):
+            return None
+
+        point = shapely.Point(longitude, latitude)
+        candidates = np.sort(self.tree.query(point))
+
+        if not len(candidates):
+            return None
+
+        hits = candidates[shapely.contains(self.geometries[candidates], point)]
+        return self.geoids[hits[0]] if len(hits) else None
+
+
+def get_boundary_index(unit_type: str, year: int) -> CensusBoundaryIndex:
+    """
+    Return the index for (unit_type, year), building it on first use
+    """
+    key = (unit_type, int(year))
+    index = _BOUNDARY_INDEXES.get(key)
+
+    if index is None:
+        with _BUILD_LOCK:
+            index = _BOUNDARY_INDEXES.get(key)
+            if index is None:
+                index = CensusBoundaryIndex(unit_type, year).build()
+                _BOUNDARY_INDEXES[key] = index
+
+    return index
+
+
+def resolve_census_units(
+    longitude: float,
+    latitude: float,
+    year: int,
+    unit_types: Optional[Iterable[str]] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Resolve every census unit containing a point from the in-memory indexes
+
+    Args:
+        longitude: X coordinate (EPSG:4326)
+        latitude: Y coordinate (EPSG:4326)
+        year: Census year of the boundaries to use
+        unit_types: Keys of CENSUS_UNIT_ASSIGNMENT_DISPATCHER (default: all)
+
+    Returns:
+        Dict of address field name -> GEOID (None where no feature contains the point)
+    """
+    unit_types = unit_types or CENSUS_UNIT_ASSIGNMENT_DISPATCHER.keys()
+
+    return {
+        CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]["address_field"]: get_boundary_index(
+            unit_type, year
+        ).lookup(longitude, latitude)
+        for unit_type in unit_types
+    }
+
+
+def preload_boundary_indexes(unit_years: Iterable[Tuple[str, int]]):
+    """
+    Build indexes up front, then freeze them out of the garbage collector
+
+    Meant to run in a parent process right before it forks workers. gc.freeze()
+    keeps the collector from touching (and therefore copying) the shared pages.
+    """
+    for unit_type, year in unit_years:
+        try:
+            get_boundary_index(unit_type, year)
+        except Exception as e:
+            logger.error(f"Could not preload {unit_type} {year} boundary index: {e}")
+
+    # Do not hand an open database connection to forked children
+    connections.close_all()
+    gc.freeze()
+
+
+def clear_boundary_indexes():
+    """Drop every cached index (e.g. after reloading boundaries)"""
+    with _BUILD_LOCK:
+        _BOUNDARY_INDEXES.clear()
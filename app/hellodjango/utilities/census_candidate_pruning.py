@@ -0,0 +1,101 @@
+"""
+Attribute-guided candidate pruning for point-in-polygon lookups
+
+Addresses usually arrive with a state abbreviation, a ZIP code and sometimes a
+county FIPS code. These narrow the candidate polygons before any containment
+test:
+- state_abbreviation -> state FIPS
+- county_fips        -> county FIPS (3 or 5 digits)
+- zip5               -> ZCTA -> counties intersecting the ZCTA
+
+Hints only narrow the search; callers still verify containment spatially and
+fall back to an unrestricted search when the hinted candidates do not contain
+the point (wrong or stale attributes).
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .address_normalization import normalize_zip5, state_fips_for
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=50000)
+def counties_for_zcta(zip5: str, year: int) -> Tuple[str, ...]:
+    """
+    5-digit county GEOIDs of the counties intersecting a ZCTA (cached per process)
+
+    Returns an empty tuple when the ZCTA is not loaded for the year.
+    """
+    from locations.models import United_States_Census_County, United_States_Census_ZCTA
+
+    zcta = United_States_Census_ZCTA.objects.filter(geoid=zip5, year=year).only("geom").first()
+    if zcta is None:
+        return ()
+
+    return tuple(
+        United_States_Census_County.objects.filter(geom__intersects=zcta.geom, year=year)
+        .order_by("geoid")
+        .values_list("geoid", flat=True)
+    )
+
+
+def _county_geoids_from_fips(county_fips: Optional[str], statefp: Optional[str]) -> List[str]:
+    """5-digit county GEOIDs from a 5-digit code, or a 3-digit code plus the state"""
+    digits = "".join(character for character in str(county_fips or "") if character.isdigit())
+    if len(digits) == 5:
+        return [digits]
+    if len(digits) in (1, 2, 3) and statefp:
+        return [statefp + digits.zfill(3)]
+    return []
+
+
+def census_candidate_hints(address, year: int) -> Dict[str, Optional[object]]:
+    """
+    Candidate restrictions derived from an address's attributes
+
+    Returns:
+        dict with 'statefp' (str or None) and 'county_geoids' (list of 5-digit
+        county GEOIDs, empty when unknown)
+    """
+    statefp = state_fips_for(address.state_abbreviation)
+
+    county_geoids = _county_geoids_from_fips(address.county_fips, statefp)
+
+    if not county_geoids:
+        zip5 = normalize_zip5(address.zip5)
+        if zip5:
+            county_geoids = list(counties_for_zcta(zip5, year))
+
+    if statefp and county_geoids:
+        # A ZCTA can cross state lines; keep the counties of the hinted state
+        county_geoids = [geoid for geoid in county_geoids if geoid.startswith(statefp)]
+    elif county_geoids and not statefp and len({geoid[:2] for geoid in county_geoids}) == 1:
+        statefp = county_geoids[0][:2]
+
+    return {"statefp": statefp, "county_geoids": county_geoids}
+
+
+def first_containing(queryset, point, hint_filters: Optional[Dict] = None):
+    """
+    First feature of queryset containing point, trying the hinted candidates first
+
+    Args:
+        queryset: Boundaries already restricted by year and parent units
+        point: GEOS point
+        hint_filters: Extra filter kwargs from census_candidate_hints (may be empty)
+
+    Returns:
+        The containing feature or None
+    """
+    queryset = queryset.filter(geom__contains=point)
+
+    if hint_filters:
+        feature = queryset.filter(**hint_filters).first()
+        if feature is not None:
+            return feature
+        logger.debug(f"Attribute hints {hint_filters} missed; searching without them")
+
+    return queryset.first()
@@ -0,0 +1,606 @@
+"""
+Generic crosswalk engine for any pair of census unit types
+
+Builds United_States_Census_Unit_Crosswalk for a (source, target, year) from the
+CENSUS_CROSSWALK_UNITS registry, e.g. ZCTA x CD, Place x County, Tract x SLDU.
+
+Work is split into state tiles:
+- units with a state FIPS column are restricted to the tile's state
+- units that cross state lines (ZCTAs) are restricted to those intersecting the
+  state boundary; when neither side has a state column, overlaps are clipped to it
+
+Per tile, one INSERT ... SELECT computes the overlaps the same way as
+census_intersections.py (each source probes the target table's GiST index,
+ST_Intersection only for partial overlaps, areas in AREA_SRID, slivers dropped). With population weights, every
+2020 block with people is matched to both units by its representative point and
+pop20 is summed per pair.
+
+Each tile commits with a checkpoint row (United_States_Census_Crosswalk_Tile),
+so an interrupted build resumes with the tiles still missing. Population weights
+are normalized per source unit once every tile is done (finalize_census_crosswalk).
+
+Each tile also stores a geometry fingerprint (md5 of the normalized WKB) of every
+input unit (United_States_Census_Crosswalk_Input). After a boundary reload, an
+incremental build compares them with the units now loaded: rows of removed or
+changed units are deleted and only pairs touching added or changed units are
+recomputed. Fingerprints are read from the units' stored geom_hash, and only the
+changed units and their bbox neighbours are repaired and measured, so a refresh
+costs time proportional to the change.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from locations.models import (
+    United_States_Census_Crosswalk_Input,
+    United_States_Census_Crosswalk_Tile,
+    United_States_Census_State,
+    United_States_Census_Tabulation_Block,
+    United_States_Census_Unit_Crosswalk,
+)
+
+from .census_fingerprints import GEOMETRY_HASH_SQL
+from .census_intersections import AREA_SRID
+from .copy_utilities import create_temp_table
+from .dispatchers import CENSUS_CROSSWALK_UNITS
+
+logger = logging.getLogger(__name__)
+
+# Tabulation block vintage carrying pop20
+POPULATION_BLOCK_YEAR = 2020
+
+# Per-transaction staging of the fingerprints now loaded and of the units that differ
+INPUTS_TABLE = "tmp_crosswalk_inputs"
+CHANGES_TABLE = "tmp_crosswalk_changes"
+
+
+def _unit_config(unit_type: str) -> Dict:
+    if unit_type not in CENSUS_CROSSWALK_UNITS:
+        raise ValueError(
+            f"Unknown crosswalk unit: {unit_type} (choose from {', '.join(CENSUS_CROSSWALK_UNITS)})"
+        )
+    return CENSUS_CROSSWALK_UNITS[unit_type]
+
+
+def _tile_filter_sql(config: Dict, alias: str) -> str:
+    """Restrict a unit table to the tile: its state column, or the state boundary"""
+    quote = connection.ops.quote_name
+    if config["statefp_field"]:
+        return f"{alias}.{quote(config['statefp_field'])} = %(statefp)s"
+    return f"{alias}.geom && tile.geom AND ST_Intersects({alias}.geom, tile.geom)"
+
+
+def _changed_geoids_sql(side: str) -> str:
+    return f"SELECT geoid FROM {CHANGES_TABLE} WHERE side = '{side}'"
+
+
+def _units_sql(config: Dict, side: Optional[str] = None, extra_where: str = "") -> str:
+    """Units of the tile with valid geometry, equal-area size and whether they changed"""
+    quote = connection.ops.quote_name
+    tile_join = "" if config["statefp_field"] else ", tile"
+    changed = (
+        f"u.{quote(config['geoid_field'])} IN ({_changed_geoids_sql(side)})"
+        if side else "TRUE"
+    )
+    return f"""
+        SELECT u.{quote(config['model']._meta.pk.column)} AS id,
+               u.{quote(config['geoid_field'])} AS geoid,
+               CASE WHEN ST_IsValid(u.geom) THEN u.geom ELSE ST_MakeValid(u.geom) END AS geom,
+               ST_Area(ST_Transform(u.geom, {AREA_SRID})) AS area,
+               {changed} AS changed
+        FROM {quote(config['model']._meta.db_table)} AS u{tile_join}
+        WHERE u.year = %(year)s AND {_tile_filter_sql(config, "u")}
+          {extra_where}
+    """
+
+
+def _needs_tile_boundary(source: Dict, target: Dict) -> bool:
+    return not source["statefp_field"] or not target["statefp_field"]
+
+
+def _tile_cte_sql(source: Dict, target: Dict) -> str:
+    """CTE with the state boundary, when a side has no state column"""
+    if not _needs_tile_boundary(source, target):
+        return ""
+    return f"""
+        tile AS MATERIALIZED (
+            SELECT geom FROM {connection.ops.quote_name(United_States_Census_State._meta.db_table)}
+            WHERE year = %(year)s AND statefp = %(statefp)s
+            LIMIT 1
+        ),"""
+
+
+def _fingerprint_sql(source: Dict, target: Dict, side: str) -> str:
+    """
+    Stage the geometry fingerprint of every unit of one side of the tile
+
+    The geom_hash stored on the unit (kept up to date by load_census_features) is
+    reused; only rows loaded before fingerprinting are hashed here.
+    """
+    quote = connection.ops.quote_name
+    config = source if side == "source" else target
+    tile_join = "" if config["statefp_field"] else ", tile"
+    return f"""
+        WITH {_tile_cte_sql(source, target)}
+        units AS (
+            SELECT u.{quote(config['geoid_field'])} AS geoid,
+                   COALESCE(u.geom_hash, {GEOMETRY_HASH_SQL.format(geom="u.geom")}) AS geom_hash
+            FROM {quote(config['model']._meta.db_table)} AS u{tile_join}
+            WHERE u.year = %(year)s AND {_tile_filter_sql(config, "u")}
+        )
+        INSERT INTO {INPUTS_TABLE} (side, geoid, geom_hash)
+        SELECT '{side}', geoid, geom_hash FROM units
+    """
+
+
+def _crosswalk_insert_sql(source: Dict, target: Dict, changed_only: bool = False) -> str:
+    """Build the INSERT ... SELECT writing the overlaps of one tile (or of its changed units)"""
+    quote = connection.ops.quote_name
+    crosswalk_table = quote(United_States_Census_Unit_Crosswalk._meta.db_table)
+
+    # Only units without a state column need the boundary; clip when neither side has one
+    if not source["statefp_field"] and not target["statefp_field"]:
+        geometry = "ST_Intersection(ST_Intersection(s.geom, t.geom), tile.geom)"
+        tile_join = "CROSS JOIN tile"
+    else:
+        geometry = """CASE
+                       WHEN ST_CoveredBy(s.geom, t.geom) THEN s.geom
+                       WHEN ST_CoveredBy(t.geom, s.geom) THEN t.geom
+                       ELSE ST_Intersection(s.geom, t.geom)
+                   END"""
+        tile_join = ""
+
+    target_table = quote(target["model"]._meta.db_table)
+    target_pk = quote(target["model"]._meta.pk.column)
+    target_state = (
+        f"AND t.{quote(target['statefp_field'])} = %(statefp)s" if target["statefp_field"] else ""
+    )
+    pair_filter = ""
+    if changed_only:
+        # Only changed sources and sources near a changed target are materialized,
+        # and only pairs with a changed side are kept, so the work follows the change
+        near_changed_target = f"""
+            AND (u.{quote(source['geoid_field'])} IN ({_changed_geoids_sql("source")})
+                 OR EXISTS (SELECT 1 FROM {CHANGES_TABLE} AS x
+                            WHERE x.side = 'target' AND x.geom && u.geom))
+        """
+        sources = _units_sql(source, "source", near_changed_target)
+        pair_filter = f"""
+              AND (s.changed OR t.{quote(target['geoid_field'])} IN ({_changed_geoids_sql("target")}))
+        """
+    else:
+        sources = _units_sql(source)
+    targets = _units_sql(
+        target, "target" if changed_only else None, f"AND u.{target_pk} IN (SELECT target_id FROM pairs)"
+    )
+
+    return f"""
+        WITH {_tile_cte_sql(source, target)}
+        sources AS MATERIALIZED ({sources}),
+        -- Each source probes the target table's GiST index
+        pairs AS MATERIALIZED (
+            SELECT s.id AS source_id, t.{target_pk} AS target_id
+            FROM sources AS s
+            JOIN {target_table} AS t ON t.geom && s.geom AND t.year = %(year)s {target_state}
+            {pair_filter}
+        ),
+        -- Validity and area only for targets that have a candidate pair
+        targets AS MATERIALIZED ({targets}),
+        cut AS (
+            SELECT s.geoid AS source_geoid, t.geoid AS target_geoid,
+                   s.area AS source_area, t.area AS target_area,
+                   {geometry} AS geom
+            FROM pairs AS p
+            JOIN sources AS s ON s.id = p.source_id
+            JOIN targets AS t ON t.id = p.target_id
+            {tile_join}
+            WHERE (s.changed OR t.changed) AND ST_Intersects(t.geom, s.geom)
+        ),
+        measured AS (
+            SELECT source_geoid, target_geoid, source_area, target_area,
+                   ST_Area(ST_Transform(geom, {AREA_SRID})) AS area
+            FROM cut
+        )
+        INSERT INTO {crosswalk_table} (
+            source_type, source_geoid, target_type, target_geoid, year, statefp,
+            intersection_area_sqm, area_weight, target_area_weight, population, computed_at
+        )
+        SELECT %(source_type)s, source_geoid, %(target_type)s, target_geoid, %(year)s, %(statefp)s,
+               round(area),
+               COALESCE(LEAST(1, area / NULLIF(source_area, 0)), 0),
+               COALESCE(LEAST(1, area / NULLIF(target_area, 0)), 0),
+               CASE WHEN %(with_population)s THEN 0 END,
+               now()
+        FROM measured
+        WHERE area >= %(min_area)s
+    """
+
+
+def _unit_lateral_sql(config: Dict, name: str) -> str:
+    """LATERAL probe finding the unit that contains a block's point"""
+    quote = connection.ops.quote_name
+    state_clause = (
+        f"AND u.{quote(config['statefp_field'])} = %(statefp)s" if config["statefp_field"] else ""
+    )
+    return f"""
+        JOIN LATERAL (
+            SELECT u.{quote(config['geoid_field'])} AS geoid
+            FROM {quote(config['model']._meta.db_table)} AS u
+            WHERE u.year = %(year)s
+              AND ST_Contains(u.geom, b.point)
+              {state_clause}
+            LIMIT 1
+        ) AS {name} ON TRUE
+    """
+
+
+def _population_update_sql(source: Dict, target: Dict, changed_only: bool = False) -> str:
+    """
+    Build the UPDATE summing block population per (source, target) pair of one tile
+
+    With changed_only, only blocks near a changed unit are probed and only pairs
+    with a changed unit are updated (those blocks cover such pairs entirely).
+    """
+    quote = connection.ops.quote_name
+    block_table = quote(United_States_Census_Tabulation_Block._meta.db_table)
+    crosswalk_table = quote(United_States_Census_Unit_Crosswalk._meta.db_table)
+
+    block_filter = pair_filter = ""
+    if changed_only:
+        block_filter = f"AND EXISTS (SELECT 1 FROM {CHANGES_TABLE} AS x WHERE x.geom && blk.geom)"
+        pair_filter = f"""AND (c.source_geoid IN ({_changed_geoids_sql("source")})
+               OR c.target_geoid IN ({_changed_geoids_sql("target")}))"""
+
+    return f"""
+        UPDATE {crosswalk_table} AS c SET population = m.population
+        FROM (
+            SELECT s.geoid AS source_geoid, t.geoid AS target_geoid, sum(b.pop20) AS population
+            FROM (
+                SELECT blk.pop20, ST_PointOnSurface(blk.geom) AS point
+                FROM {block_table} AS blk
+                WHERE blk.year = %(block_year)s AND blk.statefp20 = %(statefp)s AND blk.pop20 > 0
+                  {block_filter}
+            ) AS b
+            {_unit_lateral_sql(source, "s")}
+            {_unit_lateral_sql(target, "t")}
+            GROUP BY s.geoid, t.geoid
+        ) AS m
+        WHERE c.source_type = %(source_type)s
+          AND c.target_type = %(target_type)s
+          AND c.year = %(year)s
+          AND c.statefp = %(statefp)s
+          AND c.source_geoid = m.source_geoid
+          AND c.target_geoid = m.target_geoid
+          {pair_filter}
+    """
+
+
+def _stage_changes(cursor, source: Dict, target: Dict, params: Dict) -> Dict[str, int]:
+    """
+    Stage the units whose fingerprint differs from the last build of the tile
+
+    Added and changed units keep their current geometry (to find affected
+    blocks); removed units are staged without one.
+    """
+    quote = connection.ops.quote_name
+    inputs_table = quote(United_States_Census_Crosswalk_Input._meta.db_table)
+
+    create_temp_table(cursor, CHANGES_TABLE, [("side", "text"), ("geoid", "text"), ("geom", "geometry")])
+    cursor.execute(
+        f"""
+        INSERT INTO {CHANGES_TABLE} (side, geoid)
+        SELECT COALESCE(i.side, f.side), COALESCE(i.geoid, f.geoid)
+        FROM {INPUTS_TABLE} AS i
+        FULL JOIN (
+            SELECT side, geoid, geom_hash FROM {inputs_table}
+            WHERE source_type = %(source_type)s AND target_type = %(target_type)s
+              AND year = %(year)s AND statefp = %(statefp)s
+        ) AS f ON f.side = i.side AND f.geoid = i.geoid
+        WHERE i.geom_hash IS DISTINCT FROM f.geom_hash
+        """,
+        params,
+    )
+
+    for side, config in (("source", source), ("target", target)):
+        cursor.execute(
+            f"""
+            UPDATE {CHANGES_TABLE} AS x SET geom = u.geom
+            FROM {quote(config['model']._meta.db_table)} AS u
+            WHERE x.side = '{side}'
+              AND u.{quote(config['geoid_field'])} = x.geoid
+              AND u.year = %(year)s
+            """,
+            params,
+        )
+
+    cursor.execute(
+        f"""
+        SELECT side, count(*) FILTER (WHERE geom IS NOT NULL), count(*) FILTER (WHERE geom IS NULL)
+        FROM {CHANGES_TABLE} GROUP BY side
+        """
+    )
+    changes = {"changed_source": 0, "removed_source": 0, "changed_target": 0, "removed_target": 0}
+    for side, changed, removed in cursor.fetchall():
+        changes[f"changed_{side}"] = changed
+        changes[f"removed_{side}"] = removed
+    return changes
+
+
+def _delete_changed_rows(cursor, params: Dict) -> int:
+    """Delete the tile's rows whose source or target was added, changed or removed"""
+    cursor.execute(
+        f"""
+        DELETE FROM {connection.ops.quote_name(United_States_Census_Unit_Crosswalk._meta.db_table)}
+        WHERE source_type = %(source_type)s AND target_type = %(target_type)s
+          AND year = %(year)s AND statefp = %(statefp)s
+          AND (source_geoid IN ({_changed_geoids_sql("source")})
+               OR target_geoid IN ({_changed_geoids_sql("target")}))
+        """,
+        params,
+    )
+    return cursor.rowcount
+
+
+def _save_fingerprints(cursor, params: Dict):
+    """Replace the tile's stored fingerprints with the staged ones"""
+    inputs_table = connection.ops.quote_name(United_States_Census_Crosswalk_Input._meta.db_table)
+    cursor.execute(
+        f"""
+        DELETE FROM {inputs_table}
+        WHERE source_type = %(source_type)s AND target_type = %(target_type)s
+          AND year = %(year)s AND statefp = %(statefp)s
+        """,
+        params,
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO {inputs_table} (source_type, target_type, year, statefp, side, geoid, geom_hash)
+        SELECT %(source_type)s, %(target_type)s, %(year)s, %(statefp)s, side, geoid, geom_hash
+        FROM {INPUTS_TABLE}
+        """,
+        params,
+    )
+
+
+def _can_update_incrementally(source_type: str, target_type: str, year: int, statefp: str,
+                              with_population: bool) -> bool:
+    """The tile was built with fingerprints (and population, when it is wanted)"""
+    checkpoint = United_States_Census_Crosswalk_Tile.objects.filter(
+        source_type=source_type, target_type=target_type, year=year, statefp=statefp
+    ).first()
+    if not checkpoint or (with_population and not checkpoint.with_population):
+        return False
+    return United_States_Census_Crosswalk_Input.objects.filter(
+        source_type=source_type, target_type=target_type, year=year, statefp=statefp
+    ).exists()
+
+
+def build_crosswalk_tile(
+    source_type: str,
+    target_type: str,
+    year: int,
+    statefp: str,
+    with_population: bool = False,
+    block_year: int = POPULATION_BLOCK_YEAR,
+    incremental: bool = False,
+) -> int:
+    """
+    Rebuild one state tile of a crosswalk and record its checkpoint and input fingerprints
+
+    Existing rows of the tile are replaced in the same transaction. With
+    incremental, only rows of units whose geometry changed since the last build
+    are replaced (a tile without fingerprints is rebuilt in full).
+
+    Returns:
+        Number of crosswalk rows written
+    """
+    source = _unit_config(source_type)
+    target = _unit_config(target_type)
+    params = {
+        "source_type": source_type,
+        "target_type": target_type,
+        "year": year,
+        "statefp": statefp,
+        "block_year": block_year,
+        "with_population": with_population,
+        "min_area": settings.CENSUS_INTERSECTION_MIN_AREA_SQM,
+    }
+
+    if _needs_tile_boundary(source, target) and not United_States_Census_State.objects.filter(
+        year=year, statefp=statefp
+    ).exists():
+        raise ValueError(f"The {year} boundary of state {statefp} must be loaded to tile {source_type} x {target_type}")
+
+    incremental = incremental and _can_update_incrementally(
+        source_type, target_type, year, statefp, with_population
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_temp_table(cursor, INPUTS_TABLE, [("side", "text"), ("geoid", "text"), ("geom_hash", "text")])
+        cursor.execute(_fingerprint_sql(source, target, "source"), params)
+        cursor.execute(_fingerprint_sql(source, target, "target"), params)
+
+        if incremental:
+            changes = _stage_changes(cursor, source, target, params)
+            deleted = _delete_changed_rows(cursor, params)
+        else:
+            United_States_Census_Unit_Crosswalk.objects.filter(
+                source_type=source_type, target_type=target_type, year=year, statefp=statefp
+            ).delete()
+
+        cursor.execute(_crosswalk_insert_sql(source, target, incremental), params)
+        rows = cursor.rowcount
+
+        if with_population and rows:
+            cursor.execute(_population_update_sql(source, target, incremental), params)
+
+        _save_fingerprints(cursor, params)
+
+        if incremental:
+            logger.info(
+                f"{source_type} x {target_type} tile {statefp} ({year}): "
+                f"{changes['changed_source']} changed/added and {changes['removed_source']} removed sources, "
+                f"{changes['changed_target']} changed/added and {changes['removed_target']} removed targets; "
+                f"{deleted} rows replaced by {rows}"
+            )
+
+        United_States_Census_Crosswalk_Tile.objects.update_or_create(
+            source_type=source_type,
+            target_type=target_type,
+            year=year,
+            statefp=statefp,
+            defaults={
+                "with_population": with_population,
+                "rows": United_States_Census_Unit_Crosswalk.objects.filter(
+                    source_type=source_type, target_type=target_type, year=year, statefp=statefp
+                ).count() if incremental else rows,
+            },
+        )
+
+    return rows
+
+
+def get_crosswalk_tiles(source_type: str, target_type: str, year: int) -> List[str]:
+    """State FIPS codes to tile a crosswalk by (states with units of a state-scoped side)"""
+    for unit_type in (source_type, target_type):
+        config = _unit_config(unit_type)
+        if config["statefp_field"]:
+            return list(
+                config["model"].objects.filter(year=year)
+                .values_list(config["statefp_field"], flat=True)
+                .distinct()
+                .order_by(config["statefp_field"])
+            )
+
+    return list(
+        United_States_Census_State.objects.filter(year=year)
+        .values_list("statefp", flat=True)
+        .distinct()
+        .order_by("statefp")
+    )
+
+
+def pending_crosswalk_tiles(
+    source_type: str,
+    target_type: str,
+    year: int,
+    with_population: bool = False,
+    state_fips: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """Tiles without a checkpoint (or built without population when it is now wanted)"""
+    tiles = list(state_fips or get_crosswalk_tiles(source_type, target_type, year))
+
+    done = United_States_Census_Crosswalk_Tile.objects.filter(
+        source_type=source_type, target_type=target_type, year=year, statefp__in=tiles
+    )
+    if with_population:
+        done = done.filter(with_population=True)
+
+    completed = set(done.values_list("statefp", flat=True))
+    return [statefp for statefp in tiles if statefp not in completed]
+
+
+def reset_crosswalk_checkpoints(source_type: str, target_type: str, year: int) -> int:
+    """Forget completed tiles so the next build recomputes every tile"""
+    deleted, _ = United_States_Census_Crosswalk_Tile.objects.filter(
+        source_type=source_type, target_type=target_type, year=year
+    ).delete()
+    return deleted
+
+
+def finalize_census_crosswalk(source_type: str, target_type: str, year: int) -> int:
+    """
+    Normalize population weights per source unit over all tiles
+
+    Returns:
+        Number of rows updated
+    """
+    crosswalk_table = connection.ops.quote_name(United_States_Census_Unit_Crosswalk._meta.db_table)
+    params = {"source_type": source_type, "target_type": target_type, "year": year}
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {crosswalk_table} AS c
+            SET population_weight = c.population::double precision / NULLIF(totals.population, 0)
+            FROM (
+                SELECT source_geoid, sum(population) AS population
+                FROM {crosswalk_table}
+                WHERE source_type = %(source_type)s AND target_type = %(target_type)s
+                  AND year = %(year)s AND population IS NOT NULL
+                GROUP BY source_geoid
+            ) AS totals
+            WHERE c.source_type = %(source_type)s AND c.target_type = %(target_type)s
+              AND c.year = %(year)s AND c.source_geoid = totals.source_geoid
+            """,
+            params,
+        )
+        return cursor.rowcount
+
+
+def build_census_crosswalk(
+    source_type: str,
+    target_type: str,
+    year: int,
+    with_population: bool = False,
+    block_year: int = POPULATION_BLOCK_YEAR,
+    state_fips: Optional[Iterable[str]] = None,
+    resume: bool = True,
+    incremental: bool = False,
+) -> Dict[str, float]:
+    """
+    Build a crosswalk in this process, tile by tile
+
+    Args:
+        source_type, target_type: Keys of CENSUS_CROSSWALK_UNITS
+        year: Census year of both unit types
+        with_population: Also store pop20-based weights
+        block_year: Tabulation block year for population (pop20 is 2020)
+        state_fips: Restrict to these tiles (default: all)
+        resume: Skip tiles that already have a checkpoint
+        incremental: Revisit every tile, recomputing only pairs of units whose
+            geometry changed since it was built (after a boundary reload)
+
+    Returns:
+        dict with tiles built, rows written and elapsed seconds
+    """
+    _unit_config(source_type)
+    _unit_config(target_type)
+    start_time = time.time()
+
+    if not resume:
+        reset_crosswalk_checkpoints(source_type, target_type, year)
+
+    if incremental:
+        tiles = list(state_fips or get_crosswalk_tiles(source_type, target_type, year))
+    else:
+        tiles = pending_crosswalk_tiles(source_type, target_type, year, with_population, state_fips)
+
+    total = 0
+    for statefp in tiles:
+        tile_time = time.time()
+        rows = build_crosswalk_tile(
+            source_type, target_type, year, statefp, with_population, block_year, incremental
+        )
+        total += rows
+        logger.info(
+            f"Built {source_type} x {target_type} crosswalk tile {statefp} ({year}): "
+            f"{rows} rows in {time.time() - tile_time:.2f}s"
+        )
+
+    if with_population:
+        finalize_census_crosswalk(source_type, target_type, year)
+
+    elapsed = time.time() - start_time
+    return {
+        "source": source_type,
+        "target": target_type,
+        "year": year,
+        "tiles": len(tiles),
+        "rows": total,
+        "elapsed_seconds": round(elapsed, 2),
+    }
@@ -0,0 +1,382 @@
+"""
+Geometry fingerprinting and change detection across TIGER vintages
+
+Every TIGER feature stores a geom_hash (md5 of its normalized WKB) and an
+attr_hash (md5 of the attribute columns read from the file), see
+locations/models/census/tiger/fingerprint.py. Both are computed in PostGIS, so
+fingerprints of stored rows and of freshly staged features are comparable.
+
+load_census_features replaces LayerMapping for fetch_census_data:
+1. features are streamed with COPY into a staging table and hashed there
+2. stored rows of the same (year, state) that are identical are left alone;
+   changed rows are updated, new ones inserted, missing ones deleted
+3. the staged features are compared with the previous loaded vintage, so each
+   load reports how many units actually changed
+
+diff_census_vintages reports added, removed and changed GEOIDs between any two
+years from the stored fingerprints, without comparing geometry; it only reads,
+so rows loaded before fingerprinting are reported rather than hashed.
+"""
+
+import logging
+import time
+from typing import Dict, Iterator, List, Optional
+
+from django.contrib.gis.gdal import DataSource
+from django.db import connection, transaction
+
+from .copy_utilities import copy_rows, create_temp_table
+from .dispatchers import CENSUS_FINGERPRINT_UNITS
+
+logger = logging.getLogger(__name__)
+
+# md5 of the normalized WKB: vertex order and ring start points do not change it
+GEOMETRY_HASH_SQL = "md5(ST_AsBinary(ST_Normalize({geom})))"
+
+STAGING_TABLE = "tmp_census_load"
+
+
+def _unit_config(unit_type: str) -> Dict:
+    if unit_type not in CENSUS_FINGERPRINT_UNITS:
+        raise ValueError(
+            f"Unknown census unit: {unit_type} (choose from {', '.join(CENSUS_FINGERPRINT_UNITS)})"
+        )
+    return CENSUS_FINGERPRINT_UNITS[unit_type]
+
+
+def attribute_fields(config: Dict) -> List:
+    """Model fields loaded from the TIGER file (the mapping keys, minus geom)"""
+    meta = config["model"]._meta
+    return [meta.get_field(name) for name in config["mapping"] if name != "geom"]
+
+
+def _attribute_hash_sql(config: Dict, alias: str) -> str:
+    """md5 of the attribute columns as a row (distinguishes NULL from '')"""
+    quote = connection.ops.quote_name
+    columns = ", ".join(f"{alias}.{quote(field.column)}" for field in attribute_fields(config))
+    return f"md5(ROW({columns})::text)"
+
+
+def _state_sql(config: Dict, alias: str, state_fips: Optional[str]) -> str:
+    """Restrict to one state when the unit has a state column (ZCTAs load nationally)"""
+    if not state_fips or not config["statefp_field"]:
+        return ""
+    return f"AND {alias}.{connection.ops.quote_name(config['statefp_field'])} = %(statefp)s"
+
+
+def _scope_sql(config: Dict, alias: str, year_param: str, state_fips: Optional[str]) -> str:
+    """Rows of one year (and state)"""
+    return f"{alias}.year = %({year_param})s {_state_sql(config, alias, state_fips)}"
+
+
+def fingerprint_census_units(
+    unit_type: str,
+    year: Optional[int] = None,
+    state_fips: Optional[str] = None,
+    only_missing: bool = True,
+) -> int:
+    """
+    Compute the fingerprints of stored rows (backfill for rows loaded before hashing)
+
+    Args:
+        unit_type: Key of CENSUS_FINGERPRINT_UNITS
+        year: Restrict to one year (default: all years)
+        state_fips: Restrict to one state
+        only_missing: Only rows without a fingerprint
+
+    Returns:
+        Number of rows fingerprinted
+    """
+    config = _unit_config(unit_type)
+    quote = connection.ops.quote_name
+    conditions = ["TRUE"]
+    if year is not None:
+        conditions.append(_scope_sql(config, "t", "year", state_fips))
+    if only_missing:
+        conditions.append("(t.geom_hash IS NULL OR t.attr_hash IS NULL)")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {quote(config['model']._meta.db_table)} AS t
+            SET geom_hash = {GEOMETRY_HASH_SQL.format(geom="t.geom")},
+                attr_hash = {_attribute_hash_sql(config, "t")}
+            WHERE {" AND ".join(conditions)}
+            """,
+            {"year": year, "statefp": state_fips},
+        )
+        return cursor.rowcount
+
+
+def read_census_features(shapefile_path: str, mapping: Dict[str, str], fields: List) -> Iterator[List]:
+    """Yield [values of fields..., geometry hex WKB] for every feature of a TIGER file"""
+    layer = DataSource(str(shapefile_path), encoding="utf-8")[0]
+    sources = [mapping[field.name] for field in fields]
+    for feature in layer:
+        yield [feature.get(source) for source in sources] + [feature.geom.hex]
+
+
+def _previous_vintage(cursor, config: Dict, year: int, state_fips: Optional[str]) -> Optional[int]:
+    cursor.execute(
+        f"""
+        SELECT max(t.year) FROM {connection.ops.quote_name(config['model']._meta.db_table)} AS t
+        WHERE t.year < %(year)s {_state_sql(config, "t", state_fips)}
+        """,
+        {"year": year, "statefp": state_fips},
+    )
+    return cursor.fetchone()[0]
+
+
+def _compare_with_staging(cursor, config: Dict, year: int, state_fips: Optional[str]) -> Dict[str, int]:
+    """Count staged features added, removed, changed or unchanged relative to a stored year"""
+    quote = connection.ops.quote_name
+    geoid = quote(config["model"]._meta.get_field(config["geoid_field"]).column)
+    cursor.execute(
+        f"""
+        SELECT count(*) FILTER (WHERE p.geoid IS NULL),
+               count(*) FILTER (WHERE s.{geoid} IS NULL),
+               count(*) FILTER (WHERE s.{geoid} IS NOT NULL AND p.geoid IS NOT NULL
+                                  AND (s.geom_hash IS DISTINCT FROM p.geom_hash
+                                       OR s.attr_hash IS DISTINCT FROM p.attr_hash)),
+               count(*) FILTER (WHERE s.geom_hash = p.geom_hash AND s.attr_hash = p.attr_hash)
+        FROM {STAGING_TABLE} AS s
+        FULL JOIN (
+            SELECT t.{geoid} AS geoid, t.geom_hash, t.attr_hash
+            FROM {quote(config['model']._meta.db_table)} AS t
+            WHERE {_scope_sql(config, "t", "year", state_fips)}
+        ) AS p ON p.geoid = s.{geoid}
+        """,
+        {"year": year, "statefp": state_fips},
+    )
+    added, removed, changed, unchanged = cursor.fetchone()
+    return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+
+def load_census_features(
+    unit_type: str,
+    shapefile_path: str,
+    year: int,
+    state_fips: Optional[str] = None,
+    mapping: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """
+    Load one TIGER file, writing only features that differ from the stored rows
+
+    Args:
+        unit_type: Key of CENSUS_FINGERPRINT_UNITS
+        shapefile_path: Extracted TIGER shapefile
+        year: Vintage being loaded
+        state_fips: State of a per-state file (None for national files)
+        mapping: LayerMapping dict for this vintage's field names (default: the
+            registry's mapping)
+
+    Returns:
+        dict with staged, inserted, updated, unchanged and deleted counts, and
+        the comparison with the previous loaded vintage
+    """
+    start_time = time.time()
+    config = _unit_config(unit_type)
+    mapping = mapping or config["mapping"]
+    model = config["model"]
+    meta = model._meta
+    quote = connection.ops.quote_name
+    table = quote(meta.db_table)
+    geoid = quote(meta.get_field(config["geoid_field"]).column)
+    params = {"year": year, "statefp": state_fips}
+
+    fields = attribute_fields(config)
+    columns = [field.column for field in fields]
+    geom_field = meta.get_field("geom")
+    geometry = "ST_Multi(geom)" if geom_field.geom_type.upper().startswith("MULTI") else "geom"
+
+    # Columns outside the file that are NOT NULL with a Django-side default (e.g. VTD source)
+    defaults = [
+        field for field in meta.concrete_fields
+        if not field.primary_key and field.has_default()
+        and field.column not in columns and field.name not in ("geom", "year", "geom_hash", "attr_hash")
+    ]
+    for field in defaults:
+        params[f"default_{field.column}"] = field.get_default()
+
+    written = columns + ["geom", "geom_hash", "attr_hash"]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_temp_table(
+            cursor,
+            STAGING_TABLE,
+            [(field.column, field.db_type(connection)) for field in fields]
+            + [("geom", "geometry"), ("geom_hash", "text"), ("attr_hash", "text")],
+        )
+        staged = copy_rows(cursor, STAGING_TABLE, columns + ["geom"], read_census_features(shapefile_path, mapping, fields))
+
+        cursor.execute(f"UPDATE {STAGING_TABLE} SET geom = ST_SetSRID({geometry}, {geom_field.srid})")
+        cursor.execute(
+            f"""
+            UPDATE {STAGING_TABLE} AS s
+            SET geom_hash = {GEOMETRY_HASH_SQL.format(geom="s.geom")},
+                attr_hash = {_attribute_hash_sql(config, "s")}
+            """
+        )
+
+        previous_year = _previous_vintage(cursor, config, year, state_fips)
+        previous = None
+        if previous_year is not None:
+            fingerprint_census_units(unit_type, previous_year, state_fips)
+            previous = dict(_compare_with_staging(cursor, config, previous_year, state_fips), year=previous_year)
+
+        cursor.execute(
+            f"""
+            DELETE FROM {table} AS t
+            WHERE {_scope_sql(config, "t", "year", state_fips)}
+              AND NOT EXISTS (SELECT 1 FROM {STAGING_TABLE} AS s WHERE s.{geoid} = t.{geoid})
+            """,
+            params,
+        )
+        deleted = cursor.rowcount
+
+        cursor.execute(
+            f"""
+            UPDATE {table} AS t
+            SET {", ".join(f"{quote(column)} = s.{quote(column)}" for column in written)}
+            FROM {STAGING_TABLE} AS s
+            WHERE {_scope_sql(config, "t", "year", state_fips)}
+              AND t.{geoid} = s.{geoid}
+              AND (t.geom_hash IS DISTINCT FROM s.geom_hash OR t.attr_hash IS DISTINCT FROM s.attr_hash)
+            """,
+            params,
+        )
+        updated = cursor.rowcount
+
+        insert_columns = written + ["year"] + [field.column for field in defaults]
+        insert_values = (
+            [f"s.{quote(column)}" for column in written]
+            + ["%(year)s"]
+            + [f"%(default_{field.column})s" for field in defaults]
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({", ".join(quote(column) for column in insert_columns)})
+            SELECT {", ".join(insert_values)}
+            FROM {STAGING_TABLE} AS s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table} AS t WHERE t.year = %(year)s AND t.{geoid} = s.{geoid}
+            )
+            """,
+            params,
+        )
+        inserted = cursor.rowcount
+
+    stats = {
+        "unit_type": unit_type,
+        "year": year,
+        "state_fips": state_fips,
+        "staged": staged,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": staged - inserted - updated,
+        "deleted": deleted,
+        "previous_vintage": previous,
+        "elapsed_seconds": round(time.time() - start_time, 2),
+    }
+    logger.info(
+        f"Loaded {unit_type} {year} {state_fips or 'national'}: {inserted} inserted, {updated} updated, "
+        f"{stats['unchanged']} unchanged, {deleted} deleted"
+        + (
+            f"; vs {previous_year}: {previous['unchanged']} identical, {previous['changed']} changed, "
+            f"{previous['added']} added, {previous['removed']} removed"
+            if previous else ""
+        )
+    )
+    return stats
+
+
+def diff_census_vintages(
+    unit_type: str,
+    from_year: int,
+    to_year: int,
+    state_fips: Optional[str] = None,
+) -> Dict:
+    """
+    Compare two vintages of a unit type by GEOID using the stored fingerprints
+
+    Read-only: rows without fingerprints are not hashed here (backfill them with
+    the fingerprint_census command); GEOIDs present in both years whose rows lack
+    a fingerprint are reported as unfingerprinted instead of changed.
+
+    Returns:
+        dict with added, removed, changed (geometry or attributes),
+        geometry_changed, attributes_changed and unfingerprinted GEOID lists,
+        the unchanged count and the count of rows missing fingerprints per year
+    """
+    config = _unit_config(unit_type)
+    quote = connection.ops.quote_name
+    table = quote(config["model"]._meta.db_table)
+    geoid = quote(config["model"]._meta.get_field(config["geoid_field"]).column)
+
+    def vintage(year_param: str) -> str:
+        return f"""
+            SELECT t.{geoid} AS geoid, t.geom_hash, t.attr_hash FROM {table} AS t
+            WHERE {_scope_sql(config, "t", year_param, state_fips)}
+        """
+
+    unfingerprinted = (
+        "a.geom_hash IS NULL OR a.attr_hash IS NULL OR b.geom_hash IS NULL OR b.attr_hash IS NULL"
+    )
+    params = {"from_year": from_year, "to_year": to_year, "statefp": state_fips}
+    diff = {"added": [], "removed": [], "geometry_changed": [], "attributes_changed": [], "unfingerprinted": []}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT COALESCE(a.geoid, b.geoid),
+                   CASE
+                       WHEN a.geoid IS NULL THEN 'added'
+                       WHEN b.geoid IS NULL THEN 'removed'
+                       WHEN {unfingerprinted} THEN 'unfingerprinted'
+                       WHEN a.geom_hash IS DISTINCT FROM b.geom_hash THEN 'geometry_changed'
+                       ELSE 'attributes_changed'
+                   END
+            FROM ({vintage("from_year")}) AS a
+            FULL JOIN ({vintage("to_year")}) AS b ON b.geoid = a.geoid
+            WHERE a.geoid IS NULL OR b.geoid IS NULL
+               OR {unfingerprinted}
+               OR a.geom_hash IS DISTINCT FROM b.geom_hash
+               OR a.attr_hash IS DISTINCT FROM b.attr_hash
+            ORDER BY 1
+            """,
+            params,
+        )
+        for unit_geoid, change in cursor.fetchall():
+            diff[change].append(unit_geoid)
+
+        cursor.execute(
+            f"""
+            SELECT count(*)
+            FROM ({vintage("from_year")}) AS a
+            JOIN ({vintage("to_year")}) AS b
+              ON b.geoid = a.geoid AND b.geom_hash = a.geom_hash AND b.attr_hash = a.attr_hash
+            """,
+            params,
+        )
+        unchanged = cursor.fetchone()[0]
+
+        missing_fingerprints = {}
+        for year_param in ("from_year", "to_year"):
+            cursor.execute(
+                f"""
+                SELECT count(*) FROM ({vintage(year_param)}) AS v
+                WHERE v.geom_hash IS NULL OR v.attr_hash IS NULL
+                """,
+                params,
+            )
+            missing_fingerprints[params[year_param]] = cursor.fetchone()[0]
+
+    return {
+        "unit_type": unit_type,
+        "from_year": from_year,
+        "to_year": to_year,
+        "state_fips": state_fips,
+        **diff,
+        "changed": sorted(diff["geometry_changed"] + diff["attributes_changed"]),
+        "unchanged": unchanged,
+        "missing_fingerprints": missing_fingerprints,
+    }
@@ -0,0 +1,288 @@
+"""
+Deduplicated cross-year geometry storage for TIGER tables
+
+Every TIGER model stores a full geometry per (geoid, year), yet most units are
+identical across vintages. A unit type can be switched to deduplicated storage:
+
+    census_tract (table)                  census_tract_rows (table, no geom)
+      id, ..., geom, geom_hash, year  ->    id, ..., geom_hash, year
+                                          census_geometry (table)
+                                            geom_hash (pk), geom (GiST)
+                                          census_tract (view)
+                                            rows JOIN census_geometry USING geom_hash
+
+The view keeps the table's name and columns, so the ORM and raw SQL read it as
+before; spatial predicates on geom use the GiST index of census_geometry.
+INSTEAD OF triggers route writes (ORM saves, fetch_census_data loads) to the
+rows table and add new geometries to census_geometry.
+
+Switching back (inline) restores the table. Schema migrations of a unit must run
+while it is inline. Geometries no longer referenced are removed by
+prune_census_geometry; space freed in the rows table is returned by VACUUM FULL.
+"""
+
+import logging
+from typing import Dict, List
+
+from django.db import connection, transaction
+
+from locations.models import Census_Geometry
+
+from .census_fingerprints import GEOMETRY_HASH_SQL, fingerprint_census_units
+from .dispatchers import CENSUS_FINGERPRINT_UNITS
+
+logger = logging.getLogger(__name__)
+
+GEOMETRY_STORAGE_MODES = ["inline", "deduplicated"]
+
+
+def _unit_config(unit_type: str) -> Dict:
+    if unit_type not in CENSUS_FINGERPRINT_UNITS:
+        raise ValueError(
+            f"Unknown census unit: {unit_type} (choose from {', '.join(CENSUS_FINGERPRINT_UNITS)})"
+        )
+    return CENSUS_FINGERPRINT_UNITS[unit_type]
+
+
+def _rows_table(config: Dict) -> str:
+    return f"{config['model']._meta.db_table}_rows"
+
+
+def _trigger_function(config: Dict) -> str:
+    return f"{config['model']._meta.db_table}_write"
+
+
+def _row_columns(config: Dict) -> List[str]:
+    """Physical columns of the rows table (all concrete columns except id and geom)"""
+    return [
+        field.column for field in config["model"]._meta.concrete_fields
+        if not field.primary_key and field.name != "geom"
+    ]
+
+
+def census_geometry_storage_mode(unit_type: str) -> str:
+    """'deduplicated' when the unit's table has been replaced by the joining view"""
+    config = _unit_config(unit_type)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+            [config["model"]._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return "deduplicated" if row and row[0] == "v" else "inline"
+
+
+def _view_sql(config: Dict) -> str:
+    quote = connection.ops.quote_name
+    pk = config["model"]._meta.pk.column
+    columns = ", ".join(f"r.{quote(column)}" for column in [pk] + _row_columns(config))
+    return f"""
+        CREATE VIEW {quote(config['model']._meta.db_table)} AS
+        SELECT {columns}, g.geom
+        FROM {quote(_rows_table(config))} AS r
+        JOIN {quote(Census_Geometry._meta.db_table)} AS g ON g.geom_hash = r.geom_hash
+    """
+
+
+def _trigger_sql(config: Dict) -> List[str]:
+    """INSTEAD OF trigger writing through the view to the rows and geometry tables"""
+    quote = connection.ops.quote_name
+    rows_table = quote(_rows_table(config))
+    pk = quote(config["model"]._meta.pk.column)
+    columns = [quote(column) for column in _row_columns(config)]
+    function = quote(_trigger_function(config))
+    new_hash = GEOMETRY_HASH_SQL.format(geom="NEW.geom")
+
+    return [
+        f"""
+        CREATE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM {rows_table} WHERE {pk} = OLD.{pk};
+                RETURN OLD;
+            END IF;
+
+            -- A new geometry without a new fingerprint gets its hash recomputed
+            IF TG_OP = 'UPDATE' AND NEW.geom IS DISTINCT FROM OLD.geom
+               AND NEW.geom_hash IS NOT DISTINCT FROM OLD.geom_hash THEN
+                NEW.geom_hash := NULL;
+            END IF;
+            NEW.geom_hash := COALESCE(NEW.geom_hash, {new_hash});
+
+            INSERT INTO {quote(Census_Geometry._meta.db_table)} (geom_hash, geom)
+            VALUES (NEW.geom_hash, NEW.geom)
+            ON CONFLICT (geom_hash) DO NOTHING;
+
+            IF TG_OP = 'INSERT' THEN
+                NEW.{pk} := COALESCE(NEW.{pk}, nextval(pg_get_serial_sequence('{_rows_table(config)}', '{config["model"]._meta.pk.column}')));
+                INSERT INTO {rows_table} ({pk}, {", ".join(columns)})
+                VALUES (NEW.{pk}, {", ".join(f"NEW.{column}" for column in columns)});
+            ELSE
+                UPDATE {rows_table}
+                SET {pk} = NEW.{pk}, {", ".join(f"{column} = NEW.{column}" for column in columns)}
+                WHERE {pk} = OLD.{pk};
+            END IF;
+            RETURN NEW;
+        END;
+        $$
+        """,
+        f"""
+        CREATE TRIGGER {function}
+        INSTEAD OF INSERT OR UPDATE OR DELETE ON {quote(config['model']._meta.db_table)}
+        FOR EACH ROW EXECUTE PROCEDURE {function}()
+        """,
+    ]
+
+
+def deduplicate_census_geometry(unit_type: str) -> Dict:
+    """
+    Move a unit type's geometries into census_geometry and replace its table by a view
+
+    Returns:
+        dict with rows and distinct geometries of the unit
+    """
+    config = _unit_config(unit_type)
+    if census_geometry_storage_mode(unit_type) == "deduplicated":
+        raise ValueError(f"{unit_type} geometry is already deduplicated")
+
+    quote = connection.ops.quote_name
+    table = quote(config["model"]._meta.db_table)
+    rows_table = quote(_rows_table(config))
+
+    fingerprint_census_units(unit_type)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {quote(Census_Geometry._meta.db_table)} (geom_hash, geom)
+            SELECT DISTINCT ON (geom_hash) geom_hash, geom FROM {table}
+            ORDER BY geom_hash
+            ON CONFLICT (geom_hash) DO NOTHING
+            """
+        )
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {rows_table}")
+        cursor.execute(f"ALTER TABLE {rows_table} ALTER COLUMN geom_hash SET NOT NULL")
+        cursor.execute(f"ALTER TABLE {rows_table} DROP COLUMN geom")
+        cursor.execute(f"CREATE INDEX {quote(_rows_table(config) + '_geom_hash')} ON {rows_table} (geom_hash)")
+        cursor.execute(_view_sql(config))
+        for statement in _trigger_sql(config):
+            cursor.execute(statement)
+
+        cursor.execute(f"SELECT count(*), count(DISTINCT geom_hash) FROM {rows_table}")
+        rows, geometries = cursor.fetchone()
+
+    logger.info(f"Deduplicated {unit_type} geometry: {rows} rows share {geometries} geometries")
+    return {"unit_type": unit_type, "rows": rows, "geometries": geometries}
+
+
+def inline_census_geometry(unit_type: str) -> Dict:
+    """
+    Restore a unit type's table with its own geom column (undoes deduplicate_census_geometry)
+
+    Returns:
+        dict with rows restored
+    """
+    config = _unit_config(unit_type)
+    if census_geometry_storage_mode(unit_type) == "inline":
+        raise ValueError(f"{unit_type} geometry is already inline")
+
+    quote = connection.ops.quote_name
+    meta = config["model"]._meta
+    table = quote(meta.db_table)
+    rows_table = quote(_rows_table(config))
+    geom_field = meta.get_field("geom")
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DROP VIEW {table}")
+        cursor.execute(f"DROP FUNCTION {quote(_trigger_function(config))}()")
+        cursor.execute(
+            f"ALTER TABLE {rows_table} ADD COLUMN geom geometry({geom_field.geom_type}, {geom_field.srid})"
+        )
+        cursor.execute(
+            f"""
+            UPDATE {rows_table} AS r SET geom = g.geom
+            FROM {quote(Census_Geometry._meta.db_table)} AS g
+            WHERE g.geom_hash = r.geom_hash
+            """
+        )
+        rows = cursor.rowcount
+        cursor.execute(f"ALTER TABLE {rows_table} ALTER COLUMN geom SET NOT NULL")
+        cursor.execute(f"ALTER TABLE {rows_table} ALTER COLUMN geom_hash DROP NOT NULL")
+        cursor.execute(f"DROP INDEX {quote(_rows_table(config) + '_geom_hash')}")
+        cursor.execute(f"ALTER TABLE {rows_table} RENAME TO {table}")
+        cursor.execute(f"CREATE INDEX {quote(meta.db_table + '_geom_id')} ON {table} USING GIST (geom)")
+
+    prune_census_geometry()
+
+    logger.info(f"Restored inline {unit_type} geometry for {rows} rows")
+    return {"unit_type": unit_type, "rows": rows}
+
+
+def prune_census_geometry() -> int:
+    """Delete geometries no deduplicated unit references any more"""
+    quote = connection.ops.quote_name
+    references = [
+        f"NOT EXISTS (SELECT 1 FROM {quote(_rows_table(config))} AS r WHERE r.geom_hash = g.geom_hash)"
+        for unit_type, config in CENSUS_FINGERPRINT_UNITS.items()
+        if census_geometry_storage_mode(unit_type) == "deduplicated"
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            DELETE FROM {quote(Census_Geometry._meta.db_table)} AS g
+            WHERE {" AND ".join(references) or "TRUE"}
+            """
+        )
+        return cursor.rowcount
+
+
+def vacuum_census_unit_table(unit_type: str):
+    """VACUUM FULL the unit's physical table, returning space freed by a switch (outside a transaction)"""
+    config = _unit_config(unit_type)
+    table = (
+        _rows_table(config) if census_geometry_storage_mode(unit_type) == "deduplicated"
+        else config["model"]._meta.db_table
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"VACUUM FULL ANALYZE {connection.ops.quote_name(table)}")
+
+
+def census_geometry_storage_report() -> Dict:
+    """
+    Storage mode, row and geometry counts, and on-disk size of every TIGER unit type
+
+    Returns:
+        dict with units (one entry per unit type) and geometry_table_bytes
+    """
+    quote = connection.ops.quote_name
+    units = []
+
+    with connection.cursor() as cursor:
+        for unit_type, config in CENSUS_FINGERPRINT_UNITS.items():
+            mode = census_geometry_storage_mode(unit_type)
+            table = _rows_table(config) if mode == "deduplicated" else config["model"]._meta.db_table
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table])
+            if not cursor.fetchone()[0]:
+                continue
+
+            cursor.execute(
+                f"""
+                SELECT count(*), count(DISTINCT geom_hash), pg_total_relation_size(%s)
+                FROM {quote(table)}
+                """,
+                [table],
+            )
+            rows, geometries, size = cursor.fetchone()
+            units.append({
+                "unit_type": unit_type,
+                "mode": mode,
+                "rows": rows,
+                "distinct_geometries": geometries,
+                "table_bytes": size,
+            })
+
+        cursor.execute("SELECT pg_total_relation_size(%s)", [Census_Geometry._meta.db_table])
+        geometry_bytes = cursor.fetchone()[0]
+
+    return {"units": units, "geometry_table_bytes": geometry_bytes}
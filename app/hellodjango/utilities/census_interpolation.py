@@ -0,0 +1,194 @@
+"""
+Areal interpolation over precomputed census crosswalk weights
+
+Reallocates values keyed by source GEOIDs (donations per VTD, counts per ZCTA)
+onto a target unit type without touching geometry. The weights come from
+United_States_Census_Unit_Crosswalk (see census_crosswalks.py):
+
+    target_values = W @ source_values
+
+where W is a sparse (targets x sources) matrix of area_weight or population_weight,
+summed over state tiles. W is built once per (source, target, year, weight) and
+cached in the process; it is rebuilt when a crosswalk tile checkpoint changes.
+Each request is then a GEOID lookup plus one sparse matrix-vector product.
+
+Values are treated as counts (extensive): a source split 60/40 gives 60% of its
+value to one target and 40% to the other.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.db.models import Count, Max
+from scipy import sparse
+
+from locations.models import United_States_Census_Crosswalk_Tile, United_States_Census_Unit_Crosswalk
+
+from .dispatchers import CENSUS_CROSSWALK_UNITS
+
+logger = logging.getLogger(__name__)
+
+# Crosswalk column holding each weight kind
+INTERPOLATION_WEIGHTS = {
+    "area": "area_weight",
+    "population": "population_weight",
+}
+
+_weight_matrices = {}
+_weight_matrices_lock = threading.Lock()
+
+
+def _crosswalk_version(source_type: str, target_type: str, year: int) -> Tuple:
+    """Changes whenever a tile of the crosswalk is (re)built or reset"""
+    tiles = United_States_Census_Crosswalk_Tile.objects.filter(
+        source_type=source_type, target_type=target_type, year=year
+    ).aggregate(tiles=Count("id"), latest=Max("completed_at"))
+    return tiles["tiles"], tiles["latest"]
+
+
+def _load_weight_matrix(source_type: str, target_type: str, year: int, weight: str) -> Dict:
+    """Read the pair weights (summed over state tiles) into a CSR matrix"""
+    crosswalk_table = connection.ops.quote_name(United_States_Census_Unit_Crosswalk._meta.db_table)
+    weight_column = connection.ops.quote_name(INTERPOLATION_WEIGHTS[weight])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT source_geoid, target_geoid, sum({weight_column})
+            FROM {crosswalk_table}
+            WHERE source_type = %s AND target_type = %s AND year = %s
+              AND {weight_column} IS NOT NULL
+            GROUP BY source_geoid, target_geoid
+            """,
+            [source_type, target_type, year],
+        )
+        pairs = pd.DataFrame(cursor.fetchall(), columns=["source", "target", "weight"])
+
+    if pairs.empty:
+        raise ValueError(
+            f"No {weight} weights for {source_type} x {target_type} ({year}); "
+            f"build it with: manage.py build_crosswalk --source {source_type} --target {target_type} "
+            f"--year {year}" + (" --population" if weight == "population" else "")
+        )
+
+    source_codes, source_geoids = pd.factorize(pairs["source"])
+    target_codes, target_geoids = pd.factorize(pairs["target"])
+    matrix = sparse.csr_matrix(
+        (pairs["weight"].to_numpy(dtype=np.float64), (target_codes, source_codes)),
+        shape=(len(target_geoids), len(source_geoids)),
+    )
+
+    logger.info(
+        f"Loaded {source_type} x {target_type} ({year}) {weight} weights: "
+        f"{len(source_geoids)} sources, {len(target_geoids)} targets, {matrix.nnz} pairs"
+    )
+    return {
+        "sources": pd.Index(source_geoids),
+        "targets": np.asarray(target_geoids, dtype=object),
+        "matrix": matrix,
+    }
+
+
+def get_weight_matrix(source_type: str, target_type: str, year: int, weight: str = "area") -> Dict:
+    """
+    Cached sparse weight matrix of a crosswalk
+
+    Returns:
+        dict with sources (pd.Index of source GEOIDs), targets (array of target
+        GEOIDs) and matrix (CSR, targets x sources)
+    """
+    for unit_type in (source_type, target_type):
+        if unit_type not in CENSUS_CROSSWALK_UNITS:
+            raise ValueError(f"Unknown census unit type: {unit_type}")
+    if weight not in INTERPOLATION_WEIGHTS:
+        raise ValueError(f"Unknown weight: {weight} (expected one of {', '.join(INTERPOLATION_WEIGHTS)})")
+
+    key = (source_type, target_type, year, weight)
+    version = _crosswalk_version(source_type, target_type, year)
+
+    cached = _weight_matrices.get(key)
+    if cached and cached["version"] == version:
+        return cached
+
+    with _weight_matrices_lock:
+        cached = _weight_matrices.get(key)
+        if cached and cached["version"] == version:
+            return cached
+        cached = dict(_load_weight_matrix(source_type, target_type, year, weight), version=version)
+        _weight_matrices[key] = cached
+        return cached
+
+
+def interpolate_census_values(
+    values: Union[Mapping[str, float], Iterable[Tuple[str, float]]],
+    source_type: str,
+    target_type: str,
+    year: int = 2020,
+    weight: str = "area",
+) -> Dict:
+    """
+    Reallocate values keyed by source GEOID onto target units
+
+    Args:
+        values: {source_geoid: value} or (source_geoid, value) pairs; repeated
+            GEOIDs are summed
+        source_type, target_type: Keys of CENSUS_CROSSWALK_UNITS
+        year: Census year of the crosswalk
+        weight: 'area' or 'population'
+
+    Returns:
+        dict with values ({target_geoid: value}, targets with a non-zero result),
+        unmatched (source GEOIDs missing from the crosswalk), source_total and
+        allocated_total
+    """
+    weights = get_weight_matrix(source_type, target_type, year, weight)
+
+    if isinstance(values, Mapping):
+        values = values.items()
+    series = pd.DataFrame(list(values), columns=["geoid", "value"])
+    series["geoid"] = series["geoid"].astype(str)
+    series["value"] = series["value"].astype(np.float64)
+    series = series.groupby("geoid", sort=False)["value"].sum()
+
+    positions = weights["sources"].get_indexer(series.index)
+    matched = positions >= 0
+
+    vector = np.zeros(len(weights["sources"]), dtype=np.float64)
+    np.add.at(vector, positions[matched], series.to_numpy()[matched])
+    allocated = weights["matrix"] @ vector
+
+    nonzero = np.flatnonzero(allocated)
+    return {
+        "source_type": source_type,
+        "target_type": target_type,
+        "year": year,
+        "weight": weight,
+        "values": dict(zip(weights["targets"][nonzero].tolist(), allocated[nonzero].tolist())),
+        "unmatched": series.index[~matched].tolist(),
+        "source_total": float(series.sum()),
+        "allocated_total": float(allocated.sum()),
+    }
+
+
+def interpolate_queryset(
+    queryset,
+    geoid_field: str,
+    value_field: str,
+    source_type: str,
+    target_type: str,
+    year: int = 2020,
+    weight: str = "area",
+) -> Dict:
+    """
+    Reallocate a queryset column keyed by a source GEOID column onto target units
+
+    Example:
+        interpolate_queryset(Donation.objects.filter(cycle=2024), "vtd_geoid", "amount",
+                             "vtd", "cd", 2020)
+    """
+    rows = queryset.exclude(**{f"{geoid_field}__isnull": True}).values_list(geoid_field, value_field)
+    return interpolate_census_values(rows, source_type, target_type, year, weight)
@@ -0,0 +1,224 @@
+"""
+PostGIS builder for pre-computed census unit intersections
+
+Fills the models in CENSUS_INTERSECTION_DISPATCHER (County x CD, VTD x CD) one
+state at a time, in a single INSERT ... SELECT per state:
+1. each source unit of the state probes the target table's GiST index (&&),
+   restricted to the same state and year; candidate pairs are then tested with
+   ST_Intersects
+2. a unit covered by the other keeps its own geometry; only true overlaps pay
+   for ST_Intersection
+3. areas are measured in an equal-area projection (AREA_SRID); each unit's own
+   area is computed once, not once per pair, and only for targets that have a
+   candidate pair
+4. slivers below CENSUS_INTERSECTION_MIN_AREA_SQM (edge-touching boundaries)
+   are dropped, and each row is classified (relationship, is_dominant)
+
+States are independent, so they can be built in parallel
+(see locations.tasks.build_census_intersections_all). Existing rows of a
+(year, state) are replaced in the same transaction.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .dispatchers import CENSUS_INTERSECTION_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+# Equal-area projection used for intersection areas (CONUS Albers)
+AREA_SRID = 5070
+
+# A unit counts as fully inside the other above this share (boundary digitizing noise)
+FULL_CONTAINMENT_PCT = 99.9
+
+
+def _intersection_config(intersection_type: str) -> Dict:
+    if intersection_type not in CENSUS_INTERSECTION_DISPATCHER:
+        raise ValueError(f"Unknown intersection type: {intersection_type}")
+    return CENSUS_INTERSECTION_DISPATCHER[intersection_type]
+
+
+def _relationship_sql(config: Dict) -> str:
+    """CASE expression classifying a row from its source/target shares"""
+    labels = config["relationship"]
+    return f"""
+        CASE
+            WHEN pct_of_source >= {FULL_CONTAINMENT_PCT} THEN '{labels["source_in_target"]}'
+            WHEN pct_of_target >= {FULL_CONTAINMENT_PCT} THEN '{labels["target_in_source"]}'
+            ELSE '{labels["split"]}'
+        END
+    """
+
+
+def _intersection_insert_sql(config: Dict) -> str:
+    """Build the INSERT ... SELECT that intersects every source unit of one state"""
+    quote = connection.ops.quote_name
+    meta = config["model"]._meta
+    source_table = quote(config["source_model"]._meta.db_table)
+    target_table = quote(config["target_model"]._meta.db_table)
+
+    columns = [
+        meta.get_field(config["source_field"]).column,
+        meta.get_field(config["target_field"]).column,
+        "year",
+        "intersection_geom",
+        "intersection_area_sqm",
+        config["source_pct_field"],
+        config["target_pct_field"],
+        "is_dominant",
+        "computed_at",
+    ]
+    values = [
+        "source_id",
+        "target_id",
+        "%(year)s",
+        "ST_Multi(ST_CollectionExtract(geom, 3))",
+        "round(area)",
+        "pct_of_source",
+        "pct_of_target",
+        "pct_of_source > 50",
+        "now()",
+    ]
+    if config["relationship"]:
+        columns.append("relationship")
+        values.append(_relationship_sql(config))
+
+    return f"""
+        WITH sources AS MATERIALIZED (
+            SELECT id,
+                   CASE WHEN ST_IsValid(geom) THEN geom ELSE ST_MakeValid(geom) END AS geom,
+                   ST_Area(ST_Transform(geom, {AREA_SRID})) AS area
+            FROM {source_table}
+            WHERE year = %(year)s AND statefp = %(statefp)s
+        ),
+        -- Each source probes the target table's GiST index
+        pairs AS MATERIALIZED (
+            SELECT s.id AS source_id, t.id AS target_id
+            FROM sources AS s
+            JOIN {target_table} AS t
+              ON t.geom && s.geom AND t.year = %(year)s AND t.statefp = %(statefp)s
+        ),
+        -- Validity and area only for targets that have a candidate pair
+        targets AS MATERIALIZED (
+            SELECT id,
+                   CASE WHEN ST_IsValid(geom) THEN geom ELSE ST_MakeValid(geom) END AS geom,
+                   ST_Area(ST_Transform(geom, {AREA_SRID})) AS area
+            FROM {target_table}
+            WHERE id IN (SELECT target_id FROM pairs)
+        ),
+        cut AS (
+            SELECT s.id AS source_id, t.id AS target_id, s.area AS source_area, t.area AS target_area,
+                   CASE
+                       WHEN ST_CoveredBy(s.geom, t.geom) THEN s.geom
+                       WHEN ST_CoveredBy(t.geom, s.geom) THEN t.geom
+                       ELSE ST_Intersection(s.geom, t.geom)
+                   END AS geom
+            FROM pairs AS p
+            JOIN sources AS s ON s.id = p.source_id
+            JOIN targets AS t ON t.id = p.target_id
+            WHERE ST_Intersects(t.geom, s.geom)
+        ),
+        measured AS (
+            SELECT source_id, target_id, geom, area,
+                   COALESCE(LEAST(100, round((100 * area / NULLIF(source_area, 0))::numeric, 2)), 0) AS pct_of_source,
+                   COALESCE(LEAST(100, round((100 * area / NULLIF(target_area, 0))::numeric, 2)), 0) AS pct_of_target
+            FROM (
+                SELECT cut.*, ST_Area(ST_Transform(cut.geom, {AREA_SRID})) AS area FROM cut
+            ) AS areas
+            WHERE area >= %(min_area)s
+        )
+        INSERT INTO {quote(meta.db_table)} ({", ".join(quote(column) for column in columns)})
+        SELECT {", ".join(values)}
+        FROM measured
+    """
+
+
+def build_census_intersections_for_state(intersection_type: str, year: int, statefp: str) -> int:
+    """
+    Rebuild the intersections of one state
+
+    Args:
+        intersection_type: Key of CENSUS_INTERSECTION_DISPATCHER ('county_cd', 'vtd_cd')
+        year: Census year of both unit types
+        statefp: 2-digit state FIPS code
+
+    Returns:
+        Number of intersections written
+    """
+    config = _intersection_config(intersection_type)
+    quote = connection.ops.quote_name
+    meta = config["model"]._meta
+    params = {
+        "year": year,
+        "statefp": statefp,
+        "min_area": settings.CENSUS_INTERSECTION_MIN_AREA_SQM,
+    }
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            DELETE FROM {quote(meta.db_table)} AS i
+            USING {quote(config["source_model"]._meta.db_table)} AS s
+            WHERE i.{quote(meta.get_field(config["source_field"]).column)} = s.id
+              AND i.year = %(year)s
+              AND s.statefp = %(statefp)s
+            """,
+            params,
+        )
+        cursor.execute(_intersection_insert_sql(config), params)
+        return cursor.rowcount
+
+
+def get_intersection_states(intersection_type: str, year: int) -> List[str]:
+    """State FIPS codes that have source units loaded for a year"""
+    config = _intersection_config(intersection_type)
+    return list(
+        config["source_model"].objects.filter(year=year)
+        .values_list("statefp", flat=True)
+        .distinct()
+        .order_by("statefp")
+    )
+
+
+def build_census_intersections(
+    intersection_type: str,
+    year: int,
+    state_fips: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """
+    Build intersections for several states in this process, one after another
+
+    Args:
+        intersection_type: Key of CENSUS_INTERSECTION_DISPATCHER
+        year: Census year of both unit types
+        state_fips: State FIPS codes (default: every state with source units loaded)
+
+    Returns:
+        dict with intersections written, states built and elapsed seconds
+    """
+    start_time = time.time()
+    state_fips = list(state_fips or get_intersection_states(intersection_type, year))
+
+    total = 0
+    for statefp in state_fips:
+        state_time = time.time()
+        written = build_census_intersections_for_state(intersection_type, year, statefp)
+        total += written
+        logger.info(
+            f"Built {intersection_type} intersections for state {statefp} ({year}): "
+            f"{written} rows in {time.time() - state_time:.2f}s"
+        )
+
+    elapsed = time.time() - start_time
+    return {
+        "type": intersection_type,
+        "year": year,
+        "intersections": total,
+        "states": len(state_fips),
+        "elapsed_seconds": round(elapsed, 2),
+    }
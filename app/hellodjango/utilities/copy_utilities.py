@@ -0,0 +1,79 @@
+"""
+PostgreSQL COPY helpers
+
+Bulk writes go through COPY ... FROM STDIN into a temporary table, followed by
+one set-based statement against the target table. This is much faster than
+row-by-row INSERT/UPDATE and keeps the write to a single transaction.
+"""
+
+import io
+from typing import Iterable, List, Sequence, Tuple
+
+from django.db import connection
+
+# Temporary table column definitions are (name, PostgreSQL type) pairs
+ColumnDefinitions = Sequence[Tuple[str, str]]
+
+
+def _copy_value(value) -> str:
+    """Encode one value for COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def create_temp_table(cursor, table: str, columns: ColumnDefinitions):
+    """Create a temporary table dropped at the end of the current transaction"""
+    definitions = ", ".join(f"{connection.ops.quote_name(name)} {sql_type}" for name, sql_type in columns)
+    cursor.execute(f"CREATE TEMPORARY TABLE {connection.ops.quote_name(table)} ({definitions}) ON COMMIT DROP")
+
+
+def copy_rows(cursor, table: str, columns: List[str], rows: Iterable[Sequence], buffer_rows: int = 100000) -> int:
+    """
+    COPY rows into a table
+
+    Args:
+        cursor: Django cursor on a PostgreSQL (psycopg2) connection
+        table: Target table
+        columns: Column names, in row order
+        rows: Iterable of value sequences (None -> NULL)
+        buffer_rows: Rows encoded per COPY round trip
+
+    Returns:
+        Number of rows copied
+    """
+    statement = (
+        f"COPY {connection.ops.quote_name(table)} "
+        f"({', '.join(connection.ops.quote_name(column) for column in columns)}) FROM STDIN"
+    )
+
+    copied = 0
+    buffer = io.StringIO()
+    buffered = 0
+
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+        buffered += 1
+
+        if buffered >= buffer_rows:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            copied += buffered
+            buffer = io.StringIO()
+            buffered = 0
+
+    if buffered:
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        copied += buffered
+
+    return copied
@@ -102,3 +102,256 @@ DOWNLOADS_DISPATCHER = {
         / "combined-shapefile-with-oceans-now.shp",
     },
 }
+
+# Census units that are assigned to United_States_Address rows, in hierarchical order.
+# Each entry names the TIGER model, the column holding the unit GEOID and state FIPS
+# (blocks use the 2020-suffixed columns) and the address field that receives the GEOID.
+
+CENSUS_UNIT_ASSIGNMENT_DISPATCHER = {
+    "state": {
+        "model": United_States_Census_State,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "state_geoid",
+    },
+    "county": {
+        "model": United_States_Census_County,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "county_geoid",
+    },
+    "tract": {
+        "model": United_States_Census_Tract,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "tract_geoid",
+    },
+    "block_group": {
+        "model": United_States_Census_Block_Group,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "block_group_geoid",
+    },
+    "block": {
+        "model": United_States_Census_Tabulation_Block,
+        "geoid_field": "geoid20",
+        "statefp_field": "statefp20",
+        "address_field": "block_geoid",
+    },
+    "vtd": {
+        "model": United_States_Census_Voter_Tabulation_District,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "vtd_geoid",
+    },
+    "cd": {
+        "model": United_States_Census_Congressional_District,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+        "address_field": "cd_geoid",
+    },
+}
+
+# District types stored in United_States_Census_Block_Crosswalk. Blocks are matched
+# by their representative point. "scope" lists the block columns (block field, district
+# field) used to narrow candidates; ZCTAs cross state lines and are matched nationally.
+
+BLOCK_CROSSWALK_DISTRICT_DISPATCHER = {
+    "vtd": {
+        "model": United_States_Census_Voter_Tabulation_District,
+        "geoid_field": "geoid",
+        "crosswalk_field": "vtd_geoid",
+        "scope": [("statefp20", "statefp"), ("countyfp20", "countyfp")],
+    },
+    "cd": {
+        "model": United_States_Census_Congressional_District,
+        "geoid_field": "geoid",
+        "crosswalk_field": "cd_geoid",
+        "scope": [("statefp20", "statefp")],
+    },
+    "sldu": {
+        "model": United_States_Census_State_Legislative_District_Upper,
+        "geoid_field": "geoid",
+        "crosswalk_field": "sldu_geoid",
+        "scope": [("statefp20", "statefp")],
+    },
+    "sldl": {
+        "model": United_States_Census_State_Legislative_District_Lower,
+        "geoid_field": "geoid",
+        "crosswalk_field": "sldl_geoid",
+        "scope": [("statefp20", "statefp")],
+    },
+    "place": {
+        "model": United_States_Census_Place,
+        "geoid_field": "geoid",
+        "crosswalk_field": "place_geoid",
+        "scope": [("statefp20", "statefp")],
+    },
+    "zcta": {
+        "model": United_States_Census_ZCTA,
+        "geoid_field": "geoid",
+        "crosswalk_field": "zcta_geoid",
+        "scope": [],
+    },
+}
+
+# Pre-computed unit x unit intersections (locations/models/intersections). "source" is
+# the unit whose share is measured first (pct_of_<source>); both units are scoped to the
+# same state. "relationship" names the classification values when the model stores one.
+
+CENSUS_INTERSECTION_DISPATCHER = {
+    "county_cd": {
+        "model": CountyCongressionalDistrictIntersection,
+        "source_model": United_States_Census_County,
+        "source_field": "county",
+        "target_model": United_States_Census_Congressional_District,
+        "target_field": "cd",
+        "source_pct_field": "pct_of_county",
+        "target_pct_field": "pct_of_cd",
+        "relationship": {
+            "source_in_target": "COUNTY_IN_CD",
+            "target_in_source": "CD_IN_COUNTY",
+            "split": "SPLIT",
+        },
+    },
+    "vtd_cd": {
+        "model": VTDCongressionalDistrictIntersection,
+        "source_model": United_States_Census_Voter_Tabulation_District,
+        "source_field": "vtd",
+        "target_model": United_States_Census_Congressional_District,
+        "target_field": "cd",
+        "source_pct_field": "pct_of_vtd",
+        "target_pct_field": "pct_of_cd",
+        "relationship": None,
+    },
+}
+
+# Unit types the generic crosswalk engine (utilities/census_crosswalks.py) can pair.
+# "statefp_field" is None for units that cross state lines (ZCTAs); those are tiled
+# by intersecting them with the state boundary instead.
+
+CENSUS_CROSSWALK_UNITS = {
+    "state": {
+        "model": United_States_Census_State,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "county": {
+        "model": United_States_Census_County,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "tract": {
+        "model": United_States_Census_Tract,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "block_group": {
+        "model": United_States_Census_Block_Group,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "vtd": {
+        "model": United_States_Census_Voter_Tabulation_District,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "cd": {
+        "model": United_States_Census_Congressional_District,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "sldu": {
+        "model": United_States_Census_State_Legislative_District_Upper,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "sldl": {
+        "model": United_States_Census_State_Legislative_District_Lower,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "place": {
+        "model": United_States_Census_Place,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "zcta": {
+        "model": United_States_Census_ZCTA,
+        "geoid_field": "geoid",
+        "statefp_field": None,
+    },
+}
+
+# TIGER unit types fingerprinted by utilities/census_fingerprints.py, keyed like
+# fetch_census_data --unit. "mapping" is the LayerMapping dict whose model-side keys
+# (minus geom) are the attribute columns hashed into attr_hash.
+
+CENSUS_FINGERPRINT_UNITS = {
+    "state": {
+        "model": United_States_Census_State,
+        "mapping": united_states_census_state_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "county": {
+        "model": United_States_Census_County,
+        "mapping": united_states_census_county_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "cd": {
+        "model": United_States_Census_Congressional_District,
+        "mapping": united_states_census_congressional_district_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "sldu": {
+        "model": United_States_Census_State_Legislative_District_Upper,
+        "mapping": united_states_census_state_legislative_district_upper_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "sldl": {
+        "model": United_States_Census_State_Legislative_District_Lower,
+        "mapping": united_states_census_state_legislative_district_lower_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "tract": {
+        "model": United_States_Census_Tract,
+        "mapping": united_states_census_tract_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "blockgroup": {
+        "model": United_States_Census_Block_Group,
+        "mapping": united_states_census_block_group_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "tabblock": {
+        "model": United_States_Census_Tabulation_Block,
+        "mapping": united_states_census_tabulation_block_mapping,
+        "geoid_field": "geoid20",
+        "statefp_field": "statefp20",
+    },
+    "vtd": {
+        "model": United_States_Census_Voter_Tabulation_District,
+        "mapping": united_states_census_voter_tabulation_district_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "place": {
+        "model": United_States_Census_Place,
+        "mapping": united_states_census_place_mapping,
+        "geoid_field": "geoid",
+        "statefp_field": "statefp",
+    },
+    "zcta": {
+        "model": United_States_Census_ZCTA,
+        "mapping": united_states_census_zcta_mapping_2020,
+        "geoid_field": "geoid",
+        "statefp_field": None,
+    },
+}
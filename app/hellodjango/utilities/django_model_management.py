@@ -14,6 +14,8 @@ logger = logging.getLogger("django")
 
 from django.db.models import Max
 
+from .gadm_resolution import GADM_FIELD_NAMES, resolve_gadm_units
+
 
 def reset_primary_keys(target_app: str) -> bool:
     """
@@ -112,6 +114,16 @@ def update_model_geometry_foreign_keys(target_object, model_keys_and_names: dict
         tof for tof in target_object_fields if tof in model_keys_and_names.keys()
     ]
 
+    # GADM keys all come from the deepest level covering the geometry,
+    # whose row carries its ancestors
+
+    gadm_keys = [k for k in keys_to_test if k in GADM_FIELD_NAMES]
+    if gadm_keys:
+        gadm_units = resolve_gadm_units(target_object.geom)
+        for k in gadm_keys:
+            setattr(target_object, f"{k}_id", gadm_units[f"{k}_id"])
+        keys_to_test = [k for k in keys_to_test if k not in gadm_keys]
+
     # now we test the values
 
     for k in keys_to_test:
@@ -0,0 +1,190 @@
+"""
+Deepest-level-first GADM resolution
+
+Every Admin_Level_N row already carries its ancestors (gid_0..gid_{N-1} foreign
+keys, or the gid_k_string codes before FK resolution has run). So a location's
+six GADM keys come from a single containment test against the deepest level
+that covers it:
+
+    level 5 -> level 4 -> ... -> level 0, stop at the first hit
+
+Levels with no polygon near the point cost only a GiST index probe. Levels that
+are not loaded are skipped entirely. When the country is known, the search
+starts at the deepest level loaded for that country.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from django.db import connection
+
+from .dispatchers import GADM_MODEL_NAMES
+
+logger = logging.getLogger(__name__)
+
+GADM_LEVELS = list(range(len(GADM_MODEL_NAMES)))
+
+# GADM foreign-key fields of a location, level order
+GADM_FIELD_NAMES = [f"gid_{level}" for level in GADM_LEVELS]
+
+TEMP_TABLE = "tmp_gadm_pending"
+
+_loaded_levels: Optional[List[int]] = None
+_country_depths: Optional[Dict[str, int]] = None
+
+
+def gadm_loaded_levels(refresh: bool = False) -> List[int]:
+    """GADM levels that have rows, deepest first (cached per process)"""
+    global _loaded_levels
+    if _loaded_levels is None or refresh:
+        _loaded_levels = [level for level in reversed(GADM_LEVELS) if GADM_MODEL_NAMES[level].objects.exists()]
+    return _loaded_levels
+
+
+def gadm_country_depths(refresh: bool = False) -> Dict[str, int]:
+    """
+    Deepest loaded GADM level per country code (GID_0, e.g. 'USA': 2), cached per process
+    """
+    global _country_depths
+    if _country_depths is None or refresh:
+        depths = {}
+        for level in GADM_LEVELS:
+            model = GADM_MODEL_NAMES[level]
+            codes = (
+                model.objects.values_list("gid_0", flat=True)
+                if level == 0
+                else model.objects.values_list("gid_0_string", flat=True)
+            )
+            for code in codes.distinct():
+                if code:
+                    depths[code] = level
+        _country_depths = depths
+    return _country_depths
+
+
+def _ancestor_id(unit, level: int) -> Optional[int]:
+    """Id of a unit's ancestor at a shallower level (FK, falling back to the code string)"""
+    ancestor_id = getattr(unit, f"gid_{level}_id")
+    if ancestor_id is not None:
+        return ancestor_id
+
+    code = getattr(unit, f"gid_{level}_string", None)
+    if not code:
+        return None
+    return (
+        GADM_MODEL_NAMES[level].objects.filter(**{f"gid_{level}": code})
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def resolve_gadm_units(geom, country: Optional[str] = None) -> Dict[str, Optional[int]]:
+    """
+    GADM unit ids of every level for a geometry, from the deepest covering polygon
+
+    Args:
+        geom: GEOS geometry (SRID 4326)
+        country: GID_0 code, when known, to start at that country's deepest level
+
+    Returns:
+        dict of 'gid_0_id'..'gid_5_id' -> Admin_Level_N id or None
+    """
+    units = {f"{name}_id": None for name in GADM_FIELD_NAMES}
+    if geom is None:
+        return units
+
+    levels = gadm_loaded_levels()
+    if country and country in gadm_country_depths():
+        levels = [level for level in levels if level <= gadm_country_depths()[country]]
+
+    for level in levels:
+        unit = GADM_MODEL_NAMES[level].objects.filter(geom__intersects=geom).order_by("id").first()
+        if unit is None:
+            continue
+
+        units[f"gid_{level}_id"] = unit.id
+        for ancestor in range(level):
+            units[f"gid_{ancestor}_id"] = _ancestor_id(unit, ancestor)
+        return units
+
+    return units
+
+
+def _ancestor_sql(level: int, ancestor: int, alias: str) -> str:
+    """Ancestor id of a level-N row in SQL, falling back to its code string"""
+    if ancestor == level:
+        return f"{alias}.id"
+
+    ancestor_table = connection.ops.quote_name(GADM_MODEL_NAMES[ancestor]._meta.db_table)
+    return f"""COALESCE(
+        {alias}.gid_{ancestor}_id,
+        (SELECT x.id FROM {ancestor_table} AS x WHERE x.gid_{ancestor} = {alias}.gid_{ancestor}_string
+         ORDER BY x.id LIMIT 1)
+    )"""
+
+
+def resolve_gadm_foreign_keys(model, probe_sql: str) -> Dict[str, int]:
+    """
+    Set gid_0..gid_5 of every row of a location model, deepest level first
+
+    Pending rows are staged in a temporary table; each loaded level, deepest
+    first, assigns the rows it covers (with their ancestors) and removes them
+    from the stage. Rows no level covers get NULLs.
+
+    Must run inside a transaction (the stage is dropped on commit).
+
+    Args:
+        model: Place or Locality (needs gid_0..gid_5 foreign keys)
+        probe_sql: Geometry expression of the row under alias 'source'
+
+    Returns:
+        dict of 'level_N' -> rows resolved at that level, and 'unmatched'
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = [connection.ops.quote_name(model._meta.get_field(name).column) for name in GADM_FIELD_NAMES]
+    counts = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            CREATE TEMPORARY TABLE {TEMP_TABLE} ON COMMIT DROP AS
+            SELECT source.id, {probe_sql} AS geom FROM {table} AS source
+            """
+        )
+
+        for level in gadm_loaded_levels():
+            level_table = connection.ops.quote_name(GADM_MODEL_NAMES[level]._meta.db_table)
+            assignments = ", ".join(
+                f"{column} = {_ancestor_sql(level, index, 'm') if index <= level else 'NULL'}"
+                for index, column in enumerate(columns)
+            )
+
+            cursor.execute(
+                f"""
+                WITH updated AS (
+                    UPDATE {table} AS l SET {assignments}
+                    FROM {TEMP_TABLE} AS p
+                    JOIN LATERAL (
+                        SELECT t.* FROM {level_table} AS t
+                        WHERE ST_Intersects(t.geom, p.geom)
+                        ORDER BY t.id
+                        LIMIT 1
+                    ) AS m ON TRUE
+                    WHERE l.id = p.id
+                    RETURNING l.id
+                )
+                DELETE FROM {TEMP_TABLE} WHERE id IN (SELECT id FROM updated)
+                """
+            )
+            counts[f"level_{level}"] = cursor.rowcount
+
+        cursor.execute(
+            f"""
+            UPDATE {table} AS l SET {", ".join(f"{column} = NULL" for column in columns)}
+            FROM {TEMP_TABLE} AS p
+            WHERE l.id = p.id
+            """
+        )
+        counts["unmatched"] = cursor.rowcount
+
+    return counts
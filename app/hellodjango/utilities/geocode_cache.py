@@ -0,0 +1,175 @@
+"""
+Geocode result cache
+
+Results are keyed on (normalized one-line address, provider) and stored in
+Geocode_Cache_Entry with an expiry; no-matches are stored too. When
+settings.GEOCODE_CACHE_REDIS_URL is set, a Redis tier sits in front of the table
+and is back-filled on table hits.
+
+Cached entries are plain dicts:
+    {"matched": bool, "latitude": float, "longitude": float,
+     "geocode_quality": str, "geocode_source": str}
+A lookup returns None on a miss (never looked up, or expired).
+"""
+
+import json
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from locations.models import Geocode_Cache_Entry
+
+from .address_normalization import clean_address_text
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "geocode"
+
+_redis_client = None
+
+ENTRY_FIELDS = ["matched", "latitude", "longitude", "geocode_quality", "geocode_source"]
+
+
+def normalize_address_key(concatenated_address: str) -> str:
+    """
+    Canonical cache key for a one-line address
+
+    Upper case, punctuation other than '#', '/' and '-' dropped, whitespace collapsed.
+    """
+    return clean_address_text(concatenated_address)
+
+
+def _get_redis():
+    """Return a Redis client for the front tier, or None when not configured/available"""
+    global _redis_client
+
+    if _redis_client is None and settings.GEOCODE_CACHE_REDIS_URL:
+        try:
+            import redis
+
+            _redis_client = redis.Redis.from_url(settings.GEOCODE_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("redis is not installed, geocode cache Redis tier disabled")
+            return None
+
+    return _redis_client
+
+
+def _redis_key(address_key: str, provider: str) -> str:
+    return f"{REDIS_KEY_PREFIX}:{provider}:{address_key}"
+
+
+def _ttl(matched: bool) -> timedelta:
+    days = settings.GEOCODE_CACHE_TTL_DAYS if matched else settings.GEOCODE_CACHE_NEGATIVE_TTL_DAYS
+    return timedelta(days=days)
+
+
+def _redis_set(address_key: str, provider: str, entry: Dict, ttl: timedelta):
+    client = _get_redis()
+    if client is None:
+        return
+
+    try:
+        client.setex(_redis_key(address_key, provider), ttl, json.dumps(entry))
+    except Exception as e:
+        logger.warning(f"Could not write geocode cache entry to Redis: {e}")
+
+
+def get_cached_geocode(address_key: str, provider: str) -> Optional[Dict]:
+    """
+    Look up one cached result (Redis first, then the table)
+    """
+    if not settings.GEOCODE_CACHE_ENABLED:
+        return None
+
+    client = _get_redis()
+    if client is not None:
+        try:
+            cached = client.get(_redis_key(address_key, provider))
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning(f"Could not read geocode cache entry from Redis: {e}")
+
+    row = (
+        Geocode_Cache_Entry.objects.filter(
+            address_key=address_key, provider=provider, expires_at__gt=timezone.now()
+        )
+        .values(*ENTRY_FIELDS, "expires_at")
+        .first()
+    )
+    if row is None:
+        return None
+
+    expires_at = row.pop("expires_at")
+    _redis_set(address_key, provider, row, expires_at - timezone.now())
+    return row
+
+
+def get_cached_geocodes(address_keys: Iterable[str], provider: str) -> Dict[str, Dict]:
+    """
+    Look up many keys with one query; returns {address_key: entry} for hits only
+    """
+    if not settings.GEOCODE_CACHE_ENABLED:
+        return {}
+
+    rows = Geocode_Cache_Entry.objects.filter(
+        address_key__in=set(address_keys), provider=provider, expires_at__gt=timezone.now()
+    ).values("address_key", *ENTRY_FIELDS)
+
+    return {row.pop("address_key"): row for row in rows}
+
+
+def cache_entry(latitude=None, longitude=None, geocode_quality=None, geocode_source=None) -> Dict:
+    """Build a cache entry; call without coordinates for a no-match"""
+    return {
+        "matched": latitude is not None and longitude is not None,
+        "latitude": latitude,
+        "longitude": longitude,
+        "geocode_quality": geocode_quality,
+        "geocode_source": geocode_source,
+    }
+
+
+def set_cached_geocodes(results: Dict[str, Dict], provider: str):
+    """
+    Store results in one upsert; results maps address_key -> entry dict
+    (build entries with cache_entry(); a no-match is cache_entry())
+    """
+    if not settings.GEOCODE_CACHE_ENABLED or not results:
+        return
+
+    now = timezone.now()
+    rows = [
+        Geocode_Cache_Entry(
+            address_key=address_key,
+            provider=provider,
+            expires_at=now + _ttl(entry["matched"]),
+            **entry,
+        )
+        for address_key, entry in results.items()
+    ]
+
+    Geocode_Cache_Entry.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["address_key", "provider"],
+        update_fields=ENTRY_FIELDS + ["updated_at", "expires_at"],
+    )
+
+    for address_key, entry in results.items():
+        _redis_set(address_key, provider, entry, _ttl(entry["matched"]))
+
+
+def set_cached_geocode(address_key: str, provider: str, entry: Dict):
+    """Store one result"""
+    set_cached_geocodes({address_key: entry}, provider)
+
+
+def purge_expired_geocodes() -> int:
+    """Delete expired table rows (Redis expires its own keys)"""
+    deleted, _ = Geocode_Cache_Entry.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -9,7 +9,14 @@ from django.conf import settings
 
 from utilities import *
 from locations.models import *
-from geopy import geocoders
+from .address_normalization import normalize_address_fields
+from .geocoding_client import get_geocoding_client
+from .geocode_cache import (
+    cache_entry,
+    get_cached_geocode,
+    normalize_address_key,
+    set_cached_geocode,
+)
 
 # logging
 
@@ -33,14 +40,55 @@ def distance_to_decimal_degrees(distance, latitude):
 
 
 def geocode_with_nominatim_public(concatenated_address: str) -> str:
+    """
+    Geocode a one-line address with the public Nominatim API
 
-    try:
-        geocoder = geocoders.Nominatim(user_agent=settings.NOMINATIM_USER_AGENT)
-        location = geocoder.geocode(concatenated_address)
+    A single search request (with address details) through the shared,
+    rate-limited Nominatim client. Returns the raw result dict, or False.
+    Cached results are returned without a request, as a dict holding only
+    the latitude and longitude variables.
+    """
 
-        result = geocoder.geocode(concatenated_address, addressdetails=True)
+    address_key = normalize_address_key(concatenated_address)
+    cached = get_cached_geocode(address_key, "nominatim")
 
-        address_information = result.raw
+    if cached is not None:
+        if not cached["matched"]:
+            return False
+        return {
+            settings.NOMINATIM_LATITUDE_VARIABLE: cached["latitude"],
+            settings.NOMINATIM_LONGITUDE_VARIABLE: cached["longitude"],
+        }
+
+    try:
+        response = get_geocoding_client("nominatim").get(
+            "search",
+            params={
+                "q": concatenated_address,
+                "format": "jsonv2",
+                "addressdetails": 1,
+                "limit": 1,
+            },
+        )
+        results = response.json()
+
+        if not results:
+            logging.info(f"No Nominatim match for {concatenated_address}")
+            set_cached_geocode(address_key, "nominatim", cache_entry())
+            return False
+
+        address_information = results[0]
+
+        set_cached_geocode(
+            address_key,
+            "nominatim",
+            cache_entry(
+                latitude=float(address_information[settings.NOMINATIM_LATITUDE_VARIABLE]),
+                longitude=float(address_information[settings.NOMINATIM_LONGITUDE_VARIABLE]),
+                geocode_quality="Approximate",
+                geocode_source="Nominatim",
+            ),
+        )
 
         message = ""
         message += f"Successfully geocoded {concatenated_address}"
@@ -54,3 +102,69 @@ def geocode_with_nominatim_public(concatenated_address: str) -> str:
         logging.error(message)
 
         return False
+
+
+def address_oneline(address) -> str:
+    """
+    Return 'street, city, state zip' for a United_States_Address
+
+    Built from the normalized components, so spelling variants of one address
+    share a geocode cache key.
+    """
+    fields = normalize_address_fields(
+        address.primary_number,
+        address.street_name,
+        address.street_suffix,
+        address.city_name or address.default_city_name,
+        address.state_abbreviation,
+        address.zip5,
+    )
+    street = " ".join(part for part in [fields["primary_number"], fields["full_street"]] if part)
+    state_zip = " ".join(part for part in [fields["state_abbreviation"], fields["zip5"]] if part)
+    return f"{street}, {fields['city_name']}, {state_zip}"
+
+
+def geocode_with_census_oneline(concatenated_address: str):
+    """
+    Geocode a one-line address with the Census onelineaddress endpoint
+
+    Uses the shared, rate-limited Census client. Returns the first address match
+    dict (with 'coordinates' and 'matchedAddress'), or None when nothing matched.
+    Cached results (including no-matches) are answered without a request; cached
+    matches carry 'coordinates' only. Provider errors propagate to the caller.
+    """
+    address_key = normalize_address_key(concatenated_address)
+    cached = get_cached_geocode(address_key, "census")
+
+    if cached is not None:
+        if not cached["matched"]:
+            return None
+        return {"coordinates": {"x": cached["longitude"], "y": cached["latitude"]}}
+
+    response = get_geocoding_client("census").get(
+        "locations/onelineaddress",
+        params={
+            "address": concatenated_address,
+            "benchmark": settings.CENSUS_GEOCODER_BENCHMARK,
+            "format": "json",
+        },
+    )
+    matches = response.json().get("result", {}).get("addressMatches") or []
+
+    if not matches:
+        set_cached_geocode(address_key, "census", cache_entry())
+        return None
+
+    coordinates = matches[0]["coordinates"]
+    set_cached_geocode(
+        address_key,
+        "census",
+        cache_entry(
+            latitude=coordinates["y"],
+            longitude=coordinates["x"],
+            geocode_quality="Interpolated",
+            geocode_source="Census",
+        ),
+    )
+
+    return matches[0]
@@ -0,0 +1,218 @@
+"""
+Shared HTTP client for geocoding providers
+
+One GeocodingClient per provider per process (see get_geocoding_client) holds:
+- a requests.Session with a keep-alive connection pool sized to max_in_flight
+- a token bucket that paces requests to the provider's rate limit
+- a semaphore bounding concurrent in-flight requests
+- retries with backoff on 429 / 5xx / connection errors, honouring Retry-After
+
+The bucket rate adapts: a 429 halves it, every success recovers it a step toward
+the configured rate. Throughput therefore converges on what the provider allows
+instead of being capped by per-request latency. Provider limits come from
+settings.GEOCODING_PROVIDERS.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_CLIENTS: Dict[str, "GeocodingClient"] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+class GeocodingProviderError(Exception):
+    """Raised when a provider request still fails after all retries"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; acquire() blocks until a token is available
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.max_rate = float(rate_per_second)
+        self.rate = float(rate_per_second)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, factor: float = 0.5, floor: float = 0.1):
+        """Cut the rate after the provider pushed back"""
+        with self.lock:
+            self._refill()
+            self.rate = max(floor, self.rate * factor)
+
+    def recover(self, step: float = 0.05):
+        """Move the rate back toward its configured maximum"""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate * step)
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or as an HTTP date"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class GeocodingClient:
+    """
+    Pooled, rate-limited HTTP client for one geocoding provider
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        base_url: str,
+        rate_per_second: float = 1.0,
+        burst: int = 1,
+        max_in_flight: int = 1,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        timeout: float = 30,
+        user_agent: Optional[str] = None,
+    ):
+        self.provider = provider
+        self.base_url = base_url.rstrip("/")
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.in_flight = threading.BoundedSemaphore(self.max_in_flight)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send one request, paced by the bucket and retried on 429 / 5xx
+
+        Raises:
+            GeocodingProviderError: when every attempt failed
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            retry_after = None
+
+            with self.in_flight:
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response = None
+                    last_error = e
+
+            if response is not None:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    self.bucket.recover()
+                    return response
+
+                last_error = f"HTTP {response.status_code}"
+                retry_after = _retry_after_seconds(response)
+                if response.status_code == 429:
+                    self.bucket.throttle()
+                response.close()
+
+            if attempt < self.max_retries:
+                delay = retry_after
+                if delay is None:
+                    delay = self.backoff_seconds * (2 ** attempt) * (1 + random.random())
+                logger.warning(
+                    f"{self.provider} request failed ({last_error}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+        raise GeocodingProviderError(
+            f"{self.provider} request to {url} failed after {self.max_retries + 1} attempts: {last_error}"
+        )
+
+    def get(self, path: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+        return self.request("GET", path, params=params, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def map(self, function: Callable, items: Iterable) -> List:
+        """
+        Apply function (which calls this client) to items with max_in_flight threads
+
+        Results come back in input order; an item whose call raised yields the exception.
+        """
+        def call(item):
+            try:
+                return function(item)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            return list(executor.map(call, items))
+
+
+def get_geocoding_client(provider: str) -> GeocodingClient:
+    """
+    Return this process's client for a provider configured in settings.GEOCODING_PROVIDERS
+    """
+    client = _CLIENTS.get(provider)
+
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(provider)
+            if client is None:
+                if provider not in settings.GEOCODING_PROVIDERS:
+                    raise ValueError(f"Unknown geocoding provider: {provider}")
+                client = GeocodingClient(provider, **settings.GEOCODING_PROVIDERS[provider])
+                _CLIENTS[provider] = client
+
+    return client
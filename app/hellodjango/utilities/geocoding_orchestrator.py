@@ -0,0 +1,183 @@
+"""
+Hedged multi-provider geocoding for single addresses
+
+Providers are tried in settings.GEOCODING_PROVIDER_ORDER:
+1. the first provider is started
+2. if it has not answered after GEOCODING_HEDGE_DELAY_SECONDS, or it answered
+   below the quality bar (or not at all), the next provider is started too
+3. the first result at or above GEOCODING_MIN_QUALITY wins and is returned
+   immediately; slower providers are abandoned
+
+If no result reaches the bar, the best result below it is returned, so a
+rough location is preferred over no match. The winner is recorded in the
+result's geocode_source.
+
+Providers go through the rate-limited clients and the geocode cache. The rate
+limits are per process, so N worker processes can send N times a provider's
+rate; public Nominatim (1 request/second across all clients) is therefore not
+in the default order.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from locations.models import United_States_Address
+
+from .geocoding import address_oneline, geocode_with_census_oneline, geocode_with_nominatim_public
+from .tiger_geocoder import geocode_address_tiger
+
+logger = logging.getLogger(__name__)
+
+QUALITY_RANK = {"Rooftop": 4, "Interpolated": 3, "Approximate": 2, "Zip": 1}
+
+
+def _geocode_census(address: United_States_Address) -> Optional[Dict]:
+    match = geocode_with_census_oneline(address_oneline(address))
+    if not match:
+        return None
+    return {
+        "latitude": float(match["coordinates"]["y"]),
+        "longitude": float(match["coordinates"]["x"]),
+        "geocode_quality": "Interpolated",
+        "geocode_source": "Census",
+    }
+
+
+def _geocode_nominatim(address: United_States_Address) -> Optional[Dict]:
+    match = geocode_with_nominatim_public(address_oneline(address))
+    if not match:
+        return None
+    return {
+        "latitude": float(match[settings.NOMINATIM_LATITUDE_VARIABLE]),
+        "longitude": float(match[settings.NOMINATIM_LONGITUDE_VARIABLE]),
+        "geocode_quality": "Approximate",
+        "geocode_source": "Nominatim",
+    }
+
+
+# provider name -> function(address) returning a geocode result dict or None
+GEOCODING_PROVIDER_FUNCTIONS = {
+    "census": _geocode_census,
+    "tiger_local": geocode_address_tiger,
+    "nominatim": _geocode_nominatim,
+}
+
+
+def meets_quality(result: Optional[Dict], min_quality: str) -> bool:
+    """Whether a geocode result is at least min_quality"""
+    if not result:
+        return False
+    return QUALITY_RANK.get(result.get("geocode_quality"), 0) >= QUALITY_RANK.get(min_quality, 0)
+
+
+def _run_provider(provider: str, address: United_States_Address) -> Optional[Dict]:
+    """Call one provider from a worker thread, releasing the thread's DB connection afterwards"""
+    try:
+        return GEOCODING_PROVIDER_FUNCTIONS[provider](address)
+    finally:
+        connection.close()
+
+
+def geocode_hedged(
+    address: United_States_Address,
+    providers: Optional[List[str]] = None,
+    hedge_delay: Optional[float] = None,
+    min_quality: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """
+    Geocode one address across providers with hedged requests
+
+    Args:
+        address: United_States_Address instance (not saved)
+        providers: Provider names in order (default: settings.GEOCODING_PROVIDER_ORDER)
+        hedge_delay: Seconds to wait for a provider before starting the next
+        min_quality: Lowest geocode_quality accepted without trying further providers
+        timeout: Seconds after which outstanding providers are abandoned
+
+    Returns:
+        dict with 'result' (geocode result dict or None), 'provider' (winner or None)
+        and 'attempts' (provider, outcome, elapsed seconds per provider started)
+    """
+    providers = providers or settings.GEOCODING_PROVIDER_ORDER
+    hedge_delay = settings.GEOCODING_HEDGE_DELAY_SECONDS if hedge_delay is None else hedge_delay
+    min_quality = min_quality or settings.GEOCODING_MIN_QUALITY
+    timeout = settings.GEOCODING_ORCHESTRATOR_TIMEOUT if timeout is None else timeout
+
+    unknown = [provider for provider in providers if provider not in GEOCODING_PROVIDER_FUNCTIONS]
+    if unknown:
+        raise ValueError(f"Unknown geocoding provider(s): {', '.join(unknown)}")
+
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    queue = list(providers)
+    pending = {}
+    attempts = []
+    best = None
+    best_provider = None
+
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="geocode-hedge")
+
+    def start_next():
+        provider = queue.pop(0)
+        pending[executor.submit(_run_provider, provider, address)] = (provider, time.monotonic())
+
+    try:
+        start_next()
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                for provider, started in pending.values():
+                    attempts.append((provider, "timeout", round(time.monotonic() - started, 3)))
+                break
+
+            done, _ = wait(pending, timeout=min(hedge_delay, remaining), return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slow provider: hedge with the next one, keep waiting for both
+                if queue:
+                    start_next()
+                continue
+
+            for future in done:
+                provider, started = pending.pop(future)
+                elapsed = round(time.monotonic() - started, 3)
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Geocoding provider {provider} failed: {e}")
+                    attempts.append((provider, "error", elapsed))
+                    result = None
+                else:
+                    attempts.append((provider, "match" if result else "no_match", elapsed))
+
+                if meets_quality(result, min_quality):
+                    for other_provider, other_started in pending.values():
+                        attempts.append(
+                            (other_provider, "abandoned", round(time.monotonic() - other_started, 3))
+                        )
+                    return {"result": result, "provider": provider, "attempts": attempts}
+
+                if result and (
+                    best is None
+                    or QUALITY_RANK.get(result.get("geocode_quality"), 0)
+                    > QUALITY_RANK.get(best.get("geocode_quality"), 0)
+                ):
+                    best, best_provider = result, provider
+
+                # Not good enough: fall back to the next provider right away,
+                # even while a hedged provider is still running
+                if queue:
+                    start_next()
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {"result": best, "provider": best_provider, "attempts": attempts}
@@ -0,0 +1,287 @@
+"""
+Vectorized census unit assignment with GeoPandas
+
+Offline batch engine for large address tables:
+1. address id/lon/lat are read in id-range chunks into NumPy arrays
+2. boundaries are loaded once per (unit type, state) and kept for the whole run
+3. memberships are computed with geopandas.sjoin (shapely 2 STRtree underneath),
+   one join per unit type and state
+4. results are written back with COPY into a temporary table plus one UPDATE
+
+Reads go to settings.CENSUS_BATCH_READ_DATABASE (e.g. a read replica), so the
+spatial work runs in this process instead of on the primary database.
+
+NOTE: TIGER geometries are NAD83 (4269) and addresses are WGS84 (4326). As in
+census_boundary_index.py, points are tested as-is; the datum shift is well below
+TIGER positional accuracy.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from django.conf import settings
+from django.contrib.gis.db.models.functions import AsWKB
+from django.db import connection, connections, transaction
+
+from locations.models import United_States_Address
+
+from .address_deduplication import assignment_representative_clause, fan_out_census_units
+from .bulk_census_assignment import get_assignable_id_bounds, iter_id_chunks
+from .copy_utilities import copy_rows, create_temp_table
+from .dispatchers import CENSUS_UNIT_ASSIGNMENT_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+POINT_CRS = "EPSG:4326"
+
+TEMP_TABLE = "tmp_census_unit_assignment"
+
+
+class GeoPandasAssignmentEngine:
+    """
+    Assigns census units to address chunks, caching boundaries per (unit type, state)
+    """
+
+    def __init__(self, year: int, unit_types: Optional[Iterable[str]] = None, using: Optional[str] = None):
+        self.year = int(year)
+        self.unit_types = list(unit_types or CENSUS_UNIT_ASSIGNMENT_DISPATCHER.keys())
+        self.using = using or settings.CENSUS_BATCH_READ_DATABASE
+
+        unknown = [u for u in self.unit_types if u not in CENSUS_UNIT_ASSIGNMENT_DISPATCHER]
+        if unknown:
+            raise ValueError(f"Unknown census unit type(s): {', '.join(unknown)}")
+
+        self._states = None
+        self._polygons: Dict[Tuple[str, str], gpd.GeoDataFrame] = {}
+
+    def _read_polygons(self, unit_type: str, statefps: Optional[Iterable[str]] = None) -> gpd.GeoDataFrame:
+        """Read boundaries as a GeoDataFrame with statefp and geoid columns"""
+        config = CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]
+        queryset = config["model"].objects.using(self.using).filter(year=self.year)
+        if statefps is not None:
+            queryset = queryset.filter(**{f"{config['statefp_field']}__in": list(statefps)})
+
+        statefp_values = []
+        geoids = []
+        wkbs = []
+        for statefp, geoid, wkb in (
+            queryset.annotate(wkb=AsWKB("geom"))
+            .values_list(config["statefp_field"], config["geoid_field"], "wkb")
+            .iterator(chunk_size=5000)
+        ):
+            statefp_values.append(statefp)
+            geoids.append(geoid)
+            wkbs.append(bytes(wkb))
+
+        return gpd.GeoDataFrame(
+            {"statefp": statefp_values, "geoid": geoids},
+            geometry=shapely.from_wkb(wkbs) if wkbs else [],
+            crs=POINT_CRS,
+        )
+
+    def states(self) -> gpd.GeoDataFrame:
+        """All state boundaries of the year (loaded once)"""
+        if self._states is None:
+            self._states = self._read_polygons("state")
+        return self._states
+
+    def state_polygons(self, unit_type: str, statefp: str) -> gpd.GeoDataFrame:
+        """Boundaries of one unit type inside one state (loaded once)"""
+        key = (unit_type, statefp)
+        if key not in self._polygons:
+            start_time = time.time()
+            self._polygons[key] = self._read_polygons(unit_type, [statefp])
+            logger.info(
+                f"Loaded {len(self._polygons[key])} {unit_type} {self.year} boundaries "
+                f"for state {statefp} in {time.time() - start_time:.2f}s"
+            )
+        return self._polygons[key]
+
+    def fetch_points(self, start_id: int, end_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read ids and coordinates of assignable addresses in an id range
+
+        Only one row per address fingerprint and point is read; duplicates are filled in
+        by fan_out_census_units().
+        """
+        table = connection.ops.quote_name(United_States_Address._meta.db_table)
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT a.id, ST_X(a.geom), ST_Y(a.geom)
+                FROM {table} AS a
+                WHERE a.id BETWEEN %(start_id)s AND %(end_id)s
+                  AND a.census_year = %(year)s
+                  AND a.geocoded
+                  AND a.geom IS NOT NULL
+                  {assignment_representative_clause("a")}
+                """,
+                {"start_id": start_id, "end_id": end_id, "year": self.year},
+            )
+            rows = cursor.fetchall()
+
+        if not rows:
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty, empty
+
+        data = np.array(rows, dtype=np.float64)
+        return data[:, 0].astype(np.int64), data[:, 1], data[:, 2]
+
+    @staticmethod
+    def _join(points: gpd.GeoDataFrame, polygons: gpd.GeoDataFrame) -> np.ndarray:
+        """GEOID of the polygon containing each point (None where none does), in point order"""
+        if polygons.empty or points.empty:
+            return np.full(len(points), None, dtype=object)
+
+        joined = gpd.sjoin(points, polygons[["geoid", "geometry"]], how="left", predicate="within")
+        # Points on a shared edge can fall in two polygons; keep one
+        joined = joined[~joined.index.duplicated(keep="first")]
+        geoids = joined["geoid"].reindex(points.index)
+        return geoids.where(geoids.notna(), None).to_numpy(dtype=object)
+
+    def assign_points(self, ids: np.ndarray, longitudes: np.ndarray, latitudes: np.ndarray) -> pd.DataFrame:
+        """
+        Compute census units for a batch of points
+
+        Returns:
+            DataFrame with an id column and one column per address field
+        """
+        points = gpd.GeoDataFrame(
+            {"id": ids}, geometry=gpd.points_from_xy(longitudes, latitudes), crs=POINT_CRS
+        )
+        result = pd.DataFrame({"id": ids})
+
+        # States first: every other unit is joined only against its state's boundaries
+        statefps = self._join(points, self.states())
+        if "state" in self.unit_types:
+            result[CENSUS_UNIT_ASSIGNMENT_DISPATCHER["state"]["address_field"]] = statefps
+
+        state_positions = {
+            statefp: np.flatnonzero(statefps == statefp)
+            for statefp in pd.unique(statefps[pd.notna(statefps)])
+        }
+
+        for unit_type in self.unit_types:
+            if unit_type == "state":
+                continue
+
+            geoids = np.full(len(points), None, dtype=object)
+            for statefp, positions in state_positions.items():
+                geoids[positions] = self._join(
+                    points.iloc[positions], self.state_polygons(unit_type, statefp)
+                )
+
+            result[CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]["address_field"]] = geoids
+
+        return result
+
+    def write_assignments(self, assignments: pd.DataFrame) -> int:
+        """
+        Write computed units back with COPY into a temporary table plus one UPDATE
+
+        Every unit of every address in the chunk is overwritten: a unit that no
+        longer contains the point becomes NULL, as the set-based SQL path clears
+        the chunk before reassigning it. Writes always go to the default database.
+
+        Returns:
+            Number of addresses updated
+        """
+        if assignments.empty:
+            return 0
+
+        quote = connection.ops.quote_name
+        fields = [column for column in assignments.columns if column != "id"]
+        columns = ["id"] + fields
+        assignments_sql = ", ".join(
+            f"{quote(field)} = t.{quote(field)}" for field in fields
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            create_temp_table(cursor, TEMP_TABLE, [("id", "bigint")] + [(field, "varchar") for field in fields])
+            copy_rows(cursor, TEMP_TABLE, columns, assignments[columns].itertuples(index=False, name=None))
+            cursor.execute(
+                f"""
+                UPDATE {quote(United_States_Address._meta.db_table)} AS a
+                SET {assignments_sql}, census_units_assigned_at = now()
+                FROM {quote(TEMP_TABLE)} AS t
+                WHERE a.id = t.id
+                """
+            )
+            return cursor.rowcount
+
+
+def assign_census_units_geopandas(
+    year: int,
+    chunk_size: Optional[int] = None,
+    start_id: Optional[int] = None,
+    end_id: Optional[int] = None,
+    unit_types: Optional[Iterable[str]] = None,
+) -> Dict[str, float]:
+    """
+    Assign census units to all geocoded addresses of a census year with the GeoPandas engine
+
+    Args:
+        year: Census year (restricts both addresses and boundaries)
+        chunk_size: Address ids per in-memory chunk (default: CENSUS_GEOPANDAS_CHUNK_SIZE)
+        start_id: First id to process (default: lowest geocoded id)
+        end_id: Last id to process (default: highest geocoded id)
+        unit_types: Keys of CENSUS_UNIT_ASSIGNMENT_DISPATCHER (default: all)
+
+    Returns:
+        dict with addresses assigned, chunk count, duplicates fanned out,
+        elapsed seconds and rows per second
+    """
+    start_time = time.time()
+    chunk_size = chunk_size or settings.CENSUS_GEOPANDAS_CHUNK_SIZE
+
+    if start_id is None or end_id is None:
+        min_id, max_id = get_assignable_id_bounds(year)
+        start_id = min_id if start_id is None else start_id
+        end_id = max_id if end_id is None else end_id
+
+    engine = GeoPandasAssignmentEngine(year, unit_types)
+    total_addresses = 0
+    chunks = 0
+
+    if start_id is not None and end_id is not None:
+        for chunk_start, chunk_end in iter_id_chunks(start_id, end_id, chunk_size):
+            chunk_time = time.time()
+            ids, longitudes, latitudes = engine.fetch_points(chunk_start, chunk_end)
+            chunks += 1
+
+            if not len(ids):
+                continue
+
+            updated = engine.write_assignments(engine.assign_points(ids, longitudes, latitudes))
+            total_addresses += updated
+
+            chunk_elapsed = time.time() - chunk_time
+            logger.info(
+                f"GeoPandas assigned census units for ids {chunk_start}-{chunk_end} ({year}): "
+                f"{updated} addresses in {chunk_elapsed:.2f}s "
+                f"({updated / max(chunk_elapsed, 1e-6):.0f} rows/s)"
+            )
+
+    fanned_out = fan_out_census_units(year)
+
+    elapsed = time.time() - start_time
+    rows_per_second = total_addresses / max(elapsed, 1e-6)
+    logger.info(
+        f"GeoPandas census assignment ({year}) complete: {total_addresses} addresses, "
+        f"{chunks} chunks in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)"
+    )
+
+    return {
+        "year": year,
+        "addresses": total_addresses,
+        "chunks": chunks,
+        "fanned_out": fanned_out,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(rows_per_second, 1),
+    }
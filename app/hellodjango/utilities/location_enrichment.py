@@ -0,0 +1,217 @@
+"""
+Set-based spatial foreign-key enrichment for Places and Localities
+
+update_model_geometry_foreign_keys() resolves one foreign key of one object per
+query. Here every foreign key in MODEL_FIELDS_AND_NAMES_TO_TEST that a location
+model actually has (gid_0..gid_5, timezone, and any census keys) is filled for
+all rows of the model with one UPDATE per target table. Each UPDATE is a lateral
+spatial join on the target's GiST index, except the GADM keys, which are all
+read from the deepest GADM level covering the location.
+
+Places are tested with their point. Localities use ST_PointOnSurface of their
+polygon, so each gets exactly one containing unit. Where several target polygons
+match (e.g. census units loaded for several years), the latest year wins, then
+the lowest id. Rows that match nothing are set to NULL, as before.
+
+United_States_Address.time_zone and utc_offset are filled from Timezone in the
+same pass. The offset is the zone's UTC offset at enrichment time, e.g. '-07:00'.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import connection, transaction
+
+from locations.models import Locality, Place, Timezone, United_States_Address
+
+from .copy_utilities import copy_rows, create_temp_table
+from .dispatchers import MODEL_FIELDS_AND_NAMES_TO_TEST
+from .gadm_resolution import GADM_FIELD_NAMES, resolve_gadm_foreign_keys
+
+logger = logging.getLogger(__name__)
+
+LOCATION_ENRICHMENT_MODELS = [Place, Locality]
+
+TIMEZONE_OFFSET_TABLE = "tmp_timezone_offsets"
+
+
+def location_probe_sql(model, alias: str) -> str:
+    """Geometry a location is tested with: the point itself, or a point inside the polygon"""
+    column = f"{alias}.{connection.ops.quote_name('geom')}"
+    if model._meta.get_field("geom").geom_type == "POINT":
+        return column
+    return f"ST_PointOnSurface({column})"
+
+
+def spatial_foreign_keys(model, fields: Optional[Iterable[str]] = None) -> List[Tuple[str, type]]:
+    """
+    (column, target model) of the spatial foreign keys a location model has
+
+    Args:
+        model: Place or Locality
+        fields: Restrict to these field names (default: all of MODEL_FIELDS_AND_NAMES_TO_TEST)
+    """
+    names = list(fields) if fields is not None else list(MODEL_FIELDS_AND_NAMES_TO_TEST)
+    model_fields = {field.name: field for field in model._meta.concrete_fields}
+
+    return [
+        (model_fields[name].column, MODEL_FIELDS_AND_NAMES_TO_TEST[name])
+        for name in names
+        if name in model_fields and name in MODEL_FIELDS_AND_NAMES_TO_TEST
+    ]
+
+
+def _target_order_sql(target_model) -> str:
+    target_fields = {field.name for field in target_model._meta.concrete_fields}
+    return "t.year DESC, t.id" if "year" in target_fields else "t.id"
+
+
+def enrich_foreign_key(model, column: str, target_model) -> int:
+    """
+    Fill one spatial foreign key for every row of a location model
+
+    Returns:
+        Number of rows whose value changed
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    target_table = connection.ops.quote_name(target_model._meta.db_table)
+    column = connection.ops.quote_name(column)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} AS l SET {column} = m.target_id
+            FROM (
+                SELECT source.id AS location_id, match.id AS target_id
+                FROM {table} AS source
+                LEFT JOIN LATERAL (
+                    SELECT t.id FROM {target_table} AS t
+                    WHERE ST_Intersects(t.geom, {location_probe_sql(model, "source")})
+                    ORDER BY {_target_order_sql(target_model)}
+                    LIMIT 1
+                ) AS match ON TRUE
+            ) AS m
+            WHERE l.id = m.location_id
+              AND l.{column} IS DISTINCT FROM m.target_id
+            """
+        )
+        return cursor.rowcount
+
+
+def enrich_location_foreign_keys(model, fields: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Fill all spatial foreign keys of a location model, one join per target table
+
+    GADM keys are resolved together from the deepest covering level
+    (utilities/gadm_resolution.py) instead of one join per level.
+
+    Must run inside a transaction.
+
+    Returns:
+        dict of field column -> rows changed ('gadm_level_N' / 'gadm_unmatched'
+        -> rows resolved per GADM level)
+    """
+    counts = {}
+    foreign_keys = spatial_foreign_keys(model, fields)
+    gadm_columns = {model._meta.get_field(name).column for name in GADM_FIELD_NAMES}
+
+    if gadm_columns <= {column for column, _ in foreign_keys}:
+        start_time = time.time()
+        for key, value in resolve_gadm_foreign_keys(model, location_probe_sql(model, "source")).items():
+            counts[f"gadm_{key}"] = value
+        logger.info(f"{model.__name__} GADM keys resolved in {time.time() - start_time:.2f}s: {counts}")
+        foreign_keys = [(column, target) for column, target in foreign_keys if column not in gadm_columns]
+
+    for column, target_model in foreign_keys:
+        start_time = time.time()
+        counts[column] = enrich_foreign_key(model, column, target_model)
+        logger.info(
+            f"{model.__name__}.{column}: {counts[column]} rows changed "
+            f"({target_model.__name__}, {time.time() - start_time:.2f}s)"
+        )
+    return counts
+
+
+def format_utc_offset(tzid: str, at: Optional[datetime] = None) -> Optional[str]:
+    """UTC offset of an IANA zone as '+HH:MM' (None for zones Python does not know)"""
+    try:
+        offset = (at or datetime.now(dt_timezone.utc)).astimezone(ZoneInfo(tzid)).utcoffset()
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+    minutes = int(offset.total_seconds() // 60)
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def enrich_address_time_zones(only_missing: bool = True) -> int:
+    """
+    Fill time_zone and utc_offset of geocoded addresses from Timezone polygons
+
+    Args:
+        only_missing: Skip addresses that already have a time_zone
+
+    Returns:
+        Number of addresses updated
+    """
+    address_table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    timezone_table = connection.ops.quote_name(Timezone._meta.db_table)
+
+    now = datetime.now(dt_timezone.utc)
+    offsets = [
+        (tzid, format_utc_offset(tzid, now))
+        for tzid in Timezone.objects.values_list("tzid", flat=True).distinct()
+    ]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_temp_table(cursor, TIMEZONE_OFFSET_TABLE, [("tzid", "text"), ("utc_offset", "text")])
+        copy_rows(cursor, TIMEZONE_OFFSET_TABLE, ["tzid", "utc_offset"], offsets)
+
+        cursor.execute(
+            f"""
+            UPDATE {address_table} AS a
+            SET time_zone = z.tzid, utc_offset = o.utc_offset
+            FROM {timezone_table} AS z
+            LEFT JOIN {TIMEZONE_OFFSET_TABLE} AS o ON o.tzid = z.tzid
+            WHERE a.geom IS NOT NULL
+              AND ST_Intersects(z.geom, a.geom)
+              {"AND a.time_zone IS NULL" if only_missing else ""}
+            """
+        )
+        return cursor.rowcount
+
+
+def enrich_locations(
+    models: Optional[Iterable] = None,
+    fields: Optional[Iterable[str]] = None,
+    include_addresses: bool = True,
+    only_missing_addresses: bool = True,
+) -> Dict[str, object]:
+    """
+    Fill spatial foreign keys of Places and Localities and address time zones
+
+    Args:
+        models: Location models (default: LOCATION_ENRICHMENT_MODELS)
+        fields: Foreign key field names (default: every one the model has)
+        include_addresses: Also fill United_States_Address.time_zone/utc_offset
+        only_missing_addresses: Only addresses without a time_zone
+
+    Returns:
+        dict of model name -> {column: rows changed}, 'addresses' and elapsed seconds
+    """
+    start_time = time.time()
+    stats = {}
+
+    for model in models or LOCATION_ENRICHMENT_MODELS:
+        with transaction.atomic():
+            stats[model.__name__] = enrich_location_foreign_keys(model, fields)
+
+    if include_addresses:
+        stats["addresses"] = enrich_address_time_zones(only_missing_addresses)
+
+    stats["elapsed_seconds"] = round(time.time() - start_time, 2)
+    return stats
@@ -0,0 +1,574 @@
+"""
+Streaming CSV importer for point datasets (addresses and places)
+
+Multi-million-row files (voter rolls, donor lists, facility lists) are read in
+chunks with pandas and never held in memory at once. Per chunk:
+1. mapped columns are cleaned with vectorized string operations
+2. normalization and fingerprints are computed once per distinct address
+3. lon/lat become EWKT points (invalid coordinates -> no geometry)
+4. the chunk is COPYed into a temporary table and merged with set-based SQL
+
+Modes:
+- wipe:   delete existing rows first (addresses; places and addresses for places)
+- append: insert every row (duplicates stay separate rows, see address_deduplication.py)
+- upsert: rows whose address_fingerprint already exists refresh the existing
+          addresses' coordinates instead of adding a row; places match on
+          (name, address)
+
+Each chunk commits on its own. Files can be split into row ranges and imported
+by parallel Celery tasks (import_point_csv_range_task); in upsert mode the merge
+step of concurrent ranges is serialized with an advisory lock so the same new
+address is not inserted twice.
+"""
+
+import logging
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from locations.models import Place, United_States_Address
+
+from .address_normalization import address_fingerprint, normalize_address_fields
+from .copy_utilities import copy_rows, create_temp_table
+
+logger = logging.getLogger(__name__)
+
+POINT_IMPORT_DATASETS = ["address", "place"]
+
+POINT_IMPORT_MODES = ["wipe", "append", "upsert"]
+
+# geocode_source of rows whose coordinates came with the file
+IMPORTED_GEOCODE_SOURCE = "Import"
+
+# Address text fields, in normalize_address_fields argument order
+ADDRESS_TEXT_FIELDS = [
+    "primary_number",
+    "street_name",
+    "street_suffix",
+    "city_name",
+    "state_abbreviation",
+    "zip5",
+]
+
+# Fields a column map may set; values are a source column or a list of
+# source columns joined with spaces
+POINT_IMPORT_FIELDS = ADDRESS_TEXT_FIELDS + [
+    "county_fips",
+    "longitude",
+    "latitude",
+    "geocode_quality",
+    "name",
+]
+
+ColumnMap = Dict[str, Union[str, Sequence[str]]]
+
+# Column maps of the sample datasets
+POINT_IMPORT_PRESETS: Dict[str, ColumnMap] = {
+    "address_sample": {
+        "primary_number": "number",
+        "street_name": ["predir", "prequal", "pretyp", "street", "suftyp", "sufqual", "sufdir"],
+        "city_name": "city",
+        "state_abbreviation": "state",
+        "zip5": "zip",
+    },
+    "pharmacies": {
+        "name": "name",
+        "primary_number": "housenumber",
+        "street_name": "street",
+        "city_name": "city",
+        "state_abbreviation": "state_code",
+        "zip5": "postcode",
+        "longitude": "lon",
+        "latitude": "lat",
+    },
+}
+
+TEMP_TABLE = "tmp_point_import"
+
+TEMP_COLUMNS = [
+    ("import_row", "bigint"),
+    ("primary_number", "text"),
+    ("street_name", "text"),
+    ("street_suffix", "text"),
+    ("city_name", "text"),
+    ("state_abbreviation", "text"),
+    ("zip5", "text"),
+    ("county_fips", "text"),
+    ("address_fingerprint", "text"),
+    ("longitude", "numeric"),
+    ("latitude", "numeric"),
+    ("geom", "text"),
+    ("geocode_quality", "text"),
+    ("name", "text"),
+    ("address_id", "bigint"),
+    ("is_new", "boolean"),
+]
+
+# Everything but the ids, which are allocated in SQL
+COPY_COLUMNS = [name for name, _ in TEMP_COLUMNS if name not in ("address_id", "is_new")]
+
+
+def parse_column_map(value: str) -> ColumnMap:
+    """
+    Column map from 'field=column,field=column+column' (command line form)
+
+    Example: 'primary_number=HOUSE_NO,street_name=PRE_DIR+STREET,zip5=ZIP'
+    """
+    column_map = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        field, _, source = item.partition("=")
+        field = field.strip()
+        if not source:
+            raise ValueError(f"Column mapping '{item}' is not field=column")
+        columns = [column.strip() for column in source.split("+")]
+        column_map[field] = columns if len(columns) > 1 else columns[0]
+    return column_map
+
+
+def _check_column_map(column_map: ColumnMap, dataset: str):
+    unknown = [field for field in column_map if field not in POINT_IMPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown point import field(s): {', '.join(unknown)}")
+    if ("longitude" in column_map) != ("latitude" in column_map):
+        raise ValueError("Map both longitude and latitude, or neither")
+    if dataset == "place" and "name" not in column_map:
+        raise ValueError("Place imports need a 'name' column")
+
+
+def _source_columns(column_map: ColumnMap) -> List[str]:
+    columns = []
+    for source in column_map.values():
+        for column in [source] if isinstance(source, str) else source:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def _clean_text(series: pd.Series) -> pd.Series:
+    """Vectorized clean_address_text: upper case, punctuation to spaces, whitespace collapsed"""
+    return (
+        series.str.upper()
+        .str.replace(r"[^\w\s#/-]", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _mapped_column(chunk: pd.DataFrame, source: Union[str, Sequence[str]]) -> pd.Series:
+    """One source column, or several joined with spaces (blanks collapse when cleaned)"""
+    if isinstance(source, str):
+        return chunk[source]
+    first, *rest = source
+    return chunk[first].str.cat([chunk[column] for column in rest], sep=" ")
+
+
+def _normalize_distinct(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Canonical address fields and fingerprint, computed once per distinct address
+
+    frame holds the cleaned ADDRESS_TEXT_FIELDS; returns the same index.
+    """
+    distinct = frame[ADDRESS_TEXT_FIELDS].drop_duplicates()
+
+    records = []
+    for values in distinct.itertuples(index=False, name=None):
+        if not any(values):
+            record = dict.fromkeys(ADDRESS_TEXT_FIELDS, "")
+            record["address_fingerprint"] = None
+            records.append(record)
+            continue
+        fields = normalize_address_fields(*values)
+        record = {field: fields[field] for field in ADDRESS_TEXT_FIELDS}
+        record["address_fingerprint"] = address_fingerprint(fields)
+        if len(record["state_abbreviation"]) > 2:
+            # Unrecognised state that does not fit the column; the fingerprint keeps it
+            record["state_abbreviation"] = ""
+        records.append(record)
+
+    normalized = pd.DataFrame(records, index=distinct.index)
+    normalized.columns = [f"normalized_{column}" for column in normalized.columns]
+
+    keyed = pd.concat([distinct, normalized], axis=1)
+    merged = frame[ADDRESS_TEXT_FIELDS].merge(keyed, on=ADDRESS_TEXT_FIELDS, how="left")
+    merged.index = frame.index
+
+    result = pd.DataFrame(index=frame.index)
+    for column in ADDRESS_TEXT_FIELDS + ["address_fingerprint"]:
+        result[column] = merged[f"normalized_{column}"]
+    return result
+
+
+def prepare_point_chunk(chunk: pd.DataFrame, column_map: ColumnMap, first_row: int) -> pd.DataFrame:
+    """
+    Map, clean and normalize one chunk of raw CSV rows
+
+    Args:
+        chunk: Raw rows read as strings
+        column_map: Target field -> source column(s)
+        first_row: File row number of the chunk's first row (0-based, header excluded)
+
+    Returns:
+        DataFrame with COPY_COLUMNS; rows with neither an address nor a valid
+        point are dropped
+    """
+    empty = pd.Series("", index=chunk.index)
+    mapped = pd.DataFrame(index=chunk.index)
+    for field in ADDRESS_TEXT_FIELDS + ["county_fips", "geocode_quality", "name"]:
+        mapped[field] = _mapped_column(chunk, column_map[field]) if field in column_map else empty
+
+    for field in ADDRESS_TEXT_FIELDS + ["county_fips"]:
+        mapped[field] = _clean_text(mapped[field].fillna(""))
+    mapped["name"] = mapped["name"].fillna("").str.strip()
+    mapped["geocode_quality"] = mapped["geocode_quality"].fillna("").str.strip()
+
+    prepared = _normalize_distinct(mapped)
+    prepared["import_row"] = np.arange(first_row, first_row + len(chunk))
+    prepared["county_fips"] = mapped["county_fips"]
+    prepared["name"] = mapped["name"]
+
+    if "longitude" in column_map:
+        longitude = pd.to_numeric(_mapped_column(chunk, column_map["longitude"]), errors="coerce")
+        latitude = pd.to_numeric(_mapped_column(chunk, column_map["latitude"]), errors="coerce")
+        valid = longitude.between(-180, 180) & latitude.between(-90, 90) & ~((longitude == 0) & (latitude == 0))
+    else:
+        longitude = latitude = pd.Series(np.nan, index=chunk.index)
+        valid = pd.Series(False, index=chunk.index)
+
+    prepared["longitude"] = longitude.where(valid)
+    prepared["latitude"] = latitude.where(valid)
+    prepared["geom"] = ("SRID=4326;POINT(" + longitude.astype(str) + " " + latitude.astype(str) + ")").where(valid)
+    prepared["geocode_quality"] = mapped["geocode_quality"].where(valid)
+
+    keep = valid | prepared["address_fingerprint"].notna()
+    return prepared.loc[keep, COPY_COLUMNS]
+
+
+def _copy_records(prepared: pd.DataFrame) -> Iterator[tuple]:
+    """Rows of a prepared chunk with empty strings and NaN as NULL"""
+    for row in prepared.itertuples(index=False, name=None):
+        yield tuple(None if value is None or value == "" or value != value else value for value in row)
+
+
+def read_point_chunks(
+    path,
+    column_map: ColumnMap,
+    chunk_size: int,
+    start_row: int = 0,
+    max_rows: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream raw rows of a CSV as string DataFrames
+
+    Args:
+        path: CSV with a header row
+        column_map: Only the mapped source columns are parsed
+        chunk_size: Rows per DataFrame
+        start_row: Data rows to skip (header excluded)
+        max_rows: Stop after this many rows
+    """
+    return pd.read_csv(
+        path,
+        usecols=_source_columns(column_map),
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8-sig",
+        skiprows=(lambda line: 0 < line <= start_row) if start_row else None,
+        nrows=max_rows,
+        chunksize=chunk_size,
+    )
+
+
+def count_csv_rows(path, column_map: ColumnMap, chunk_size: int = 1000000) -> int:
+    """Data rows of a CSV (parses a single column, so quoted newlines are handled)"""
+    first_column = _source_columns(column_map)[:1]
+    return sum(
+        len(chunk)
+        for chunk in pd.read_csv(
+            path, usecols=first_column, dtype=str, keep_default_na=False,
+            encoding="utf-8-sig", chunksize=chunk_size,
+        )
+    )
+
+
+def point_csv_row_ranges(total_rows: int, rows_per_task: int) -> List[Dict[str, int]]:
+    """Split a file into (start_row, max_rows) ranges for parallel import"""
+    return [
+        {"start_row": start, "max_rows": min(rows_per_task, total_rows - start)}
+        for start in range(0, total_rows, rows_per_task)
+    ]
+
+
+def wipe_point_dataset(dataset: str):
+    """Delete existing addresses (and places, for the place dataset)"""
+    address_table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    place_table = connection.ops.quote_name(Place._meta.db_table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if dataset == "place":
+            cursor.execute(f"TRUNCATE {place_table}, {address_table}")
+        else:
+            # Places keep their rows and lose the address link, as with on_delete=SET_DEFAULT
+            cursor.execute(f"UPDATE {place_table} SET address_id = NULL WHERE address_id IS NOT NULL")
+            cursor.execute(f"DELETE FROM {address_table}")
+
+    logger.info(f"Wiped existing {dataset} rows before import")
+
+
+def _allocate_address_ids(cursor, mode: str) -> int:
+    """
+    Set address_id and is_new on the staged rows
+
+    append: every row gets a new address. upsert: rows reuse the lowest existing
+    id of their fingerprint, and the remaining fingerprints get one new address each.
+    """
+    address_table = connection.ops.quote_name(United_States_Address._meta.db_table)
+    next_id = f"nextval(pg_get_serial_sequence('{United_States_Address._meta.db_table}', 'id'))"
+
+    if mode != "upsert":
+        cursor.execute(f"UPDATE {TEMP_TABLE} SET address_id = {next_id}, is_new = TRUE")
+        return 0
+
+    cursor.execute(
+        f"""
+        UPDATE {TEMP_TABLE} AS i SET address_id = a.id
+        FROM (
+            SELECT DISTINCT ON (address_fingerprint) id, address_fingerprint
+            FROM {address_table}
+            WHERE address_fingerprint IN (
+                SELECT address_fingerprint FROM {TEMP_TABLE} WHERE address_fingerprint IS NOT NULL
+            )
+            ORDER BY address_fingerprint, id
+        ) AS a
+        WHERE i.address_fingerprint = a.address_fingerprint
+        """
+    )
+    matched = cursor.rowcount
+
+    cursor.execute(
+        f"""
+        UPDATE {TEMP_TABLE} SET address_id = {next_id}, is_new = TRUE
+        WHERE address_id IS NULL
+          AND (
+              address_fingerprint IS NULL
+              OR import_row IN (
+                  SELECT DISTINCT ON (address_fingerprint) import_row FROM {TEMP_TABLE}
+                  WHERE address_id IS NULL AND address_fingerprint IS NOT NULL
+                  ORDER BY address_fingerprint, import_row
+              )
+          )
+        """
+    )
+    cursor.execute(
+        f"""
+        UPDATE {TEMP_TABLE} AS i SET address_id = f.address_id
+        FROM {TEMP_TABLE} AS f
+        WHERE i.address_id IS NULL AND f.is_new AND f.address_fingerprint = i.address_fingerprint
+        """
+    )
+    return matched
+
+
+def _refresh_existing_addresses(cursor, now) -> int:
+    """Upsert: move existing addresses to the file's point (census units reset when it moves)"""
+    address_table = connection.ops.quote_name(United_States_Address._meta.db_table)
+
+    cursor.execute(
+        f"""
+        UPDATE {address_table} AS a SET
+            longitude = i.longitude,
+            latitude = i.latitude,
+            geom = ST_GeomFromEWKT(i.geom),
+            geocoded = TRUE,
+            geocode_quality = i.geocode_quality,
+            geocode_source = %(source)s,
+            geocoded_at = %(now)s,
+            census_units_assigned_at = CASE
+                WHEN a.geom IS NOT DISTINCT FROM ST_GeomFromEWKT(i.geom) THEN a.census_units_assigned_at
+            END
+        FROM (
+            SELECT DISTINCT ON (address_fingerprint) *
+            FROM {TEMP_TABLE}
+            WHERE is_new IS NOT TRUE AND address_id IS NOT NULL AND geom IS NOT NULL
+            ORDER BY address_fingerprint, import_row DESC
+        ) AS i
+        WHERE a.address_fingerprint = i.address_fingerprint
+        """,
+        {"source": IMPORTED_GEOCODE_SOURCE, "now": now},
+    )
+    return cursor.rowcount
+
+
+def _insert_new_addresses(cursor, now, census_year: int) -> int:
+    address_table = connection.ops.quote_name(United_States_Address._meta.db_table)
+
+    cursor.execute(
+        f"""
+        INSERT INTO {address_table} (
+            id, primary_number, street_name, street_suffix, city_name, state_abbreviation,
+            zip5, county_fips, address_fingerprint, longitude, latitude, geom,
+            geocoded, geocode_quality, geocode_source, geocoded_at, census_year
+        )
+        SELECT
+            address_id, primary_number, street_name, street_suffix, city_name, state_abbreviation,
+            zip5, county_fips, address_fingerprint, longitude, latitude, ST_GeomFromEWKT(geom),
+            geom IS NOT NULL,
+            geocode_quality,
+            CASE WHEN geom IS NOT NULL THEN %(source)s END,
+            CASE WHEN geom IS NOT NULL THEN %(now)s::timestamptz END,
+            %(census_year)s
+        FROM {TEMP_TABLE}
+        WHERE is_new
+        """,
+        {"source": IMPORTED_GEOCODE_SOURCE, "now": now, "census_year": census_year},
+    )
+    return cursor.rowcount
+
+
+def _merge_places(cursor, mode: str) -> Dict[str, int]:
+    """Insert places for the staged rows (upsert: refresh (name, address) matches instead)"""
+    place_table = connection.ops.quote_name(Place._meta.db_table)
+    updated = 0
+
+    if mode == "upsert":
+        cursor.execute(
+            f"""
+            UPDATE {place_table} AS p SET geom = ST_GeomFromEWKT(i.geom)
+            FROM {TEMP_TABLE} AS i
+            WHERE p.address_id = i.address_id
+              AND p.name = COALESCE(i.name, '')
+              AND i.geom IS NOT NULL
+            """
+        )
+        updated = cursor.rowcount
+        missing = f"""
+            AND NOT EXISTS (
+                SELECT 1 FROM {place_table} AS p
+                WHERE p.address_id = i.address_id AND p.name = COALESCE(i.name, '')
+            )
+        """
+        rows = f"""
+            SELECT DISTINCT ON (i.address_id, COALESCE(i.name, '')) i.*
+            FROM {TEMP_TABLE} AS i
+            WHERE TRUE {missing}
+            ORDER BY i.address_id, COALESCE(i.name, ''), i.import_row
+        """
+    else:
+        rows = f"SELECT * FROM {TEMP_TABLE}"
+
+    cursor.execute(
+        f"""
+        INSERT INTO {place_table} (name, nickname, address_id, geom)
+        SELECT COALESCE(name, ''), '', address_id, ST_GeomFromEWKT(geom)
+        FROM ({rows}) AS staged
+        """
+    )
+    return {"places_inserted": cursor.rowcount, "places_updated": updated}
+
+
+def import_point_chunk(
+    prepared: pd.DataFrame,
+    dataset: str = "address",
+    mode: str = "append",
+    census_year: int = 2020,
+) -> Dict[str, int]:
+    """
+    COPY one prepared chunk into a temporary table and merge it, in one transaction
+
+    Args:
+        prepared: Output of prepare_point_chunk
+        dataset: 'address' or 'place'
+        mode: 'append' or 'upsert' ('wipe' is append after wipe_point_dataset)
+        census_year: census_year of new addresses
+
+    Returns:
+        dict of inserted/updated counts
+    """
+    now = timezone.now()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_temp_table(cursor, TEMP_TABLE, TEMP_COLUMNS)
+        copy_rows(cursor, TEMP_TABLE, COPY_COLUMNS, _copy_records(prepared))
+
+        if mode == "upsert":
+            # Concurrent range tasks would otherwise insert the same new fingerprint twice
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('point_csv_import'))")
+
+        counts = {"addresses_matched": _allocate_address_ids(cursor, mode)}
+        if mode == "upsert":
+            counts["addresses_updated"] = _refresh_existing_addresses(cursor, now)
+        counts["addresses_inserted"] = _insert_new_addresses(cursor, now, census_year)
+
+        if dataset == "place":
+            counts.update(_merge_places(cursor, mode))
+
+    return counts
+
+
+def import_point_csv(
+    path,
+    dataset: str = "address",
+    column_map: Optional[ColumnMap] = None,
+    mode: str = "append",
+    chunk_size: Optional[int] = None,
+    start_row: int = 0,
+    max_rows: Optional[int] = None,
+    census_year: int = 2020,
+) -> Dict[str, float]:
+    """
+    Stream a point CSV into United_States_Address (and Place)
+
+    Args:
+        path: CSV with a header row
+        dataset: 'address' or 'place'
+        column_map: Target field -> source column(s), see POINT_IMPORT_FIELDS
+        mode: 'wipe', 'append' or 'upsert'
+        chunk_size: Rows per chunk/transaction (default: settings.POINT_IMPORT_CHUNK_SIZE)
+        start_row: Data rows to skip (for parallel row ranges)
+        max_rows: Stop after this many rows
+        census_year: census_year of new addresses
+
+    Returns:
+        dict with rows read, rows skipped, the merge counts and rows per second
+    """
+    if dataset not in POINT_IMPORT_DATASETS:
+        raise ValueError(f"Unknown point dataset: {dataset}")
+    if mode not in POINT_IMPORT_MODES:
+        raise ValueError(f"Unknown point import mode: {mode}")
+    if not column_map:
+        raise ValueError("A column map is required")
+    _check_column_map(column_map, dataset)
+
+    chunk_size = chunk_size or settings.POINT_IMPORT_CHUNK_SIZE
+    start_time = time.time()
+
+    if mode == "wipe":
+        wipe_point_dataset(dataset)
+        mode = "append"
+
+    stats = {"rows": 0, "skipped": 0}
+    first_row = start_row
+
+    for chunk in read_point_chunks(path, column_map, chunk_size, start_row, max_rows):
+        prepared = prepare_point_chunk(chunk, column_map, first_row)
+        first_row += len(chunk)
+
+        stats["rows"] += len(chunk)
+        stats["skipped"] += len(chunk) - len(prepared)
+
+        if prepared.empty:
+            continue
+
+        for key, value in import_point_chunk(prepared, dataset, mode, census_year).items():
+            stats[key] = stats.get(key, 0) + value
+
+        logger.info(f"Imported rows {first_row - len(chunk)}-{first_row - 1} of {path} ({stats})")
+
+    elapsed = time.time() - start_time
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["rows_per_second"] = round(stats["rows"] / max(elapsed, 1e-6), 1)
+    return stats
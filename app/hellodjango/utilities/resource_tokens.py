@@ -0,0 +1,308 @@
+"""
+Resource tokens for memory- and database-heavy Celery tasks
+
+Every worker runs a fixed pool of processes, so a chord of six GADM layers (or a
+few hundred TIGER loads) starts as many heavy tasks at once as there are free
+processes, whatever they cost. Heavy tasks instead declare an estimated cost and
+take it from shared token pools before running:
+
+    memory_mb : megabytes of worker RAM (capacity: a fraction of the container's
+                memory limit, or of host memory when there is none)
+    db_writes : concurrent bulk writers against PostGIS
+
+The pools live in Redis and are shared by every worker. A task whose tokens are
+not available is retried later (self.retry) instead of blocking a process, so
+concurrency follows the declared costs rather than the pool size.
+
+Holdings are leases: each has an expiry that the running task keeps extending,
+so tokens of a worker that was killed (OOM, restart) come back on their own.
+A task costing more than a pool's whole capacity runs when that pool is idle.
+
+    @shared_task(bind=True, max_retries=None)
+    @uses_resource_tokens(memory_mb=lambda layer_index, layer_name, path: 8000)
+    def preprocess_layer(self, layer_index, layer_name, path):
+        ...
+
+Without Redis (no RESOURCE_TOKENS_REDIS_URL, or redis not installed) tasks run
+without tokens.
+"""
+
+import functools
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "resource_tokens"
+
+RESOURCE_TOKEN_POOLS = ["memory_mb", "db_writes"]
+
+# Memory limit of the worker's container: cgroup v2, then v1
+CGROUP_MEMORY_LIMIT_FILES = [
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+]
+
+_redis_client = None
+
+# Atomically drop expired leases, check every requested pool, then take all of them.
+# KEYS: (leases zset, amounts hash) per pool
+# ARGV: now, expires_at, lease id, then (capacity, amount) per pool
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local pools = #KEYS / 2
+
+for i = 1, pools do
+    local leases, amounts = KEYS[2 * i - 1], KEYS[2 * i]
+    for _, expired in ipairs(redis.call('ZRANGEBYSCORE', leases, '-inf', now)) do
+        redis.call('HDEL', amounts, expired)
+    end
+    redis.call('ZREMRANGEBYSCORE', leases, '-inf', now)
+
+    local used = 0
+    for _, amount in ipairs(redis.call('HVALS', amounts)) do
+        used = used + tonumber(amount)
+    end
+
+    local capacity, amount = tonumber(ARGV[2 + 2 * i]), tonumber(ARGV[3 + 2 * i])
+    if used > 0 and used + amount > capacity then
+        return 0
+    end
+end
+
+for i = 1, pools do
+    redis.call('ZADD', KEYS[2 * i - 1], ARGV[2], ARGV[3])
+    redis.call('HSET', KEYS[2 * i], ARGV[3], ARGV[3 + 2 * i])
+end
+return 1
+"""
+
+
+def _get_redis():
+    """Return a Redis client for the token pools, or None when not configured/available"""
+    global _redis_client
+
+    if _redis_client is None and settings.RESOURCE_TOKENS_REDIS_URL:
+        try:
+            import redis
+
+            _redis_client = redis.Redis.from_url(settings.RESOURCE_TOKENS_REDIS_URL)
+        except ImportError:
+            logger.warning("redis is not installed, resource tokens disabled")
+            return None
+
+    return _redis_client
+
+
+def _pool_keys(pool: str):
+    return f"{REDIS_KEY_PREFIX}:{pool}:leases", f"{REDIS_KEY_PREFIX}:{pool}:amounts"
+
+
+def _cgroup_memory_limit_mb() -> Optional[int]:
+    """Memory limit of the container in MB, or None when unlimited or not in a cgroup"""
+    for path in CGROUP_MEMORY_LIMIT_FILES:
+        try:
+            with open(path) as f:
+                limit = f.read().strip()
+        except OSError:
+            continue
+        if limit == "max":
+            return None
+        try:
+            return int(limit) // (1024 * 1024)
+        except ValueError:
+            logger.warning(f"Unexpected cgroup memory limit in {path}: {limit!r}")
+            return None
+    return None
+
+
+def _available_memory_mb() -> int:
+    """Physical memory, capped by the container's cgroup limit"""
+    host_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    limit_mb = _cgroup_memory_limit_mb()
+    # cgroup v1 reports "unlimited" as a huge number
+    return min(host_mb, limit_mb) if limit_mb else host_mb
+
+
+def resource_token_capacity() -> Dict[str, int]:
+    """
+    Capacity of each token pool
+
+    memory_mb defaults to RESOURCE_TOKEN_MEMORY_FRACTION of the memory the worker
+    may use (its container's cgroup limit, else the host's physical memory)
+    unless RESOURCE_TOKEN_MEMORY_MB is set.
+    """
+    memory_mb = settings.RESOURCE_TOKEN_MEMORY_MB
+    if not memory_mb:
+        memory_mb = int(_available_memory_mb() * settings.RESOURCE_TOKEN_MEMORY_FRACTION)
+
+    return {"memory_mb": memory_mb, "db_writes": settings.RESOURCE_TOKEN_DB_WRITES}
+
+
+def acquire_resource_tokens(owner: str = "", **amounts: int) -> Optional[Dict]:
+    """
+    Try to take tokens from every pool in one step (all or nothing)
+
+    Args:
+        owner: Label stored in the lease id (e.g. the Celery task id)
+        **amounts: Tokens per pool, e.g. memory_mb=6000, db_writes=1
+
+    Returns:
+        lease dict (pass to release/renew), or None when a pool is short
+    """
+    unknown = set(amounts) - set(RESOURCE_TOKEN_POOLS)
+    if unknown:
+        raise ValueError(f"Unknown resource token pools: {', '.join(sorted(unknown))}")
+
+    amounts = {pool: int(amount) for pool, amount in amounts.items() if amount}
+    lease = {"id": f"{owner}:{uuid.uuid4().hex}", "amounts": amounts}
+
+    client = _get_redis()
+    if client is None or not amounts:
+        return lease
+
+    capacity = resource_token_capacity()
+    keys, args = [], []
+    for pool, amount in amounts.items():
+        keys.extend(_pool_keys(pool))
+        args.extend([capacity[pool], amount])
+
+    now = time.time()
+    granted = client.eval(
+        ACQUIRE_SCRIPT,
+        len(keys),
+        *keys,
+        now,
+        now + settings.RESOURCE_TOKEN_LEASE_SECONDS,
+        lease["id"],
+        *args,
+    )
+    return lease if granted else None
+
+
+def renew_resource_tokens(lease: Dict):
+    """Push the lease's expiry forward (while its task is still running)"""
+    client = _get_redis()
+    if client is None or not lease["amounts"]:
+        return
+
+    expires_at = time.time() + settings.RESOURCE_TOKEN_LEASE_SECONDS
+    pipe = client.pipeline()
+    for pool in lease["amounts"]:
+        leases_key, _ = _pool_keys(pool)
+        pipe.zadd(leases_key, {lease["id"]: expires_at}, xx=True)
+    pipe.execute()
+
+
+def release_resource_tokens(lease: Dict):
+    """Return the lease's tokens to their pools"""
+    client = _get_redis()
+    if client is None or not lease["amounts"]:
+        return
+
+    pipe = client.pipeline()
+    for pool in lease["amounts"]:
+        leases_key, amounts_key = _pool_keys(pool)
+        pipe.zrem(leases_key, lease["id"])
+        pipe.hdel(amounts_key, lease["id"])
+    pipe.execute()
+
+
+def resource_token_usage() -> Dict:
+    """
+    Live leases per pool
+
+    Returns:
+        {pool: {capacity, used, leases}} (empty when Redis is not available)
+    """
+    client = _get_redis()
+    if client is None:
+        return {}
+
+    now = time.time()
+    capacity = resource_token_capacity()
+    usage = {}
+    for pool in RESOURCE_TOKEN_POOLS:
+        leases_key, amounts_key = _pool_keys(pool)
+        live = [lease.decode() for lease in client.zrangebyscore(leases_key, now, "+inf")]
+        amounts = client.hmget(amounts_key, live) if live else []
+        usage[pool] = {
+            "capacity": capacity[pool],
+            "used": sum(int(amount) for amount in amounts if amount is not None),
+            "leases": len(live),
+        }
+    return usage
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renews a lease every third of its lifetime until stopped"""
+
+    def __init__(self, lease: Dict):
+        super().__init__(daemon=True)
+        self.lease = lease
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(settings.RESOURCE_TOKEN_LEASE_SECONDS / 3):
+            try:
+                renew_resource_tokens(self.lease)
+            except Exception as e:
+                logger.warning(f"Could not renew resource tokens {self.lease['id']}: {e}")
+
+
+TokenAmount = Union[int, Callable[..., int]]
+
+
+def uses_resource_tokens(memory_mb: TokenAmount = 0, db_writes: TokenAmount = 0):
+    """
+    Decorator for bound Celery tasks: hold resource tokens while the task runs
+
+    Goes between @shared_task(bind=True, max_retries=None) and the function.
+    Amounts are ints, or callables receiving the task's arguments (to size by
+    layer or unit type). When the tokens are not available the task is retried
+    after RESOURCE_TOKEN_RETRY_SECONDS (with jitter); self.retry counts against
+    the task's max_retries (Celery's default is 3), hence max_retries=None.
+    """
+    def decorator(run):
+        @functools.wraps(run)
+        def wrapper(self, *args, **kwargs):
+            amounts = {
+                pool: amount(*args, **kwargs) if callable(amount) else amount
+                for pool, amount in (("memory_mb", memory_mb), ("db_writes", db_writes))
+            }
+
+            try:
+                lease = acquire_resource_tokens(self.request.id or "", **amounts)
+            except Exception as e:
+                logger.warning(f"Resource tokens unavailable ({e}), running {self.name} without them")
+                lease = {"id": "", "amounts": {}}
+
+            if lease is None:
+                countdown = settings.RESOURCE_TOKEN_RETRY_SECONDS * random.uniform(0.5, 1.5)
+                logger.info(
+                    f"[Worker {self.request.hostname}] {self.name} waiting for resource tokens "
+                    f"{amounts}, retrying in {countdown:.0f}s"
+                )
+                raise self.retry(countdown=countdown)
+
+            keeper = _LeaseKeeper(lease)
+            keeper.start()
+            try:
+                return run(self, *args, **kwargs)
+            finally:
+                keeper.stopped.set()
+                try:
+                    release_resource_tokens(lease)
+                except Exception as e:
+                    logger.warning(f"Could not release resource tokens {lease['id']}: {e}")
+
+        return wrapper
+
+    return decorator
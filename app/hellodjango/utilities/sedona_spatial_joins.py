@@ -0,0 +1,392 @@
+"""
+Apache Sedona (Spark local mode) engine for the heaviest spatial joins
+
+Jobs:
+- address x tabulation block: assigns block_geoid (and the state, county, tract
+  and block group GEOIDs it is prefixed with, plus VTD/CD from the block
+  crosswalk) to every geocoded address of a census year
+- VTD x CD: rebuilds VTDCongressionalDistrictIntersection for a year
+
+Each job:
+1. exports its inputs from PostGIS to GeoParquet part files
+   (settings.GEOPARQUET_EXPORT_SUBDIRECTORY), reading from
+   settings.CENSUS_BATCH_READ_DATABASE
+2. runs a partitioned spatial join on a local Spark session across every core
+   (settings.SEDONA_SPARK_MASTER, default local[*])
+3. streams the result back to the driver and writes it with COPY into a
+   temporary table plus one set-based statement
+
+Spark and Sedona are imported lazily; only processes that run a job pay for the JVM.
+"""
+
+import logging
+import os
+import pathlib
+import shutil
+import time
+from typing import Dict, Optional
+
+import geopandas as gpd
+import shapely
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+from locations.models import (
+    United_States_Address,
+    United_States_Census_Block_Crosswalk,
+    United_States_Census_Congressional_District,
+    United_States_Census_Tabulation_Block,
+    United_States_Census_Voter_Tabulation_District,
+    VTDCongressionalDistrictIntersection,
+)
+
+from .address_deduplication import assignment_representative_clause, fan_out_census_units
+from .bulk_census_assignment import BLOCK_GEOID_PREFIXES
+from .census_intersections import AREA_SRID
+from .copy_utilities import copy_rows, create_temp_table
+from .dispatchers import CENSUS_UNIT_ASSIGNMENT_DISPATCHER
+
+logger = logging.getLogger(__name__)
+
+_sedona_context = None
+
+
+def get_sedona_context():
+    """
+    Return this process's Sedona-enabled Spark session (created on first use)
+    """
+    global _sedona_context
+
+    if _sedona_context is None:
+        from sedona.spark import SedonaContext
+
+        partitions = settings.SEDONA_SHUFFLE_PARTITIONS or (os.cpu_count() or 1) * 4
+
+        config = (
+            SedonaContext.builder()
+            .master(settings.SEDONA_SPARK_MASTER)
+            .appName("geodjango-sedona")
+            .config("spark.driver.memory", settings.SEDONA_SPARK_DRIVER_MEMORY)
+            .config("spark.jars.packages", settings.SEDONA_SPARK_PACKAGES)
+            .config("spark.sql.shuffle.partitions", str(partitions))
+            .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer")
+            .config("spark.kryo.registrator", "org.apache.sedona.core.serde.SedonaKryoRegistrator")
+            .config("sedona.join.gridtype", "kdbtree")
+            .getOrCreate()
+        )
+        _sedona_context = SedonaContext.create(config)
+
+    return _sedona_context
+
+
+def export_geoparquet(
+    sql: str,
+    params: Dict,
+    output_dir: pathlib.Path,
+    crs: str,
+    batch_rows: int = 500000,
+    using: Optional[str] = None,
+) -> int:
+    """
+    Export a query to a directory of GeoParquet part files
+
+    The query must return its geometry as WKB in a column named 'geometry'.
+    The directory is replaced. Rows are fetched with a server-side cursor and
+    written batch_rows at a time, so memory stays bounded.
+
+    Returns:
+        Number of rows exported
+    """
+    using = using or settings.CENSUS_BATCH_READ_DATABASE
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    exported = 0
+    part = 0
+
+    with transaction.atomic(using=using), connections[using].chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchmany(batch_rows)
+
+        # A server-side cursor only has a description after the first fetch
+        columns = [column[0] for column in cursor.description] if cursor.description else []
+        geometry_index = columns.index("geometry") if columns else None
+
+        while rows:
+            attributes = {
+                name: [row[index] for row in rows]
+                for index, name in enumerate(columns)
+                if index != geometry_index
+            }
+            frame = gpd.GeoDataFrame(
+                attributes,
+                geometry=shapely.from_wkb([bytes(row[geometry_index]) for row in rows]),
+                crs=crs,
+            )
+            frame.to_parquet(output_dir / f"part-{part:05d}.parquet")
+
+            exported += len(rows)
+            part += 1
+            rows = cursor.fetchmany(batch_rows)
+
+    logger.info(f"Exported {exported} rows to {output_dir} ({part} parts)")
+    return exported
+
+
+def _read_geoparquet_view(sedona, path: pathlib.Path, view: str):
+    """Register a GeoParquet directory as a temporary Spark view"""
+    frame = sedona.read.format("geoparquet").load(str(path))
+    frame.createOrReplaceTempView(view)
+    return frame
+
+
+def assign_blocks_sedona(year: int) -> Dict[str, float]:
+    """
+    Assign blocks (and everything derived from them) to geocoded addresses with Sedona
+
+    Only one row per address fingerprint and point is joined; duplicates are filled in afterwards.
+
+    Returns:
+        dict with addresses exported, addresses assigned, duplicates fanned out
+        and elapsed seconds
+    """
+    start_time = time.time()
+    quote = connection.ops.quote_name
+    export_dir = settings.GEOPARQUET_EXPORT_SUBDIRECTORY / f"address_block_{year}"
+    block_config = CENSUS_UNIT_ASSIGNMENT_DISPATCHER["block"]
+
+    addresses_exported = export_geoparquet(
+        f"""
+        SELECT a.id, ST_AsBinary(a.geom) AS geometry
+        FROM {quote(United_States_Address._meta.db_table)} AS a
+        WHERE a.census_year = %(year)s
+          AND a.geocoded
+          AND a.geom IS NOT NULL
+          {assignment_representative_clause("a")}
+        """,
+        {"year": year},
+        export_dir / "addresses",
+        crs="EPSG:4326",
+    )
+
+    if not addresses_exported:
+        return {"year": year, "exported": 0, "addresses": 0, "fanned_out": 0,
+                "elapsed_seconds": round(time.time() - start_time, 2)}
+
+    # Addresses are WGS84 and blocks NAD83; as elsewhere, points are tested as-is
+    blocks_exported = export_geoparquet(
+        f"""
+        SELECT {quote(block_config['geoid_field'])} AS geoid, ST_AsBinary(geom) AS geometry
+        FROM {quote(United_States_Census_Tabulation_Block._meta.db_table)}
+        WHERE year = %(year)s
+        """,
+        {"year": year},
+        export_dir / "blocks",
+        crs="EPSG:4269",
+    )
+
+    if not blocks_exported:
+        raise ValueError(f"Tabulation blocks for {year} must be loaded first")
+
+    sedona = get_sedona_context()
+    _read_geoparquet_view(sedona, export_dir / "addresses", "addresses")
+    _read_geoparquet_view(sedona, export_dir / "blocks", "blocks")
+
+    # ST_Contains between two views is planned as a partitioned spatial join
+    assignments = sedona.sql(
+        """
+        SELECT a.id, min(b.geoid) AS block_geoid
+        FROM addresses a
+        JOIN blocks b ON ST_Contains(b.geometry, a.geometry)
+        GROUP BY a.id
+        """
+    )
+
+    derived = ", ".join(
+        f"{quote(CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]['address_field'])} = "
+        f"left(t.block_geoid, {prefix_length})"
+        for unit_type, prefix_length in BLOCK_GEOID_PREFIXES.items()
+    )
+
+    reset = ", ".join(
+        f"{quote(CENSUS_UNIT_ASSIGNMENT_DISPATCHER[unit_type]['address_field'])} = NULL"
+        for unit_type in ["block", *BLOCK_GEOID_PREFIXES, "vtd", "cd"]
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Addresses in no block, or in a block without crosswalk row, end up NULL
+        # instead of keeping the units of a previous run
+        cursor.execute(
+            f"""
+            UPDATE {quote(United_States_Address._meta.db_table)} AS a
+            SET {reset}
+            WHERE a.census_year = %(year)s
+              AND a.geocoded
+              AND a.geom IS NOT NULL
+            """,
+            {"year": year},
+        )
+        create_temp_table(cursor, "tmp_sedona_block_assignment", [("id", "bigint"), ("block_geoid", "varchar")])
+        copy_rows(
+            cursor,
+            "tmp_sedona_block_assignment",
+            ["id", "block_geoid"],
+            ((row["id"], row["block_geoid"]) for row in assignments.toLocalIterator()),
+        )
+        cursor.execute(
+            f"""
+            UPDATE {quote(United_States_Address._meta.db_table)} AS a
+            SET block_geoid = t.block_geoid,
+                {derived},
+                vtd_geoid = x.vtd_geoid,
+                cd_geoid = x.cd_geoid,
+                census_units_assigned_at = now()
+            FROM tmp_sedona_block_assignment AS t
+            LEFT JOIN {quote(United_States_Census_Block_Crosswalk._meta.db_table)} AS x
+                ON x.block_geoid = t.block_geoid AND x.year = %(year)s
+            WHERE a.id = t.id
+            """,
+            {"year": year},
+        )
+        assigned = cursor.rowcount
+
+    fanned_out = fan_out_census_units(year)
+    elapsed = time.time() - start_time
+
+    logger.info(
+        f"Sedona block assignment ({year}): {assigned}/{addresses_exported} addresses in {elapsed:.2f}s"
+    )
+
+    return {
+        "year": year,
+        "exported": addresses_exported,
+        "addresses": assigned,
+        "fanned_out": fanned_out,
+        "elapsed_seconds": round(elapsed, 2),
+    }
+
+
+def build_vtd_cd_intersections_sedona(year: int) -> Dict[str, float]:
+    """
+    Rebuild VTD x CD intersections for a year with Sedona
+
+    Intersections are computed per state pair (VTDs never cross state lines),
+    areas in an equal-area projection. Existing rows for the year are replaced
+    in one transaction.
+
+    Returns:
+        dict with VTDs and CDs exported, intersections written and elapsed seconds
+    """
+    start_time = time.time()
+    quote = connection.ops.quote_name
+    export_dir = settings.GEOPARQUET_EXPORT_SUBDIRECTORY / f"vtd_cd_{year}"
+
+    exported = {}
+    for name, model in [
+        ("vtds", United_States_Census_Voter_Tabulation_District),
+        ("cds", United_States_Census_Congressional_District),
+    ]:
+        exported[name] = export_geoparquet(
+            f"""
+            SELECT id, statefp, ST_AsBinary(geom) AS geometry
+            FROM {quote(model._meta.db_table)}
+            WHERE year = %(year)s
+            """,
+            {"year": year},
+            export_dir / name,
+            crs="EPSG:4269",
+        )
+
+    if not exported["vtds"] or not exported["cds"]:
+        raise ValueError(f"VTDs and CDs for {year} must be loaded first")
+
+    sedona = get_sedona_context()
+    _read_geoparquet_view(sedona, export_dir / "vtds", "vtds")
+    _read_geoparquet_view(sedona, export_dir / "cds", "cds")
+
+    intersections = sedona.sql(
+        f"""
+        SELECT vtd_id, cd_id,
+               ST_AsBinary(intersection) AS intersection_wkb,
+               ST_Area(ST_Transform(intersection, 'EPSG:4269', 'EPSG:{AREA_SRID}')) AS intersection_area,
+               ST_Area(ST_Transform(vtd_geometry, 'EPSG:4269', 'EPSG:{AREA_SRID}')) AS vtd_area,
+               ST_Area(ST_Transform(cd_geometry, 'EPSG:4269', 'EPSG:{AREA_SRID}')) AS cd_area
+        FROM (
+            SELECT v.id AS vtd_id, c.id AS cd_id,
+                   v.geometry AS vtd_geometry, c.geometry AS cd_geometry,
+                   ST_Intersection(v.geometry, c.geometry) AS intersection
+            FROM vtds v
+            JOIN cds c ON ST_Intersects(v.geometry, c.geometry)
+            WHERE v.statefp = c.statefp
+        ) pairs
+        """
+    ).where("intersection_area > 0")
+
+    meta = VTDCongressionalDistrictIntersection._meta
+    table = quote(meta.db_table)
+    vtd_column = quote(meta.get_field("vtd").column)
+    cd_column = quote(meta.get_field("cd").column)
+    temp_table = "tmp_sedona_vtd_cd"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        create_temp_table(
+            cursor,
+            temp_table,
+            [
+                ("vtd_id", "integer"),
+                ("cd_id", "integer"),
+                ("wkb_hex", "text"),
+                ("intersection_area", "double precision"),
+                ("vtd_area", "double precision"),
+                ("cd_area", "double precision"),
+            ],
+        )
+        copy_rows(
+            cursor,
+            temp_table,
+            ["vtd_id", "cd_id", "wkb_hex", "intersection_area", "vtd_area", "cd_area"],
+            (
+                (
+                    row["vtd_id"],
+                    row["cd_id"],
+                    bytes(row["intersection_wkb"]).hex(),
+                    row["intersection_area"],
+                    row["vtd_area"],
+                    row["cd_area"],
+                )
+                for row in intersections.toLocalIterator()
+            ),
+        )
+
+        cursor.execute(f"DELETE FROM {table} WHERE year = %(year)s", {"year": year})
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (
+                {vtd_column}, {cd_column}, year, intersection_geom, intersection_area_sqm,
+                pct_of_vtd, pct_of_cd, is_dominant, computed_at
+            )
+            SELECT t.vtd_id, t.cd_id, %(year)s,
+                   ST_Multi(ST_CollectionExtract(ST_GeomFromWKB(decode(t.wkb_hex, 'hex'), 4269), 3)),
+                   round(t.intersection_area),
+                   COALESCE(LEAST(100, round((100 * t.intersection_area / NULLIF(t.vtd_area, 0))::numeric, 2)), 0),
+                   COALESCE(LEAST(100, round((100 * t.intersection_area / NULLIF(t.cd_area, 0))::numeric, 2)), 0),
+                   t.intersection_area > 0.5 * t.vtd_area,
+                   now()
+            FROM {temp_table} AS t
+            """,
+            {"year": year},
+        )
+        written = cursor.rowcount
+
+    elapsed = time.time() - start_time
+    logger.info(f"Sedona VTD x CD intersections ({year}): {written} rows in {elapsed:.2f}s")
+
+    return {
+        "year": year,
+        "vtds": exported["vtds"],
+        "cds": exported["cds"],
+        "intersections": written,
+        "elapsed_seconds": round(elapsed, 2),
+    }
@@ -0,0 +1,251 @@
+"""
+Offline geocoder on TIGER address ranges (ADDRFEAT)
+
+Address range features are loaded per county into United_States_Census_Address_Feature
+(python manage.py fetch_census_addrfeat). An address is geocoded by:
+1. normalizing its street name the way TIGER spells FULLNAME
+2. finding segments with that name whose left or right range holds the house
+   number (restricted by ZIP, else by state)
+3. interpolating the number's position between the range ends along the segment
+
+Everything runs against the local database, so throughput is not bound by any
+provider rate limit. Results use geocode_source 'TIGER_LOCAL' and quality 'Interpolated'.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.gis.utils import LayerMapping
+from django.db.models import Q
+from django.utils import timezone
+
+from locations.models import United_States_Address, United_States_Census_Address_Feature
+from locations.models.census.tiger.addrfeat import united_states_census_address_feature_mapping
+
+from .address_normalization import (
+    normalize_street_name,
+    parse_house_number,
+    state_fips_for,
+)
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_SOURCE = "TIGER_LOCAL"
+
+SIDE_FIELDS = {
+    "left": ("lfrom_number", "lto_number", "parityl", "zipl"),
+    "right": ("rfrom_number", "rto_number", "parityr", "zipr"),
+}
+
+
+class AddressFeatureLayerMapping(LayerMapping):
+    """
+    LayerMapping that adds the county/year and the derived matching keys to each feature
+    """
+
+    def __init__(self, *args, extra_kwargs=None, **kwargs):
+        self.extra_kwargs = extra_kwargs or {}
+        super().__init__(*args, **kwargs)
+
+    def feature_kwargs(self, feat):
+        kwargs = super().feature_kwargs(feat)
+        kwargs.update(self.extra_kwargs)
+        kwargs["normalized_name"] = normalize_street_name(kwargs.get("fullname"))[:100]
+        kwargs["lfrom_number"] = parse_house_number(kwargs.get("lfromhn"))
+        kwargs["lto_number"] = parse_house_number(kwargs.get("ltohn"))
+        kwargs["rfrom_number"] = parse_house_number(kwargs.get("rfromhn"))
+        kwargs["rto_number"] = parse_house_number(kwargs.get("rtohn"))
+        return kwargs
+
+
+def load_address_features(shp_path: str, year: int, statefp: str, countyfp: str) -> int:
+    """
+    Replace the address range features of one county with those in an ADDRFEAT shapefile
+
+    Returns:
+        Number of features loaded
+    """
+    United_States_Census_Address_Feature.objects.filter(
+        year=year, statefp=statefp, countyfp=countyfp
+    ).delete()
+
+    lm = AddressFeatureLayerMapping(
+        United_States_Census_Address_Feature,
+        str(shp_path),
+        united_states_census_address_feature_mapping,
+        transform=False,
+        encoding='utf-8',
+        extra_kwargs={"year": year, "statefp": statefp, "countyfp": countyfp},
+    )
+    lm.save(strict=False, verbose=False)
+
+    return United_States_Census_Address_Feature.objects.filter(
+        year=year, statefp=statefp, countyfp=countyfp
+    ).count()
+
+
+def _parity_matches(parity: Optional[str], house_number: int) -> bool:
+    if parity == "O":
+        return house_number % 2 == 1
+    if parity == "E":
+        return house_number % 2 == 0
+    return True
+
+
+def _in_range(from_number, to_number, house_number) -> bool:
+    if from_number is None or to_number is None:
+        return False
+    return min(from_number, to_number) <= house_number <= max(from_number, to_number)
+
+
+def interpolate_position(feature: United_States_Census_Address_Feature, side: str, house_number: int):
+    """
+    Point for a house number on one side of a segment (SRID 4326)
+    """
+    from_field, to_field, _, _ = SIDE_FIELDS[side]
+    from_number = getattr(feature, from_field)
+    to_number = getattr(feature, to_field)
+
+    if from_number == to_number:
+        fraction = 0.5
+    else:
+        fraction = (house_number - from_number) / (to_number - from_number)
+
+    point = feature.geom.interpolate_normalized(min(max(fraction, 0.0), 1.0))
+    point.srid = feature.geom.srid
+    return point.transform(4326, clone=True)
+
+
+def _match_segment(candidates, house_number: int, zip5: Optional[str] = None):
+    """
+    First candidate side whose range and parity hold the house number
+
+    With zip5, a side carrying that ZIP is preferred over one that does not.
+    """
+    number_filter = Q()
+    for from_field, to_field, _, _ in SIDE_FIELDS.values():
+        number_filter |= Q(**{f"{from_field}__lte": house_number, f"{to_field}__gte": house_number})
+        number_filter |= Q(**{f"{from_field}__gte": house_number, f"{to_field}__lte": house_number})
+
+    fallback = (None, None)
+    for feature in candidates.filter(number_filter):
+        for side, (from_field, to_field, parity_field, zip_field) in SIDE_FIELDS.items():
+            if not _in_range(getattr(feature, from_field), getattr(feature, to_field), house_number):
+                continue
+            if not _parity_matches(getattr(feature, parity_field), house_number):
+                continue
+            if not zip5 or getattr(feature, zip_field) == zip5:
+                return feature, side
+            if fallback[0] is None:
+                fallback = (feature, side)
+
+    return fallback
+
+
+def find_address_segment(
+    street_name: str,
+    house_number: int,
+    zip5: Optional[str] = None,
+    statefp: Optional[str] = None,
+    year: Optional[int] = None,
+):
+    """
+    Find the segment and side whose range holds the house number
+
+    Segments of the ZIP are searched first; when none matches (a wrong ZIP, or
+    segments with blank zipl/zipr) the street is searched again within the state.
+
+    Returns:
+        (feature, side) or (None, None)
+    """
+    year = year or settings.TIGER_GEOCODER_YEAR
+
+    candidates = United_States_Census_Address_Feature.objects.filter(
+        year=year, normalized_name=street_name
+    )
+
+    if zip5:
+        feature, side = _match_segment(
+            candidates.filter(Q(zipl=zip5) | Q(zipr=zip5)), house_number, zip5
+        )
+        if feature is not None:
+            return feature, side
+
+    if statefp:
+        return _match_segment(candidates.filter(statefp=statefp), house_number)
+
+    return None, None
+
+
+def geocode_address_tiger(address: United_States_Address, year: Optional[int] = None) -> Optional[Dict]:
+    """
+    Geocode one address against the local address ranges
+
+    Returns:
+        dict with latitude, longitude, geocode_quality and geocode_source, or None
+    """
+    house_number = parse_house_number(address.primary_number)
+    street_name = normalize_street_name(address.street_name, address.street_suffix)
+
+    if house_number is None or not street_name:
+        return None
+
+    feature, side = find_address_segment(
+        street_name,
+        house_number,
+        zip5=address.zip5,
+        statefp=state_fips_for(address.state_abbreviation),
+        year=year,
+    )
+    if feature is None:
+        return None
+
+    point = interpolate_position(feature, side, house_number)
+    return {
+        "latitude": point.y,
+        "longitude": point.x,
+        "geocode_quality": "Interpolated",
+        "geocode_source": GEOCODE_SOURCE,
+    }
+
+
+def apply_geocode_result(address: United_States_Address, result: Dict, geocoded_at=None):
+    """Copy a geocode result onto an address instance (does not save)"""
+    from django.contrib.gis.geos import Point
+
+    address.geom = Point(result["longitude"], result["latitude"], srid=4326)
+    address.latitude = result["latitude"]
+    address.longitude = result["longitude"]
+    address.geocoded = True
+    address.geocode_quality = result["geocode_quality"]
+    address.geocode_source = result["geocode_source"]
+    address.geocoded_at = geocoded_at or timezone.now()
+
+
+def geocode_addresses_tiger(
+    addresses: Iterable[United_States_Address], year: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Geocode addresses offline and save matches with one bulk_update
+
+    Returns:
+        dict with submitted, matched and no_match counts
+    """
+    from .census_batch_geocoding import GEOCODED_FIELDS
+
+    geocoded_at = timezone.now()
+    matched = []
+    submitted = 0
+
+    for address in addresses:
+        submitted += 1
+        result = geocode_address_tiger(address, year)
+        if result:
+            apply_geocode_result(address, result, geocoded_at)
+            matched.append(address)
+
+    if matched:
+        United_States_Address.objects.bulk_update(matched, GEOCODED_FIELDS)
+
+    return {"submitted": submitted, "matched": len(matched), "no_match": submitted - len(matched)}